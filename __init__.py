@@ -278,6 +278,8 @@ def register():
         from .checker import gizmo_draw
         if gizmo_draw.uvv_depsgraph_ui_update not in bpy.app.handlers.depsgraph_update_post:
             bpy.app.handlers.depsgraph_update_post.append(gizmo_draw.uvv_depsgraph_ui_update)
+        if gizmo_draw.uvv_load_post_clear_updates not in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.append(gizmo_draw.uvv_load_post_clear_updates)
         print("UVV: Depsgraph handler registered")
     except Exception as e:
         print(f"UVV: Failed to register depsgraph handler: {e}")
@@ -535,6 +537,8 @@ def unregister():
         from .checker import gizmo_draw
         if gizmo_draw.uvv_depsgraph_ui_update in bpy.app.handlers.depsgraph_update_post:
             bpy.app.handlers.depsgraph_update_post.remove(gizmo_draw.uvv_depsgraph_ui_update)
+        if gizmo_draw.uvv_load_post_clear_updates in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.remove(gizmo_draw.uvv_load_post_clear_updates)
         print("UVV: Depsgraph handler unregistered")
     except Exception as e:
         print(f"UVV: Failed to unregister depsgraph handler: {e}")
@@ -0,0 +1,22 @@
+"""
+UVV headless benchmarks
+
+Parametric test meshes (meshes.py), timed cases for the heavy island, stack,
+weld, stitch, relax, quadrify, texel density and coverage paths (cases.py) and
+a runner that writes JSON results and compares them to a stored baseline
+(runner.py). Not part of the release zip.
+
+Usage:
+    blender -b --factory-startup --python benchmarks/run.py -- [options]
+
+Options:
+    --sizes 1k,10k,100k     Target face counts (k/M suffixes), default 1k,10k,100k
+    --cases islands,weld    Case names or prefixes, default all
+    --repeat 3              Timed runs per case
+    --output results.json   Write results
+    --baseline base.json    Compare against a previous results file
+    --threshold 0.25        Allowed slowdown ratio before a case is a regression
+
+Operators that need a UV editor or 3D viewport are reported with an error in
+background mode, run Blender with a UI window to time them.
+"""
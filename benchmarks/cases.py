@@ -0,0 +1,157 @@
+"""
+Benchmark cases
+
+A case times one call on a freshly generated object in edit mode with all faces
+selected and UV sync on. Cases that edit the mesh get a new object per run,
+read-only cases reuse it. The island cache is cleared before every run, so
+numbers are cold unless a case says otherwise.
+"""
+
+import contextlib
+
+import bpy
+import bmesh
+
+from . import meshes
+
+
+class Case:
+    def __init__(self, name: str, func, kinds: tuple[str, ...], mutates: bool = False, max_faces: int = 0):
+        self.name = name
+        self.func = func
+        self.kinds = kinds
+        self.mutates = mutates
+        self.max_faces = max_faces  # Skip bigger sizes, 0 for no limit
+
+
+CASES: list[Case] = []
+
+
+def case(name: str, kinds: tuple[str, ...], mutates=False, max_faces=0):
+    def decorator(func):
+        CASES.append(Case(name, func, kinds, mutates, max_faces))
+        return func
+    return decorator
+
+
+def get_umesh(obj):
+    from ..types import UMesh
+    bm = bmesh.from_edit_mesh(obj.data)
+    return UMesh(bm, obj)
+
+
+def ui_override():
+    """3D viewport context when Blender runs with a window, operators that read
+    context.area fail in background mode.
+    """
+    window = bpy.context.window or next(iter(bpy.context.window_manager.windows), None)
+    if window is None:
+        return contextlib.nullcontext()
+    for area in window.screen.areas:
+        if area.type == 'VIEW_3D':
+            region = next(r for r in area.regions if r.type == 'WINDOW')
+            return bpy.context.temp_override(window=window, area=area, region=region)
+    return contextlib.nullcontext()
+
+
+def run_operator(op, **kwargs):
+    with ui_override():
+        result = op(**kwargs)
+    if 'FINISHED' not in result:
+        raise RuntimeError(f"{op.idname_py()} returned {result}")
+
+
+# Islands
+
+@case('islands.calc_visible', ('grid', 'split_grid', 'sphere', 'kit', 'ngons'))
+def islands_calc_visible(obj):
+    from ..types import Islands
+    Islands.calc_visible(get_umesh(obj))
+
+
+@case('islands.calc_extended_with_mark_seam', ('split_grid', 'kit'))
+def islands_calc_extended_with_mark_seam(obj):
+    from ..types import Islands
+    Islands.calc_extended_with_mark_seam(get_umesh(obj))
+
+
+@case('adv_islands.calc_visible', ('split_grid', 'sphere', 'kit'))
+def adv_islands_calc_visible(obj):
+    from ..types import AdvIslands
+    AdvIslands.calc_visible(get_umesh(obj))
+
+
+@case('adv_islands.calc_extended_with_mark_seam', ('split_grid', 'kit'))
+def adv_islands_calc_extended_with_mark_seam(obj):
+    from ..types import AdvIslands
+    AdvIslands.calc_extended_with_mark_seam(get_umesh(obj))
+
+
+# Stacking
+
+@case('stack.group_by_similarity', ('kit',))
+def stack_group_by_similarity(obj):
+    from ..utils.stack_utils import StackSystem
+    StackSystem(bpy.context).group_by_similarity()
+
+
+# Weld / stitch / relax / quadrify (3D viewport variants where they exist)
+
+@case('weld', ('split_grid',), mutates=True)
+def weld(obj):
+    run_operator(bpy.ops.mesh.uvv_weld)
+
+
+@case('stitch', ('split_grid',), mutates=True)
+def stitch(obj):
+    run_operator(bpy.ops.mesh.uvv_stitch)
+
+
+@case('relax', ('sphere', 'split_grid'), mutates=True, max_faces=200_000)
+def relax(obj):
+    run_operator(bpy.ops.mesh.univ_relax)
+
+
+@case('relax.legacy', ('sphere', 'split_grid'), mutates=True, max_faces=200_000)
+def relax_legacy(obj):
+    run_operator(bpy.ops.uv.univ_relax, legacy=True)
+
+
+@case('quadrify', ('grid',), mutates=True)
+def quadrify(obj):
+    run_operator(bpy.ops.uv.uvv_quadrify)
+
+
+# Texel density / coverage
+
+@case('td.scope', ('split_grid', 'kit', 'ngons'))
+def td_scope(obj):
+    from ..checker.td_utils import TdUtils, TdContext
+    TdUtils.get_td_data_with_precision(bpy.context, [obj], TdContext(bpy.context))
+
+
+@case('coverage', ('split_grid', 'kit', 'sphere'))
+def coverage(obj):
+    from ..utils import uv_coverage
+    uv_coverage.calc_uv_coverage(uv_coverage.calc_object_uv_triangles(obj, selected_only=False))
+
+
+def select_cases(patterns: list[str] | None) -> list[Case]:
+    if not patterns:
+        return list(CASES)
+    return [c for c in CASES if any(c.name == p or c.name.startswith(p) for p in patterns)]
+
+
+@contextlib.contextmanager
+def bench_object(kind: str, faces: int):
+    """Object in edit mode with everything selected, removed afterwards"""
+    obj = meshes.create_object(kind, faces)
+    bpy.context.scene.tool_settings.use_uv_select_sync = True
+    bpy.ops.object.mode_set(mode='EDIT')
+    bpy.ops.mesh.select_mode(type='FACE')
+    bpy.ops.mesh.select_all(action='SELECT')
+    try:
+        yield obj
+    finally:
+        bpy.ops.object.mode_set(mode='OBJECT')
+        meshes.remove_object(obj)
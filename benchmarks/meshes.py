@@ -0,0 +1,172 @@
+"""
+Synthetic benchmark meshes
+
+Every generator builds topology and per-corner UVs as NumPy arrays and writes
+them with foreach_set, so 1M face meshes are created in about a second.
+Sizes are target face counts, the result is the nearest mesh of that shape.
+"""
+
+import math
+
+import bpy
+import bmesh
+import numpy as np
+
+
+UV_NAME = 'UVMap'
+
+
+def build_mesh(name: str, vert_co: np.ndarray, face_sizes: np.ndarray, corner_verts: np.ndarray,
+               uv_co: np.ndarray, seam_edges: np.ndarray | None = None) -> bpy.types.Mesh:
+    """Mesh from flat arrays, seam_edges is an (N, 2) array of vertex pairs"""
+    me = bpy.data.meshes.new(name)
+    me.vertices.add(len(vert_co))
+    me.vertices.foreach_set('co', np.ascontiguousarray(vert_co, dtype='float32').ravel())
+    me.loops.add(len(corner_verts))
+    me.loops.foreach_set('vertex_index', np.ascontiguousarray(corner_verts, dtype='int32'))
+    me.polygons.add(len(face_sizes))
+    loop_start = np.cumsum(face_sizes) - face_sizes
+    me.polygons.foreach_set('loop_start', loop_start.astype('int32'))
+    me.update(calc_edges=True)
+
+    uv = me.uv_layers.new(name=UV_NAME)
+    uv.data.foreach_set('uv', np.ascontiguousarray(uv_co, dtype='float32').ravel())
+
+    if seam_edges is not None and len(seam_edges):
+        edge_verts = np.empty(len(me.edges) * 2, dtype='int32')
+        me.edges.foreach_get('vertices', edge_verts)
+        edge_keys = np.sort(edge_verts.reshape(-1, 2), axis=1)
+        seam_keys = np.sort(np.asarray(seam_edges, dtype='int32'), axis=1)
+        width = np.int64(len(me.vertices))
+        is_seam = np.isin(edge_keys[:, 0] * width + edge_keys[:, 1], seam_keys[:, 0] * width + seam_keys[:, 1])
+        me.edges.foreach_set('use_seam', is_seam)
+    me.validate()
+    return me
+
+
+def grid_arrays(x_segments: int, y_segments: int, size: float = 2.0):
+    """Quad grid in the XY plane, UVs span the unit square"""
+    xs = np.linspace(-size / 2, size / 2, x_segments + 1, dtype='float32')
+    ys = np.linspace(-size / 2, size / 2, y_segments + 1, dtype='float32')
+    gx, gy = np.meshgrid(xs, ys)
+    vert_co = np.column_stack((gx.ravel(), gy.ravel(), np.zeros(gx.size, dtype='float32')))
+
+    row = x_segments + 1
+    ix, iy = np.meshgrid(np.arange(x_segments), np.arange(y_segments))
+    v0 = (iy * row + ix).ravel()
+    corner_verts = np.column_stack((v0, v0 + 1, v0 + row + 1, v0 + row)).ravel()
+    face_sizes = np.full(x_segments * y_segments, 4, dtype='int32')
+
+    uv_verts = np.column_stack(((gx.ravel() + size / 2) / size, (gy.ravel() + size / 2) / size))
+    uv_co = uv_verts[corner_verts]
+    return vert_co, face_sizes, corner_verts, uv_co
+
+
+def grid_plane(faces: int, name='bench_grid') -> bpy.types.Mesh:
+    """One quad-grid island"""
+    side = max(1, round(math.sqrt(faces)))
+    return build_mesh(name, *grid_arrays(side, side))
+
+
+def split_grid(faces: int, block: int = 8, gap: float = 0.002, name='bench_split_grid') -> bpy.types.Mesh:
+    """Quad grid cut into block x block islands with seams, every island is nudged apart
+    in UV so the shared borders are split (weld/stitch input).
+    """
+    side = max(block, round(math.sqrt(faces)) // block * block)
+    vert_co, face_sizes, corner_verts, uv_co = grid_arrays(side, side)
+    face = np.repeat(np.arange(len(face_sizes)), 4)
+    block_x = (face % side) // block
+    block_y = (face // side) // block
+    uv_co = uv_co + np.column_stack((block_x, block_y)).astype('float32') * gap
+
+    row = side + 1
+    lines = np.arange(block, side, block)
+    seams = []
+    for k in lines:
+        along = np.arange(side)
+        seams.append(np.column_stack((along * row + k, (along + 1) * row + k)))  # vertical
+        seams.append(np.column_stack((k * row + along, k * row + along + 1)))  # horizontal
+    seam_edges = np.concatenate(seams) if seams else None
+    return build_mesh(name, vert_co, face_sizes, corner_verts, uv_co, seam_edges)
+
+
+def uv_sphere(faces: int, name='bench_sphere') -> bpy.types.Mesh:
+    """UV sphere with the default sphere unwrap (split along one meridian, pole triangles)"""
+    segments = max(8, round(math.sqrt(faces * 2)))
+    rings = max(4, faces // segments)
+    bm = bmesh.new()
+    bm.loops.layers.uv.new(UV_NAME)
+    bmesh.ops.create_uvsphere(bm, u_segments=segments, v_segments=rings, radius=1.0, calc_uvs=True)
+    me = bpy.data.meshes.new(name)
+    bm.to_mesh(me)
+    bm.free()
+    return me
+
+
+def kit_scatter(faces: int, island_side: int = 6, name='bench_kit') -> bpy.types.Mesh:
+    """N duplicated grid islands scattered in 3D with identical UVs (stacking input).
+    Every fourth copy is rotated by 90 degrees in UV.
+    """
+    count = max(1, faces // (island_side * island_side))
+    vert_co, face_sizes, corner_verts, uv_co = grid_arrays(island_side, island_side, size=0.5)
+    uv_co = uv_co * 0.25
+    uv_rotated = np.column_stack((0.25 - uv_co[:, 1], uv_co[:, 0]))
+
+    cols = max(1, math.ceil(math.sqrt(count)))
+    offsets = np.column_stack((np.arange(count) % cols, np.arange(count) // cols, np.zeros(count))) * 0.75
+    all_co = (vert_co[None] + offsets[:, None].astype('float32')).reshape(-1, 3)
+    all_corner_verts = (corner_verts[None] + (np.arange(count) * len(vert_co))[:, None]).ravel()
+    all_uv = np.where((np.arange(count) % 4 == 3)[:, None, None], uv_rotated[None], uv_co[None]).reshape(-1, 2)
+    all_sizes = np.tile(face_sizes, count)
+    return build_mesh(name, all_co, all_sizes, all_corner_verts, all_uv)
+
+
+def ngon_mesh(faces: int, sides: int = 32, name='bench_ngons') -> bpy.types.Mesh:
+    """Separate disc n-gons in a grid, each one its own island"""
+    cols = max(1, math.ceil(math.sqrt(faces)))
+    angles = np.linspace(0, 2 * math.pi, sides, endpoint=False)
+    circle = np.column_stack((np.cos(angles), np.sin(angles))).astype('float32') * 0.45
+
+    centers = np.column_stack((np.arange(faces) % cols, np.arange(faces) // cols)).astype('float32')
+    co_2d = (centers[:, None] + circle[None]).reshape(-1, 2)
+    vert_co = np.column_stack((co_2d, np.zeros(len(co_2d), dtype='float32')))
+    corner_verts = np.arange(faces * sides)
+    face_sizes = np.full(faces, sides, dtype='int32')
+    uv_co = co_2d / cols
+    return build_mesh(name, vert_co, face_sizes, corner_verts, uv_co)
+
+
+GENERATORS = {
+    'grid': grid_plane,
+    'split_grid': split_grid,
+    'sphere': uv_sphere,
+    'kit': kit_scatter,
+    'ngons': ngon_mesh,
+}
+
+
+def parse_size(text: str) -> int:
+    """'1k' -> 1000, '2M' -> 2000000"""
+    text = text.strip()
+    scale = {'k': 1_000, 'K': 1_000, 'm': 1_000_000, 'M': 1_000_000}.get(text[-1:], 1)
+    if scale != 1:
+        text = text[:-1]
+    return int(float(text) * scale)
+
+
+def create_object(kind: str, faces: int) -> bpy.types.Object:
+    """Link a new benchmark object to the scene and make it the only selected, active one"""
+    me = GENERATORS[kind](faces)
+    obj = bpy.data.objects.new(me.name, me)
+    bpy.context.scene.collection.objects.link(obj)
+    for other in bpy.context.view_layer.objects:
+        other.select_set(False)
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+    return obj
+
+
+def remove_object(obj: bpy.types.Object):
+    me = obj.data
+    bpy.data.objects.remove(obj)
+    bpy.data.meshes.remove(me)
@@ -0,0 +1,33 @@
+"""
+Entry script: blender -b --factory-startup --python benchmarks/run.py -- [options]
+
+Imports the add-on from this checkout as a package (named after its folder),
+registers it and hands the arguments after '--' to benchmarks.runner.
+"""
+
+import importlib
+import os
+import sys
+
+
+def main():
+    addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    addon_name = os.path.basename(addon_dir)
+    parent_dir = os.path.dirname(addon_dir)
+    # Running a script puts its folder first on sys.path, the add-on's 'types' package would shadow the stdlib
+    sys.path[:] = [p for p in sys.path if os.path.abspath(p or os.curdir) != os.path.dirname(os.path.abspath(__file__))]
+    if parent_dir not in sys.path:
+        sys.path.insert(0, parent_dir)
+
+    addon = importlib.import_module(addon_name)
+    addon.register()
+    try:
+        runner = importlib.import_module(f'{addon_name}.benchmarks.runner')
+        argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+        code = runner.main(argv)
+    finally:
+        addon.unregister()
+    sys.exit(code)
+
+
+main()
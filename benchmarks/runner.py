@@ -0,0 +1,144 @@
+"""
+Benchmark runner
+
+Times the selected cases over all sizes, writes the results as JSON and
+compares them to a baseline results file. A case regresses when its median is
+slower than the baseline median by more than the threshold ratio.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+
+import bpy
+
+from . import cases
+from . import meshes
+from ..utils import island_cache
+
+
+DEFAULT_SIZES = '1k,10k,100k'
+DEFAULT_THRESHOLD = 0.25
+
+
+def time_call(bench_case: cases.Case, obj) -> float:
+    island_cache.invalidate()
+    start = time.perf_counter()
+    bench_case.func(obj)
+    return time.perf_counter() - start
+
+
+def time_case(bench_case: cases.Case, kind: str, faces: int, repeat: int) -> dict:
+    result = {'case': bench_case.name, 'mesh': kind, 'size': faces}
+    times = []
+    try:
+        if bench_case.mutates:
+            for _ in range(repeat):
+                with cases.bench_object(kind, faces) as obj:
+                    result['faces'] = len(obj.data.polygons)
+                    times.append(time_call(bench_case, obj))
+        else:
+            with cases.bench_object(kind, faces) as obj:
+                result['faces'] = len(obj.data.polygons)
+                for _ in range(repeat):
+                    times.append(time_call(bench_case, obj))
+    except Exception as e:  # noqa
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    if times:
+        result['times'] = times
+        result['min'] = min(times)
+        result['median'] = statistics.median(times)
+    return result
+
+
+def result_key(result: dict) -> tuple:
+    return result['case'], result['mesh'], result['size']
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float) -> list[dict]:
+    """Adds 'baseline' and 'ratio' to results with a matching baseline entry"""
+    baseline_map = {result_key(r): r for r in baseline if 'median' in r}
+    regressions = []
+    for result in results:
+        base = baseline_map.get(result_key(result))
+        if base is None or 'median' not in result:
+            continue
+        result['baseline'] = base['median']
+        result['ratio'] = result['median'] / base['median'] if base['median'] else 1.0
+        result['regression'] = result['ratio'] > 1.0 + threshold
+        if result['regression']:
+            regressions.append(result)
+    return regressions
+
+
+def format_result(result: dict) -> str:
+    name = f"{result['case']:<42} {result['mesh']:<11} {result.get('faces', result['size']):>9}"
+    if 'error' in result:
+        return f"{name}  ERROR {result['error']}"
+    line = f"{name}  {result['median'] * 1000:10.2f} ms"
+    if 'ratio' in result:
+        line += f"  x{result['ratio']:.2f}" + ("  REGRESSION" if result['regression'] else "")
+    return line
+
+
+def parse_args(argv: list[str]):
+    parser = argparse.ArgumentParser(prog='blender -b --python benchmarks/run.py --')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES)
+    parser.add_argument('--cases', default='')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='')
+    parser.add_argument('--baseline', default='')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    sizes = [meshes.parse_size(s) for s in args.sizes.split(',') if s.strip()]
+    selected = cases.select_cases([c for c in args.cases.split(',') if c.strip()])
+
+    if bpy.context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    results = []
+    for bench_case in selected:
+        for kind in bench_case.kinds:
+            for faces in sizes:
+                if bench_case.max_faces and faces > bench_case.max_faces:
+                    continue
+                result = time_case(bench_case, kind, faces, max(1, args.repeat))
+                results.append(result)
+                print(format_result(result), flush=True)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        print("\nCompared to", args.baseline)
+        for result in results:
+            print(format_result(result))
+
+    if args.output:
+        report = {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'blender': bpy.app.version_string,
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'repeat': args.repeat,
+            'results': results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+        print("Results written to", args.output)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above x{1.0 + args.threshold:.2f}")
+        return 1
+    return 0
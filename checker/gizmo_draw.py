@@ -4,13 +4,16 @@ import bpy
 import gpu
 import bmesh
 import blf
-import functools
 import numpy as np
 import uuid
-from collections import defaultdict
 from gpu_extras.batch import batch_for_shader
 from mathutils import Vector, Matrix
 
+from ..utils import trace
+from ..utils import bvh_cache
+from ..utils import island_cache
+from ..utils.island_engine import MeshArrays
+
 # Zen UV 1:1 Pattern - Global storage and literals
 UVV_3D_GIZMOS = {}
 UVV_UV_GIZMOS = {}
@@ -255,6 +258,7 @@ def uvv_depsgraph_ui_update(_):
 
             if b_geom:
                 p_data[0] = s_uuid
+                bvh_cache.invalidate(update.id.original)
             if b_shade:
                 p_data[1] = s_uuid
 
@@ -270,19 +274,60 @@ def uvv_depsgraph_ui_update(_):
         bpy.app.timers.register(uvv_depsgraph_delayed, first_interval=0.1)
 
 
-class DrawCustomShape:
-    """Wrapper for batch + shader - Zen UV pattern"""
-    __slots__ = ('batch', 'shader', 'obj', 'color', 'mode')
+@bpy.app.handlers.persistent
+def uvv_load_post_clear_updates(_):
+    """Mesh pointers of the old file can be reused by the loaded one, drop the stamps and the caches keyed on them"""
+    bpy.app.driver_namespace.pop(LITERAL_UVV_UPDATE, None)
+    island_cache.invalidate()
+    bvh_cache.invalidate()
 
-    def __init__(self, batch, shader, obj, color_func, mode=0):
-        self.batch = batch
-        self.shader = shader
-        self.obj = obj
-        self.color = color_func
-        self.mode = mode
 
-    def get_shape(self):
-        return self.batch, self.shader
+def calc_overlay_triangles(arrays, face_indices: np.ndarray, face_islands: np.ndarray, uv_sync: bool):
+    """Fan triangulated UVs (T * 3, 2) of the given faces and the TD island of every vertex.
+    Hidden faces and, without UV sync, unselected faces are skipped.
+    """
+    valid = face_indices < arrays.face_count  # TD scope may be older than the mesh
+    face_indices = face_indices[valid]
+    face_islands = face_islands[valid]
+    shown = ~arrays.face_hide[face_indices]
+    if not uv_sync:
+        shown &= arrays.face_select[face_indices]
+    face_indices = face_indices[shown]
+    face_islands = face_islands[shown]
+
+    tri_count = np.maximum(arrays.loop_total[face_indices] - 2, 0)
+    tri_face = np.repeat(np.arange(len(face_indices)), tri_count)
+    tri_offset = np.arange(len(tri_face)) - np.repeat(np.cumsum(tri_count) - tri_count, tri_count) + 1
+    first = arrays.loop_start[face_indices][tri_face]
+    tri_corners = np.stack((first, first + tri_offset, first + tri_offset + 1), axis=1)
+    positions = np.ascontiguousarray(arrays.uv_co[tri_corners].reshape(-1, 2), dtype='float32')
+    return positions, np.repeat(face_islands[tri_face], 3)
+
+
+class TdOverlayBatch:
+    """TD overlay of one object: a single TRIS batch with a color per vertex.
+    Positions are uploaded once, a color change only replaces the color vertex buffer.
+    """
+    __slots__ = ('obj', 'pos_vbo', 'vert_islands', 'batch')
+
+    def __init__(self, obj, positions: np.ndarray, vert_islands: np.ndarray):
+        pos_format = gpu.types.GPUVertFormat()
+        pos_format.attr_add(id='pos', comp_type='F32', len=2, fetch_mode='FLOAT')
+        self.obj = obj
+        self.pos_vbo = gpu.types.GPUVertBuf(pos_format, len(positions))
+        self.pos_vbo.attr_fill('pos', positions)
+        self.vert_islands = vert_islands
+        self.batch = None
+
+    def set_colors(self, island_colors: np.ndarray):
+        """Upload RGBA colors (I, 4) of the TD scope islands"""
+        color_format = gpu.types.GPUVertFormat()
+        color_format.attr_add(id='color', comp_type='F32', len=4, fetch_mode='FLOAT')
+        color_vbo = gpu.types.GPUVertBuf(color_format, len(self.vert_islands))
+        color_vbo.attr_fill('color', np.ascontiguousarray(island_colors[self.vert_islands], dtype='float32'))
+        batch = gpu.types.GPUBatch(type='TRIS', buf=self.pos_vbo)
+        batch.vertbuf_add(color_vbo)
+        self.batch = batch
 
 
 # ============================================================================
@@ -299,6 +344,7 @@ class UVV_UVGizmoTexelDensity(bpy.types.Gizmo):
         "uv_sync",
         "last_mode",
         "mark_build",
+        "mark_recolor",
         "custom_data"
     )
 
@@ -310,6 +356,7 @@ class UVV_UVGizmoTexelDensity(bpy.types.Gizmo):
             self.uv_sync = False
             self.last_mode = 'TEXEL_DENSITY'
             self.mark_build = -1
+            self.mark_recolor = False
             self.custom_data = {}
 
     def _delayed_build(self):
@@ -384,6 +431,7 @@ class UVV_UVGizmoTexelDensity(bpy.types.Gizmo):
         # Dispatch to build_texel_density method (Zen UV pattern)
         self.build_texel_density(context)
 
+    @trace.traced('GPU')
     def build_texel_density(self, context):
         """
         Build texel density visualization - COMPLETE ZEN UV 1:1 PATTERN
@@ -391,7 +439,6 @@ class UVV_UVGizmoTexelDensity(bpy.types.Gizmo):
         """
         try:
             from .td_utils import TdUtils, TdContext, TdBmeshManager
-            from .td_display_utils import TdColorProcessor
 
             # Get settings
             if not hasattr(context.scene, 'uvv_settings'):
@@ -440,124 +487,31 @@ class UVV_UVGizmoTexelDensity(bpy.types.Gizmo):
                 td_scope = TdUtils.get_td_data_with_precision(context, p_objects, td_inputs, td_influence)
                 bpy.app.driver_namespace[LITERAL_UVV_TD_SCOPE] = (p_geometry_keys, td_scope)
 
-            # Process colors - EXACT ZenUV pattern (pass settings directly)
-            # Don't update UI limits during gizmo build (not allowed in that context)
-            # Always use SPECTRUM mode (Full Spectrum)
-            CP = TdColorProcessor(context, td_scope, settings, update_ui_limits=False)
-            CP.calc_output_range(context, td_inputs, 'SPECTRUM')
-
-            # Update GradientProperties for enhanced gradient display (ZenUV 1:1)
-            from .td_display_utils import TdSysUtils
-            p_td_values, p_colors = td_scope.get_referenced_values_for_gradient(td_inputs)
-            GradientProperties.range_values = p_td_values
-            GradientProperties.range_colors = p_colors
-            GradientProperties.range_labels = TdSysUtils.td_labels_filter(p_td_values, settings.values_filter)
-
-            # Get alpha from preferences (Zen UV pattern)
-            # For now, use settings - may need to add to preferences later
-            alpha = settings.td_gradient_alpha if hasattr(settings, 'td_gradient_alpha') else 0.5
-
-            def get_color(p_color):
-                return (*p_color, alpha)
-
-            # Store texel data map for gradient display
-            self.custom_data['texel_data_map'] = {}
-
-            for p_obj_name, p_islands in td_scope.get_islands_by_objects().items():
-                if len(p_islands) == 0:
+            # One batch per object, colored below
+            for p_obj_name, (p_face_indices, p_face_islands) in td_scope.get_faces_by_objects().items():
+                if len(p_face_indices) == 0:
                     continue
 
                 p_obj = context.scene.objects[p_obj_name]
-                
-                # Create color map (island index -> color) - Zen UV pattern
-                t_color_map = {
-                    idx: [(round(island.color[0], 2), round(island.color[1], 2), round(island.color[2], 2)), island.td]
-                    for island in p_islands for idx in island.indices
-                }
-                self.custom_data['texel_data_map'][p_obj_name] = t_color_map
-
-                # Extract UV triangles using stack overlay approach (fresh BMesh, face loops)
-                # Group triangles by color for batch creation
-                face_tri_indices = defaultdict(list)
-                
+
                 try:
                     # Get fresh BMesh data (like stack overlay - avoids stale data during transforms)
                     bm = bmesh.from_edit_mesh(p_obj.data)
-                    bm.faces.ensure_lookup_table()
-                    
                     uv_layer = bm.loops.layers.uv.active
                     if not uv_layer:
                         continue
-                    
-                    # Process each island's faces
-                    for island in p_islands:
-                        island_color, _ = t_color_map.get(island.indices[0] if island.indices else None, [(0, 0, 0), 0])
-                        
-                        # Extract UV triangles for this island's faces
-                        for face_idx in island.indices:
-                            try:
-                                # Get face from BMesh (may fail if face was deleted during transform)
-                                face = bm.faces[face_idx]
-                                
-                                # Skip hidden faces and check selection if needed
-                                if face.hide:
-                                    continue
-                                if not self.uv_sync and not face.select:
-                                    continue
-                                
-                                # Get UV coordinates for this face (like stack overlay)
-                                face_uvs = [loop[uv_layer].uv.copy() for loop in face.loops]
-                                
-                                # Triangulate face manually (stack overlay pattern)
-                                if len(face_uvs) == 3:
-                                    # Already a triangle
-                                    for uv in face_uvs:
-                                        face_tri_indices[island_color].append((uv.x, uv.y))
-                                elif len(face_uvs) == 4:
-                                    # Quad - split into 2 triangles
-                                    face_tri_indices[island_color].extend([
-                                        (face_uvs[0].x, face_uvs[0].y),
-                                        (face_uvs[1].x, face_uvs[1].y),
-                                        (face_uvs[2].x, face_uvs[2].y),
-                                        (face_uvs[0].x, face_uvs[0].y),
-                                        (face_uvs[2].x, face_uvs[2].y),
-                                        (face_uvs[3].x, face_uvs[3].y),
-                                    ])
-                                elif len(face_uvs) > 4:
-                                    # N-gon - fan triangulation
-                                    for i in range(1, len(face_uvs) - 1):
-                                        face_tri_indices[island_color].extend([
-                                            (face_uvs[0].x, face_uvs[0].y),
-                                            (face_uvs[i].x, face_uvs[i].y),
-                                            (face_uvs[i + 1].x, face_uvs[i + 1].y),
-                                        ])
-                            except (ReferenceError, IndexError, KeyError):
-                                # Face was deleted or invalid during transform - skip gracefully
-                                continue
-                    
-                except (ReferenceError, IndexError, RuntimeError) as e:
+                    arrays = MeshArrays.from_bmesh(bm, uv_layer)
+                except (ReferenceError, RuntimeError):
                     # BMesh became invalid during transform - skip this object
                     continue
+                if arrays is None:
+                    continue
+
+                positions, vert_islands = calc_overlay_triangles(arrays, p_face_indices, p_face_islands, self.uv_sync)
+                if len(positions):
+                    self.custom_shapes.append(TdOverlayBatch(p_obj, positions, vert_islands))
 
-                # Create batches from grouped triangles (stack overlay pattern)
-                if face_tri_indices:
-                    shader = gpu.shader.from_builtin('UNIFORM_COLOR')
-                    
-                    for color_tuple, vertices in face_tri_indices.items():
-                        if len(vertices) < 3:
-                            continue
-                        
-                        try:
-                            # Create batch directly from triangles (like stack overlay)
-                            # No deduplication needed - GPU handles it efficiently
-                            batch = batch_for_shader(shader, 'TRIS', {"pos": vertices})
-                            batch.program_set(shader)
-
-                            self.custom_shapes.append(
-                                DrawCustomShape(batch, shader, p_obj, functools.partial(get_color, color_tuple)))
-                        except Exception as e:
-                            # Skip this color group if there's an error
-                            continue
+            self.update_texel_colors(context, td_scope, td_inputs)
 
         except Exception as e:
             import traceback
@@ -841,6 +795,55 @@ class UVV_UVGizmoTexelDensity(bpy.types.Gizmo):
         
         gpu.state.blend_set('NONE')
 
+    def update_texel_colors(self, context, td_scope, td_inputs):
+        """Color the TD scope islands with the current scheme and re-upload the color buffers"""
+        from .td_display_utils import TdColorProcessor, TdSysUtils
+
+        self.mark_recolor = False
+        settings = context.scene.uvv_settings
+
+        # Process colors - EXACT ZenUV pattern (pass settings directly)
+        # Don't update UI limits during gizmo build (not allowed in that context)
+        # Always use SPECTRUM mode (Full Spectrum)
+        CP = TdColorProcessor(context, td_scope, settings, update_ui_limits=False)
+        CP.calc_output_range(context, td_inputs, 'SPECTRUM')
+
+        # Update GradientProperties for enhanced gradient display (ZenUV 1:1)
+        p_td_values, p_colors = td_scope.get_referenced_values_for_gradient(td_inputs)
+        GradientProperties.range_values = p_td_values
+        GradientProperties.range_colors = p_colors
+        GradientProperties.range_labels = TdSysUtils.td_labels_filter(p_td_values, settings.values_filter)
+
+        # Store texel data map for gradient display: face index -> (color, td) arrays - Zen UV pattern
+        p_island_colors = np.round(td_scope.colors, 2)
+        self.custom_data['texel_data_map'] = {
+            p_obj_name: (p_face_indices, p_island_colors[p_face_islands], td_scope.td[p_face_islands])
+            for p_obj_name, (p_face_indices, p_face_islands) in td_scope.get_faces_by_objects().items()
+            if len(p_face_indices)}
+
+        # Get alpha from preferences (Zen UV pattern)
+        alpha = settings.td_gradient_alpha if hasattr(settings, 'td_gradient_alpha') else 0.5
+        island_colors = np.empty((len(p_island_colors), 4), dtype='float32')
+        island_colors[:, :3] = np.asarray(td_scope.colors)[:, :3]
+        island_colors[:, 3] = alpha
+        for draw_shape in self.custom_shapes:
+            draw_shape.set_colors(island_colors)
+
+    def recolor(self, context):
+        """Re-color the built overlay after a color setting change, positions stay on the GPU"""
+        from .td_utils import TdContext
+
+        p_stored_td_scope = bpy.app.driver_namespace.get(LITERAL_UVV_TD_SCOPE, None)
+        if not p_stored_td_scope:
+            self.mark_recolor = False
+            self.mark_build = 1
+            return
+        try:
+            self.update_texel_colors(context, p_stored_td_scope[1], TdContext(context))
+        except Exception as e:
+            print(f"UVV: Error coloring texel density overlay: {e}")
+            self.mark_build = -1
+
     def _do_draw(self, context, select_id=None):
         """Internal draw method - EXACT ZenUV 1:1 pattern (lines 817-879)"""
         # Draw label first (ZenUV pattern - we skip label for now)
@@ -892,6 +895,8 @@ class UVV_UVGizmoTexelDensity(bpy.types.Gizmo):
                 if settings.draw_sub_TD_UV in {'GRADIENT', 'ALL'}:
                     self.draw_gradient(context)
             return  # Don't draw with invalid data
+        elif self.mark_recolor:
+            self.recolor(context)
 
         if not self.custom_shapes:
             # Draw gradient before early return
@@ -938,14 +943,13 @@ class UVV_UVGizmoTexelDensity(bpy.types.Gizmo):
             with gpu.matrix.push_pop_projection():
                 gpu.matrix.load_projection_matrix(identity)
 
-                draw_shape: DrawCustomShape
+                # One draw call per object
+                shader = gpu.shader.from_builtin('SMOOTH_COLOR')
+                shader.bind()
+                draw_shape: TdOverlayBatch
                 for draw_shape in self.custom_shapes:
-                    batch, shader = draw_shape.get_shape()
-
-                    shader.bind()
-                    if draw_shape.color is not None:
-                        shader.uniform_float("color", draw_shape.color())
-                    batch.draw()
+                    if draw_shape.batch is not None:
+                        draw_shape.batch.draw(shader)
 
         gpu.state.blend_set('NONE')
         
@@ -1067,6 +1071,18 @@ def mark_all_gizmos_for_rebuild():
             gizmo.mark_build = 1
 
 
+def update_all_gizmo_colors(context):
+    """Re-color gizmos for changed TD color settings, without rebuilding their geometry"""
+    for gizmo in UVV_UV_GIZMOS.values():
+        if hasattr(gizmo, 'mark_recolor'):
+            gizmo.mark_recolor = True
+
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'IMAGE_EDITOR':
+                area.tag_redraw()
+
+
 def update_all_gizmos(context, force=False):
     """Mark all gizmos for rebuild - Zen UV pattern"""
     for gizmo in UVV_UV_GIZMOS.values():
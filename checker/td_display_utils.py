@@ -1,6 +1,7 @@
 """ UVV Texel Density Display Utilities - Complete Zen UV 1:1 Copy """
 
 import bpy
+import numpy as np
 from dataclasses import dataclass
 from mathutils import Color
 
@@ -111,49 +112,62 @@ class TdRangesMapper:
 
         SCOPE.append_color_scheme_reference_values(colors, td_min, td_max)
 
-        underrated = False
-        overrated = False
+        underrated = SCOPE.td < range_limits[0]
+        overrated = SCOPE.td > range_limits[1]
 
-        for isl in SCOPE.islands:
-            if isl.td < range_limits[0]:
-                isl.color = TdColorManager.black
-                if not underrated:
-                    underrated = True
-                    SCOPE.append_reference(td=range_limits[0], color=TdColorManager.black)
-                    SCOPE.append_reference(td=range_limits[0] - 0.01, color=TdColorManager.black)
+        SCOPE.colors[:] = cls.calc_colors(td_min, td_max, colors, SCOPE.td)
+        SCOPE.colors[underrated] = TdColorManager.black
+        SCOPE.colors[overrated] = TdColorManager.white
 
-            elif isl.td > range_limits[1]:
-                isl.color = TdColorManager.white
-                if not overrated:
-                    overrated = True
-                    SCOPE.append_reference(td=range_limits[1] - 0.01, color=cls._calc_island_color(td_min, td_max, colors, isl.td))
-                    SCOPE.append_reference(td=range_limits[1], color=TdColorManager.white)
+        if underrated.any():
+            SCOPE.append_reference(td=range_limits[0], color=TdColorManager.black)
+            SCOPE.append_reference(td=range_limits[0] - 0.01, color=TdColorManager.black)
 
-            else:
-                isl.color = cls._calc_island_color(td_min, td_max, colors, isl.td)
+        if overrated.any():
+            p_first_over = float(SCOPE.td[overrated].min())
+            SCOPE.append_reference(td=range_limits[1] - 0.01, color=cls._calc_island_color(td_min, td_max, colors, p_first_over))
+            SCOPE.append_reference(td=range_limits[1], color=TdColorManager.white)
 
         return SCOPE
 
     @classmethod
-    def calc_remap_balanced(cls, SCOPE: TdIslandsStorage, base_value: float, mesh_limits: list):
-        """Remap for BALANCED mode (ZenUV 1:1)"""
+    def calc_remap_balanced(cls, SCOPE: TdIslandsStorage, base_value: float, mesh_limits: list, colors: list):
+        """Remap for BALANCED mode (ZenUV 1:1), colors are (min, base, max)"""
         td_min = mesh_limits[0]
         td_max = mesh_limits[1]
 
-        for isl in SCOPE.islands:
-            if not isl.is_fake:
-                if isl.td < base_value:
-                    # Interpolate between min and base
-                    isl.color = cls._calc_island_color(td_min, base_value, [SCOPE.get_island_by_value(td_min, 'EXACT').color, SCOPE.get_island_by_value(base_value, 'EXACT').color], isl.td)
-                elif isl.td > base_value:
-                    # Interpolate between base and max
-                    isl.color = cls._calc_island_color(base_value, td_max, [SCOPE.get_island_by_value(base_value, 'EXACT').color, SCOPE.get_island_by_value(td_max, 'EXACT').color], isl.td)
-                else:
-                    # Exact match
-                    isl.color = SCOPE.get_island_by_value(base_value, 'EXACT').color
+        under = SCOPE.td < base_value
+        over = SCOPE.td > base_value
+
+        # Interpolate between min and base, base and max, exact match gets the base color
+        SCOPE.colors[:] = colors[1]
+        SCOPE.colors[under] = cls.calc_colors(td_min, base_value, colors[:2], SCOPE.td[under])
+        SCOPE.colors[over] = cls.calc_colors(base_value, td_max, colors[1:], SCOPE.td[over])
 
         return SCOPE
 
+    @classmethod
+    def calc_colors(cls, td_min: float, td_max: float, colors: list, td_values: np.ndarray) -> np.ndarray:
+        """Vectorized _calc_island_color, (N, 3) colors for TD values"""
+        colors = np.asarray(colors, dtype='float64')[:, :3]
+        if len(colors) == 1:
+            return np.repeat(colors, len(td_values), axis=0)
+
+        td_clamped = np.maximum(td_min, np.minimum(td_max, td_values))
+        p_val = td_max - td_min
+        if p_val == 0:
+            p_val = 1
+
+        position = (td_clamped - td_min) / p_val * (len(colors) - 1)
+        index = position.astype('int64')
+        alpha = (position - index)[:, None]
+        last = index == len(colors) - 1
+        index = np.minimum(index, len(colors) - 2)
+
+        result = (1 - alpha) * colors[index] + alpha * colors[index + 1]
+        result[last] = colors[-1]
+        return result
+
     @classmethod
     def _calc_island_color(cls, td_min: float, td_max: float, colors: list, island_td: float):
         """Calculate island color based on TD value"""
@@ -234,7 +248,7 @@ class TdColorProcessor(TdDisplayProperties):
         if not len(self.td_values):
             self.mesh_limits = [0.0, 1.0]
         else:
-            self.mesh_limits = [min(self.td_values), max(self.td_values)]
+            self.mesh_limits = [float(self.td_values[0]), float(self.td_values[-1])]
 
         if update_ui_limits:
             TdDisplayLimits.cl_td_limits = self.mesh_limits
@@ -247,7 +261,7 @@ class TdColorProcessor(TdDisplayProperties):
         else:
             if self._is_all_values_uniform():
                 self.pr_td_limits[0] = 0.0
-                self.pr_td_limits[-1] = self.td_values[-1] * 2
+                self.pr_td_limits[-1] = float(self.td_values[-1]) * 2
                 if update_ui_limits:
                     settings.td_range_min = self.pr_td_limits[0]
                     settings.td_range_max = self.pr_td_limits[1]
@@ -386,26 +400,21 @@ class TdDisplayBalancedFactory:
             return SCOPE
 
         p_equal_color = user_three[1]
-        if base_value not in SCOPE.get_all_td_values():
+        if SCOPE.get_island_by_value(base_value, method='EXACT') is None:
             SCOPE.append_reference(base_value, color=p_equal_color)
-        else:
-            SCOPE.get_island_by_value(base_value, method='EXACT').color = p_equal_color
 
         if td_min < base_value < td_max:
-            SCOPE.get_island_by_value(td_min, method='EXACT').color = user_three[0]
-            SCOPE.get_island_by_value(td_max, method='EXACT').color = user_three[2]
+            p_colors = [user_three[0], p_equal_color, user_three[2]]
+        elif base_value <= td_min:
+            p_colors = [user_three[1], p_equal_color, user_three[2]]
         else:
-            if base_value <= td_min:
-                SCOPE.get_island_by_value(td_min, method='EXACT').color = user_three[1]
-                SCOPE.get_island_by_value(td_max, method='EXACT').color = user_three[2]
-            elif base_value >= td_max:
-                SCOPE.get_island_by_value(td_min, method='EXACT').color = user_three[0]
-                SCOPE.get_island_by_value(td_max, method='EXACT').color = user_three[1]
+            p_colors = [user_three[0], p_equal_color, user_three[1]]
 
         TdRangesMapper.calc_remap_balanced(
             SCOPE,
             base_value=base_value,
-            mesh_limits=mesh_limits)
+            mesh_limits=mesh_limits,
+            colors=p_colors)
 
         return SCOPE
 
@@ -446,22 +455,15 @@ class TdDisplayPresetsFactory:
     def _remap_presets(self, context: bpy.types.Context, SCOPE: TdIslandsStorage, mesh_limits, use_presets_only: bool):
         """Remap scope for presets mode"""
         # Color islands based on nearest preset
-        for isl in SCOPE.islands:
-            if isl.is_fake:
-                continue
-
-            # Find nearest preset
-            nearest_preset = min(TdPresetsStorage.presets, key=lambda p: abs(p.td - isl.td))
-
-            if use_presets_only:
-                # Only color exact matches
-                if abs(isl.td - nearest_preset.td) < 0.01:
-                    isl.color = Color(nearest_preset.color[:])
-                else:
-                    isl.color = TdColorManager.black
-            else:
-                # Use nearest preset color
-                isl.color = Color(nearest_preset.color[:])
+        p_presets = TdPresetsStorage.presets
+        p_presets_td = np.array([p.td for p in p_presets], dtype='float64')
+        p_presets_colors = np.array([p.color[:] for p in p_presets], dtype='float32')
+        nearest = np.argmin(np.abs(SCOPE.td[:, None] - p_presets_td[None, :]), axis=1)
+        SCOPE.colors[:] = p_presets_colors[nearest]
+
+        if use_presets_only:
+            # Only color exact matches
+            SCOPE.colors[np.abs(SCOPE.td - p_presets_td[nearest]) >= 0.01] = TdColorManager.black
 
         # Add preset reference points for gradient
         for preset in TdPresetsStorage.presets:
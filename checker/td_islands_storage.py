@@ -1,13 +1,14 @@
 """ UVV TD Islands Storage - Zen UV Architecture """
 
 import bpy
+import numpy as np
 from dataclasses import dataclass, field
 from mathutils import Color
 
 
 @dataclass
 class TdIsland:
-    """Storage for single island texel density data"""
+    """Storage for single reference TD value (gradient points)"""
 
     index: int = -1
     name: str = 'TdIsland'
@@ -31,8 +32,7 @@ class TdReferencedManager:
     """Manage reference values for gradient display"""
 
     def __init__(self) -> None:
-        self.ref_td: list = []
-        self.ref_colors: list = []
+        self.references: list = []
 
     def append_color_scheme_reference_values(self, colors: list, td_min: float, td_max: float):
         """Add color scheme reference points for gradient"""
@@ -48,118 +48,153 @@ class TdReferencedManager:
 
     def append_reference(self, td: float, color, color_ref_point: bool = False) -> None:
         """Add a reference point"""
-        self.islands.append(TdIsland(td=td, color=color, is_fake=True, color_ref_point=color_ref_point))
-        self.sort()
+        self.references.append(TdIsland(td=td, color=color, is_fake=True, color_ref_point=color_ref_point))
+        self.references.sort(key=lambda island: island.td)
 
     def remove_referenced_items(self) -> None:
         """Remove fake reference items"""
-        self.islands = [i for i in self.islands if i.is_fake is False]
+        self.references.clear()
 
     def get_referenced_values_for_gradient(self, td_inputs) -> tuple:
         """Get TD values and colors for gradient display"""
-        p_islands = [i for i in self.islands if i.is_fake]
-        p_islands = sorted(p_islands, key=lambda island: island.td)
-        return [round(i.td, td_inputs.round_value) for i in p_islands], [i.color for i in p_islands]
+        return [round(i.td, td_inputs.round_value) for i in self.references], [i.color for i in self.references]
 
 
 class TdIslandsStorage(TdReferencedManager):
-    """Storage for all island TD data"""
+    """Columnar storage for all island TD data, one array entry per island.
+    Faces of island i are face_indices[face_starts[i]:face_starts[i + 1]].
+    """
 
     def __init__(self) -> None:
         super().__init__()
-        self.islands: list = []
+        self.obj_names: list = []
+        self.obj_ids = np.empty(0, dtype='int32')
+        self.td = np.empty(0, dtype='float64')
+        self.area_3d = np.empty(0, dtype='float64')
+        self.uv_area = np.empty(0, dtype='float64')
+        self.colors = np.zeros((0, 3), dtype='float32')
+        self.face_indices = np.empty(0, dtype='int32')
+        self.face_starts = np.zeros(1, dtype='int64')
+
+    def __len__(self) -> int:
+        return len(self.td)
 
     def is_empty(self) -> bool:
-        return not len(self.islands)
+        return not len(self.td)
 
     def clear(self) -> None:
-        self.islands.clear()
-
-    def append(self, island: TdIsland) -> None:
-        island.td = round(island.td, 2)
-        self.islands.append(island)
-
-    def get(self) -> list:
-        return self.islands
+        self.__init__()
+
+    def append_object(self, obj_name: str, face_indices, face_starts, td, area_3d, uv_area) -> None:
+        """Add the islands of one object, face_starts holds the start of every island in face_indices"""
+        if not len(td):
+            return
+        self.obj_names.append(obj_name)
+        self.obj_ids = np.concatenate((self.obj_ids, np.full(len(td), len(self.obj_names) - 1, dtype='int32')))
+        self.td = np.concatenate((self.td, np.round(td, 2)))
+        self.area_3d = np.concatenate((self.area_3d, area_3d))
+        self.uv_area = np.concatenate((self.uv_area, uv_area))
+        self.colors = np.concatenate((self.colors, np.zeros((len(td), 3), dtype='float32')))
+        self.face_starts = np.concatenate((self.face_starts[:-1], np.asarray(face_starts) + len(self.face_indices),
+                                           [len(self.face_indices) + len(face_indices)]))
+        self.face_indices = np.concatenate((self.face_indices, face_indices)).astype('int32')
+
+    def get_face_counts(self) -> np.ndarray:
+        return np.diff(self.face_starts)
 
     def get_colors(self, include_fake=False):
-        """Get all colors"""
-        self.sort()
+        """Get all colors, sorted by TD"""
+        colors = [tuple(c) for c in self.colors.tolist()]
+        td_values = self.td
         if include_fake:
-            return [i.color for i in self.islands]
-        else:
-            return [i.color for i in self.islands if not i.is_fake]
+            colors += [i.color for i in self.references]
+            td_values = np.concatenate((td_values, [i.td for i in self.references]))
+        return [colors[i] for i in np.argsort(td_values, kind='stable').tolist()]
 
     def reset_colors(self):
         """Reset all colors to black"""
-        for i in self.islands:
-            i.color = Color((0.0, 0.0, 0.0))
+        self.colors[:] = 0.0
 
     def set_color(self, color):
         """Set same color for all islands"""
-        for i in self.islands:
-            i.color = color
+        self.colors[:] = tuple(color)[:3]
 
     def get_max_td_value(self) -> float:
-        return max([i.td for i in self.islands]) if self.islands else 0.0
+        return float(self.td.max()) if len(self.td) else 0.0
 
     def get_min_td_value(self) -> float:
-        return min([i.td for i in self.islands]) if self.islands else 0.0
+        return float(self.td.min()) if len(self.td) else 0.0
 
     def is_td_uniform(self):
         """Check if all islands have same TD"""
         return self.get_min_td_value() == self.get_max_td_value()
 
-    def get_all_td_values(self, include_fake=False) -> list:
-        """Get all TD values"""
+    def get_all_td_values(self, include_fake=False) -> np.ndarray:
+        """Get all TD values, sorted"""
         if include_fake:
-            return sorted(round(i.td, 2) for i in self.islands)
-        else:
-            return sorted(round(i.td, 2) for i in self.islands if not i.is_fake)
+            return np.sort(np.concatenate((self.td, [i.td for i in self.references])).round(2))
+        return np.sort(self.td)
 
-    def get_sorted_islands(self) -> list:
-        return sorted(self.islands, key=lambda island: island.td)
+    def get_sorted_islands(self) -> np.ndarray:
+        """Island indices sorted by TD value"""
+        return np.argsort(self.td, kind='stable')
 
-    def get_sorted_td_values(self, rounded: bool = True) -> list:
-        if not len(self.islands):
-            return [0.0]
+    def get_sorted_td_values(self, rounded: bool = True) -> np.ndarray:
+        if not len(self.td):
+            return np.zeros(1, dtype='float64')
         if rounded:
-            return [round(v, 2) for v in self.get_all_td_values()]
-        else:
-            return self.get_all_td_values()
-
-    def get_islands_by_objects(self) -> dict:
-        """Group islands by object name"""
+            return np.round(self.get_all_td_values(), 2)
+        return self.get_all_td_values()
+
+    def get_faces_by_objects(self) -> dict:
+        """Object name -> (face indices, island index of every face)"""
+        face_islands = np.repeat(np.arange(len(self.td)), self.get_face_counts())
+        face_objects = self.obj_ids[face_islands]
+        order = np.argsort(face_objects, kind='stable')
+        bounds = np.searchsorted(face_objects[order], np.arange(len(self.obj_names) + 1))
         p_output = dict()
-        for p_obj_name in {i.obj_name for i in self.islands}:
-            if p_obj_name is None:
-                continue
-            p_output[p_obj_name] = [island for island in self.islands if island.obj_name == p_obj_name]
+        for obj_id, p_obj_name in enumerate(self.obj_names):
+            sel = order[bounds[obj_id]:bounds[obj_id + 1]]
+            if len(sel):
+                p_output[p_obj_name] = (self.face_indices[sel], face_islands[sel])
         return p_output
 
     def get_island_by_value(self, value, method: str = 'EXACT'):
         """
-        Get island by TD value
+        Get island index by TD value, None if there is no such island
         method: in {'EXACT', 'NEAR'}
         """
+        if not len(self.td):
+            return None
         if method == 'EXACT':
-            return next((i for i in self.islands if i.td == value), None)
+            found = np.flatnonzero(self.td == value)
+            return int(found[0]) if len(found) else None
         elif method == 'NEAR':
-            return min(self.islands, key=lambda island: abs(island.td - value))
+            return int(np.argmin(np.abs(self.td - value)))
 
     def sort(self) -> None:
         """Sort islands by TD value"""
-        self.islands = self.get_sorted_islands()
-
-    def get_islands_in_td_range(self, td_min, td_max) -> list:
-        """Get islands within TD range"""
-        self.sort()
-        return [i for i in self.islands if td_min <= i.td <= td_max]
+        order = self.get_sorted_islands()
+        counts = self.get_face_counts()[order]
+        first = self.face_starts[:-1][order]
+        new_starts = np.cumsum(counts) - counts
+        self.face_indices = self.face_indices[np.repeat(first - new_starts, counts) + np.arange(counts.sum())]
+        self.face_starts = np.append(new_starts, counts.sum())
+        self.obj_ids = self.obj_ids[order]
+        self.td = self.td[order]
+        self.area_3d = self.area_3d[order]
+        self.uv_area = self.uv_area[order]
+        self.colors = self.colors[order]
+
+    def get_islands_in_td_range(self, td_min, td_max) -> np.ndarray:
+        """Get indices of islands within TD range, sorted by TD"""
+        order = self.get_sorted_islands()
+        return order[(td_min <= self.td[order]) & (self.td[order] <= td_max)]
 
     def _fill_fake_values(self):
         """Add fake values for empty scopes (gradient needs at least some data)"""
         for p_td in [0.0, 0.5, 1.0]:
-            self.islands.append(TdIsland(td=p_td, is_fake=True))
+            self.references.append(TdIsland(td=p_td, is_fake=True))
 
 
 @dataclass
@@ -3,9 +3,11 @@
 import bpy
 import bmesh
 import math
-from mathutils import Vector
+import numpy as np
 
-from .td_islands_storage import TdIslandsStorage, TdIsland
+from .td_islands_storage import TdIslandsStorage
+from ..utils import island_engine
+from ..utils.island_engine import MeshArrays
 
 
 class TdContext:
@@ -26,92 +28,66 @@ class TdContext:
         self.round_value: int = 2
 
 
-class UvFaceArea:
-    """UV area calculation utilities"""
+class TexelDensityFactory:
+    """Factory for texel density calculations, one array entry per island"""
 
-    @classmethod
-    def polygon_area(cls, p):
-        """Calculate 2D polygon area using shoelace formula"""
-        return 0.5 * abs(sum(x0 * y1 - x1 * y0 for ((x0, y0), (x1, y1)) in cls.segments(p)))
+    # Minimum threshold to avoid division by zero and numerical instability
+    MIN_AREA_THRESHOLD = 1e-10
 
     @classmethod
-    def segments(cls, p):
-        """Get polygon segments"""
-        return zip(p, p[1:] + [p[0]])
+    def calc_faces_areas(cls, arrays: MeshArrays) -> tuple:
+        """3D area (Newell normal, as BMFace.calc_area) and UV area (shoelace) per face"""
+        co = arrays.vert_co[arrays.loop_vert].astype('float64')
+        cross = np.cross(co, co[arrays.loop_next])
+        normal = np.stack([np.bincount(arrays.loop_face, cross[:, i], minlength=arrays.face_count) for i in range(3)], axis=1)
+        area_3d = np.linalg.norm(normal, axis=1) * 0.5
+
+        uv = arrays.uv_co.astype('float64')
+        uv_next = uv[arrays.loop_next]
+        shoelace = uv[:, 0] * uv_next[:, 1] - uv_next[:, 0] * uv[:, 1]
+        uv_area = np.abs(np.bincount(arrays.loop_face, shoelace, minlength=arrays.face_count)) * 0.5
+        return area_3d, uv_area
 
     @classmethod
-    def get_uv_faces_area(cls, faces, uv_layer):
-        """Calculate total UV area for faces"""
-        return sum([cls.polygon_area([loop[uv_layer].uv for loop in face.loops]) for face in faces])
-
-
-class TexelDensityFactory:
-    """Factory for texel density calculations"""
+    def reduce_islands_polycount(cls, face_order: np.ndarray, starts: np.ndarray, precision: int = 100) -> np.ndarray:
+        """Mask of the faces used per island, every n-th face of larger islands (precision 0-100)"""
+        if precision == 100:
+            return np.ones(len(face_order), dtype=bool)
+        counts = np.diff(starts, append=len(face_order))
+        step = np.maximum(np.round(counts / precision), 1).astype('int64')
+        position = np.arange(len(face_order)) - np.repeat(starts, counts)
+        return position % np.repeat(step, counts) == 0
 
     @classmethod
-    def calc_averaged_td(cls, obj: bpy.types.Object, uv_layer, islands: list, td_inputs: TdContext):
+    def calc_texel_density(cls, area_3d: np.ndarray, uv_area: np.ndarray, td_inputs: TdContext) -> np.ndarray:
         """
-        Calculate averaged texel density for all islands.
-        Take into account the object transformation matrix.
+        Calculate texel density from summed island areas.
+        Does not take into account the object transformation matrix.
         """
-        if not len(islands):
-            return [0.0, 0.0]
+        image_size = td_inputs.image_size
+        max_side = max(image_size)
+        image_aspect = max(image_size) / min(image_size)
 
-        ob_scale = obj.matrix_world.inverted().median_scale
-        p_islands = cls.reduce_islands_polycount(islands, precision=td_inputs.td_calc_precision)
-        p_td_data = [cls._calculate_texel_density(uv_layer, island, td_inputs) for island in p_islands]
-        return sum(val[0] for val in p_td_data) * ob_scale / len(p_islands), sum(val[1] for val in p_td_data)
+        valid = (area_3d > cls.MIN_AREA_THRESHOLD) & (uv_area > cls.MIN_AREA_THRESHOLD)
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            td = (((max_side / math.sqrt(image_aspect)) * np.sqrt(uv_area)) /
+                  (np.sqrt(area_3d) * 100) / td_inputs.bl_units_scale) * td_inputs.units
+        return np.where(valid & np.isfinite(td), td, 0.0001)
 
     @classmethod
-    def reduce_islands_polycount(cls, islands, precision: int = 100):
-        """Reduce island face count for performance (precision 0-100)"""
-        if precision != 100:
-            return [list(island)[::max(round(len(island) / precision), 1)] for island in islands]
-        else:
-            return islands
-
-    @classmethod
-    def _calculate_texel_density(cls, uv_layer, faces: list, td_inputs: TdContext):
+    def calc_islands_td(cls, obj: bpy.types.Object, arrays: MeshArrays, face_order: np.ndarray, starts: np.ndarray, td_inputs: TdContext) -> tuple:
         """
-        Calculate texel density for particular faces.
-        Does not take into account the object transformation matrix.
+        Texel density, 3D area and UV area per island.
+        Take into account the object transformation matrix.
         """
-        image_size = td_inputs.image_size
-        max_side = max(image_size)
-        image_aspect = max(image_size) / min(image_size)
+        face_area_3d, face_uv_area = cls.calc_faces_areas(arrays)
+        used = cls.reduce_islands_polycount(face_order, starts, precision=td_inputs.td_calc_precision)
+        island_ids = np.repeat(np.arange(len(starts)), np.diff(starts, append=len(face_order)))[used]
+        area_3d = np.bincount(island_ids, face_area_3d[face_order[used]], minlength=len(starts))
+        uv_area = np.bincount(island_ids, face_uv_area[face_order[used]], minlength=len(starts))
 
-        # Calculate geometry area (3D)
-        geometry_area = sum(f.calc_area() for f in faces)
-
-        # Calculate UV area (2D)
-        uv_area = UvFaceArea.get_uv_faces_area(faces, uv_layer)
-
-        # Minimum threshold to avoid division by zero and numerical instability
-        MIN_AREA_THRESHOLD = 1e-10
-        
-        if geometry_area > MIN_AREA_THRESHOLD and uv_area > MIN_AREA_THRESHOLD:
-            try:
-                # Calculate texel density with validation
-                sqrt_uv_area = math.sqrt(uv_area)
-                sqrt_geom_area = math.sqrt(geometry_area)
-                
-                # Additional check to prevent division by zero
-                if sqrt_geom_area < MIN_AREA_THRESHOLD:
-                    return 0.0001, uv_area * 100.0
-                
-                td_value = (((max_side / math.sqrt(image_aspect)) * sqrt_uv_area) /
-                           (sqrt_geom_area * 100) / td_inputs.bl_units_scale) * td_inputs.units
-                
-                # Validate result is finite
-                if not math.isfinite(td_value):
-                    return 0.0001, uv_area * 100.0
-                
-                return td_value, uv_area * 100.0
-            except (ValueError, ZeroDivisionError, OverflowError):
-                # Fallback for numerical errors
-                return 0.0001, max(uv_area * 100.0, 0.0)
-        else:
-            return 0.0001, max(uv_area * 100.0, 0.0)
+        ob_scale = obj.matrix_world.inverted().median_scale
+        return cls.calc_texel_density(area_3d, uv_area, td_inputs) * ob_scale, area_3d, uv_area
 
 
 class TdBmeshManager:
@@ -166,27 +142,31 @@ class TdUtils:
         if not uv_layer:
             return Scope
 
+        arrays = MeshArrays.from_bmesh(bm, uv_layer)
+        if arrays is None:
+            return Scope
+
         # Handle FACE vs ISLAND mode (EXACT ZenUV pattern)
         if td_influence == 'ISLAND':
-            # ISLAND mode: Calculate per-island - group faces into UV islands
-            from ..utils.island_utils import get_islands_ignore_context
-            islands = get_islands_ignore_context(bm, is_include_hidden=False)
+            # ISLAND mode: Calculate per-island - group faces into UV islands, skip partly hidden islands
+            face_order, starts = island_engine.calc_island_face_order(
+                arrays, np.ones(arrays.face_count, dtype=bool), island_engine.MODE_UV)
+            if len(starts):
+                hidden = np.add.reduceat(arrays.face_hide[face_order], starts) > 0
+                counts = np.diff(starts, append=len(face_order))
+                face_order = face_order[np.repeat(~hidden, counts)]
+                counts = counts[~hidden]
+                starts = np.cumsum(counts) - counts
         else:
             # FACE mode: Calculate per-face - each face becomes its own "island"
-            islands = [[f] for f in bm.faces if not f.hide]
-
-        for idx, island in enumerate(islands):
-            td_value = TexelDensityFactory.calc_averaged_td(obj, uv_layer, [island], td_inputs)[0]
+            face_order = np.flatnonzero(~arrays.face_hide)
+            starts = np.arange(len(face_order))
 
-            Scope.append(
-                TdIsland(
-                    index=idx,
-                    indices=[f.index for f in island],
-                    obj_name=obj.name,
-                    td=td_value
-                )
-            )
+        if not len(starts):
+            return Scope
 
+        td, area_3d, uv_area = TexelDensityFactory.calc_islands_td(obj, arrays, face_order, starts, td_inputs)
+        Scope.append_object(obj.name, face_order, starts, td, area_3d, uv_area)
         return Scope
 
 
@@ -48,6 +48,7 @@ EXCLUDE_PATTERNS = [
     '.DS_Store',
     'Thumbs.db',
     'create_release_zip.py',
+    'benchmarks',
     'UVV.zip',  # Exclude any existing zip files
 ]
 
@@ -3,17 +3,28 @@
 import bpy
 import bmesh
 import os
+import shutil
 import subprocess
 import urllib.error
 import urllib.request
 import ssl
 import uuid
+import tempfile
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from zipfile import ZipFile
 from io import BytesIO
 from collections import defaultdict
 from bpy.types import Operator
 from bpy.props import BoolProperty, EnumProperty, FloatProperty, StringProperty
 
+from ..properties import get_uvv_settings
+from ..utils import obj_stream
+
+
+# Seconds an unwrapper process may run before its object counts as failed
+UNWRAP_TIMEOUT = 600
+
 
 class MinistryOfFlatData:
     """Constants for Ministry of Flat unwrapper"""
@@ -37,6 +48,11 @@ def get_unwrapper_path():
     return os.path.join(unwrapper_dir, "MinistryOfFlat_Release", "UnWrapConsole3.exe")
 
 
+def get_max_unwrap_processes():
+    """Concurrent unwrapper processes, one core is left for Blender"""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
 def internet_enabled():
     """Check if Blender has internet access enabled"""
     try:
@@ -231,7 +247,7 @@ class UVV_OT_AutoUnwrap(Operator):
     def draw(self, context):
         UVV_OT_AutoUnwrap.do_draw(self, self.layout, context)
 
-    def build_command_args(self, input_file, output_file):
+    def build_command_args(self, input_file, output_file, packing=True):
         """Build command line arguments for unwrapper"""
         args = [get_unwrapper_path(), input_file, output_file]
 
@@ -256,7 +272,7 @@ class UVV_OT_AutoUnwrap(Operator):
 
         # Default settings for removed advanced options
         args.extend(["-STRETCH", "FALSE"])
-        args.extend(["-PACKING", "TRUE"])
+        args.extend(["-PACKING", "TRUE" if packing else "FALSE"])
         args.extend(["-CUTDEBUG", "FALSE"])
         args.extend(["-SQUARE", "FALSE"])
         args.extend(["-WELD", "FALSE"])
@@ -265,6 +281,50 @@ class UVV_OT_AutoUnwrap(Operator):
 
         return args
 
+    @staticmethod
+    def run_unwrap_job(data, args, job_dir):
+        """Unwrap one mesh in its own job dir, runs in a worker thread (no bpy access)"""
+        input_file, output_file = args[1], args[2]
+        obj_stream.write_obj(input_file, [data])
+        try:
+            subprocess.run(args, cwd=job_dir, timeout=UNWRAP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"unwrapper timed out after {UNWRAP_TIMEOUT} seconds") from None
+
+        if not os.path.exists(output_file):
+            raise RuntimeError("no output file")
+        corner_uvs, face_sizes = obj_stream.read_obj_uvs(output_file)
+        return obj_stream.split_corner_uvs([data], corner_uvs, face_sizes)[0]
+
+    def pack_objects(self, objects_data):
+        """Pack the unwrapped faces of all objects into one 0-1 layout"""
+        from ..types import UMesh
+        from ..utils import island_engine, island_packer
+
+        settings = get_uvv_settings()
+        meshes = []
+        for obj, data in objects_data:
+            umesh = UMesh(bmesh.from_edit_mesh(obj.data), obj)
+            if (arrays := island_engine.MeshArrays.from_bmesh(umesh.bm, umesh.uv)) is None:
+                continue
+            face_tags = np.zeros(arrays.face_count, dtype=bool)
+            face_tags[data.faces] = True
+            face_order, starts = island_engine.calc_island_face_order(arrays, face_tags, island_engine.MODE_UV)
+            bm_faces = umesh.bm.faces
+            bm_faces.ensure_lookup_table()
+            islands = [[bm_faces[i] for i in island.tolist()] for island in np.split(face_order, starts[1:])]
+            if (pack_data := island_packer.collect_pack_mesh(umesh, islands)) is not None:
+                meshes.append(pack_data)
+        if not meshes:
+            return
+
+        # Texel density keeps the unwrapper scale, the layout may then exceed 0-1
+        size = int(self.texture_size) if self.use_texel_density else int(settings.size_x)
+        island_packer.pack_islands(meshes, (np.zeros(2), np.ones(2)), image_size=(size, size),
+                                   padding=settings.padding, scale=not self.use_texel_density)
+        for pack_data in meshes:
+            pack_data.umesh.update()
+
     def execute(self, context):
         try:
             # Ensure we're in face select mode and UV sync
@@ -272,193 +332,77 @@ class UVV_OT_AutoUnwrap(Operator):
                 context.scene.tool_settings.use_uv_select_sync = True
             bpy.ops.mesh.select_mode(type="FACE", action="ENABLE")
 
-            # Store selection and original objects
             selected_objects = [obj for obj in context.objects_in_mode_unique_data]
             if not selected_objects:
                 self.report({'WARNING'}, "No objects selected")
                 return {'CANCELLED'}
 
-            active_obj_name = context.active_object.name if context.active_object else None
-
-            # Get working directory
-            work_dir = get_unwrapper_directory()
-            os.makedirs(work_dir, exist_ok=True)
-
-            # Store face data while in edit mode
+            # Selected faces are streamed straight from the edit meshes
             objects_data = []
-
             for obj in selected_objects:
-                bm = bmesh.from_edit_mesh(obj.data)
-                selected_faces = [f for f in bm.faces if f.select]
-
-                if not selected_faces:
-                    continue
-
-                # Store face indices
-                face_indices = [f.index for f in selected_faces]
-                objects_data.append((obj, face_indices))
-
-                # Create temporary object with selected faces
-                temp_name = str(uuid.uuid4())
-                temp_mesh = bpy.data.meshes.new(temp_name)
-                temp_obj = bpy.data.objects.new(temp_name, temp_mesh)
-                context.collection.objects.link(temp_obj)
-
-                temp_bm = bmesh.new()
-                vert_map = {}
-
-                # Copy selected faces
-                for face in selected_faces:
-                    new_verts = []
-                    for vert in face.verts:
-                        if vert not in vert_map:
-                            new_vert = temp_bm.verts.new(vert.co)
-                            vert_map[vert] = new_vert
-                            new_vert.normal = vert.normal[:]
-                        new_verts.append(vert_map[vert])
-
-                    new_face = temp_bm.faces.new(new_verts)
-                    new_face.normal = face.normal[:]
-                    new_face.smooth = face.smooth
-
-                # Handle seams
-                temp_bm.edges.ensure_lookup_table()
-                edges = [e for e in temp_bm.edges if e.seam]
-
-                if edges:
-                    bmesh.ops.split_edges(temp_bm, edges=edges)
-
-                temp_bm.to_mesh(temp_mesh)
-                temp_mesh.update()
-                temp_bm.free()
+                data = obj_stream.collect_unwrap_data(bmesh.from_edit_mesh(obj.data), str(uuid.uuid4()))
+                if data is not None:
+                    objects_data.append((obj, data))
 
             if not objects_data:
                 self.report({'WARNING'}, "No faces selected")
                 return {'CANCELLED'}
 
-            # Switch to object mode for export
-            bpy.ops.object.mode_set(mode='OBJECT')
-            bpy.ops.object.select_all(action='DESELECT')
-
-            # Select only temp objects for export
-            temp_objs_to_export = [obj for obj in context.collection.objects if obj.name.count('-') == 4 and len(obj.name) == 36]
-            for temp_obj in temp_objs_to_export:
-                temp_obj.select_set(True)
-
-            input_file = os.path.join(work_dir, "_TEMP.obj")
-            output_file = os.path.join(work_dir, "_TEMP_UNWRAPPED.obj")
-
-            result = bpy.ops.wm.obj_export(
-                filepath=input_file,
-                export_selected_objects=True,
-                export_materials=False,
-                export_uv=False,
-                export_normals=True,
-                export_smooth_groups=True
-            )
-
-            if 'FINISHED' not in result:
-                self.report({'ERROR'}, "Export failed")
-                return {'CANCELLED'}
-
-            # Run unwrapper
-            args = self.build_command_args(input_file, output_file)
-            subprocess.call(args, cwd=work_dir)
-
-            # Import result
-            if not os.path.exists(output_file):
-                self.report({'ERROR'}, "Unwrap failed - no output file")
-                return {'CANCELLED'}
-
-            all_objs_before = set(bpy.data.objects)
-            result = bpy.ops.wm.obj_import(filepath=output_file)
-
-            if 'FINISHED' not in result:
-                self.report({'ERROR'}, "Import failed")
+            # One unwrapper process per object, the unwrapper itself is single-threaded
+            objects_uvs = [None] * len(objects_data)
+            failed = []
+            wm = context.window_manager
+            wm.progress_begin(0, len(objects_data))
+            root_dir = tempfile.mkdtemp(prefix="uvv_auto_unwrap_")
+            try:
+                # Operator properties are read here, the workers only get plain arguments.
+                # Every job would pack into its own 0-1 space, several objects are packed together afterwards
+                packing = len(objects_data) == 1
+                jobs = []
+                for idx, (_obj, data) in enumerate(objects_data):
+                    job_dir = os.path.join(root_dir, str(idx))
+                    os.makedirs(job_dir)
+                    args = self.build_command_args(os.path.join(job_dir, "_TEMP.obj"),
+                                                   os.path.join(job_dir, "_TEMP_UNWRAPPED.obj"), packing)
+                    jobs.append((data, args, job_dir))
+
+                max_workers = min(get_max_unwrap_processes(), len(objects_data))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {executor.submit(self.run_unwrap_job, *job): idx
+                               for idx, job in enumerate(jobs)}
+                    for done, future in enumerate(as_completed(futures), 1):
+                        idx = futures[future]
+                        try:
+                            objects_uvs[idx] = future.result()
+                        except Exception as e:
+                            failed.append((objects_data[idx][0].name, str(e)))
+                        wm.progress_update(done)
+            finally:
+                shutil.rmtree(root_dir, ignore_errors=True)
+                wm.progress_end()
+
+            # Merge back in object order, independent of job completion order
+            results = [(obj, data, uvs) for (obj, data), uvs in zip(objects_data, objects_uvs) if uvs is not None]
+            if not results:
+                self.report({'ERROR'}, f"Auto unwrap failed: {failed[0][1]}")
                 return {'CANCELLED'}
 
-            imported_objs = list(set(bpy.data.objects) - all_objs_before)
-
-            # Calculate normalization factor if needed (when not using texel density)
+            # Normalize to 0-1 range if needed (when not using texel density)
             uv_scale_factor = 1.0
             if not self.use_texel_density and self.world_scale:
-                # Find max UV coordinate to normalize to 0-1 range
-                max_uv = 0.0
-                for imported_obj in imported_objs:
-                    uv_layer = imported_obj.data.uv_layers.active
-                    if uv_layer:
-                        for uv_data in uv_layer.data:
-                            max_uv = max(max_uv, abs(uv_data.uv.x), abs(uv_data.uv.y))
-
+                max_uv = max(float(np.abs(uvs).max(initial=0.0)) for _obj, _data, uvs in results)
                 if max_uv > 0:
                     uv_scale_factor = 1.0 / max_uv
 
-            # Transfer UVs back to original objects (still in object mode)
-            for (orig_obj, face_indices), imported_obj in zip(objects_data, imported_objs):
-                # Read UV data from imported object
-                uv_layer_import = imported_obj.data.uv_layers.active
-                if not uv_layer_import:
-                    continue
-
-                # Get UV data
-                import_uvs = {}
-                for poly_idx, poly in enumerate(imported_obj.data.polygons):
-                    loop_uvs = []
-                    for loop_idx in poly.loop_indices:
-                        uv = uv_layer_import.data[loop_idx].uv.copy()
-                        # Apply normalization if needed
-                        uv.x *= uv_scale_factor
-                        uv.y *= uv_scale_factor
-                        loop_uvs.append(uv)
-                    import_uvs[poly_idx] = loop_uvs
-
-                # Create or get UV layer on original object
-                if not orig_obj.data.uv_layers.active:
-                    orig_obj.data.uv_layers.new()
-                uv_layer_orig = orig_obj.data.uv_layers.active
-
-                # Transfer UVs to original object
-                for poly_idx, face_idx in enumerate(face_indices):
-                    if poly_idx in import_uvs and face_idx < len(orig_obj.data.polygons):
-                        orig_poly = orig_obj.data.polygons[face_idx]
-                        import_loop_uvs = import_uvs[poly_idx]
-
-                        for i, loop_idx in enumerate(orig_poly.loop_indices):
-                            if i < len(import_loop_uvs):
-                                uv_layer_orig.data[loop_idx].uv = import_uvs[poly_idx][i]
-
-            # Cleanup temp and imported objects
-            for temp_obj in temp_objs_to_export:
-                if temp_obj.name in bpy.data.objects:
-                    mesh = temp_obj.data
-                    bpy.data.objects.remove(temp_obj)
-                    if mesh and mesh.users == 0:
-                        bpy.data.meshes.remove(mesh)
-
-            for obj in imported_objs:
-                if obj.name in bpy.data.objects:
-                    mesh = obj.data
-                    bpy.data.objects.remove(obj)
-                    if mesh and mesh.users == 0:
-                        bpy.data.meshes.remove(mesh)
-
-            # Return to edit mode
-            for obj in selected_objects:
-                obj.select_set(True)
-
-            if active_obj_name and active_obj_name in bpy.data.objects:
-                context.view_layer.objects.active = bpy.data.objects[active_obj_name]
+            for obj, data, uvs in results:
+                obj_stream.apply_corner_uvs(obj, data, uvs * uv_scale_factor)
+            if not packing:
+                self.pack_objects([(obj, data) for obj, data, _uvs in results])
 
-            bpy.ops.object.mode_set(mode='EDIT')
-
-            # Remove temp files
-            try:
-                if os.path.exists(input_file):
-                    os.remove(input_file)
-                if os.path.exists(output_file):
-                    os.remove(output_file)
-            except:
-                pass
+            if failed:
+                names = ", ".join(sorted(name for name, _error in failed))
+                self.report({'WARNING'}, f"Auto unwrap failed for: {names}")
+                return {'FINISHED'}
 
             self.report({'INFO'}, "Auto unwrap completed successfully")
             return {'FINISHED'}
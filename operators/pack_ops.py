@@ -174,6 +174,8 @@ class UVV_OT_Pack(bpy.types.Operator):
                 settings.use_uvpm = False
                 self.report({'WARNING'}, 'UVPackmaster not found')
                 return {'CANCELLED'}
+        elif settings.use_builtin_packer:
+            return self.pack_builtin(context)
         else:
             return self.pack_native()
 
@@ -437,6 +439,58 @@ class UVV_OT_Pack(bpy.types.Operator):
         else:
             return bpy.ops.uv.pack_islands('EXEC_DEFAULT', **args)  # noqa
 
+    def pack_builtin(self, context):
+        from ..types.island import AdvIslands
+        from ..utils import island_packer
+        from ..utils.stack_utils import get_group_face_indices
+
+        umeshes = UMeshes.calc()
+        settings = get_uvv_settings()
+        use_stack_groups = settings.pack_enable_stacking and settings.pack_use_stack_groups
+
+        meshes = []
+        for umesh in umeshes:
+            islands = AdvIslands.calc_extended(umesh)
+            if not islands:
+                umesh.update_tag = False
+                continue
+            face_groups = {}
+            if use_stack_groups:
+                for stack_group in umesh.obj.uvv_stack_groups:
+                    for face_indices in get_group_face_indices(stack_group, umesh.obj):
+                        face_groups.update(dict.fromkeys(face_indices, stack_group.group_id))
+            if (data := island_packer.collect_pack_mesh(umesh, [isl.faces for isl in islands], face_groups)) is None:
+                umesh.update_tag = False
+                continue
+            meshes.append(data)
+
+        if not meshes:
+            self.report({'WARNING'}, 'No islands to pack')
+            return {'CANCELLED'}
+
+        bounds = island_packer.calc_target_bounds(meshes, settings.udim_source, self.get_active_tile(context))
+        island_packer.pack_islands(
+            meshes, bounds,
+            image_size=(int(settings.size_x), int(settings.size_y)),
+            padding=settings.padding,
+            scale=settings.scale,
+            normalize=settings.normalize_islands,
+            rotate=settings.rotate,
+            orient=settings.rotate and settings.rotate_method != 'CARDINAL')
+        return umeshes.update()
+
+    @staticmethod
+    def get_active_tile(context) -> tuple[int, int]:
+        """Active UDIM image tile, or the tile under the 2D cursor"""
+        space = context.space_data
+        if not space or space.type != 'IMAGE_EDITOR':
+            return 0, 0
+        if (image := space.image) and image.source == 'TILED' and image.tiles.active:
+            number = image.tiles.active.number - 1001
+            return number % 10, number // 10
+        cursor = space.cursor_location
+        return max(int(cursor[0] // 1), 0), max(int(cursor[1] // 1), 0)
+
     @staticmethod
     def press_enter_key():
         import ctypes
@@ -463,185 +517,44 @@ class UVV_OT_GetUVCoverage(bpy.types.Operator):
         settings = get_uvv_settings()
 
         try:
-            coverage = self.calculate_uv_coverage(context, settings.uv_coverage_mode)
-            settings.uv_coverage = coverage
+            result = self.calculate_uv_coverage(context, settings.uv_coverage_mode)
+            settings.uv_coverage = min(result.coverage, 100.0)
+            settings.uv_overlap = min(result.overlap, 100.0)
 
             # Calculate average texel density
             avg_td = self.calculate_average_texel_density(context)
             settings.average_texel_density = avg_td
 
-            empty_space = max(0.0, 100.0 - coverage)
-            self.report({'INFO'}, f"UV Coverage: {coverage:.2f}%, Empty Space: {empty_space:.2f}%")
+            empty_space = max(0.0, 100.0 - settings.uv_coverage)
+            info = f"UV Coverage: {settings.uv_coverage:.2f}%, Empty Space: {empty_space:.2f}%, Overlap: {settings.uv_overlap:.2f}%"
+            other_tiles = [f"{udim}: {coverage:.2f}%" for udim, (coverage, _overlap) in result.tiles.items() if udim != 1001]
+            if other_tiles:
+                info += ", UDIM " + ", ".join(other_tiles)
+            self.report({'INFO'}, info)
 
         except Exception as e:
             self.report({'ERROR'}, f"Coverage calculation failed: {str(e)}")
             settings.uv_coverage = 0.0
+            settings.uv_overlap = 0.0
             settings.average_texel_density = 0.0
             return {'CANCELLED'}
 
         return {'FINISHED'}
 
     def calculate_uv_coverage(self, context, mode):
-        """Calculate UV coverage based on selected mode"""
+        """Calculate UV coverage, overlap and per UDIM tile coverage of the selected (or visible) faces"""
+        import numpy as np
+        from ..utils import uv_coverage
+
         # Get all selected mesh objects
         mesh_objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
         if not mesh_objects:
             mesh_objects = [context.active_object] if context.active_object and context.active_object.type == 'MESH' else []
 
-        if not mesh_objects:
-            return 0.0
-
-        # Collect all faces from all objects
-        all_faces_data = []
-        
-        for obj in mesh_objects:
-            # Get bmesh
-            if obj.mode == 'EDIT':
-                bm = bmesh.from_edit_mesh(obj.data)
-            else:
-                bm = bmesh.new()
-                bm.from_mesh(obj.data)
-
-            # Get UV layer
-            if not bm.loops.layers.uv:
-                if obj.mode != 'EDIT':
-                    bm.free()
-                continue
-
-            uv_layer = bm.loops.layers.uv.active
-
-            # Collect faces - prefer selected faces if any are selected, otherwise use all visible faces
-            selected_faces = [f for f in bm.faces if f.select and not f.hide]
-            if selected_faces:
-                faces_to_process = selected_faces
-            else:
-                # No selection, use all visible faces
-                faces_to_process = [f for f in bm.faces if not f.hide]
-
-            # Store face UV data for later processing
-            for face in faces_to_process:
-                uv_coords = [loop[uv_layer].uv for loop in face.loops]
-                if len(uv_coords) >= 3:
-                    all_faces_data.append(uv_coords)
-
-            # Clean up if we created a new bmesh
-            if obj.mode != 'EDIT':
-                bm.free()
-
-        if not all_faces_data:
-            return 0.0
-
-        # Calculate actual coverage using grid-based sampling
-        coverage = self.calculate_actual_coverage(all_faces_data)
-        return min(coverage, 100.0)
-
-    def calculate_actual_coverage(self, faces_uv_data):
-        """Calculate the actual percentage of UV space covered using optimized grid sampling"""
-        # Use adaptive grid resolution based on number of faces
-        # Lower resolution = faster but less accurate
-        num_faces = len(faces_uv_data)
-        if num_faces < 10:
-            grid_resolution = 200  # 200x200 = 40,000 points
-        elif num_faces < 50:
-            grid_resolution = 150  # 150x150 = 22,500 points
-        else:
-            grid_resolution = 100  # 100x100 = 10,000 points for complex meshes
-        
-        # Use a 2D boolean array for faster lookups (faster than set for dense coverage)
-        # Initialize as False (not covered)
-        grid = [[False] * grid_resolution for _ in range(grid_resolution)]
-        
-        # Pre-calculate bounding boxes for all faces to optimize
-        face_bboxes = []
-        for uv_coords in faces_uv_data:
-            if len(uv_coords) < 3:
-                continue
-            
-            min_u = max(0.0, min(coord.x for coord in uv_coords))
-            max_u = min(1.0, max(coord.x for coord in uv_coords))
-            min_v = max(0.0, min(coord.y for coord in uv_coords))
-            max_v = min(1.0, max(coord.y for coord in uv_coords))
-            
-            # Skip faces completely outside UV space
-            if min_u >= 1.0 or max_u <= 0.0 or min_v >= 1.0 or max_v <= 0.0:
-                continue
-            
-            face_bboxes.append((uv_coords, min_u, max_u, min_v, max_v))
-        
-        # Process each face with optimized bounding box checks
-        for uv_coords, min_u, max_u, min_v, max_v in face_bboxes:
-            # Convert to grid coordinates
-            min_u_grid = max(0, int(min_u * grid_resolution))
-            max_u_grid = min(grid_resolution, int(max_u * grid_resolution) + 1)
-            min_v_grid = max(0, int(min_v * grid_resolution))
-            max_v_grid = min(grid_resolution, int(max_v * grid_resolution) + 1)
-            
-            # Only check cells in the bounding box
-            for v_grid in range(min_v_grid, max_v_grid):
-                # Pre-calculate v coordinate once per row
-                v = (v_grid + 0.5) / grid_resolution
-                
-                for u_grid in range(min_u_grid, max_u_grid):
-                    # Skip if already marked as covered (optimization)
-                    if grid[v_grid][u_grid]:
-                        continue
-                    
-                    # Convert grid cell center to UV coordinates
-                    u = (u_grid + 0.5) / grid_resolution
-                    
-                    # Check if this point is inside the face
-                    if self.point_in_polygon(u, v, uv_coords):
-                        grid[v_grid][u_grid] = True
-        
-        # Count covered cells
-        covered_count = sum(sum(row) for row in grid)
-        total_cells = grid_resolution * grid_resolution
-        coverage_percent = (covered_count / total_cells) * 100.0
-        
-        return coverage_percent
-
-    def point_in_polygon(self, u, v, uv_coords):
-        """Check if a point (u, v) is inside a polygon using optimized ray casting"""
-        num_verts = len(uv_coords)
-        if num_verts < 3:
-            return False
-        
-        # Fast path for triangles (most common case)
-        if num_verts == 3:
-            v0 = uv_coords[0]
-            v1 = uv_coords[1]
-            v2 = uv_coords[2]
-            
-            # Barycentric coordinates check (faster for triangles)
-            denom = (v1.y - v2.y) * (v0.x - v2.x) + (v2.x - v1.x) * (v0.y - v2.y)
-            if abs(denom) < 1e-10:
-                return False  # Degenerate triangle
-            
-            a = ((v1.y - v2.y) * (u - v2.x) + (v2.x - v1.x) * (v - v2.y)) / denom
-            b = ((v2.y - v0.y) * (u - v2.x) + (v0.x - v2.x) * (v - v2.y)) / denom
-            c = 1 - a - b
-            
-            return a >= 0 and b >= 0 and c >= 0
-        
-        # Ray casting for polygons with more than 3 vertices
-        inside = False
-        j = num_verts - 1
-        
-        for i in range(num_verts):
-            ui, vi = uv_coords[i].x, uv_coords[i].y
-            uj, vj = uv_coords[j].x, uv_coords[j].y
-            
-            # Check if ray crosses edge (skip horizontal edges)
-            if (vi != vj) and ((vi > v) != (vj > v)):
-                # Calculate intersection point
-                t = (v - vi) / (vj - vi)
-                intersection_u = ui + t * (uj - ui)
-                if u < intersection_u:
-                    inside = not inside
-            
-            j = i
-        
-        return inside
+        # Collect triangulated UVs from all objects - prefer selected faces if any are selected
+        tris = [uv_coverage.calc_object_uv_triangles(obj, selected_only=True) for obj in mesh_objects]
+        tris = np.concatenate(tris) if tris else np.empty((0, 3, 2), dtype='float32')
+        return uv_coverage.calc_uv_coverage(tris)
 
     def calculate_average_texel_density(self, context):
         """Calculate average texel density across all UV islands"""
@@ -673,12 +586,12 @@ class UVV_OT_GetUVCoverage(bpy.types.Operator):
                 return 0.0
 
             # Calculate average TD (TD values are already in px/cm from the calculation)
-            td_values = [island.td for island in td_storage.islands if island.td > 0.0]
-            
-            if not td_values:
+            td_values = td_storage.td[td_storage.td > 0.0]
+
+            if not len(td_values):
                 return 0.0
 
-            avg_td_cm = sum(td_values) / len(td_values)
+            avg_td_cm = float(td_values.mean())
 
             # Convert to the selected unit
             # TD calculation returns px/cm, so we need to convert based on td_unit
@@ -782,7 +695,9 @@ class UVV_OT_OpenPackSettings(bpy.types.Operator):
         uvpm_available = hasattr(context.scene, 'uvpm3_props')
         if uvpm_available:
             col.prop(settings, 'use_uvpm')
-            col.separator()
+        if not settings.use_uvpm:
+            col.prop(settings, 'use_builtin_packer')
+        col.separator()
         
         # Show pack options based on mode
         if settings.use_uvpm:
@@ -795,11 +710,12 @@ class UVV_OT_OpenPackSettings(bpy.types.Operator):
             # Native Blender mode
             if bpy.app.version >= (3, 6, 0):
                 # === Shape method (Exact/Fast) with border ===
-                box = col.box()
-                row = box.row(align=True)
-                row.prop(settings, 'shape_method', expand=True)
+                if not settings.use_builtin_packer:
+                    box = col.box()
+                    row = box.row(align=True)
+                    row.prop(settings, 'shape_method', expand=True)
 
-                col.separator(factor=0.5)
+                    col.separator(factor=0.5)
 
                 # === SCALE BOX ===
                 box = col.box()
@@ -830,16 +746,17 @@ class UVV_OT_OpenPackSettings(bpy.types.Operator):
                 col.separator(factor=0.5)
 
                 # === LOCK GROUP ===
-                box = col.box()
-                box.label(text="Lock")
-                box_col = box.column(align=True)
+                if not settings.use_builtin_packer:
+                    box = col.box()
+                    box.label(text="Lock")
+                    box_col = box.column(align=True)
 
-                # Lock checkboxes in same row
-                row = box_col.row(align=True)
-                row.prop(settings, 'pin', text='Pinned Islands', toggle=False)
-                row.prop(settings, 'merge_overlap', text='Overlaps', toggle=False)
+                    # Lock checkboxes in same row
+                    row = box_col.row(align=True)
+                    row.prop(settings, 'pin', text='Pinned Islands', toggle=False)
+                    row.prop(settings, 'merge_overlap', text='Overlaps', toggle=False)
 
-                col.separator(factor=0.5)
+                    col.separator(factor=0.5)
 
                 # === MISC GROUP ===
                 box = col.box()
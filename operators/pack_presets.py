@@ -25,6 +25,7 @@ class UVV_OT_SavePackPreset(Operator):
 
         # Copy current settings to preset
         preset.use_uvpm = settings.use_uvpm
+        preset.use_builtin_packer = settings.use_builtin_packer
         preset.shape_method = settings.shape_method
         preset.scale = settings.scale
         preset.rotate = settings.rotate
@@ -59,6 +60,7 @@ class UVV_OT_AddPackPreset(Operator):
 
         # Copy current settings
         preset.use_uvpm = settings.use_uvpm
+        preset.use_builtin_packer = settings.use_builtin_packer
         preset.shape_method = settings.shape_method
         preset.scale = settings.scale
         preset.rotate = settings.rotate
@@ -232,6 +234,7 @@ class UVV_OT_ApplyPackPreset(Operator):
 
         # Apply preset to current settings
         settings.use_uvpm = preset.use_uvpm
+        settings.use_builtin_packer = preset.use_builtin_packer
         settings.shape_method = preset.shape_method
         settings.scale = preset.scale
         settings.rotate = preset.rotate
@@ -5,6 +5,10 @@ Handles opening addon preferences and hotkey settings
 
 import bpy
 from bpy.types import Operator
+from bpy.props import IntProperty, StringProperty
+from bpy_extras.io_utils import ExportHelper
+
+from ..utils import trace
 
 
 class UVV_OT_OpenAddonHotkeys(Operator):
@@ -42,8 +46,50 @@ class UVV_OT_OpenAddonHotkeys(Operator):
         return {"FINISHED"}
 
 
+class UVV_OT_ExportTrace(Operator, ExportHelper):
+    """Export the recorded UVV trace as Chrome trace JSON (chrome://tracing or ui.perfetto.dev)"""
+    bl_idname = "uv.uvv_export_trace"
+    bl_label = "Export Trace"
+    bl_options = {"REGISTER"}
+
+    filename_ext = ".json"
+    filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+
+    last_events: IntProperty(
+        name="Last Events",
+        description="Export only the most recent events, 0 exports the whole buffer",
+        default=0,
+        min=0
+    )
+
+    def execute(self, context):
+        if not trace.tracer.events:
+            self.report({'WARNING'}, "Trace buffer is empty, enable tracing in the UVV preferences")
+            return {'CANCELLED'}
+        try:
+            count = trace.tracer.export_chrome_trace(self.filepath, self.last_events)
+        except OSError as e:
+            self.report({'ERROR'}, f"Failed to write trace: {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Exported {count} trace events")
+        return {"FINISHED"}
+
+
+class UVV_OT_ClearTrace(Operator):
+    """Clear the recorded UVV trace"""
+    bl_idname = "uv.uvv_clear_trace"
+    bl_label = "Clear Trace"
+    bl_options = {"REGISTER"}
+
+    def execute(self, context):
+        trace.tracer.clear()
+        return {"FINISHED"}
+
+
 classes = [
     UVV_OT_OpenAddonHotkeys,
+    UVV_OT_ExportTrace,
+    UVV_OT_ClearTrace,
 ]
 
 
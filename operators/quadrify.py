@@ -10,20 +10,17 @@ if 'bpy' in locals():
 import bpy
 import math
 import numpy as np
-import itertools
 from itertools import chain
-from math import sqrt
-from mathutils import Vector, Matrix
-from bmesh.types import BMLoopUV, BMLoop, BMFace
+from mathutils import Vector
 from collections.abc import Callable
-from mathutils.geometry import area_tri
-from bl_math import clamp, lerp
+from bl_math import lerp
 
 from .. import utils
 from .. import types
 from ..types import UMeshes, IslandHit
-from ..types.island import AdvIsland, AdvIslands
-from ..utils import linked_crn_uv_by_face_tag_unordered_included, set_faces_tag
+from ..types.island import AdvIslands
+from ..utils import linked_crn_uv_by_face_tag_unordered_included, quad_lattice, uv_transform
+from ..utils.island_engine import MeshArrays
 from ..utils.stitch_utils import get_aspect_ratio
 
 
@@ -143,32 +140,19 @@ class UVV_OT_Quadrify(bpy.types.Operator):
         for umesh in self.umeshes:
             umesh.update_tag = False
             if dirt_islands := AdvIslands.calc_extended_with_mark_seam(umesh):
-                uv = umesh.uv
                 umesh.value = umesh.check_uniform_scale(report=self.report)
                 umesh.aspect = get_aspect_ratio(umesh) if self.use_aspect else 1.0
-                edge_lengths = []
+                groups = []
                 for d_island in dirt_islands:
                     links_static_with_quads, static_faces, non_quad_selected, quad_islands = self.split_by_static_faces_and_quad_islands(
                         d_island)
                     selected_non_quads_counter += len(non_quad_selected)
-                    for isl in quad_islands:
-                        utils.set_faces_tag(isl, True)
-                        set_corner_tag_by_border_and_by_tag(isl)  # TODO: Preserve flipped 3D
+                    if quad_islands:
+                        groups.append((links_static_with_quads, quad_islands))
 
-                        if not edge_lengths:
-                            edge_lengths = self.init_edge_sequence_from_umesh(umesh)
-
-                        quad(isl, edge_lengths)
-                        counter += 1
-                        umesh.update_tag = True
-
-                    if self.shear or self.xy_scale:
-                        self.quad_normalize(quad_islands, umesh)
-
-                    for static_crn, quad_corners in links_static_with_quads:
-                        static_co = static_crn[uv].uv
-                        min_dist_quad_crn = min(quad_corners, key=lambda q_crn: (q_crn[uv].uv - static_co).length)
-                        static_co[:] = min_dist_quad_crn[uv].uv
+                if groups and self.quadrify_umesh(umesh, groups):
+                    counter += sum(len(quad_islands) for _, quad_islands in groups)
+                    umesh.update_tag = True
 
         if selected_non_quads_counter:
             self.report({'WARNING'}, f"Ignored {selected_non_quads_counter} non-quad faces")
@@ -178,224 +162,103 @@ class UVV_OT_Quadrify(bpy.types.Operator):
         self.umeshes.silent_update()
         return {'FINISHED'}
 
-    @staticmethod
-    def init_edge_sequence_from_umesh(umesh: types.UMesh) -> list[None | float]:
-        idx = 0
-        for f in umesh.bm.faces:
-            for crn in f.loops:
-                crn.index = idx
-                idx += 1
-
-        return [None] * umesh.total_corners
-
-    @staticmethod
-    def init_edge_sequence_from_island(island: types.FaceIsland) -> list[None | float]:
-        idx = 0
-        for f in island:
-            for crn in f.loops:
-                crn.index = idx
-                idx += 1
-
-        return [None] * idx
-
-    def quad_normalize(self, quad_islands, umesh):
-        """Normalize quad islands with shear and scale adjustments"""
-        # adjust and normalize
-        quad_islands = AdvIslands(quad_islands, umesh)
-        quad_islands.calc_tris_simple()
-        quad_islands.calc_flat_uv_coords(save_triplet=True)
-        quad_islands.calc_flat_unique_uv_coords()
-        quad_islands.calc_flat_3d_coords(save_triplet=True, scale=umesh.value)
-        quad_islands.calc_area_3d(umesh.value, areas_to_weight=True)  # umesh.value == obj scale
-        
-        # Use the normalize operator methods like univ does - call static methods with self as first parameter
-        for isl in quad_islands:
-            old_center = isl.bbox.center
-            isl.value = old_center
-            new_center = UVV_OT_Quadrify.individual_scale(self, isl)  # Call static method with self as first parameter
-            isl.value = new_center
-            if len(quad_islands) == 1:
-                isl.set_position(old_center, new_center)
-        
-        if len(quad_islands) > 1:
-            tot_area_uv, tot_area_3d = UVV_OT_Quadrify.avg_by_frequencies(self, quad_islands)
-            UVV_OT_Quadrify.normalize(self, quad_islands, tot_area_uv, tot_area_3d)
-
-    @staticmethod
-    def individual_scale(quadrify_op, isl, threshold=1e-8):
+    def quadrify_umesh(self, umesh: types.UMesh, groups) -> bool:
+        """Quadrify all groups (links of static corners and the quad islands of a dirt island) of the umesh
+        with one UV buffer written back through the loops of the changed faces,
+        the islands of a group are normalized together.
+        Returns False when the UVs can't be read.
         """
-        Individual scale method for quadrify normalization.
-        Based on UniV's individual_scale() method.
+        bm = umesh.bm
+        if (buffer := uv_transform.CornerUVs.from_bmesh(bm, umesh.uv)) is None:
+            return False
+        arrays = buffer.arrays
+        bm.faces.index_update()
+
+        quad_islands = [isl for _, islands in groups for isl in islands]
+        island_sizes = [len(isl) for isl in quad_islands]
+        faces = np.fromiter((f.index for isl in quad_islands for f in isl), dtype='int32', count=sum(island_sizes))
+        face_islands = np.repeat(np.arange(len(quad_islands)), island_sizes)
+
+        links = [link for links_static_with_quads, _ in groups for link in links_static_with_quads]
+        static_loops = calc_loop_indices(arrays, [static_crn for static_crn, _ in links])
+        quad_loops = calc_loop_indices(arrays, [crn for _, quad_corners in links for crn in quad_corners])
+        link_sizes = [len(quad_corners) for _, quad_corners in links]
+
+        quad_lattice.quadrify_islands(arrays, buffer.uv_co, faces, face_islands, len(quad_islands))
+        zero_area_groups = []
+        if self.shear or self.xy_scale:
+            islands = buffer.calc_face_corners(faces, face_islands, len(quad_islands))
+            zero_area_groups = self.quad_normalize(buffer, islands, faces, face_islands,
+                                                   [len(islands) for _, islands in groups], umesh)
+        if links:
+            snap_static_corners(buffer.uv_co, static_loops, quad_loops, link_sizes)
+
+        buffer.write()
+
+        for group_islands, zero_area in zero_area_groups:
+            for isl_idx, is_zero in zip(group_islands, zero_area):
+                quad_islands[isl_idx].select = bool(is_zero)
+            self.report({'WARNING'}, f"Found {np.count_nonzero(zero_area)} islands with zero area")
+        return True
+
+    def quad_normalize(self, buffer: uv_transform.CornerUVs, islands: uv_transform.IslandCorners,
+                       faces: np.ndarray, face_islands: np.ndarray, group_sizes: list[int], umesh: types.UMesh):
+        """Scale U against V (and unshear) every island to its 3D proportions around its bounds center,
+        the islands of a group are then scaled to their average texel density.
+        Returns the island indices and zero area mask of groups that have zero area islands.
         """
-        if not quadrify_op.shear and not quadrify_op.xy_scale:
-            return isl.value
-
-        if isinstance(isl.value, Vector):
-            new_center = isl.value.copy()
-        else:
-            new_center = Vector((1, 1))
-
-        aspect = isl.umesh.aspect
-        transform_acc = Matrix.Identity(2)
-        scale_acc = Vector((1.0, 1.0))
-
-        flat_3d_coords = np.array([(pt_a.to_tuple(), pt_b.to_tuple(), pt_c.to_tuple())
-                                  for pt_a, pt_b, pt_c in isl.flat_3d_coords], dtype=np.float32)
-        vec_ac = flat_3d_coords[:, 0] - flat_3d_coords[:, 2]
-        vec_bc = flat_3d_coords[:, 1] - flat_3d_coords[:, 2]
-        flat_uv_coords = np.array([(pt_a.to_tuple(), pt_b.to_tuple(), pt_c.to_tuple())
-                                  for pt_a, pt_b, pt_c in isl.flat_coords], dtype=np.float32)
-        weights = np.array(list(isl.weights) if isinstance(
-            isl.weights, itertools.chain) else isl.weights, dtype=np.float32)
-
-        for _ in range(10):
-            m00 = flat_uv_coords[:, 0, 0] - flat_uv_coords[:, 2, 0]
-            m01 = flat_uv_coords[:, 0, 1] - flat_uv_coords[:, 2, 1]
-            m10 = flat_uv_coords[:, 1, 0] - flat_uv_coords[:, 2, 0]
-            m11 = flat_uv_coords[:, 1, 1] - flat_uv_coords[:, 2, 1]
-
-            det = m00 * m11 - m01 * m10
-            mask = np.abs(det) > threshold
-
-            with np.errstate(divide='ignore', invalid='ignore'):
-                inv00, inv01 = m11 / det, -m01 / det
-                inv10, inv11 = -m10 / det, m00 / det
-
-                cou = inv00[:, None] * vec_ac + inv01[:, None] * vec_bc
-                cov = inv10[:, None] * vec_ac + inv11[:, None] * vec_bc
-
-            w = weights
-            if not np.all(mask):
-                if not np.any(mask):
-                    break
-                cou = cou[mask]
-                cov = cov[mask]
-                w = weights[mask]
-
-            scale_cou = np.sum(utils.np_vec_normalized(cou, keepdims=False) * w)
-            scale_cov = np.sum(utils.np_vec_normalized(cov, keepdims=False) * w)
-            scale_cross = 0.0
-            if quadrify_op.shear:
-                cou_n = cou / utils.np_vec_normalized(cou)
-                cov_n = cov / utils.np_vec_normalized(cov)
-                scale_cross = np.sum(utils.np_vec_dot(cou_n, cov_n) * w)
-
-            if scale_cou * scale_cov < 1e-10:
-                break
-
-            scale_factor_u = sqrt(scale_cou / scale_cov / aspect)
-
-            tolerance = 1e-5  # Trade accuracy for performance.
-            if quadrify_op.shear:
-                t = Matrix.Identity(2)
-                t[0][0] = scale_factor_u
-                t[1][0] = clamp((scale_cross / isl.area_3d) * aspect, -0.5 * aspect, 0.5 * aspect)
-                t[0][1] = 0
-                t[1][1] = 1 / scale_factor_u
-
-                err = abs(t[0][0] - 1.0) + abs(t[1][0]) + abs(t[0][1]) + abs(t[1][1] - 1.0)
-                if err < tolerance:
-                    break
-
-                # Transform
-                transform_acc @= t
-                flat_uv_coords = flat_uv_coords @ np.array(t, dtype=np.float32)
-            else:
-                if not quadrify_op.xy_scale:
-                    # If xy_scale is False, don't apply any scaling
-                    break
-                if math.isclose(scale_factor_u, 1.0, abs_tol=tolerance):
-                    break
-                scale = Vector((scale_factor_u, 1.0/scale_factor_u))
-                scale_acc *= scale
-                flat_uv_coords *= np.array(scale, dtype=np.float32)
-
-        if quadrify_op.shear:
-            if transform_acc != Matrix.Identity(2):
-                isl.umesh.update_tag = True
-                for uv_coord in isl.flat_unique_uv_coords:
-                    uv_coord.xy = uv_coord @ transform_acc
-                new_center = new_center @ transform_acc
-        else:
-            if scale_acc != Vector((1.0, 1.0)):
-                isl.umesh.update_tag = True
-                for uv_coord in isl.flat_unique_uv_coords:
-                    uv_coord *= scale_acc
-                new_center *= scale_acc
-        return new_center
-
-    @staticmethod
-    def normalize(quadrify_op, islands, tot_area_uv, tot_area_3d):
+        transforms, areas_3d, areas_uv = quad_lattice.calc_normalize_transforms(
+            buffer.arrays, buffer.uv_co, faces, face_islands, len(islands), umesh.value, umesh.aspect, self.shear)
+
+        bounds_min, bounds_max = islands.calc_bounds(buffer.uv_co)
+        centers = (bounds_min + bounds_max) * 0.5
+        scales = np.ones(len(islands))
+        recenter = np.ones(len(islands), dtype=bool)
+        zero_area_groups = []
+        start = 0
+        for size in group_sizes:
+            group = np.arange(start, start + size)
+            start += size
+            if size == 1:
+                continue
+            # Islands that aren't normalized keep the scale around the UV origin
+            if (normalized := self.normalize(areas_3d[group], areas_uv[group])) is None:
+                recenter[group] = False
+                continue
+            scales[group], zero_area = normalized
+            recenter[group] = ~zero_area
+            if zero_area.any():
+                zero_area_groups.append((group, zero_area))
+
+        matrices = np.empty((len(islands), 2, 3))
+        matrices[:, :, :2] = transforms.transpose(0, 2, 1) * scales[:, None, None]
+        matrices[:, :, 2] = np.where(recenter[:, None], centers - np.einsum('nij,nj->ni', matrices[:, :, :2], centers), 0.0)
+        buffer.transform_islands(islands, matrices)
+        return zero_area_groups
+
+    def normalize(self, areas_3d, areas_uv):
         """
-        Normalize islands based on total UV and 3D areas.
+        Scale per island to the average texel density of the islands and the mask of zero area islands,
+        which keep their scale. None when the total area is zero.
         Based on UniV's normalize() method.
         """
-        if not quadrify_op.xy_scale and len(islands) <= 1:
-            quadrify_op.report({'WARNING'}, f"Islands should be more than 1, given {len(islands)} islands")
-            return
+        tot_area_uv, tot_area_3d = self.avg_by_frequencies(areas_uv, areas_3d)
         if tot_area_3d == 0.0 or tot_area_uv == 0.0:
             # Prevent divide by zero.
-            quadrify_op.report({'WARNING'}, f"Cannot normalize islands, total {'UV-area' if tot_area_3d else '3D-area'} of faces is zero")
-            return
+            self.report({'WARNING'}, f"Cannot normalize islands, total {'UV-area' if tot_area_3d else '3D-area'} of faces is zero")
+            return None
 
         tot_fac = tot_area_3d / tot_area_uv
+        zero_area = np.isclose(areas_3d, 0.0, rtol=0.0, atol=1e-6) | np.isclose(areas_uv, 0.0, rtol=0.0, atol=1e-6)
+        fac = np.divide(areas_3d, areas_uv, out=np.full(len(areas_uv), tot_fac), where=~zero_area)
+        return np.sqrt(fac / tot_fac), zero_area
 
-        zero_area_islands = []
-        for isl in islands:
-            if math.isclose(isl.area_3d, 0.0, abs_tol=1e-6) or math.isclose(isl.area_uv, 0.0, abs_tol=1e-6):
-                zero_area_islands.append(isl)
-                continue
-
-            fac = isl.area_3d / isl.area_uv
-            scale = math.sqrt(fac / tot_fac)
-
-            if quadrify_op.xy_scale or quadrify_op.shear:
-                old_pivot = isl.bbox.center
-                new_pivot = isl.value
-                new_pivot_with_scale = new_pivot * scale
-
-                diff1 = old_pivot - new_pivot
-                diff = (new_pivot - new_pivot_with_scale) + diff1
-
-                if utils.vec_isclose(old_pivot, new_pivot) and math.isclose(scale, 1.0, abs_tol=0.00001):
-                    continue
-
-                for crn_co in isl.flat_unique_uv_coords:
-                    crn_co *= scale
-                    crn_co += diff
-
-                isl.umesh.update_tag = True
-            else:
-                if math.isclose(scale, 1.0, abs_tol=0.00001):
-                    continue
-                if isl.scale(Vector((scale, scale)), pivot=isl.calc_bbox().center):
-                    isl.umesh.update_tag = True
-
-        if zero_area_islands:
-            for isl in islands:
-                if isl not in zero_area_islands:
-                    isl.select = False
-                    isl.umesh.update_tag = True
-            for isl in zero_area_islands:
-                isl.select = True
-                isl.umesh.update_tag = True
-
-            quadrify_op.report({'WARNING'}, f"Found {len(zero_area_islands)} islands with zero area")
-
-    @staticmethod
-    def avg_by_frequencies(quadrify_op, all_islands):
+    def avg_by_frequencies(self, areas_uv, areas_3d):
         """
         Calculate average areas by frequency analysis.
         Based on UniV's avg_by_frequencies() method.
         """
-        areas_uv = np.empty(len(all_islands), dtype=float)
-        areas_3d = np.empty(len(all_islands), dtype=float)
-
-        for idx, isl in enumerate(all_islands):
-            areas_uv[idx] = isl.calc_area_uv()
-            areas_3d[idx] = isl.area_3d
-
-        areas = areas_uv if quadrify_op.bl_idname.startswith('UV') else areas_3d
+        areas = areas_uv if self.bl_idname.startswith('UV') else areas_3d
         median: float = np.median(areas)
         min_area = np.amin(areas)
         max_area = np.amax(areas)
@@ -449,25 +312,14 @@ class UVV_OT_Quadrify(bpy.types.Operator):
             self.report({'WARNING'}, f"All {len(static_faces)} faces is non-quad")
             return {'CANCELLED'}
 
-        for isl in quad_islands:
-            utils.set_faces_tag(isl, True)
-            set_corner_tag_by_border_and_by_tag(isl)
-            edge_lengths = self.init_edge_sequence_from_island(isl)
-            quad(isl, edge_lengths)
-
         umesh = hit.island.umesh
-        uv = umesh.uv
         umesh.value = umesh.check_uniform_scale(report=self.report)
         umesh.aspect = get_aspect_ratio(umesh) if self.use_aspect else 1.0
-        if self.shear or self.xy_scale:
-            self.quad_normalize(quad_islands, umesh)
-
-        for static_crn, quad_corners in links_static_with_quads:
-            static_co = static_crn[uv].uv
-            min_dist_quad_crn = min(quad_corners, key=lambda q_crn: (q_crn[uv].uv - static_co).length)
-            static_co[:] = min_dist_quad_crn[uv].uv
+        if not self.quadrify_umesh(umesh, [(links_static_with_quads, quad_islands)]):
+            self.report({'WARNING'}, "Failed to read UVs")
+            return {'CANCELLED'}
 
-        hit.island.umesh.update()
+        umesh.update()
         if static_faces:
             self.report({'WARNING'}, f"Ignored {len(static_faces)} non-quad faces")
         return {'FINISHED'}
@@ -534,233 +386,23 @@ class UVV_OT_Quadrify(bpy.types.Operator):
         return links_static_with_quads
 
 
-def set_corner_tag_by_border_and_by_tag(island: AdvIsland):
-    uv = island.umesh.uv
-    for crn in island.corners_iter():
-        prev = crn.link_loop_radial_prev
-        if crn.edge.seam or crn == prev or not prev.face.tag:
-            crn.tag = False
-            continue
-        crn.tag = utils.is_pair(crn, prev, uv)
-
+def calc_loop_indices(arrays: MeshArrays, corners) -> np.ndarray:
+    """Mesh loop index of BMesh corners, the faces must be indexed"""
+    loop_indices = {}
+    for f in {crn.face for crn in corners}:
+        start = arrays.loop_start[f.index]
+        for i, crn in enumerate(f.loops):
+            loop_indices[crn] = start + i
+    return np.fromiter((loop_indices[crn] for crn in corners), dtype='int64', count=len(corners))
 
-def quad(island: AdvIsland, edge_lengths):
-    uv = island.umesh.uv
 
-    def max_quad_uv_face_area(f):
-        f_loops = f.loops
-        l1 = f_loops[0][uv].uv
-        l2 = f_loops[1][uv].uv
-        l3 = f_loops[2][uv].uv
-        l4 = f_loops[3][uv].uv
-
-        return area_tri(l1, l2, l3) + area_tri(l3, l4, l1)
-
-    # TODO: Find most quare and large target face
-    target_face = max(island, key=max_quad_uv_face_area)
-    co_and_linked_uv_corners = calc_co_and_linked_uv_corners_dict(target_face, island.umesh.uv)
-    shape_face(uv, target_face, co_and_linked_uv_corners)
-    follow_active_uv(target_face, island, edge_lengths)
-
-
-def calc_co_and_linked_uv_corners_dict(f, uv) -> dict[Vector, list[BMLoopUV]]:
-    co_and_linked_uv_corners = {}
-    for crn in f.loops:
-        co: Vector = crn[uv].uv.copy().freeze()
-        corners = linked_crn_uv_by_face_tag_unordered_included(crn, uv)
-        co_and_linked_uv_corners[co] = [crn[uv] for crn in corners]
-
-    return co_and_linked_uv_corners
-
-
-def shape_face(uv, target_face, co_and_linked_uv_corners):
-    corners = []
-    for l in target_face.loops:
-        corners.append(l[uv])
-
-    first_highest = corners[0]
-    for c in corners:
-        if c.uv.y > first_highest.uv.y:
-            first_highest = c
-    corners.remove(first_highest)
-
-    second_highest = corners[0]
-    for c in corners:
-        if c.uv.y > second_highest.uv.y:
-            second_highest = c
-
-    if first_highest.uv.x < second_highest.uv.x:
-        left_up = first_highest
-        right_up = second_highest
-    else:
-        left_up = second_highest
-        right_up = first_highest
-    corners.remove(second_highest)
-
-    first_lowest = corners[0]
-    second_lowest = corners[1]
-
-    if first_lowest.uv.x < second_lowest.uv.x:
-        left_down = first_lowest
-        right_down = second_lowest
-    else:
-        left_down = second_lowest
-        right_down = first_lowest
-
-    make_uv_face_equal_rectangle(co_and_linked_uv_corners, left_up, right_up, right_down, left_down)
-
-
-def make_uv_face_equal_rectangle(co_and_linked_uv_corners, left_up, right_up, right_down, left_down):
-    left_up = left_up.uv.copy().freeze()
-    right_up = right_up.uv.copy().freeze()
-    right_down = right_down.uv.copy().freeze()
-    left_down = left_down.uv.copy().freeze()
-
-    final_scale_x = (left_up - right_up).length
-    final_scale_y = (left_up - left_down).length
-    curr_row_x = left_up.x
-    curr_row_y = left_up.y
-
-    for v in co_and_linked_uv_corners[left_up]:
-        v.uv[:] = curr_row_x, curr_row_y
-
-    for v in co_and_linked_uv_corners[right_up]:
-        v.uv[:] = curr_row_x + final_scale_x, curr_row_y
-
-    for v in co_and_linked_uv_corners[right_down]:
-        v.uv[:] = curr_row_x + final_scale_x, curr_row_y - final_scale_y
-
-    for v in co_and_linked_uv_corners[left_down]:
-        v.uv[:] = curr_row_x, curr_row_y - final_scale_y
-
-
-def follow_active_uv(f_act, island: AdvIsland, edge_lengths):
-    uv = island.umesh.uv  # noqa
-
-    def walk_face(f: BMFace):  # noqa
-        # all faces in this list must be tagged
-        f.tag = False
-        faces_a = [f]
-        faces_b = []
-
-        while faces_a:
-            for f in faces_a:  # noqa
-                for l in f.loops:  # noqa
-                    if l.tag:
-                        l_other = l.link_loop_radial_prev
-                        f_other = l_other.face
-                        if f_other.tag:
-                            yield l
-                            f_other.tag = False
-                            faces_b.append(f_other)
-            # swap
-            faces_a, faces_b = faces_b, faces_a
-            faces_b.clear()
-
-    def extrapolate_uv(fac,
-                       l_a_outer, l_a_inner,
-                       l_b_outer, l_b_inner):
-        l_b_inner[:] = l_a_inner
-        l_b_outer[:] = l_a_inner + ((l_a_inner - l_a_outer) * fac)
-
-    def apply_uv(l_prev: BMLoop):
-        l_a: list[BMLoop | None] = [None, None, None, None]  # TODO: Array convert to vars
-        l_b: list[BMLoop | None] = [None, None, None, None]
-
-        l_a[0] = l_prev
-        l_a[1] = l_a[0].link_loop_next
-        l_a[2] = l_a[1].link_loop_next
-        l_a[3] = l_a[2].link_loop_next
-
-        #  l_b
-        #  +-----------+
-        #  |(3)        |(2)
-        #  |           |
-        #  |l_next(0)  |(1)
-        #  +-----------+
-        #        ^
-        #  l_a   |
-        #  +-----------+
-        #  |l_prev(0)  |(1)
-        #  |    (f)    |
-        #  |(3)        |(2)
-        #  +-----------+
-        #  copy from this face to the one above.
-
-        # get the other loops
-        l_next = l_prev.link_loop_radial_prev
-        assert l_next != l_prev
-        l_b[1] = l_next
-        l_b[0] = l_b[1].link_loop_next
-        l_b[3] = l_b[0].link_loop_next
-        l_b[2] = l_b[3].link_loop_next
-
-        l_a_uv: list[Vector] = [l[uv].uv for l in l_a]  # noqa
-        l_b_uv: list[Vector] = [l[uv].uv for l in l_b]  # noqa
-
-        try:
-            fac = edge_lengths[l_b[2].index] / edge_lengths[l_a[1].index]
-        except ZeroDivisionError:
-            fac = 1.0
-
-        extrapolate_uv(fac,
-                       l_a_uv[3], l_a_uv[0],
-                       l_b_uv[3], l_b_uv[0])
-
-        extrapolate_uv(fac,
-                       l_a_uv[2], l_a_uv[1],
-                       l_b_uv[2], l_b_uv[1])
-
-    calc_avg_ring_length(edge_lengths, island)
-
-    f_act.tag = False
-    for l_prev_ in walk_face(f_act):
-        apply_uv(l_prev_)
-
-
-def calc_avg_ring_length(edge_lengths, island):
-    for f in island:
-        for ring_crn in f.loops:
-            if edge_lengths[ring_crn.index] is None:
-                corners = get_ring_corners_from_crn(ring_crn)
-
-                avg_length = sum(crn.edge.calc_length() for crn in corners) / len(corners)
-                for crn in corners:
-                    edge_lengths[crn.index] = avg_length
-
-
-# TODO: This algorithm does not always pass through all the edges, so we have to pass all 4 edges through this algorithm
-def get_ring_corners_from_crn(first_crn: BMLoop):
-    corners = [first_crn]
-
-    # first direction
-    iter_crn = first_crn
-    while True:
-        iter_crn = iter_crn.link_loop_next.link_loop_next
-        corners.append(iter_crn)
-        if not iter_crn.tag:
-            break
-
-        iter_crn = iter_crn.link_loop_radial_prev
-        if iter_crn == first_crn:  # is circular
-            return corners
-        corners.append(iter_crn)
-
-    # other dir
-    if first_crn.tag:
-        iter_crn = first_crn.link_loop_radial_prev
-        if not iter_crn.tag:
-            return corners
-
-        while True:
-            iter_crn = iter_crn.link_loop_next.link_loop_next
-            corners.append(iter_crn)
-
-            if not iter_crn.tag:
-                break
-            iter_crn = iter_crn.link_loop_radial_prev
-            corners.append(iter_crn)
-    return corners
+def snap_static_corners(uv_co, static_loops, quad_loops, link_sizes):
+    """Move every static corner to the nearest of its linked quad corners"""
+    links = np.repeat(np.arange(len(static_loops)), link_sizes)
+    dist = np.linalg.norm(uv_co[quad_loops] - uv_co[static_loops][links], axis=1)
+    order = np.lexsort((dist, links))
+    nearest = quad_loops[order[np.flatnonzero(np.diff(links[order], prepend=-1))]]
+    uv_co[static_loops] = uv_co[nearest]
 
 
 # Classes to register
@@ -5,9 +5,12 @@ import bpy
 import bmesh
 import math
 import random
+import numpy as np
 from bpy.types import Operator
 from bpy.props import BoolProperty, EnumProperty, FloatProperty, FloatVectorProperty, IntProperty
-from mathutils import Vector, Matrix
+
+from ..types import UMesh
+from ..utils import uv_transform
 
 
 class UVV_OT_Random(Operator):
@@ -181,11 +184,16 @@ class UVV_OT_Random(Operator):
             return {'CANCELLED'}
 
         uv_layer = bm.loops.layers.uv.active
+        buffer = uv_transform.CornerUVs.from_bmesh(bm, uv_layer)
+        if buffer is None:
+            self.report({'WARNING'}, 'Failed to read UVs')
+            return {'CANCELLED'}
 
         # Get selected islands
-        islands = self.get_islands(bm, uv_layer)
+        face_tags = buffer.face_select & ~buffer.arrays.face_hide
+        islands = buffer.calc_island_corners(face_tags, umesh=UMesh(bm, obj))
 
-        if not islands:
+        if not len(islands):
             self.report({'WARNING'}, 'No islands selected')
             return {'CANCELLED'}
 
@@ -193,201 +201,97 @@ class UVV_OT_Random(Operator):
         random.seed(self.rand_seed)
 
         if self.between:
-            self.randomize_between(islands, uv_layer)
+            self.randomize_between(buffer, islands)
         else:
-            self.randomize(islands, uv_layer)
+            self.randomize(buffer, islands)
 
+        buffer.write()
         bmesh.update_edit_mesh(me)
         return {'FINISHED'}
 
-    def get_islands(self, bm, uv_layer):
-        """Get UV islands from selected faces"""
-        islands = []
-        processed_faces = set()
-
-        uv_layer_data = bm.loops.layers.uv.active
-
-        for face in bm.faces:
-            if not face.select or face in processed_faces:
-                continue
-
-            # Find all connected faces
-            island = self.get_connected_faces(face, processed_faces, uv_layer_data)
-            if island:
-                islands.append(island)
-
-        return islands
-
-    def get_connected_faces(self, start_face, processed_faces, uv_layer):
-        """Get all UV-connected faces from a starting face"""
-        island = []
-        to_process = [start_face]
-
-        while to_process:
-            face = to_process.pop()
-            if face in processed_faces:
-                continue
-
-            processed_faces.add(face)
-            island.append(face)
-
-            # Check neighbors through UV connectivity
-            for loop in face.loops:
-                uv = loop[uv_layer].uv
-                for edge in loop.vert.link_edges:
-                    for linked_face in edge.link_faces:
-                        if linked_face.select and linked_face not in processed_faces:
-                            # Check if UVs are connected
-                            for linked_loop in linked_face.loops:
-                                linked_uv = linked_loop[uv_layer].uv
-                                if (linked_uv - uv).length < 0.0001:
-                                    to_process.append(linked_face)
-                                    break
-
-        return island
-
-    def get_island_bounds(self, island, uv_layer):
-        """Get bounding box of an island"""
-        min_uv = Vector((float('inf'), float('inf')))
-        max_uv = Vector((float('-inf'), float('-inf')))
-
-        for face in island:
-            for loop in face.loops:
-                uv = loop[uv_layer].uv
-                min_uv.x = min(min_uv.x, uv.x)
-                min_uv.y = min(min_uv.y, uv.y)
-                max_uv.x = max(max_uv.x, uv.x)
-                max_uv.y = max(max_uv.y, uv.y)
-
-        center = (min_uv + max_uv) * 0.5
-        size = max_uv - min_uv
-
-        return {'min': min_uv, 'max': max_uv, 'center': center, 'size': size}
-
-    def transform_island(self, island, uv_layer, offset=None, scale=None, rotation=None, pivot=None):
-        """Apply transformations to an island"""
-        if pivot is None:
-            bounds = self.get_island_bounds(island, uv_layer)
-            pivot = bounds['center']
-
-        for face in island:
-            for loop in face.loops:
-                uv = loop[uv_layer].uv
-
-                # Move to origin
-                uv -= pivot
-
-                # Apply scale
-                if scale is not None:
-                    uv.x *= scale.x
-                    uv.y *= scale.y
-
-                # Apply rotation
-                if rotation is not None:
-                    cos_a = math.cos(rotation)
-                    sin_a = math.sin(rotation)
-                    x = uv.x * cos_a - uv.y * sin_a
-                    y = uv.x * sin_a + uv.y * cos_a
-                    uv.x = x
-                    uv.y = y
-
-                # Move back and apply offset
-                uv += pivot
-                if offset is not None:
-                    uv += offset
-
-    def randomize(self, islands, uv_layer):
-        """Randomize islands individually"""
-        for i, island in enumerate(islands):
-            seed = self.rand_seed + i
+    def randomize(self, buffer, islands):
+        """Randomize islands individually, all islands are transformed at once"""
+        count = len(islands)
+        bounds_min, bounds_max = islands.calc_bounds(buffer.uv_co)
+        pivots = (bounds_min + bounds_max) * 0.5
+        angles = np.zeros(count)
+        scales = np.ones((count, 2))
 
-            bounds = self.get_island_bounds(island, uv_layer)
-            pivot = bounds['center']
+        for i in range(count):
+            seed = self.rand_seed + i
 
             # Random flip
-            flip_scale = Vector((1, 1))
             if self.flip_strength[0] > 0:
                 random.seed(seed + 1000)
                 if random.random() < self.flip_strength[0]:
-                    flip_scale.x = -1
+                    scales[i, 0] = -1
             if self.flip_strength[1] > 0:
                 random.seed(seed + 1001)
                 if random.random() < self.flip_strength[1]:
-                    flip_scale.y = -1
+                    scales[i, 1] = -1
 
             # Random rotation
-            rot_angle = 0
             if self.rotation > 0:
                 random.seed(seed + 2000)
                 rot_angle = random.uniform(-self.rotation, self.rotation)
                 if self.rotation_steps > 0:
                     rot_angle = round(rot_angle / self.rotation_steps) * self.rotation_steps
+                angles[i] = rot_angle
 
             # Random scale
-            scale = Vector((1, 1))
             if self.scale_factor > 0:
                 random.seed(seed + 3000)
                 scale_value = random.uniform(self.min_scale, self.max_scale)
-                scale_value = 1.0 + (scale_value - 1.0) * self.scale_factor
-                scale = Vector((scale_value, scale_value))
-
-            # Apply scale and rotation
-            total_scale = Vector((flip_scale.x * scale.x, flip_scale.y * scale.y))
-            self.transform_island(island, uv_layer, scale=total_scale, rotation=rot_angle, pivot=pivot)
-
-            # Random movement
-            if not self.between and (self.strength[0] > 0 or self.strength[1] > 0):
-                random.seed(seed + 4000)
-                move_x = (random.random() - 0.5) * 2 * self.strength[0]
-                random.seed(seed + 4001)
-                move_y = (random.random() - 0.5) * 2 * self.strength[1]
-
-                move = Vector((move_x, move_y))
-
-                if self.round_mode == 'INT':
-                    move.x = round(move.x)
-                    move.y = round(move.y)
-                elif self.round_mode == 'STEPS':
-                    if self.steps[0] > 0:
-                        move.x = round(move.x / self.steps[0]) * self.steps[0]
-                    if self.steps[1] > 0:
-                        move.y = round(move.y / self.steps[1]) * self.steps[1]
-
-                # Apply movement with bounds check
-                if self.bool_bounds:
-                    new_bounds = self.get_island_bounds(island, uv_layer)
-                    # Keep within 0-1 bounds
-                    if new_bounds['min'].x + move.x < 0:
-                        move.x = -new_bounds['min'].x
-                    if new_bounds['min'].y + move.y < 0:
-                        move.y = -new_bounds['min'].y
-                    if new_bounds['max'].x + move.x > 1:
-                        move.x = 1 - new_bounds['max'].x
-                    if new_bounds['max'].y + move.y > 1:
-                        move.y = 1 - new_bounds['max'].y
-
-                self.transform_island(island, uv_layer, offset=move, pivot=Vector((0, 0)))
-
-    def randomize_between(self, islands, uv_layer):
+                scales[i] *= 1.0 + (scale_value - 1.0) * self.scale_factor
+
+        # Apply scale and rotation
+        buffer.transform_islands(islands, uv_transform.affine_matrices(angles, scales, pivots))
+
+        # Random movement
+        if self.between or not (self.strength[0] > 0 or self.strength[1] > 0):
+            return
+
+        moves = np.zeros((count, 2))
+        for i in range(count):
+            seed = self.rand_seed + i
+            random.seed(seed + 4000)
+            move_x = (random.random() - 0.5) * 2 * self.strength[0]
+            random.seed(seed + 4001)
+            move_y = (random.random() - 0.5) * 2 * self.strength[1]
+
+            if self.round_mode == 'INT':
+                move_x = round(move_x)
+                move_y = round(move_y)
+            elif self.round_mode == 'STEPS':
+                if self.steps[0] > 0:
+                    move_x = round(move_x / self.steps[0]) * self.steps[0]
+                if self.steps[1] > 0:
+                    move_y = round(move_y / self.steps[1]) * self.steps[1]
+            moves[i] = move_x, move_y
+
+        # Apply movement with bounds check
+        if self.bool_bounds:
+            # Keep within 0-1 bounds
+            bounds_min, bounds_max = islands.calc_bounds(buffer.uv_co)
+            moves = np.where(bounds_min + moves < 0, -bounds_min, moves)
+            moves = np.where(bounds_max + moves > 1, 1 - bounds_max, moves)
+
+        buffer.move(moves[islands.corner_islands], islands.corners)
+
+    def randomize_between(self, buffer, islands):
         """Shuffle island positions"""
         # Get all island centers
-        positions = []
-        for island in islands:
-            bounds = self.get_island_bounds(island, uv_layer)
-            positions.append(bounds['center'].copy())
+        bounds_min, bounds_max = islands.calc_bounds(buffer.uv_co)
+        centers = (bounds_min + bounds_max) * 0.5
 
         # Shuffle positions
+        positions = list(range(len(islands)))
         random.seed(self.rand_seed)
         random.shuffle(positions)
 
         # Move each island to a shuffled position
-        for i, island in enumerate(islands):
-            bounds = self.get_island_bounds(island, uv_layer)
-            old_center = bounds['center']
-            new_center = positions[i]
-            move = new_center - old_center
-
-            self.transform_island(island, uv_layer, offset=move, pivot=Vector((0, 0)))
+        moves = centers[positions] - centers
+        buffer.move(moves[islands.corner_islands], islands.corners)
 
 
 classes = [
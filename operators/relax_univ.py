@@ -6,28 +6,22 @@ if 'bpy' in locals():
     reload.reload(globals())
 
 import bpy
-import bmesh
+import numpy as np
 
 from . import unwrap_inplace
 from .. import types
 from .. import utils
 from ..types import Islands
+from ..utils import relax_solver
+from ..utils.island_engine import MeshArrays
 
 
 class RelaxData:
-    def __init__(self, _umesh: types.UMesh, _selected_elem, _coords_before, _border_corners, _save_transform_islands):
+    def __init__(self, _umesh: types.UMesh, _border_corners, _save_transform_islands):
         self.umesh = _umesh
-        self.selected_elem = _selected_elem
-        self.coords_before = _coords_before
         self.border_corners = _border_corners
         self.save_transform_islands = _save_transform_islands
 
-    def remove_all_pins_from_umesh(self):
-        uv = self.umesh.uv
-        for f in self.umesh.bm.faces:
-            for crn in f.loops:
-                crn[uv].pin_uv = False
-
 
 class UVV_OT_Relax(unwrap_inplace.UV_OT_uvv_unwrap_inplace):
     bl_idname = "uv.univ_relax"
@@ -103,22 +97,14 @@ class UVV_OT_Relax(unwrap_inplace.UV_OT_uvv_unwrap_inplace):
         return self.umeshes.update()
 
     def relax_sync_verts_edges(self):
-        crn: bmesh.types.BMLoop
         relax_data: list[RelaxData] = []
 
         for umesh in self.umeshes:
-            if self.umeshes.elem_mode == 'VERT':
-                selected_elem = utils.calc_selected_verts(umesh)
-            else:
-                selected_elem = utils.calc_selected_edges(umesh)
-
             uv = umesh.uv
             islands = Islands.calc_visible(umesh)
-            for isl in islands:
-                isl.mark_seam()
 
             # Find island border
-            border_corners = set()  # Need restore
+            border_corners = set()
             for v in umesh.bm.verts:
                 if not v.select:
                     continue
@@ -128,87 +114,70 @@ class UVV_OT_Relax(unwrap_inplace.UV_OT_uvv_unwrap_inplace):
                 if len({crn[uv].uv.copy().freeze() for crn in v.link_loops}) > 1 or any(not crn.face.select for crn in v.link_loops):
                     border_corners.update(v.link_loops)
 
-            faces_to_select = set()
-            verts_to_select = set()
-
-            # Extend selected
-            for f in umesh.bm.faces:
-                if f.hide or f.select:
-                    continue
-                if sum(v.select for v in f.verts) not in (0, len(f.verts)):
-                    faces_to_select.add(f)
-                    for v in f.verts:
-                        if not v.select:
-                            verts_to_select.add(v)
-
-            for f in faces_to_select:
-                f.select = True
-            for v in verts_to_select:
-                v.select = True
-
-            if self.umeshes.elem_mode == 'EDGE':
-                for e in umesh.bm.edges:
-                    e.select = sum(v.select for v in e.verts) == 2
-
-            for f in umesh.bm.faces:
-                for crn in f.loops:
-                    crn[uv].pin_uv = True
-
-            for crn in border_corners:
-                crn[uv].pin_uv = False
-
-            coords_before = [crn[uv].uv.copy() for crn in border_corners]
-
             save_transform_islands = []
             for isl in islands:
                 if any(v.select for f in isl for v in f.verts):
                     save_transform_islands.append(isl.save_transform())
 
-            relax_data.append(RelaxData(umesh, selected_elem, coords_before, border_corners, save_transform_islands))
-
-        self.relax_a(relax_data)
+            relax_data.append(RelaxData(umesh, border_corners, save_transform_islands))
 
-    def relax_a(self, relax_data: list[RelaxData]):
-        # Relax
-        bpy.ops.uv.minimize_stretch(iterations=self.iterations*5)
-        if any(rd.coords_before for rd in relax_data):
-            bpy.ops.uv.unwrap(method='CONFORMAL')
-            # Blend Borders
-            for rd in relax_data:
-                uv = rd.umesh.uv
-                for co, crn in zip(rd.coords_before, rd.border_corners):
-                    crn_uv_co = crn[uv].uv
-                    crn_uv_co[:] = co.lerp(crn_uv_co, self.border_blend)
-        bpy.ops.uv.minimize_stretch(iterations=self.iterations*5)
+        self.relax_islands(relax_data)
 
+    def relax_islands(self, relax_data: list[RelaxData]):
         for rd in relax_data:
+            self.relax_umesh(rd)
             for isl in rd.save_transform_islands:  # TODO: Weld half selected islands
                 isl.inplace()
-        bpy.ops.uv.select_all(action='DESELECT')
 
-        for rd in relax_data:
-            for elem in rd.selected_elem:
-                elem.select = True
-
-        for rd in relax_data:
-            uv = rd.umesh.uv
-            for f in rd.umesh.bm.faces:
-                for crn in f.loops:
-                    crn[uv].pin_uv = False
+    def relax_umesh(self, rd: RelaxData):
+        """Relax the unpinned border corners of the saved islands:
+        conformal solve, blend with the old border by border_blend, then ARAP iterations.
+        """
+        umesh = rd.umesh
+        uv = umesh.uv
+        border_corners = [crn for crn in rd.border_corners if not crn[uv].pin_uv]
+        if not border_corners or not rd.save_transform_islands:
+            return
+        if (arrays := MeshArrays.from_bmesh(umesh.bm, uv)) is None:
+            return
+
+        umesh.bm.faces.index_update()
+        islands = [st.island for st in rd.save_transform_islands]
+        faces = np.fromiter((f.index for isl in islands for f in isl), dtype='int32', count=sum(len(isl) for isl in islands))
+        face_islands = np.repeat(np.arange(len(islands)), [len(isl) for isl in islands])
+
+        # Mesh loop index of the border corners
+        loop_indices = {}
+        for f in {crn.face for crn in border_corners}:
+            start = arrays.loop_start[f.index]
+            for i, crn in enumerate(f.loops):
+                loop_indices[crn] = start + i
+        border_loops = np.fromiter((loop_indices[crn] for crn in border_corners), dtype='int64', count=len(border_corners))
+        free_corners = np.zeros(len(arrays.uv_co), dtype=bool)
+        free_corners[border_loops] = True
+
+        system = relax_solver.RelaxSystem(arrays, arrays.uv_co.astype('float64'), faces, face_islands, len(islands), free_corners)
+        uv_before = system.uv.copy()
+        system.solve(relax_solver.MODE_CONFORMAL)
+        system.blend(uv_before, self.border_blend)
+        system.solve(relax_solver.MODE_ARAP, self.iterations)
+
+        corner_positions = np.full(len(arrays.uv_co), -1, dtype='int64')
+        corner_positions[system.corners] = np.arange(len(system.corners))
+        relaxed = system.calc_corner_uvs()
+        for crn, position in zip(border_corners, corner_positions[border_loops]):
+            if position != -1:
+                crn[uv].uv = relaxed[position]
 
     def relax_sync_faces(self):
         assert self.umeshes.elem_mode == 'FACE'
-        from ..utils import linked_crn_uv_unordered, shared_is_linked
+        from ..utils import linked_crn_uv_unordered
 
         relax_data: list[RelaxData] = []
         for umesh in self.umeshes:
             uv = umesh.uv
             islands = Islands.calc_extended(umesh)
 
-            for isl in islands:
-                isl.mark_seam()
-
-            to_select = set()
             border_corners = set()
             # Find border from selection corners
             for f in utils.calc_selected_uv_faces(umesh):
@@ -230,53 +199,17 @@ class UVV_OT_Relax(unwrap_inplace.UV_OT_uvv_unwrap_inplace):
                             border = True
                             continue
 
-                        if shared_is_linked(next_linked_disc, _crn, uv):
-                            to_select.add(next_linked_disc.face)
                         border = True
                     if border:
                         border_corners.update(linked_crn)
 
-            for _f in to_select:
-                _f.select = True
-
-            for f in umesh.bm.faces:
-                for crn in f.loops:
-                    crn[uv].pin_uv = True
-
-            for crn in border_corners:
-                crn[uv].pin_uv = False
-
-            coords_before = [crn[uv].uv.copy() for crn in border_corners]
-
             save_transform_islands = []
             for isl in islands:
                 save_transform_islands.append(isl.save_transform())
 
-            relax_data.append(RelaxData(umesh, to_select, coords_before, border_corners, save_transform_islands))
-
-        self.relax_b(relax_data)
-
-    def relax_b(self, relax_data: list[RelaxData]):
-        # Relax
-        bpy.ops.uv.minimize_stretch(iterations=self.iterations*5)
-        if any(rd.coords_before for rd in relax_data):
-            bpy.ops.uv.unwrap(method='CONFORMAL')
-            # Blend Borders
-            for rd in relax_data:
-                uv = rd.umesh.uv
-                for co, crn in zip(rd.coords_before, rd.border_corners):
-                    crn_uv = crn[uv]
-                    crn_uv.uv = co.lerp(crn_uv.uv, self.border_blend)
-        bpy.ops.uv.minimize_stretch(iterations=self.iterations*5)
-
-        for rd in relax_data:
-            for isl in rd.save_transform_islands:  # TODO: Fix, weld half selected islands
-                isl.inplace()
-
-            for elem in rd.selected_elem:
-                elem.select = False
+            relax_data.append(RelaxData(umesh, border_corners, save_transform_islands))
 
-            rd.remove_all_pins_from_umesh()
+        self.relax_islands(relax_data)
 
     def relax_non_sync(self):
         from ..utils import linked_crn_uv_unordered, is_boundary_non_sync
@@ -286,9 +219,6 @@ class UVV_OT_Relax(unwrap_inplace.UV_OT_uvv_unwrap_inplace):
             uv = umesh.uv
             islands = Islands.calc_extended_any_elem(umesh)
 
-            for isl in islands:
-                isl.mark_seam()
-
             border_corners_for_unwrap = set()
 
             for f in utils.calc_selected_uv_faces(umesh):
@@ -301,22 +231,13 @@ class UVV_OT_Relax(unwrap_inplace.UV_OT_uvv_unwrap_inplace):
                                 if crn_.face.select:
                                     border_corners_for_unwrap.add(crn_)
 
-            for f in umesh.bm.faces:
-                for crn in f.loops:
-                    crn[uv].pin_uv = True
-
-            for crn_ in border_corners_for_unwrap:
-                crn_[uv].pin_uv = False
-
-            coords_before = [crn[uv].uv.copy() for crn in border_corners_for_unwrap]
-
             save_transform_islands = []
             for isl in islands:
                 save_transform_islands.append(isl.save_transform())
 
-            relax_data.append(RelaxData(umesh, [], coords_before, border_corners_for_unwrap, save_transform_islands))
+            relax_data.append(RelaxData(umesh, border_corners_for_unwrap, save_transform_islands))
 
-        self.relax_b(relax_data)
+        self.relax_islands(relax_data)
 
 
 class UVV_OT_Relax_VIEW3D(unwrap_inplace.UV_OT_uvv_unwrap_inplace):
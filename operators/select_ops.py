@@ -1,9 +1,12 @@
 import bpy
 import bmesh
+import numpy as np
 from math import radians
 from bpy.props import BoolProperty, EnumProperty, FloatProperty
 from mathutils import Vector
 
+from ..utils import uv_overlap
+
 
 class UVV_OT_SelectUVBorders(bpy.types.Operator):
     """Select UV border edges"""
@@ -812,6 +815,95 @@ class UVV_OT_SelectHoleIslands(bpy.types.Operator):
         return boundary_edges > expected_boundary * 2
 
 
+class UVV_OT_SelectOverlapping(bpy.types.Operator):
+    """Select UV faces or islands that overlap other faces"""
+    bl_idname = "uv.uvv_select_overlapping"
+    bl_label = "Select Overlapping"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    clear_selection: BoolProperty(
+        name="Clear Selection",
+        description="Clear previous selection",
+        default=True
+    )
+
+    mode: EnumProperty(
+        name="Mode",
+        description="What to select",
+        items=[
+            ('ISLANDS', "Islands", "Select whole islands that overlap other islands"),
+            ('FACES', "Faces", "Select every face that overlaps another face, including faces of the same island"),
+        ],
+        default='ISLANDS'
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == "EDIT_MESH" and context.active_object is not None
+
+    def execute(self, context):
+        objs = [obj for obj in context.objects_in_mode if obj.type == 'MESH']
+        if not objs:
+            self.report({'WARNING'}, "No objects in edit mode")
+            return {'CANCELLED'}
+
+        # Clear selection if requested
+        if self.clear_selection:
+            if context.area.type == 'IMAGE_EDITOR' and not context.scene.tool_settings.use_uv_select_sync:
+                bpy.ops.uv.select_all(action='DESELECT')
+            else:
+                bpy.ops.mesh.select_all(action='DESELECT')
+
+        # Switch to face selection mode
+        uv_select = context.area.type == 'IMAGE_EDITOR' and not context.scene.tool_settings.use_uv_select_sync
+        if uv_select:
+            context.scene.tool_settings.uv_select_mode = "FACE"
+        else:
+            bpy.ops.mesh.select_mode(type="FACE")
+
+        face_count = 0
+        for obj in objs:
+            bm = bmesh.from_edit_mesh(obj.data)
+            uv_layer = bm.loops.layers.uv.active
+
+            if not uv_layer:
+                continue
+
+            if (overlaps := uv_overlap.calc_mesh_overlaps(bm, uv_layer)) is None:
+                continue
+
+            if self.mode == 'ISLANDS':
+                island_pairs = overlaps.island_pairs
+                selected = np.flatnonzero(np.isin(overlaps.face_islands, island_pairs.ravel()))
+            else:
+                selected = overlaps.overlapping_faces
+
+            if not len(selected):
+                continue
+
+            bm.faces.ensure_lookup_table()
+            for index in selected.tolist():
+                face = bm.faces[index]
+                # UV editor mode without sync
+                if uv_select:
+                    for loop in face.loops:
+                        loop[uv_layer].select = True
+                # 3D view or UV sync mode
+                else:
+                    face.select = True
+            face_count += len(selected)
+
+            bm.select_flush_mode()
+            bmesh.update_edit_mesh(obj.data, loop_triangles=False)
+
+        if face_count == 0:
+            self.report({'INFO'}, "No overlapping UV faces found")
+        else:
+            self.report({'INFO'}, f"Selected {face_count} overlapping UV faces")
+
+        return {'FINISHED'}
+
+
 classes = [
     UVV_OT_SelectUVBorders,
     UVV_OT_SelectByDirection,
@@ -821,6 +913,7 @@ classes = [
     UVV_OT_SelectFlippedIslands,
     UVV_OT_SelectFacesLessThanPixel,
     UVV_OT_SelectHoleIslands,
+    UVV_OT_SelectOverlapping,
 ]
 
 
@@ -16,6 +16,7 @@ from bpy.types import Operator
 
 from .. import utils
 from ..utils import draw
+from ..utils.boundary_pairs import BoundaryPairs
 from ..utils.stitch_utils import PaddingHelper
 from ..types import (
     BBox,
@@ -56,6 +57,7 @@ class Stitch:
             if len(adv_islands) <= 1:
                 continue
 
+            pairs = BoundaryPairs.from_islands(umesh.bm, umesh.uv, adv_islands, umesh.sync)
             adv_islands.indexing()
             umesh.set_corners_tag(False)
             if self.between:
@@ -81,9 +83,7 @@ class Stitch:
                 temp_exclude_indexes = exclude_indexes.copy()
                 temp_exclude_indexes.add(ref_isl[0].index)
                 # TODO: Need adapt to flipped
-                self.set_selected_boundary_tag_with_exclude_face_idx(ref_isl, temp_exclude_indexes)
-
-                loop_groups = LoopGroups.calc_by_boundary_crn_tags_v2(ref_isl)
+                loop_groups = self.calc_boundary_loop_groups(ref_isl, temp_exclude_indexes, pairs)
                 filtered = self.split_lg_for_stitch_with_padding(loop_groups)
                 if filtered:
                     # An island may not have any selected edges, but it can still be a reoriented island.
@@ -110,7 +110,7 @@ class Stitch:
                     stack = []
                     for balance_isl in balanced_target_islands:
                         if balance_isl.tag:
-                            if lg := self.balancing_filter_for_lgs(balance_isl, exclude_indexes):
+                            if lg := self.balancing_filter_for_lgs(balance_isl, exclude_indexes, pairs):
                                 trans_lg = lg.calc_shared_group_for_stitch()
                                 trans_isl_index = trans_lg[0].face.index
                                 exclude_indexes.add(trans_isl_index)
@@ -353,11 +353,10 @@ class Stitch:
                 delta = (pt_a1 - pt_b1) + orto
             trans.move(delta)
 
-    def balancing_filter_for_lgs(self, balance_isl, exclude_indexes):
+    def balancing_filter_for_lgs(self, balance_isl, exclude_indexes, pairs=None):
         """Enhances multi-stitching steps for a more even distribution"""
         if not balance_isl.sequence:
-            self.set_selected_boundary_tag_with_exclude_face_idx(balance_isl, exclude_indexes)
-            if loop_groups := LoopGroups.calc_by_boundary_crn_tags_v2(balance_isl):
+            if loop_groups := self.calc_boundary_loop_groups(balance_isl, exclude_indexes, pairs):
                 filtered = self.split_lg_for_stitch_with_padding(loop_groups)
                 if len(filtered) == 1:
                     balance_isl.tag = False
@@ -424,6 +423,14 @@ class Stitch:
                 end_filtered.append(max(g, key=lambda lg__: lg__.length_3d))
         return end_filtered
 
+    def calc_boundary_loop_groups(self, isl, exclude_idx: set, pairs: BoundaryPairs | None = None) -> LoopGroups:
+        """Loop groups of the selected boundary, the boundary pair index replaces the corner tags when there is one."""
+        if pairs is None:
+            self.set_selected_boundary_tag_with_exclude_face_idx(isl, exclude_idx)
+            return LoopGroups.calc_by_boundary_crn_tags_v2(isl)
+        loops = pairs.calc_stitch_loops(isl[0].index, exclude_idx, selected=not self.between)
+        return LoopGroups.calc_by_boundary_crn_tags_v2(isl, pairs, pairs.filter_boundary(loops))
+
     @staticmethod
     def set_boundary_tag_with_exclude_face_idx(isl, exclude_idx: set):
         uv = isl.umesh.uv
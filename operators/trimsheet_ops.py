@@ -2,11 +2,15 @@
 
 import bpy
 import bmesh
+from math import pi
+import numpy as np
 from bpy.types import Operator
 from bpy.props import IntProperty, EnumProperty, StringProperty, FloatProperty, BoolProperty
-from mathutils import Vector
+from ..types import UMesh
 from ..utils import trimsheet_utils
-from ..utils import get_island as utils_get_island
+from ..utils import trace
+from ..utils import trim_fit
+from ..utils import uv_transform
 
 # Module-level flag to track if fit operator is called from Alt+Click
 _fit_from_alt_click = False
@@ -665,277 +669,66 @@ class UVV_OT_trim_fit_selection(Operator):
             self.report({'WARNING'}, "No active UV layer")
             return {'CANCELLED'}
 
-        # Handle UV sync mode properly
-        use_uv_select_sync = context.tool_settings.use_uv_select_sync
-
-        # Get selected faces
-        selected_faces = []
-        if use_uv_select_sync:
-            selected_faces = [f for f in bm.faces if f.select]
-        else:
-            # In non-sync mode, find faces with any selected UVs
-            for face in bm.faces:
-                has_selected = any(loop[uv_layer].select for loop in face.loops)
-                if has_selected:
-                    selected_faces.append(face)
-
-        if len(selected_faces) == 0:
-            self.report({'WARNING'}, "No UVs selected")
-            return {'CANCELLED'}
-
         # Call auto-orient once BEFORE splitting into islands (if enabled)
         if self.fit_auto_orient:
             try:
                 bpy.ops.uv.uvv_orient('EXEC_DEFAULT')
-                print("Orient operator called successfully (before island split)")
                 # Refresh bmesh after orient
                 bm = bmesh.from_edit_mesh(mesh)
+                uv_layer = bm.loops.layers.uv.active
             except Exception as e:
                 print(f"Orient operator failed: {e}")
 
-        # Decide whether to fit per island or as one group
-        if self.fit_per_island:
-            # Get UV islands from selected faces
-            island_groups = utils_get_island(context, bm, uv_layer)
+        buffer = uv_transform.CornerUVs.from_bmesh(bm, uv_layer)
+        if buffer is None:
+            self.report({'WARNING'}, "Failed to read UVs")
+            return {'CANCELLED'}
+
+        # Selected faces and corners, in non-sync mode faces with any selected UV count as selected
+        arrays = buffer.arrays
+        visible_corners = np.repeat(~arrays.face_hide, arrays.loop_total)
+        if context.tool_settings.use_uv_select_sync:
+            selected_faces = buffer.face_select & ~arrays.face_hide
+            selected_corners = np.repeat(selected_faces, arrays.loop_total)
+        else:
+            selected_corners = buffer.corner_select & visible_corners
+            selected_faces = np.zeros(arrays.face_count, dtype=bool)
+            if arrays.face_count:
+                selected_faces = np.logical_or.reduceat(selected_corners, arrays.loop_start)
 
-            # Filter to only islands that have selected faces
-            selected_island_groups = []
-            for island in island_groups:
-                if any(f in selected_faces for f in island):
-                    selected_island_groups.append(island)
+        if not selected_faces.any():
+            self.report({'WARNING'}, "No UVs selected")
+            return {'CANCELLED'}
 
-            if len(selected_island_groups) == 0:
+        # Decide whether to fit per island or as one group
+        if self.fit_per_island:
+            # Islands of visible faces (faces shown in the UV editor in non-sync mode) that have selected faces
+            face_tags = ~arrays.face_hide
+            if not context.tool_settings.use_uv_select_sync:
+                face_tags &= buffer.face_select | selected_faces
+            islands = buffer.calc_island_corners(face_tags, umesh=UMesh(bm, obj))
+            if len(islands):
+                corner_selected_faces = np.repeat(selected_faces, arrays.loop_total)
+                islands = islands.filter(np.logical_or.reduceat(corner_selected_faces[islands.corners], islands.starts))
+            if len(islands) == 0:
                 self.report({'WARNING'}, "No islands found")
                 return {'CANCELLED'}
-
-            print(f"Fitting {len(selected_island_groups)} islands individually")
-
-            # Fit each island separately
-            for island_faces in selected_island_groups:
-                # Get UVs for this island
-                island_uvs = []
-                for face in island_faces:
-                    for loop in face.loops:
-                        island_uvs.append(loop[uv_layer])
-
-                # Fit this island (skip orient since we already did it)
-                self._fit_uv_group(context, island_uvs, trim, mesh, bm, uv_layer, use_uv_select_sync, skip_orient=True)
         else:
             # Fit all selected UVs as one group
-            selected_uvs = []
-            if use_uv_select_sync:
-                for face in bm.faces:
-                    if face.select:
-                        for loop in face.loops:
-                            selected_uvs.append(loop[uv_layer])
-            else:
-                for face in bm.faces:
-                    for loop in face.loops:
-                        if loop[uv_layer].select:
-                            selected_uvs.append(loop[uv_layer])
-
-            print(f"Fitting {len(selected_uvs)} UVs as one group")
-            self._fit_uv_group(context, selected_uvs, trim, mesh, bm, uv_layer, use_uv_select_sync, skip_orient=False)
-
-        # Update mesh
-        bmesh.update_edit_mesh(mesh)
-
-        return {'FINISHED'}
-
-    def _fit_uv_group(self, context, selected_uvs, trim, mesh, bm, uv_layer, use_uv_select_sync, skip_orient=False):
-
-        # Calculate current bounds of selected UVs
-        min_u = min(uv.uv.x for uv in selected_uvs)
-        max_u = max(uv.uv.x for uv in selected_uvs)
-        min_v = min(uv.uv.y for uv in selected_uvs)
-        max_v = max(uv.uv.y for uv in selected_uvs)
-
-        current_width = max_u - min_u
-        current_height = max_v - min_v
-
-        if current_width < 0.0001 or current_height < 0.0001:
+            corners = np.flatnonzero(selected_corners)
+            islands = uv_transform.IslandCorners(corners, np.zeros(len(corners), dtype=int), 1)
+
+        rect = (trim.left, trim.bottom, trim.right, trim.top)
+        angles = np.full(len(islands), self.fit_manual_rotation)
+        fitted = trim_fit.fit_islands(buffer, islands, rect, angles, self.fit_mode, self.fit_padding, self.fit_alignment,
+                                      trim_fit.FillOptions.from_operator(self), self.fit_auto_rotate, min_size=0.0001)
+        if not fitted.any():
             self.report({'WARNING'}, "Selected UVs have no area")
             return {'CANCELLED'}
 
-        # Calculate trim bounds
-        trim_width = trim.right - trim.left
-        trim_height = trim.top - trim.bottom
-
-        # Calculate centers
-        current_center_x = (min_u + max_u) / 2.0
-        current_center_y = (min_v + max_v) / 2.0
-        trim_center_x = (trim.left + trim.right) / 2.0
-        trim_center_y = (trim.bottom + trim.top) / 2.0
-
-        # Apply padding to trim bounds
-        padding_x = trim_width * self.fit_padding
-        padding_y = trim_height * self.fit_padding
-        effective_trim_width = trim_width - (2 * padding_x)
-        effective_trim_height = trim_height - (2 * padding_y)
-        effective_trim_left = trim.left + padding_x
-        effective_trim_right = trim.right - padding_x
-        effective_trim_bottom = trim.bottom + padding_y
-        effective_trim_top = trim.top - padding_y
-
-        # Step 1: Auto-orient if enabled
-        import math
-        if self.fit_auto_orient:
-            try:
-                bpy.ops.uv.uvv_orient('EXEC_DEFAULT')
-                print("Orient operator called successfully")
-
-                # Recalculate bounds after orient
-                bm = bmesh.from_edit_mesh(mesh)
-                selected_uvs_after_orient = []
-                if use_uv_select_sync:
-                    for face in bm.faces:
-                        if face.select:
-                            for loop in face.loops:
-                                selected_uvs_after_orient.append(loop[uv_layer])
-                else:
-                    for face in bm.faces:
-                        for loop in face.loops:
-                            if loop[uv_layer].select:
-                                selected_uvs_after_orient.append(loop[uv_layer])
-
-                # Recalculate bounds after orient
-                min_u = min(uv.uv.x for uv in selected_uvs_after_orient)
-                max_u = max(uv.uv.x for uv in selected_uvs_after_orient)
-                min_v = min(uv.uv.y for uv in selected_uvs_after_orient)
-                max_v = max(uv.uv.y for uv in selected_uvs_after_orient)
-
-                current_width = max_u - min_u
-                current_height = max_v - min_v
-                current_center_x = (min_u + max_u) / 2.0
-                current_center_y = (min_v + max_v) / 2.0
-
-                # Update selected_uvs list for later transforms
-                selected_uvs = selected_uvs_after_orient
-            except Exception as e:
-                print(f"Orient operator failed: {e}")
-                # Continue anyway with current orientation
-
-        # Step 2: Calculate rotation angle
-        rotation_angle = 0.0
-
-        if self.fit_auto_rotate:
-            # Auto-rotate: test 0° vs 90° to find best fit
-            aspect_uv_0 = current_width / current_height
-            aspect_trim = effective_trim_width / effective_trim_height
-            aspect_uv_90 = current_height / current_width
-
-            # Pick the rotation that gives aspect ratio closest to trim
-            if abs(aspect_uv_90 - aspect_trim) < abs(aspect_uv_0 - aspect_trim):
-                # 90° rotation is better
-                rotation_angle = math.radians(90.0)
-                current_width, current_height = current_height, current_width
-            else:
-                # Current orientation (0°) is better
-                rotation_angle = 0.0
-        else:
-            # Use manual rotation angle
-            rotation_angle = self.fit_manual_rotation
-
-            # Swap width/height for 90° and 270° rotations
-            angle_degrees = math.degrees(rotation_angle) % 360
-            if 45 < angle_degrees < 135 or 225 < angle_degrees < 315:
-                current_width, current_height = current_height, current_width
-
-        # Calculate scale factors based on fit mode
-        scale_x = 1.0
-        scale_y = 1.0
-
-        if self.fit_mode == 'FILL':
-            # Advanced fill mode with separate horizontal and vertical controls
-
-            # Calculate horizontal scale
-            if self.fit_horizontal_mode == 'FILL':
-                scale_x = effective_trim_width / current_width
-            elif self.fit_horizontal_mode == 'CONTAIN':
-                # Maintain aspect ratio based on height
-                scale = min(effective_trim_width / current_width, effective_trim_height / current_height)
-                scale_x = scale
-            elif self.fit_horizontal_mode == 'CUSTOM':
-                # Convert percentage (0-200) to scale factor (0-2)
-                scale_x = (effective_trim_width * (self.fit_horizontal_custom / 100.0)) / current_width
-
-            # Calculate vertical scale
-            if self.fit_vertical_mode == 'FILL':
-                scale_y = effective_trim_height / current_height
-            elif self.fit_vertical_mode == 'CONTAIN':
-                # Maintain aspect ratio based on width
-                scale = min(effective_trim_width / current_width, effective_trim_height / current_height)
-                scale_y = scale
-            elif self.fit_vertical_mode == 'CUSTOM':
-                # Convert percentage (0-200) to scale factor (0-2)
-                scale_y = (effective_trim_height * (self.fit_vertical_custom / 100.0)) / current_height
-
-        elif self.fit_mode == 'CONTAIN':
-            # Scale to fit inside trim bounds (maintain aspect ratio)
-            scale = min(effective_trim_width / current_width, effective_trim_height / current_height)
-            scale_x = scale
-            scale_y = scale
-
-        elif self.fit_mode == 'NONE':
-            # No scaling, only positioning
-            scale_x = 1.0
-            scale_y = 1.0
-
-        # Calculate scaled dimensions
-        scaled_width = current_width * scale_x
-        scaled_height = current_height * scale_y
-
-        # Calculate alignment offset based on fit_alignment
-        align_offset_x = 0.0
-        align_offset_y = 0.0
-
-        # Horizontal alignment
-        if self.fit_alignment in ['TOP_LEFT', 'CENTER_LEFT', 'BOTTOM_LEFT']:
-            # Align to left edge
-            align_offset_x = effective_trim_left + (scaled_width / 2) - trim_center_x
-        elif self.fit_alignment in ['TOP_RIGHT', 'CENTER_RIGHT', 'BOTTOM_RIGHT']:
-            # Align to right edge
-            align_offset_x = effective_trim_right - (scaled_width / 2) - trim_center_x
-        # else: CENTER (default, no offset needed)
-
-        # Vertical alignment
-        if self.fit_alignment in ['TOP_LEFT', 'TOP_CENTER', 'TOP_RIGHT']:
-            # Align to top edge
-            align_offset_y = effective_trim_top - (scaled_height / 2) - trim_center_y
-        elif self.fit_alignment in ['BOTTOM_LEFT', 'BOTTOM_CENTER', 'BOTTOM_RIGHT']:
-            # Align to bottom edge
-            align_offset_y = effective_trim_bottom + (scaled_height / 2) - trim_center_y
-        # else: CENTER (default, no offset needed)
-
-        # Transform all selected UVs
-        import math
-        for uv in selected_uvs:
-            # Translate to origin (current center)
-            x = uv.uv.x - current_center_x
-            y = uv.uv.y - current_center_y
-
-            # Rotate if needed
-            if rotation_angle != 0.0:
-                cos_a = math.cos(rotation_angle)
-                sin_a = math.sin(rotation_angle)
-                new_x = x * cos_a - y * sin_a
-                new_y = x * sin_a + y * cos_a
-                x = new_x
-                y = new_y
-
-            # Scale
-            x *= scale_x
-            y *= scale_y
-
-            # Move to trim center + alignment offset
-            uv.uv.x = trim_center_x + x + align_offset_x
-            uv.uv.y = trim_center_y + y + align_offset_y
-
-        # Update mesh
+        buffer.write()
         bmesh.update_edit_mesh(mesh)
 
-        # Tagging system removed
-
         self.report({'INFO'}, f"Fitted UVs to trim '{trim.name}'")
         return {'FINISHED'}
 
@@ -1760,7 +1553,7 @@ class UVV_OT_trim_smart_pack(Operator):
                         continue
                 
                 # Collect islands
-                hsp_storage.collect_islands(context, bm, uv_layer, self.detect_radial)
+                hsp_storage.collect_islands(context, bm, uv_layer, self.detect_radial, obj=obj)
                 
                 if not hsp_storage.islands_count:
                     print(f"No islands found for object {obj.name}")
@@ -1776,24 +1569,18 @@ class UVV_OT_trim_smart_pack(Operator):
                     self._orient_to_near_axis(context, hsp_storage.islands, uv_layer)
                     hsp_storage.update_islands(uv_layer)
                 
-                # Process regular islands
+                # Process regular islands, all of them are matched in one batched query
                 islands_to_process = list(hsp_storage.islands)
                 print(f"Processing {len(islands_to_process)} regular islands")
-                for island in islands_to_process:
-                    total_islands_processed += 1
-                    
-                    # Skip islands with invalid bbox
-                    if not island.bbox or island.bbox.area <= 0:
-                        print(f"Skipping island with invalid bbox")
-                        continue
-                    
-                    # Find best matching trim
-                    suited_trims = self._find_best_trim(hsp_storage, island, scalar, context)
-                    aspect_str = f"{island.aspect:.3f}" if island.aspect is not None else "None"
-                    print(f"Found {len(suited_trims)} suitable trims for island with aspect {aspect_str}")
-                    
+                total_islands_processed += len(islands_to_process)
+                # Skip islands with invalid bbox
+                islands_to_process = [island for island in islands_to_process if island.bbox and island.bbox.area > 0]
+                suited_trims_per_island = self._find_best_trims(hsp_storage, islands_to_process, scalar)
+
+                # Trim, rotation and flip are picked per island, the fit itself runs for all islands at once
+                fits = []
+                for island, suited_trims in zip(islands_to_process, suited_trims_per_island):
                     if not suited_trims:
-                        print(f"No suitable trim found for island")
                         continue
                     
                     # Choose trim (with variability)
@@ -1810,28 +1597,18 @@ class UVV_OT_trim_smart_pack(Operator):
                         import random
                         rotation_angle += random.choice([0.0, pi])
                     
-                    # Get trim-specific settings
-                    padding = self._get_padding(best_trim)
-                    
-                    # Transform island to trim
-                    if self._transform_island_to_trim(island, best_trim, rotation_angle, uv_layer, self.fit_mode, padding):
-                        total_islands_fitted += 1
-                        
-                        # Apply flip variation if enabled
-                        if self.allow_flip_variation:
-                            self._apply_flip_variation(island, uv_layer)
+                    fits.append((island, best_trim, rotation_angle, self._choose_flip()))
                 
                 # Process radial islands separately
                 if self.detect_radial and hsp_storage.radial_islands:
-                    container = hsp_storage.radial_trims if hsp_storage.radial_trims else hsp_storage.trims
+                    radial_islands = list(hsp_storage.radial_islands)
+                    # Use area-based matching for radial islands
+                    suited_trims_per_island = hsp_storage.match_radial_islands(radial_islands, scalar)
                     
-                    for island in hsp_storage.radial_islands:
+                    for island, suited_trims in zip(radial_islands, suited_trims_per_island):
                         total_islands_processed += 1
                         radial_islands_processed.append((obj.name, island))
                         
-                        # Use area-based matching for radial islands
-                        suited_trims = hsp_storage.get_area_suited_trims(list(container), island, scalar, self.allow_rotation)
-                        
                         if suited_trims:
                             if self.allow_location_variation and len(suited_trims) > 1:
                                 import random
@@ -1845,13 +1622,9 @@ class UVV_OT_trim_smart_pack(Operator):
                                 import random
                                 rotation_angle += random.choice(range(0, 360, 5)) * pi / 180  # Random 5-degree increments
                             
-                            padding = self._get_padding(best_trim)
-                            
-                            if self._transform_island_to_trim(island, best_trim, rotation_angle, uv_layer, self.fit_mode, padding):
-                                total_islands_fitted += 1
-                                
-                                if self.allow_flip_variation:
-                                    self._apply_flip_variation(island, uv_layer)
+                            fits.append((island, best_trim, rotation_angle, self._choose_flip()))
+                
+                total_islands_fitted += self._fit_islands_to_trims(bm, uv_layer, fits)
                 
                 # Update mesh
                 bmesh.update_edit_mesh(obj.data)
@@ -1916,29 +1689,17 @@ class UVV_OT_trim_smart_pack(Operator):
         # For now, just a placeholder
         print("Axis orientation not yet implemented")
     
-    def _apply_flip_variation(self, island, uv_layer):
-        """Apply random flip variation to island"""
+    def _choose_flip(self):
+        """Random flip scale when flip variation is enabled"""
+        if not self.allow_flip_variation:
+            return 1.0, 1.0
         import random
-        from mathutils import Vector
-        
-        # Get island center
-        uv_points = [Vector(loop[uv_layer].uv) for loop in island.loops]
-        center = sum(uv_points, Vector()) / len(uv_points)
-        
-        # Random flip scale
-        flip_scale = random.choice([
-            Vector((-1, 1)),   # Flip X
-            Vector((1, -1)),   # Flip Y
-            Vector((-1, -1)), # Flip both
-            Vector((1, 1))    # No flip
+        return random.choice([
+            (-1.0, 1.0),   # Flip X
+            (1.0, -1.0),   # Flip Y
+            (-1.0, -1.0),  # Flip both
+            (1.0, 1.0)     # No flip
         ])
-        
-        # Apply flip
-        for loop in island.loops:
-            uv = loop[uv_layer].uv
-            # Translate to origin, scale, translate back
-            uv.x = center.x + (uv.x - center.x) * flip_scale.x
-            uv.y = center.y + (uv.y - center.y) * flip_scale.y
     
     def _select_radial_islands(self, context, radial_islands_processed):
         """Select radial islands after processing"""
@@ -1958,109 +1719,50 @@ class UVV_OT_trim_smart_pack(Operator):
             except Exception as e:
                 print(f"Error selecting radial islands for {obj_name}: {e}")
     
-    def _find_best_trim(self, hsp_storage, island, scalar, context):
-        """Find best matching trim based on priority"""
-        if self.priority == 'ASPECT':
-            return hsp_storage.get_trims_by_aspect_priority(island, scalar, self.allow_rotation, self.aspect_tolerance, self.aspect_precision)
-        elif self.priority == 'AREA':
-            return hsp_storage.get_trims_by_area_priority(island, scalar, self.allow_rotation, self.aspect_tolerance, self.aspect_precision)
-        else:  # WORLD_SIZE
-            return hsp_storage.get_trims_by_world_size_priority(context, island, scalar, self.allow_rotation, self.aspect_tolerance, self.aspect_precision)
+    def _find_best_trims(self, hsp_storage, islands, scalar):
+        """Find matching trims for all islands based on priority, best first"""
+        return hsp_storage.match_islands(islands, self.priority, scalar, self.allow_rotation,
+                                         self.aspect_tolerance, self.aspect_precision)
     
-    def _transform_island_to_trim(self, island, trim, rotation_angle, uv_layer, fit_mode='CONTAIN', padding=0.0):
-        """Transform island to fit within trim bounds"""
-        try:
-            # Get island loops
-            loops = island.loops
-            if not loops:
-                return False
-            
-            # Get trim bounds
-            trim_left = trim.trim.left
-            trim_bottom = trim.trim.bottom
-            trim_right = trim.trim.right
-            trim_top = trim.trim.top
-            
-            # Apply padding
-            effective_left = trim_left + padding * (trim_right - trim_left)
-            effective_bottom = trim_bottom + padding * (trim_top - trim_bottom)
-            effective_right = trim_right - padding * (trim_right - trim_left)
-            effective_top = trim_top - padding * (trim_top - trim_bottom)
-            
-            # Calculate current island bounds
-            uv_points = [Vector(loop[uv_layer].uv) for loop in loops]
-            from ..utils.hotspot_system import BoundingBox2d
-            current_bbox = BoundingBox2d.from_points(uv_points)
-            
-            # Calculate scale factors
-            current_width = current_bbox.width
-            current_height = current_bbox.height
-            
-            if current_width == 0 or current_height == 0:
-                return False
-            
-            effective_width = effective_right - effective_left
-            effective_height = effective_top - effective_bottom
-            
-            # Calculate scale factors based on fit mode
-            scale_x, scale_y = self._calculate_fit_scales(
-                current_width, current_height, 
-                effective_width, effective_height, 
-                fit_mode, trim
-            )
-            
-            # Calculate alignment offset
-            align_offset_x = 0.0
-            align_offset_y = 0.0
-            
-            scaled_width = current_width * scale_x
-            scaled_height = current_height * scale_y
-            
-            trim_center_x = (trim_left + trim_right) / 2
-            trim_center_y = (trim_bottom + trim_top) / 2
-            
-            # Apply alignment
-            if self.alignment in ['TOP_LEFT', 'CENTER_LEFT', 'BOTTOM_LEFT']:
-                align_offset_x = effective_left + scaled_width / 2 - trim_center_x
-            elif self.alignment in ['TOP_RIGHT', 'CENTER_RIGHT', 'BOTTOM_RIGHT']:
-                align_offset_x = effective_right - scaled_width / 2 - trim_center_x
-            
-            if self.alignment in ['TOP_LEFT', 'TOP_CENTER', 'TOP_RIGHT']:
-                align_offset_y = effective_top - scaled_height / 2 - trim_center_y
-            elif self.alignment in ['BOTTOM_LEFT', 'BOTTOM_CENTER', 'BOTTOM_RIGHT']:
-                align_offset_y = effective_bottom + scaled_height / 2 - trim_center_y
-            
-            # Transform each loop
-            import math
-            for loop in loops:
-                uv = loop[uv_layer].uv
-                
-                # Translate to origin
-                x = uv.x - current_bbox.center.x
-                y = uv.y - current_bbox.center.y
-                
-                # Rotate if needed
-                if rotation_angle != 0.0:
-                    cos_a = math.cos(rotation_angle)
-                    sin_a = math.sin(rotation_angle)
-                    new_x = x * cos_a - y * sin_a
-                    new_y = x * sin_a + y * cos_a
-                    x = new_x
-                    y = new_y
-                
-                # Scale
-                x *= scale_x
-                y *= scale_y
-                
-                # Move to trim position
-                uv.x = trim_center_x + x + align_offset_x
-                uv.y = trim_center_y + y + align_offset_y
-            
-            return True
-            
-        except Exception as e:
-            print(f"Error transforming island: {e}")
-            return False
+    def _get_fit_mode(self, trim):
+        """Get fit mode for trim, 'FROM_TRIM' uses the trim's own setting"""
+        if self.fit_mode == 'FROM_TRIM':
+            return getattr(trim.trim, 'fit_mode', 'CONTAIN')
+        return self.fit_mode
+    
+    def _fit_islands_to_trims(self, bm, uv_layer, fits):
+        """Fit (island, trim, rotation_angle, flip) entries in one pass, returns the number of fitted islands"""
+        if not fits:
+            return 0
+        buffer = uv_transform.CornerUVs.from_bmesh(bm, uv_layer)
+        if buffer is None:
+            trace.warning('HOTSPOT', "Failed to read UVs, %s islands not fitted", len(fits))
+            return 0
+        
+        bm.faces.index_update()
+        island_faces = [np.fromiter((f.index for f in island.faces), dtype='int32', count=len(island.faces))
+                        for island, _trim, _angle, _flip in fits]
+        face_islands = np.repeat(np.arange(len(fits)), [len(faces) for faces in island_faces])
+        islands = buffer.calc_face_corners(np.concatenate(island_faces), face_islands, len(fits))
+        
+        trims = [trim for _island, trim, _angle, _flip in fits]
+        rects = np.array([(t.trim.left, t.trim.bottom, t.trim.right, t.trim.top) for t in trims], dtype='float64')
+        angles = np.array([angle for _island, _trim, angle, _flip in fits], dtype='float64')
+        padding = np.array([self._get_padding(t) for t in trims], dtype='float64')
+        fit_modes = [self._get_fit_mode(t) for t in trims]
+        fitted = trim_fit.fit_islands(buffer, islands, rects, angles, fit_modes, padding, self.alignment,
+                                      trim_fit.FillOptions.from_operator(self))
+        
+        # Flip variation mirrors fitted islands around the mean of their UVs
+        flips = np.array([flip for _island, _trim, _angle, flip in fits], dtype='float64')
+        flips[~fitted] = 1.0
+        if (flips != 1.0).any():
+            counts = np.bincount(islands.corner_islands, minlength=len(fits))
+            centers = np.add.reduceat(buffer.uv_co[islands.corners], islands.starts) / counts[:, None]
+            buffer.transform_islands(islands, uv_transform.affine_matrices(np.zeros(len(fits)), flips, centers))
+        
+        buffer.write()
+        return int(fitted.sum())
     
     def draw(self, context):
         """Draw operator properties in the panel"""
@@ -2205,91 +1907,6 @@ class UVV_OT_trim_smart_pack(Operator):
         
         if self.detect_radial:
             box.prop(self, 'select_radials')
-    
-    def _calculate_fit_scales(self, current_width, current_height, effective_width, effective_height, fit_mode, trim):
-        """Calculate scale factors based on fit mode"""
-        # Get trim-specific settings if FROM_TRIM
-        if fit_mode == 'FROM_TRIM':
-            if hasattr(trim.trim, 'fit_mode'):
-                fit_mode = trim.trim.fit_mode
-            else:
-                fit_mode = 'CONTAIN'  # Default fallback
-        
-        if fit_mode == 'FILL':
-            # Use advanced fill mode with horizontal/vertical controls
-            scale_x = self._calculate_axis_scale(current_width, effective_width, self.fit_horizontal_mode, self.fit_horizontal_custom)
-            scale_y = self._calculate_axis_scale(current_height, effective_height, self.fit_vertical_mode, self.fit_vertical_custom)
-            
-        elif fit_mode == 'CONTAIN':
-            # Fit inside trim bounds (maintains aspect, may letterbox)
-            scale_x = effective_width / current_width
-            scale_y = effective_height / current_height
-            scale = min(scale_x, scale_y)
-            scale_x = scale
-            scale_y = scale
-            
-        elif fit_mode == 'COVER':
-            # Fill trim bounds completely (maintains aspect, may crop)
-            scale_x = effective_width / current_width
-            scale_y = effective_height / current_height
-            scale = max(scale_x, scale_y)
-            scale_x = scale
-            scale_y = scale
-            
-        elif fit_mode == 'FIT_WIDTH':
-            # Match trim width, allow vertical overflow/underflow
-            scale_x = effective_width / current_width
-            scale_y = scale_x  # Maintain aspect ratio
-            
-        elif fit_mode == 'FIT_HEIGHT':
-            # Match trim height, allow horizontal overflow/underflow
-            scale_y = effective_height / current_height
-            scale_x = scale_y  # Maintain aspect ratio
-            
-        elif fit_mode == 'NONE':
-            # Don't scale, only position
-            scale_x = 1.0
-            scale_y = 1.0
-            
-        else:
-            # Default to CONTAIN
-            scale_x = effective_width / current_width
-            scale_y = effective_height / current_height
-            scale = min(scale_x, scale_y)
-            scale_x = scale
-            scale_y = scale
-        
-        return scale_x, scale_y
-    
-    def _calculate_axis_scale(self, current_size, effective_size, mode, custom_value):
-        """Calculate scale for a single axis based on mode"""
-        if mode == 'FILL':
-            return effective_size / current_size
-        elif mode == 'CONTAIN':
-            return effective_size / current_size  # Will be constrained by min() in caller
-        elif mode == 'CUSTOM':
-            return (custom_value / 100.0) * (effective_size / current_size)
-        else:
-            return effective_size / current_size
-        
-        # Tag Filtering
-        layout.label(text="Tag Filtering:")
-        box = layout.box()
-        box.prop(self, 'trim_category')
-        box.prop(self, 'trim_tag')
-        
-        # Aspect Corrector
-        layout.label(text="Aspect Corrector:")
-        box = layout.box()
-        row = box.row()
-        row.alert = True if self.aspect_precision != 0.0 else False
-        row.label(text="Wider")
-        rc = row.row(align=True)
-        rc.alignment = 'LEFT'
-        rc.prop(self, 'aspect_precision')
-        row = row.row()
-        row.alignment = 'RIGHT'
-        row.label(text="Higher")
 
 
 classes = [
@@ -2,9 +2,12 @@
 
 import bpy
 import bmesh
+import numpy as np
 from bpy.types import Operator
 from bpy.props import EnumProperty
 
+from ..utils import uv_transform
+
 
 class UVV_OT_shift_uv(Operator):
     """Shift selected UV islands by 1 UV unit in the specified direction"""
@@ -54,24 +57,25 @@ class UVV_OT_shift_uv(Operator):
             if not uv_layer:
                 continue
 
+            buffer = uv_transform.CornerUVs.from_bmesh(bm, uv_layer)
+            if buffer is None:
+                continue
+
             # Check if we're in UV sync mode
             use_uv_sync = context.tool_settings.use_uv_select_sync
 
             # Move selected UVs
             if use_uv_sync:
                 # In sync mode, move UVs of selected faces
-                for face in bm.faces:
-                    if face.select:
-                        for loop in face.loops:
-                            loop[uv_layer].uv.x += offset[0]
-                            loop[uv_layer].uv.y += offset[1]
+                corners = np.repeat(buffer.face_select, buffer.arrays.loop_total)
             else:
                 # In non-sync mode, move selected UV vertices
-                for face in bm.faces:
-                    for loop in face.loops:
-                        if loop[uv_layer].select:
-                            loop[uv_layer].uv.x += offset[0]
-                            loop[uv_layer].uv.y += offset[1]
+                corners = buffer.corner_select
+            if not corners.any():
+                continue
+
+            buffer.move(offset, np.flatnonzero(corners))
+            buffer.write()
 
             # Update the mesh
             bmesh.update_edit_mesh(mesh, loop_triangles=False)
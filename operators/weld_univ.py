@@ -15,8 +15,10 @@ from mathutils import Vector
 
 from ..utils.univ_weld_utils import weld_crn_edge_by_idx, copy_pos_to_target_with_select
 from ..utils import sync
+from ..utils import trace
 from ..utils.island_utils import get_islands_non_manifold
 from ..utils.island_align import reorient_island_to_target, find_welded_edge_pairs
+from ..utils.boundary_pairs import BoundaryPairs
 from .stitch_univ import Stitch
 
 
@@ -43,38 +45,25 @@ class UVV_OT_Weld(Operator):
         return context.mode == 'EDIT_MESH' and context.active_object and context.active_object.type == 'MESH'
 
     def execute(self, context):
-        print("=== WELD OPERATION STARTED ===")
-        print("Weld Executed.")
+        with trace.span('WELD', "weld"):
+            return self.weld(context)
+
+    def weld(self, context):
         is_sync = sync()
-        print(f"Weld: Sync mode = {is_sync}")
+        trace.info('WELD', "Sync mode = %s", is_sync)
 
         # Store islands for Phase 2 (like UniV's islands_of_mesh)
         all_objects_islands = []
         phase1_updated = False
 
         # PHASE 1: Weld edges within same island (UniV lines 683-732)
-        print("Weld: Starting Phase 1")
-        # Store original edge positions for alignment
-        original_edge_positions = {}
-        
+        trace.info('WELD', "Starting Phase 1")
+
         for obj in context.objects_in_mode_unique_data:
             bm = bmesh.from_edit_mesh(obj.data)
             uv_layer = bm.loops.layers.uv.verify()
             update_tag = False
-            print(f"Weld: Processing object {obj.name}")
-            
-            # Store original edge positions BEFORE welding
-            for face in bm.faces:
-                for loop in face.loops:
-                    edge = loop.edge
-                    if edge.index not in original_edge_positions:
-                        # Store both corners of the edge
-                        corner1 = loop
-                        corner2 = loop.link_loop_next
-                        original_edge_positions[edge.index] = {
-                            'corner1_uv': corner1[uv_layer].uv.copy(),
-                            'corner2_uv': corner2[uv_layer].uv.copy()
-                        }
+            trace.info('WELD', "Processing object %s", obj.name)
 
             # Calculate islands using non-manifold detection (UniV pattern)
             # In sync mode: use all non-hidden faces
@@ -99,12 +88,15 @@ class UVV_OT_Weld(Operator):
 
             # Keep all islands for indexing, but only process filtered ones
             filtered_islands = [isl for isl in all_islands if island_has_selected_edge(isl)]
-            print(f"Weld: Found {len(all_islands)} total islands, {len(filtered_islands)} with selected edges")
+            trace.info('WELD', "Found %s total islands, %s with selected edges", len(all_islands), len(filtered_islands))
 
             if not filtered_islands:
-                print("Weld: No islands with selected edges, skipping object")
+                trace.debug('WELD', "No islands with selected edges, skipping object")
                 continue
 
+            # Boundary pairs with the original UVs (BEFORE welding) for alignment
+            pairs = BoundaryPairs.from_islands(bm, uv_layer, filtered_islands, is_sync)
+
             # Initialize all corner tags
             for face in bm.faces:
                 for loop in face.loops:
@@ -117,11 +109,11 @@ class UVV_OT_Weld(Operator):
                     face.index = idx
 
             # Process each filtered island using UniV's exact algorithm
-            print(f"Weld: Processing {len(filtered_islands)} filtered islands")
+            trace.info('WELD', "Processing %s filtered islands", len(filtered_islands))
             for island in filtered_islands:
                 # Get the actual index from face.index (since we indexed all_islands)
                 idx = island[0].index
-                print(f"Weld: Processing island {idx} with {len(island)} faces")
+                trace.debug('WELD', "Processing island %s with %s faces", idx, len(island))
                 
                 # Tag selected edges in this island (UniV's set_selected_crn_edge_tag)
                 selected_edges_count = 0
@@ -131,14 +123,14 @@ class UVV_OT_Weld(Operator):
                             crn.tag = crn.edge.select
                             if crn.edge.select:
                                 selected_edges_count += 1
-                                print(f"Weld: Found selected edge in sync mode: face={face.index}, edge={crn.edge.index}")
+                                trace.debug('WELD', "Found selected edge in sync mode: face=%s, edge=%s", face.index, crn.edge.index)
                         else:
                             crn.tag = crn[uv_layer].select_edge
                             if crn[uv_layer].select_edge:
                                 selected_edges_count += 1
-                                print(f"Weld: Found selected edge in non-sync mode: face={face.index}, edge={crn.edge.index}")
+                                trace.debug('WELD', "Found selected edge in non-sync mode: face=%s, edge=%s", face.index, crn.edge.index)
                 
-                print(f"Weld: Island {idx} has {selected_edges_count} selected edges")
+                trace.debug('WELD', "Island %s has %s selected edges", idx, selected_edges_count)
 
                 # Process tagged corners using UniV's exact algorithm (lines 693-731)
                 welded_count = 0
@@ -150,7 +142,7 @@ class UVV_OT_Weld(Operator):
                         shared = crn.link_loop_radial_prev
                         if shared == crn:  # Boundary edge
                             crn.tag = False
-                            print(f"Weld: Boundary edge, skipping")
+                            trace.debug('WELD', "Boundary edge, skipping")
                             continue
 
                         # CRITICAL: UniV line 699 - island boundary check
@@ -159,7 +151,7 @@ class UVV_OT_Weld(Operator):
                         if shared.face.index != idx:  # island boundary skip
                             crn.tag = False
                             shared.tag = False
-                            print(f"Weld: Cross-island edge, skipping (shared.face.index={shared.face.index}, idx={idx})")
+                            trace.debug('WELD', "Cross-island edge, skipping (shared.face.index=%s, idx=%s)", shared.face.index, idx)
                             continue
 
                         # Check if edge is split (UniV lines 711-712)
@@ -169,7 +161,7 @@ class UVV_OT_Weld(Operator):
                         is_splitted_a = crn[uv_layer].uv != shared_next[uv_layer].uv
                         is_splitted_b = crn_next[uv_layer].uv != shared[uv_layer].uv
 
-                        print(f"Weld: Edge analysis - is_splitted_a={is_splitted_a}, is_splitted_b={is_splitted_b}")
+                        trace.debug('WELD', "Edge analysis - is_splitted_a=%s, is_splitted_b=%s", is_splitted_a, is_splitted_b)
 
                         # UNIV behavior: Weld split edges even if only one side is selected
                         # This allows single edge selection to work
@@ -178,63 +170,63 @@ class UVV_OT_Weld(Operator):
                             weld_crn_edge_by_idx(crn_next, shared, idx, uv_layer)
                             welded_count += 2
                             update_tag = True
-                            print(f"Weld: Welded both sides")
+                            trace.debug('WELD', "Welded both sides")
                         elif is_splitted_a:
                             weld_crn_edge_by_idx(crn, shared_next, idx, uv_layer)
                             welded_count += 1
                             update_tag = True
-                            print(f"Weld: Welded side A")
+                            trace.debug('WELD', "Welded side A")
                         elif is_splitted_b:
                             weld_crn_edge_by_idx(crn_next, shared, idx, uv_layer)
                             welded_count += 1
                             update_tag = True
-                            print(f"Weld: Welded side B")
+                            trace.debug('WELD', "Welded side B")
                         else:
-                            print(f"Weld: Edge not split, no welding needed")
+                            trace.debug('WELD', "Edge not split, no welding needed")
 
                         # Clear seam after welding (UniV lines 725-728)
                         edge = crn.edge
                         if edge.seam:
                             edge.seam = False
                             update_tag = True
-                            print(f"Weld: Cleared seam on edge {edge.index}")
+                            trace.debug('WELD', "Cleared seam on edge %s", edge.index)
 
                         # Mark as processed (UniV lines 730-731)
                         crn.tag = False
                         shared.tag = False
 
-                print(f"Weld: Island {idx} welded {welded_count} edges")
+                trace.debug('WELD', "Island %s welded %s edges", idx, welded_count)
 
             # Store for Phase 2 - store filtered_islands (ones with selection)
             # UniV stores the Islands object which was already filtered
             if filtered_islands:
-                all_objects_islands.append((obj, bm, uv_layer, filtered_islands, update_tag))
+                all_objects_islands.append((obj, bm, uv_layer, filtered_islands, pairs, update_tag))
                 if update_tag:
                     phase1_updated = True
-                    print(f"Weld: Phase 1 updated object {obj.name}")
+                    trace.info('WELD', "Phase 1 updated object %s", obj.name)
         
-        print(f"Weld: Phase 1 completed. Updated: {phase1_updated}")
+        trace.info('WELD', "Phase 1 completed. Updated: %s", phase1_updated)
 
         # Update meshes from Phase 1 and check for early return
         if phase1_updated:
-            for obj, bm, uv_layer, all_islands, update_tag in all_objects_islands:
+            for obj, bm, uv_layer, all_islands, _, update_tag in all_objects_islands:
                 if update_tag:
                     bmesh.update_edit_mesh(obj.data)
             
             # PHASE 2: Island Alignment (UNIV behavior)
-            print("Weld: Starting Phase 2 - Island Alignment")
-            self.align_islands_after_weld(all_objects_islands, is_sync, original_edge_positions)
+            trace.info('WELD', "Starting Phase 2 - Island Alignment")
+            self.align_islands_after_weld(all_objects_islands, is_sync)
             
             return {'FINISHED'}  # Early return - skip Phase 3
 
         # PHASE 2: Handle non-sync mode with remaining tagged corners (UniV lines 740-753)
         # This runs when Phase 1 didn't update anything
-        print("Weld: Starting Phase 2")
+        trace.info('WELD', "Starting Phase 2")
         phase2_updated = False
         if not is_sync:
             # CRITICAL FIX: Add Univ's Phase 2 seam clearing logic
             # This is the missing piece that clears seams after copy_pos_to_target_with_select
-            for obj, bm, uv_layer, all_islands, _ in all_objects_islands:
+            for obj, bm, uv_layer, all_islands, _, _ in all_objects_islands:
                 update_tag = False
                 
                 for idx, island in enumerate(all_islands):
@@ -253,9 +245,9 @@ class UVV_OT_Weld(Operator):
                     phase2_updated = True
 
         # Check if Phase 2 updated anything
-        print(f"Weld: Phase 2 completed. Updated: {phase2_updated}")
+        trace.info('WELD', "Phase 2 completed. Updated: %s", phase2_updated)
         if phase2_updated:
-            print("Weld: Phase 2 updated - returning early")
+            trace.info('WELD', "Phase 2 updated - returning early")
             return {'FINISHED'}  # Early return - skip Phase 3
 
         # PHASE 3: Only fallback to stitch in very specific cases
@@ -285,71 +277,55 @@ class UVV_OT_Weld(Operator):
             if has_valid_edges:
                 break
         
-        print(f"Weld Phase 3: has_valid_edges={has_valid_edges}, edge_count={edge_count}")
+        trace.info('WELD', "Phase 3: has_valid_edges=%s, edge_count=%s", has_valid_edges, edge_count)
         
         # Only call stitch if we have valid edges that could be stitched
         if has_valid_edges:
-            print("Weld: Falling back to stitch (UNIV behavior)")
+            trace.info('WELD', "Falling back to stitch (UNIV behavior)")
             return bpy.ops.uv.uvv_stitch('INVOKE_DEFAULT')
         else:
-            print("Weld: No valid edges found - operation completed")
+            trace.info('WELD', "No valid edges found - operation completed")
             # No valid edges found - weld operation completed successfully
             return {'FINISHED'}
 
-    def align_islands_after_weld(self, all_objects_islands, is_sync, original_edge_positions):
+    def align_islands_after_weld(self, all_objects_islands, is_sync):
         """
         Align islands after welding - UNIV behavior.
         This is what makes weld actually align the islands instead of just merging edges.
         """
-        print("Weld: Aligning islands after welding")
+        trace.info('WELD', "Aligning islands after welding")
         
-        for obj, bm, uv_layer, all_islands, _ in all_objects_islands:
-            # Create face to island index mapping
-            face_to_island_idx = {}
-            for idx, island in enumerate(all_islands):
-                for face in island:
-                    face_to_island_idx[face] = idx
-            
+        for obj, bm, uv_layer, all_islands, pairs, _ in all_objects_islands:
+            if pairs is None:
+                trace.warning('WELD', "No boundary pairs for object %s, skipping alignment", obj.name)
+                continue
+
             # Find welded edge pairs across islands
-            welded_pairs = find_welded_edge_pairs(all_islands, face_to_island_idx, uv_layer)
-            print(f"Weld: Found {len(welded_pairs)} welded edge pairs for alignment")
-            
+            welded_pairs = find_welded_edge_pairs(pairs)
+            trace.info('WELD', "Found %s welded edge pairs for alignment", len(welded_pairs))
+
+            # UVs BEFORE welding
+            original_uv_co = pairs.uv_co
+            loop_next = pairs.arrays.loop_next
+
             for pair in welded_pairs:
                 ref_island_idx = pair['ref_island_idx']
                 trans_island_idx = pair['trans_island_idx']
-                ref_edge_corners = pair['ref_edge_corners']
-                trans_edge_corners = pair['trans_edge_corners']
                 
                 ref_island = all_islands[ref_island_idx]
                 trans_island = all_islands[trans_island_idx]
                 
-                print(f"Weld: Aligning island {trans_island_idx} to island {ref_island_idx}")
+                trace.debug('WELD', "Aligning island %s to island %s", trans_island_idx, ref_island_idx)
                 
-                # Get ORIGINAL edge endpoints (before welding) for proper alignment
-                # Find the edge that was welded
-                ref_edge = ref_edge_corners[0].edge
-                trans_edge = trans_edge_corners[0].edge
+                # Get ORIGINAL edge endpoints (before welding) for proper alignment,
+                # both sides use the first corner of the welded edge
+                edge_loop = pair['edge_loop']
+                ref_pt1 = trans_pt1 = Vector(original_uv_co[edge_loop])
+                ref_pt2 = trans_pt2 = Vector(original_uv_co[loop_next[edge_loop]])
                 
-                # Use original positions for alignment calculation
-                if ref_edge.index in original_edge_positions:
-                    ref_pt1 = original_edge_positions[ref_edge.index]['corner1_uv']
-                    ref_pt2 = original_edge_positions[ref_edge.index]['corner2_uv']
-                else:
-                    # Fallback to current positions if original not found
-                    ref_pt1 = ref_edge_corners[0][uv_layer].uv
-                    ref_pt2 = ref_edge_corners[1][uv_layer].uv
-                
-                if trans_edge.index in original_edge_positions:
-                    trans_pt1 = original_edge_positions[trans_edge.index]['corner1_uv']
-                    trans_pt2 = original_edge_positions[trans_edge.index]['corner2_uv']
-                else:
-                    # Fallback to current positions if original not found
-                    trans_pt1 = trans_edge_corners[0][uv_layer].uv
-                    trans_pt2 = trans_edge_corners[1][uv_layer].uv
-                
-                print(f"Weld: Using original edge positions for alignment")
-                print(f"Weld: Ref edge original: {ref_pt1} - {ref_pt2}")
-                print(f"Weld: Trans edge original: {trans_pt1} - {trans_pt2}")
+                trace.debug('WELD', "Using original edge positions for alignment")
+                trace.debug('WELD', "Ref edge original: %s - %s", ref_pt1, ref_pt2)
+                trace.debug('WELD', "Trans edge original: %s - %s", trans_pt1, trans_pt2)
                 
                 # Align the islands
                 success = reorient_island_to_target(
@@ -359,14 +335,13 @@ class UVV_OT_Weld(Operator):
                 )
                 
                 if success:
-                    print(f"Weld: Successfully aligned island {trans_island_idx}")
+                    trace.debug('WELD', "Successfully aligned island %s", trans_island_idx)
                 else:
-                    print(f"Weld: Failed to align island {trans_island_idx}")
+                    trace.debug('WELD', "Failed to align island %s", trans_island_idx)
             
             # Update the mesh after alignment
             bmesh.update_edit_mesh(obj.data)
-            print(f"Weld: Updated mesh for object {obj.name}")
-
+            trace.info('WELD', "Updated mesh for object %s", obj.name)
 
 
 class UVV_OT_Weld_VIEW3D(Operator):
@@ -510,7 +485,7 @@ class UVV_OT_Weld_VIEW3D(Operator):
                         context.area.type = original_area_type
                         
                 except Exception as e:
-                    print(f"UVV: Auto unwrap failed after weld: {e}")
+                    trace.warning('WELD', "Auto unwrap failed after weld: %s", e)
             
             return {'FINISHED'}
 
@@ -532,14 +507,14 @@ class UVV_OT_Weld_VIEW3D(Operator):
             if has_valid_edges:
                 break
         
-        print(f"Weld 3D Phase 3: has_valid_edges={has_valid_edges}, edge_count={edge_count}")
+        trace.info('WELD', "3D Phase 3: has_valid_edges=%s, edge_count=%s", has_valid_edges, edge_count)
         
         # Only call stitch if we have valid edges that could be stitched
         if has_valid_edges:
-            print("Weld 3D: Falling back to stitch (UNIV behavior)")
+            trace.info('WELD', "Falling back to stitch (UNIV behavior)")
             return bpy.ops.mesh.uvv_stitch('INVOKE_DEFAULT')
         else:
-            print("Weld 3D: No valid edges found - operation completed")
+            trace.info('WELD', "No valid edges found - operation completed")
             # No valid edges found - weld operation completed successfully
             return {'FINISHED'}
 
@@ -6,6 +6,8 @@ from json import loads, dumps
 from bpy.props import FloatProperty, IntProperty, BoolProperty, StringProperty, EnumProperty, FloatVectorProperty, IntVectorProperty, CollectionProperty
 from bpy.types import PropertyGroup, AddonPreferences
 
+from .utils import trace
+
 
 def update_trim_bounds(self, context):
     """Update callback when trim bounds change"""
@@ -77,6 +79,7 @@ class UVV_PackPreset(PropertyGroup):
 
     # Pack settings
     use_uvpm: BoolProperty(name='Use UVPackmaster', default=False)
+    use_builtin_packer: BoolProperty(name='Use Built-in Packer', default=False)
 
     shape_method: EnumProperty(
         name='Shape Method',
@@ -1183,6 +1186,12 @@ class UVV_Settings(PropertyGroup):
         default='ALL'
     )
 
+    def update_td_colors(self, context):
+        """Update TD colors - re-color the overlay without rebuilding its geometry"""
+        if self.draw_mode_UV == 'TEXEL_DENSITY' or self.draw_mode_3D == 'TEXEL_DENSITY':
+            from .checker.gizmo_draw import update_all_gizmo_colors
+            update_all_gizmo_colors(context)
+
     # Texel Density Gradient Bar Properties
     td_gradient_width: IntProperty(
         name='TD Gradient Width',
@@ -1206,7 +1215,8 @@ class UVV_Settings(PropertyGroup):
         default=0.6,
         min=0.01,
         max=1.0,
-        subtype='FACTOR'
+        subtype='FACTOR',
+        update=update_td_colors
     )
 
     # Texel Density Color Scheme Properties (Zen UV pattern)
@@ -1221,7 +1231,8 @@ class UVV_Settings(PropertyGroup):
             ('USER_LINEAR', "User Linear", "Linear interpolation between user under/over colors"),
             ('MONO', "Monochrome", "Grayscale from black to white"),
         ],
-        default='FULL_SPEC'
+        default='FULL_SPEC',
+        update=update_td_colors
     )
 
     # EXACT ZenUV property names (no td_ prefix for color processor compatibility)
@@ -1244,7 +1255,8 @@ class UVV_Settings(PropertyGroup):
         size=3,
         default=(0.0, 0.0, 1.0),  # Blue
         min=0.0,
-        max=1.0
+        max=1.0,
+        update=update_td_colors
     )
 
     td_color_equal: FloatVectorProperty(
@@ -1254,7 +1266,8 @@ class UVV_Settings(PropertyGroup):
         size=3,
         default=(0.0, 1.0, 0.0),  # Green
         min=0.0,
-        max=1.0
+        max=1.0,
+        update=update_td_colors
     )
 
     td_color_over: FloatVectorProperty(
@@ -1264,7 +1277,8 @@ class UVV_Settings(PropertyGroup):
         size=3,
         default=(1.0, 0.0, 0.0),  # Red
         min=0.0,
-        max=1.0
+        max=1.0,
+        update=update_td_colors
     )
 
     # TD Range properties - EXACT ZenUV property name
@@ -1388,6 +1402,13 @@ class UVV_Settings(PropertyGroup):
     # Pack Settings (matching UNIV exactly)
     use_uvpm: BoolProperty(name='Use UVPackmaster', default=False)
 
+    use_builtin_packer: BoolProperty(
+        name='Use Built-in Packer',
+        description='Pack island bounding boxes with the UVV packer instead of the Blender packer. '
+                    'Runs without dialogs or third-party add-ons and keeps stack groups stacked',
+        default=False
+    )
+
     def update_pack_enable_stacking(self, context):
         """Auto-enable stack groups when stacking is enabled"""
         if self.pack_enable_stacking:
@@ -1547,6 +1568,14 @@ class UVV_Settings(PropertyGroup):
         max=100.0
     )
 
+    uv_overlap: FloatProperty(
+        name="UV Overlap",
+        description="Percentage of UV space covered by more than one face",
+        default=0.0,
+        min=0.0,
+        max=100.0
+    )
+
     average_texel_density: FloatProperty(
         name="Average Texel Density",
         description="Average texel density across all UV islands",
@@ -1933,6 +1962,22 @@ class UVV_Constraint(PropertyGroup):
     )
 
 
+class UVV_StackGroupIslands(PropertyGroup):
+    """Islands of one object in a stack group, see stack_utils.pack_group_islands"""
+
+    object_name: StringProperty(
+        name="Object Name",
+        description="Object the islands belong to",
+        default=""
+    )
+
+    packed: StringProperty(
+        name="Packed Islands",
+        description="Base64 int32 array: island count, island sizes, sorted face indices",
+        default=""
+    )
+
+
 class UVV_StackGroup(PropertyGroup):
     """Represents a manual stack group for organizing UV islands"""
 
@@ -1959,9 +2004,16 @@ class UVV_StackGroup(PropertyGroup):
         max=1.0
     )
 
+    members: CollectionProperty(
+        name="Members",
+        description="Islands of this group, packed per object",
+        type=UVV_StackGroupIslands
+    )
+
+    # Storage of older versions, moved to members when the group is read
     islands_data: StringProperty(
         name="Islands Data",
-        description="JSON storage of island identifiers (object_name, face_indices)",
+        description="Legacy JSON storage of island identifiers (object_name, face_indices)",
         default="[]"
     )
 
@@ -1984,6 +2036,24 @@ def univ_settings():
     return get_uvv_settings()
 
 
+trace_subsystem_items = [(key, name, description) for key, name, description in trace.SUBSYSTEMS]
+
+
+def update_trace_settings(self, context):
+    """Push the tracing preferences into the tracer"""
+    trace.tracer.configure(enabled=self.trace_enabled, level=self.trace_level,
+                           subsystems=set(self.trace_subsystems), buffer_size=self.trace_buffer_size,
+                           echo=self.trace_echo)
+
+
+def apply_trace_preferences():
+    try:
+        prefs = bpy.context.preferences.addons[__package__].preferences
+    except (AttributeError, KeyError):
+        return
+    update_trace_settings(prefs, bpy.context)
+
+
 class UVV_AddonPreferences(AddonPreferences):
     """UVV addon preferences for keymap settings"""
     bl_idname = __package__
@@ -1995,6 +2065,51 @@ class UVV_AddonPreferences(AddonPreferences):
         default=True
     )
 
+    # Tracing (utils.trace)
+    trace_enabled: BoolProperty(
+        name="Enable Tracing",
+        description="Record timed spans and debug messages of UVV operators",
+        default=False,
+        update=update_trace_settings
+    )
+
+    trace_level: EnumProperty(
+        name="Level",
+        description="Lowest level of messages that are recorded",
+        items=[
+            ('DEBUG', "Debug", "Everything, including per element messages"),
+            ('INFO', "Info", "Operator summaries"),
+            ('WARNING', "Warning", "Warnings and errors only"),
+        ],
+        default='INFO',
+        update=update_trace_settings
+    )
+
+    trace_subsystems: EnumProperty(
+        name="Subsystems",
+        description="Subsystems that are traced",
+        items=trace_subsystem_items,
+        options={'ENUM_FLAG'},
+        default={item[0] for item in trace_subsystem_items},
+        update=update_trace_settings
+    )
+
+    trace_echo: BoolProperty(
+        name="Print to Console",
+        description="Print recorded messages to the system console",
+        default=True,
+        update=update_trace_settings
+    )
+
+    trace_buffer_size: IntProperty(
+        name="Buffer Size",
+        description="Number of most recent spans and messages that are kept",
+        default=10000,
+        min=100,
+        max=1000000,
+        update=update_trace_settings
+    )
+
     def draw(self, context):
         layout = self.layout
         layout.label(text="UVV Pie Menu Settings:")
@@ -2004,12 +2119,25 @@ class UVV_AddonPreferences(AddonPreferences):
             layout.label(text="Hotkey: ALT+SHIFT+X", icon='INFO')
             layout.label(text="Works in 3D View and UV Editor (Edit Mesh mode)")
 
+        box = layout.box()
+        box.prop(self, "trace_enabled")
+        col = box.column()
+        col.active = self.trace_enabled
+        col.prop(self, "trace_level")
+        col.prop(self, "trace_subsystems")
+        col.prop(self, "trace_echo")
+        col.prop(self, "trace_buffer_size")
+        row = col.row(align=True)
+        row.operator("uv.uvv_export_trace", icon='EXPORT')
+        row.operator("uv.uvv_clear_trace", icon='TRASH')
+
 
 classes = [
     UVV_PackPreset,
     UVV_TDPreset,
     UVV_TrimRect,
     UVV_Constraint,
+    UVV_StackGroupIslands,
     UVV_StackGroup,
     UVV_Settings,
     UVV_AddonPreferences,
@@ -2055,6 +2183,7 @@ def register():
         bpy.utils.register_class(cls)
 
     bpy.types.Scene.uvv_settings = bpy.props.PointerProperty(type=UVV_Settings)
+    apply_trace_preferences()
 
     # Register trimsheet collection on Material datablock (each material has its own trims)
     bpy.types.Material.uvv_trims = CollectionProperty(type=UVV_TrimRect)
@@ -1,18 +1,48 @@
 import bpy
 import bmesh
 import os
+import numpy as np
 from bpy.types import WorkSpaceTool
 
+from ..utils import island_engine
+from ..utils import trace
+
+
+# Events that never change the edge selection, the brush ignores them
+PASSIVE_EVENTS = {
+    'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE', 'TRACKPADPAN', 'TRACKPADZOOM', 'MOUSEROTATE',
+    'TIMER', 'TIMER_REPORT', 'TIMERREGION', 'NONE',
+    'LEFT_SHIFT', 'RIGHT_SHIFT', 'LEFT_ALT', 'RIGHT_ALT', 'LEFT_CTRL', 'RIGHT_CTRL', 'OSKEY',
+}
+
+
+def read_edge_selection(bm) -> np.ndarray:
+    """Edge selection of the BMesh as a bool array, copied through the island engine scratch mesh
+    instead of syncing the object mesh with update_from_editmode
+    """
+    try:
+        me = island_engine.scratch_mesh()
+        bm.to_mesh(me)
+    except (AttributeError, RuntimeError, ValueError):
+        return np.fromiter((edge.select for edge in bm.edges), dtype=bool, count=len(bm.edges))
+
+    try:
+        return island_engine.get_attribute(me.attributes, '.select_edge', len(me.edges), bool, 'value')
+    finally:
+        me.clear_geometry()
+
 
 class UVV_OT_SeamBrush(bpy.types.Operator):
-    """Seam brush - timer-based click detection for intelligent edge seaming"""
+    """Seam brush - selection-change driven edge seaming"""
     bl_idname = "uv.uvv_seam_brush"
     bl_label = "Seam Brush"
     bl_description = "Click edges to mark seams with intelligent click detection"
     bl_options = {'REGISTER', 'UNDO'}
 
     # Instance variables for tracking selection changes and mode
-    _previous_selection = None
+    _previous_selection: np.ndarray | None = None
+    _previous_count = 0
+    _previous_active = None
     _previous_mode = None
 
     @classmethod
@@ -26,35 +56,34 @@ class UVV_OT_SeamBrush(bpy.types.Operator):
     def invoke(self, context, event):
         """Start modal operation for selection monitoring"""
         # Initialize selection and mode tracking
-        self._previous_selection = set()
-        self._previous_mode = context.mode
+        self.reset_tracking(context)
 
         # Ensure we're in edge select mode
         if not context.tool_settings.mesh_select_mode[1]:
             bpy.ops.mesh.select_mode(type='EDGE')
-            print("UVV: Switched to edge select mode")
+            trace.debug('SEAM_BRUSH', "Switched to edge select mode")
 
         # Handle existing selection when entering tool
         obj = context.active_object
-        if obj and obj.type == 'MESH':
+        if obj and obj.type == 'MESH' and obj.data.total_edge_sel:
             bm = bmesh.from_edit_mesh(obj.data)
-            existing_selection = [e.index for e in bm.edges if e.select]
+            existing_selection = np.flatnonzero(read_edge_selection(bm))
 
-            if existing_selection:
-                print(f"UVV: Found existing selection: {sorted(existing_selection)}")
+            if len(existing_selection):
+                trace.debug('SEAM_BRUSH', "Found existing selection: %s", existing_selection)
                 # Mark existing selection as seams
-                for edge_idx in existing_selection:
-                    if edge_idx < len(bm.edges):
-                        bm.edges[edge_idx].seam = True
-                bmesh.update_edit_mesh(obj.data)
+                edges = self.get_edges(bm, existing_selection)
+                for edge in edges:
+                    edge.seam = True
                 # Clear the selection
-                bpy.ops.mesh.select_all(action='DESELECT')
-                print(f"UVV: Marked {len(existing_selection)} existing edges as seams and cleared selection")
+                self.deselect_edges(edges)
+                bmesh.update_edit_mesh(obj.data, loop_triangles=False, destructive=False)
+                trace.info('SEAM_BRUSH', "Marked %s existing edges as seams and cleared selection", len(existing_selection))
 
         # Start modal operation
         if context.space_data.type == 'VIEW_3D':
             context.window_manager.modal_handler_add(self)
-            print("UVV: Seam Brush active - selections will auto-convert to seams")
+            trace.info('SEAM_BRUSH', "Seam Brush active - selections will auto-convert to seams")
             return {'RUNNING_MODAL'}
         else:
             self.report({'WARNING'}, "Active space must be a 3D viewport")
@@ -63,15 +92,20 @@ class UVV_OT_SeamBrush(bpy.types.Operator):
     def modal(self, context, event):
         # Exit conditions
         if event.type in {'RIGHTMOUSE', 'ESC'}:
-            print("UVV: Seam Brush exited")
+            trace.info('SEAM_BRUSH', "Seam Brush exited")
             return {'CANCELLED'}
 
+        # Mouse moves, timers and modifier keys don't select anything,
+        # selection operators finish on release (click, box, lasso)
+        if event.type in PASSIVE_EVENTS or event.value == 'PRESS':
+            return {'PASS_THROUGH'}
+
         # Check if we're still in the right context and if our tool is still active
         if (context.mode != 'EDIT_MESH' or
             not context.active_object or
             context.active_object.type != 'MESH' or
             context.workspace.tools.from_space_view3d_mode(context.mode, create=False).idname != "uvv.seam_brush"):
-            print("UVV: Tool switched - exiting")
+            trace.info('SEAM_BRUSH', "Tool switched - exiting")
             return {'CANCELLED'}
 
         # Monitor selection changes and auto-convert to seams
@@ -79,9 +113,29 @@ class UVV_OT_SeamBrush(bpy.types.Operator):
 
         return {'PASS_THROUGH'}
 
+    def reset_tracking(self, context):
+        self._previous_selection = None
+        self._previous_count = 0
+        self._previous_active = None
+        self._previous_mode = context.mode
+
+    @staticmethod
+    def get_edges(bm, indices: np.ndarray) -> list:
+        """BMEdges for the given indices, only touches those edges"""
+        bm.edges.ensure_lookup_table()
+        edges = bm.edges
+        return [edges[i] for i in indices.tolist()]
+
+    @staticmethod
+    def deselect_edges(edges):
+        """Replaces select_all(action='DESELECT'), the rest of the mesh is already deselected"""
+        for edge in edges:
+            edge.select_set(False)
+            for face in edge.link_faces:
+                face.select = False
 
     def check_selection_changes(self, context, event):
-        """Monitor selection changes and auto-convert to seams"""
+        """Convert newly selected edges to seams, clicks only read the clicked and previously selected edges"""
         try:
             obj = context.active_object
             if not obj or obj.type != 'MESH':
@@ -90,83 +144,109 @@ class UVV_OT_SeamBrush(bpy.types.Operator):
             # Check if mode changed (e.g., tab out and back in)
             if context.mode != self._previous_mode:
                 # Reset selection tracking when mode changes
-                self._previous_selection = set()
-                self._previous_mode = context.mode
-
-            bm = bmesh.from_edit_mesh(obj.data)
-            selected_edges = [e for e in bm.edges if e.select]
-            current_selection = set(e.index for e in selected_edges)
-
-            # Check if selection changed
-            if current_selection != self._previous_selection:
-                added = current_selection - self._previous_selection
-                print(f"UVV: Selection changed! Current: {current_selection}, Added: {added}")
+                self.reset_tracking(context)
+
+            me = obj.data
+            bm = bmesh.from_edit_mesh(me)
+            # Cheap change test, the selected edge count is kept by the edit mesh
+            count = me.total_edge_sel
+            active = bm.select_history.active
+            shift = event.shift
+            alt = event.alt
+            if count == self._previous_count and active == self._previous_active:
+                # Fallback: the same edges are still selected (timing issue), SHIFT toggles them
+                if not (count and shift and not alt):
+                    return
+
+            previous = self._previous_selection
+            if previous is None or len(previous) != len(bm.edges):
+                previous = np.zeros(len(bm.edges), dtype=bool)
+
+            if count == 0:
+                current_selection = np.zeros(len(previous), dtype=bool)
+                added = np.empty(0, dtype='int64')
+            elif (clicked := self.read_clicked_selection(bm, previous, count, active)) is not None:
+                current_selection, added = clicked
+            else:
+                # Box, lasso or edge loop select, read the whole selection
+                current_selection = read_edge_selection(bm)
+                added = np.flatnonzero(current_selection & ~previous)
+            # Nothing added and the same count means the same edges are selected
+            selection_changed = len(added) or count != self._previous_count
+
+            if selection_changed:
+                trace.debug('SEAM_BRUSH', "Selection changed! Selected: %s, Added: %s", count, len(added))
 
                 # Only process if we have new selections
-                if added:
-                    print(f"UVV: Processing {len(added)} new edges")
+                if len(added):
+                    trace.debug('SEAM_BRUSH', "Processing %s new edges", len(added))
+                    selected_edges = self.get_edges(bm, np.flatnonzero(current_selection))
 
                     # Check for SHIFT+ALT (clear edge loop seams)
-                    if hasattr(event, 'shift') and event.shift and hasattr(event, 'alt') and event.alt:
-                        print("UVV: SHIFT+ALT detected - clearing seams")
+                    if shift and alt:
+                        trace.debug('SEAM_BRUSH', "SHIFT+ALT detected - clearing seams")
                         for edge in selected_edges:
                             edge.seam = False
-                        bmesh.update_edit_mesh(obj.data)
-                        bpy.ops.mesh.select_all(action='DESELECT')
-                        current_selection = set()
+                        current_selection = self.finish_stroke(me, bm, selected_edges)
 
                     # Check for ALT only (mark edge loop seams)
-                    elif hasattr(event, 'alt') and event.alt:
-                        print("UVV: ALT detected - marking seams")
+                    elif alt:
+                        trace.debug('SEAM_BRUSH', "ALT detected - marking seams")
                         for edge in selected_edges:
                             edge.seam = True
-                        bmesh.update_edit_mesh(obj.data)
-                        bpy.ops.mesh.select_all(action='DESELECT')
-                        current_selection = set()
+                        current_selection = self.finish_stroke(me, bm, selected_edges)
 
                     # Check for SHIFT only (toggle individual edges)
-                    elif hasattr(event, 'shift') and event.shift:
-                        print("UVV: SHIFT detected - toggling seams")
+                    elif shift:
+                        trace.debug('SEAM_BRUSH', "SHIFT detected - toggling seams")
                         # Process each newly added edge
-                        for edge_idx in added:
-                            if edge_idx < len(bm.edges):
-                                edge = bm.edges[edge_idx]
-                                if edge.seam:
-                                    edge.seam = False
-                                else:
-                                    edge.seam = True
-
-                        bmesh.update_edit_mesh(obj.data)
-                        bpy.ops.mesh.select_all(action='DESELECT')
-                        current_selection = set()
+                        for edge in self.get_edges(bm, added):
+                            edge.seam = not edge.seam
+                        current_selection = self.finish_stroke(me, bm, selected_edges)
                     else:
-                        print(f"UVV: No modifiers detected - SHIFT: {hasattr(event, 'shift') and event.shift}, ALT: {hasattr(event, 'alt') and event.alt}")
+                        trace.debug('SEAM_BRUSH', "No modifiers detected - SHIFT: %s, ALT: %s", shift, alt)
                 else:
-                    print("UVV: Selection changed but no new edges added")
+                    trace.debug('SEAM_BRUSH', "Selection changed but no new edges added")
 
             # Fallback: If we have a selection but no change was detected (timing issue)
-            elif len(current_selection) > 0 and hasattr(event, 'shift') and event.shift and not (hasattr(event, 'alt') and event.alt):
-                print("UVV: Fallback triggered - processing existing selection")
+            elif count and shift and not alt:
+                trace.debug('SEAM_BRUSH', "Fallback triggered - processing existing selection")
                 # Process all currently selected edges
+                selected_edges = self.get_edges(bm, np.flatnonzero(current_selection))
                 for edge in selected_edges:
-                    if edge.seam:
-                        edge.seam = False
-                    else:
-                        edge.seam = True
-
-                bmesh.update_edit_mesh(obj.data)
-                bpy.ops.mesh.select_all(action='DESELECT')
-                current_selection = set()
+                    edge.seam = not edge.seam
+                current_selection = self.finish_stroke(me, bm, selected_edges)
 
             # Update previous selection
             self._previous_selection = current_selection
+            self._previous_count = me.total_edge_sel
+            self._previous_active = bm.select_history.active
 
         except Exception as e:
-            print(f"UVV: Error: {e}")
-
-
-
-
+            trace.warning('SEAM_BRUSH', "Error: %s", e)
+
+    def read_clicked_selection(self, bm, previous: np.ndarray, count: int, active):
+        """Selection after a click, only reads the previously selected edges and the clicked (active) edge.
+        Returns None when other edges changed, e.g. the selected count grew by more than one.
+        """
+        if count > self._previous_count + 1:
+            return None
+        candidates = np.flatnonzero(previous)
+        if isinstance(active, bmesh.types.BMEdge) and not previous[active.index]:
+            candidates = np.append(candidates, active.index)
+        selected = np.fromiter((edge.select for edge in self.get_edges(bm, candidates)),
+                               dtype=bool, count=len(candidates))
+        if np.count_nonzero(selected) != count:
+            return None
+        selection = np.zeros(len(previous), dtype=bool)
+        selection[candidates[selected]] = True
+        return selection, candidates[selected & ~previous[candidates]]
+
+    def finish_stroke(self, me, bm, selected_edges) -> np.ndarray:
+        """Deselect the stroke edges and push the seam changes, returns the cleared selection"""
+        self.deselect_edges(selected_edges)
+        bmesh.update_edit_mesh(me, loop_triangles=False, destructive=False)
+        return np.zeros(len(bm.edges), dtype=bool)
 
 
 class UVV_WT_SeamBrush(WorkSpaceTool):
@@ -963,42 +963,11 @@ class AdvIslands:
     @staticmethod
     def calc_with_markseam_iter_ex(umesh):
         """
-        Calculate islands with seam marking using iteration.
-        Based on UniV's IslandsBase.calc_with_markseam_iter_ex() (island.py:1412-1442).
-
-        This is the EXACT UniV algorithm that respects face tags.
-        """
-        uv = umesh.uv
-        island = []
-
-        for face in umesh.bm.faces:
-            if not face.tag:
-                continue
-            face.tag = False
-
-            parts_of_island = [face]
-            temp = []
-
-            while parts_of_island:
-                for f in parts_of_island:
-                    for l in f.loops:
-                        shared_crn = l.link_loop_radial_prev
-                        ff = shared_crn.face
-                        if not ff.tag:
-                            continue
-                        if l.edge.seam:  # Skip if seam
-                            continue
-                        # Check if UVs match (island connectivity)
-                        if l[uv].uv == shared_crn.link_loop_next[uv].uv and l.link_loop_next[uv].uv == shared_crn[uv].uv:
-                            temp.append(ff)
-                            ff.tag = False
-
-                island.extend(parts_of_island)
-                parts_of_island = temp
-                temp = []
-
-            yield island
-            island = []
+        Calculate islands with seam marking from tagged faces.
+        Delegates to IslandsBase.calc_with_markseam_iter_ex() (vectorized island engine).
+        """
+        from .island import IslandsBase
+        return IslandsBase.calc_with_markseam_iter_ex(umesh)
 
     @staticmethod
     def tag_filter_visible(umesh):
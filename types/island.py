@@ -24,6 +24,8 @@ from bmesh.types import BMFace, BMLoop
 
 from .. import utils
 from ..utils import umath
+from ..utils import island_engine
+from ..utils import uv_overlap
 from . import umesh as _umesh
 from . import BBox
 
@@ -1071,10 +1073,20 @@ class AdvIsland(FaceIsland):
                 for t in self.tris:
                     extend([t_crn.vert.co for t_crn in t])
 
+    def calc_flat_tris_array(self) -> np.ndarray:
+        """Flat coordinates as a (T, 3, 2) array for uv_overlap"""
+        assert self.flat_coords, 'Calculate flat coordinates'
+        if isinstance(self.flat_coords[0], tuple):
+            coords = [co for tri in self.flat_coords for co in tri]
+        else:
+            coords = self.flat_coords
+        return np.array(coords, dtype='float64').reshape(-1, 3, 2)
+
     def is_overlap(self, other: 'AdvIsland'):
         assert (self.flat_coords and other.flat_coords), 'Calculate flat coordinates'
         if not self.bbox.is_isect(other.bbox):
             return False
+        # Direct test for a single pair, many pairs go through uv_overlap.calc_island_groups
         if isinstance(self.flat_coords[0], tuple):
             for a0, a1, a2 in self.flat_coords:
                 for b0, b1, b2 in other.flat_coords:
@@ -1348,166 +1360,76 @@ class IslandsBaseTagFilterPost:
 class IslandsBase(IslandsBaseTagFilterPre, IslandsBaseTagFilterPost):
     @staticmethod
     def calc_iter_ex(umesh: _umesh.UMesh):
-        uv = umesh.uv
-        island: list[BMFace] = []
-
-        for face in umesh.bm.faces:
-            if not face.tag:  # Skip unselected and appended faces
-                continue
-            face.tag = False  # Tag first element in island (don`t add again)
-
-            parts_of_island = [face]  # Container collector of island elements
-            temp = []  # Container for get elements from loop from parts_of_island
-
-            while parts_of_island:  # Blank list == all faces of the island taken
-                for f in parts_of_island:
-                    for l in f.loops:  # Running through all the neighboring faces
-                        shared_crn = l.link_loop_radial_prev
-                        ff = shared_crn.face
-                        if not ff.tag:
-                            continue
-                        if l[uv].uv == shared_crn.link_loop_next[uv].uv and l.link_loop_next[uv].uv == shared_crn[uv].uv:
-                            temp.append(ff)
-                            ff.tag = False
-
-                island.extend(parts_of_island)
-                parts_of_island = temp
-                temp = []
-
-            yield island
-            island = []
+        return IslandsBase.calc_iter_by_mode(umesh, island_engine.MODE_UV)
 
     @staticmethod
     def calc_iter_non_manifold_ex(umesh: _umesh.UMesh):
-        uv = umesh.uv
-        island: list[BMFace] = []
-
-        for face in umesh.bm.faces:
-            if not face.tag:  # Skip unselected and appended faces
-                continue
-            face.tag = False  # Tag first element in island (don`t add again)
-
-            parts_of_island = [face]  # Container collector of island elements
-            temp = []  # Container for get elements from loop from parts_of_island
-
-            while parts_of_island:  # Blank list == all faces of the island taken
-                for f in parts_of_island:
-                    for l in f.loops:  # Running through all the neighboring faces
-                        shared_crn = l.link_loop_radial_prev
-                        ff = shared_crn.face
-                        if not ff.tag:
-                            continue
-                        if l[uv].uv == shared_crn.link_loop_next[uv].uv or l.link_loop_next[uv].uv == shared_crn[uv].uv:
-                            temp.append(ff)
-                            ff.tag = False
-
-                island.extend(parts_of_island)
-                parts_of_island = temp
-                temp = []
-
-            yield island
-            island = []
+        return IslandsBase.calc_iter_by_mode(umesh, island_engine.MODE_NON_MANIFOLD)
 
     @staticmethod
     def calc_with_markseam_iter_ex(umesh: _umesh.UMesh):
-        uv = umesh.uv
-        island: list[BMFace] = []
-
-        for face in umesh.bm.faces:
-            if not face.tag:
-                continue
-            face.tag = False
-
-            parts_of_island = [face]
-            temp = []
-
-            while parts_of_island:
-                for f in parts_of_island:
-                    for l in f.loops:
-                        shared_crn = l.link_loop_radial_prev
-                        ff = shared_crn.face
-                        if not ff.tag:
-                            continue
-                        if l.edge.seam:  # Skip if seam
-                            continue
-                        if l[uv].uv == shared_crn.link_loop_next[uv].uv and l.link_loop_next[uv].uv == shared_crn[uv].uv:
-                            temp.append(ff)
-                            ff.tag = False
-
-                island.extend(parts_of_island)
-                parts_of_island = temp
-                temp = []
-
-            yield island
-            island = []
+        return IslandsBase.calc_iter_by_mode(umesh, island_engine.MODE_SEAM)
 
     @staticmethod
     def calc_with_markseam_material_iter_ex(umesh: _umesh.UMesh):
-        uv = umesh.uv
-        island: list[BMFace] = []
-
-        for face in umesh.bm.faces:
-            if not face.tag:
-                continue
-            face.tag = False
-
-            parts_of_island = [face]
-            temp = []
-
-            while parts_of_island:
-                for f in parts_of_island:
-                    for l in f.loops:
-                        shared_crn = l.link_loop_radial_prev
-                        ff = shared_crn.face
-                        if not ff.tag:
-                            continue
-                        if l.edge.seam:  # Skip if seam
-                            continue
-                        if ff.material_index != f.material_index:  # Skip if other material
-                            continue
-                        if l[uv].uv == shared_crn.link_loop_next[uv].uv and l.link_loop_next[uv].uv == shared_crn[uv].uv:
-                            temp.append(ff)
-                            ff.tag = False
+        return IslandsBase.calc_iter_by_mode(umesh, island_engine.MODE_SEAM_MATERIAL)
 
-                island.extend(parts_of_island)
-                parts_of_island = temp
-                temp = []
+    @staticmethod
+    def calc_all_ex(umesh: _umesh.UMesh):
+        """All == mark seam, angle (umesh.value), mark sharp, material"""
+        return IslandsBase.calc_iter_by_mode(umesh, island_engine.MODE_ALL)
 
-            yield island
-            island = []
+    @staticmethod
+    def calc_iter_by_mode(umesh: _umesh.UMesh, mode: str) -> 'typing.Iterable[list[BMFace]]':
+        """Islands from tagged faces, tags are reset. Uses the NumPy engine when the mesh is large enough."""
+        if (islands := island_engine.calc_islands(umesh, mode)) is not None:
+            return islands
+        return IslandsBase.calc_iter_flood_fill(umesh, mode)
 
     @staticmethod
-    def calc_all_ex(umesh: _umesh.UMesh):
+    def calc_iter_flood_fill(umesh: _umesh.UMesh, mode: str):
+        """Fallback for FakeBMesh, small meshes and contexts where the scratch mesh can't be written"""
         uv = umesh.uv
-        angle = umesh.value
+        non_manifold = mode == island_engine.MODE_NON_MANIFOLD
+        check_seam = mode in (island_engine.MODE_SEAM, island_engine.MODE_SEAM_MATERIAL, island_engine.MODE_ALL)
+        check_material = mode in (island_engine.MODE_SEAM_MATERIAL, island_engine.MODE_ALL)
+        check_sharp_angle = mode == island_engine.MODE_ALL
+        angle = umesh.value if check_sharp_angle else math.pi
         island: list[BMFace] = []
 
         for face in umesh.bm.faces:
-            if not face.tag:
+            if not face.tag:  # Skip unselected and appended faces
                 continue
-            face.tag = False
+            face.tag = False  # Tag first element in island (don`t add again)
 
-            parts_of_island = [face]
-            temp = []
+            parts_of_island = [face]  # Container collector of island elements
+            temp = []  # Container for get elements from loop from parts_of_island
 
-            while parts_of_island:
+            while parts_of_island:  # Blank list == all faces of the island taken
                 for f in parts_of_island:
-                    for l in f.loops:
+                    for l in f.loops:  # Running through all the neighboring faces
                         shared_crn = l.link_loop_radial_prev
                         ff = shared_crn.face
                         if not ff.tag:
                             continue
-                        if not l.edge.smooth:  # Skip by sharp
+                        if check_seam and l.edge.seam:  # Skip if seam
                             continue
-                        if l.edge.calc_face_angle() >= angle:  # Skip by angle
+                        if check_material and ff.material_index != f.material_index:  # Skip if other material
                             continue
-                        if l.edge.seam:  # Skip if seam
-                            continue
-                        if ff.material_index != f.material_index:  # Skip if other material
+                        if check_sharp_angle:
+                            if not l.edge.smooth:  # Skip by sharp
+                                continue
+                            if l.edge.calc_face_angle(math.pi) >= angle:  # Skip by angle
+                                continue
+                        if non_manifold:
+                            if not (l[uv].uv == shared_crn.link_loop_next[uv].uv or
+                                    l.link_loop_next[uv].uv == shared_crn[uv].uv):
+                                continue
+                        elif not (l[uv].uv == shared_crn.link_loop_next[uv].uv and
+                                  l.link_loop_next[uv].uv == shared_crn[uv].uv):
                             continue
-                        if l[uv].uv == shared_crn.link_loop_next[uv].uv and l.link_loop_next[uv].uv == shared_crn[uv].uv:
-                            temp.append(ff)
-                            ff.tag = False
+                        temp.append(ff)
+                        ff.tag = False
 
                 island.extend(parts_of_island)
                 parts_of_island = temp
@@ -2119,19 +2041,59 @@ class UnionIslands(Islands):
                 threshold_to_precision = max(0, int(-math.log10(threshold)))
 
             class ExactOverlap:
+                """Unique corner UVs of an island, matched through a grid of threshold sized cells"""
+                cell_row = 1 << 32
+
                 def __init__(self, island):
                     self.island = island
-                    self.coords: np.array = np.array
+                    self.coords: np.ndarray = np.empty((0, 2), dtype='float32')
+                    self.duplicates: list[ExactOverlap] = [self]
+                    self.cells: np.ndarray | None = None
+                    self.cell_order: np.ndarray | None = None
+                    self.cell_keys: np.ndarray | None = None
 
                 def calc_coords(self):
                     uv = self.island.umesh.uv
-                    self.coords = np.array([crn[uv].uv for f in self.island for crn in f.loops], dtype='float32')
+                    coords = np.array([crn[uv].uv for f in self.island for crn in f.loops], dtype='float32')
+                    # Sorted unique corners, islands with identical corners have identical bytes
+                    self.coords = np.unique(coords, axis=0)
+
+                @property
+                def signature(self) -> bytes:
+                    return self.coords.tobytes()
+
+                def calc_cells(self, threshold_):
+                    self.cells = np.floor(self.coords / np.float64(threshold_)).astype('int64')
+                    keys = self.cells[:, 0] * self.cell_row + self.cells[:, 1]
+                    self.cell_order = np.argsort(keys, kind='stable')
+                    self.cell_keys = keys[self.cell_order]
+
+                def covers(self, other, threshold_) -> bool:
+                    """Every corner of other has a corner of self closer than threshold_,
+                    such corners are at most one cell apart.
+                    """
+                    found = np.zeros(len(other.coords), dtype=bool)
+                    for dx in (-1, 0, 1):
+                        for dy in (-1, 0, 1):
+                            query = (other.cells[:, 0] + dx) * self.cell_row + other.cells[:, 1] + dy
+                            lo = np.searchsorted(self.cell_keys, query, 'left')
+                            counts = np.searchsorted(self.cell_keys, query, 'right') - lo
+                            if not counts.any():
+                                continue
+                            queried = np.repeat(np.arange(len(query)), counts)
+                            candidates = np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+                            candidates = self.cell_order[candidates]
+                            distances = np.linalg.norm(other.coords[queried] - self.coords[candidates], axis=1)
+                            found[queried[distances < threshold_]] = True
+                    return bool(found.all())
 
                 def compare(self, other, threshold_):
-                    distances = np.linalg.norm(self.coords[:, None] - other.coords, axis=2)
-                    a_matches = np.any(distances < threshold_, axis=1)
-                    b_matches = np.any(distances < threshold_, axis=0)
-                    return np.all(a_matches) and np.all(b_matches)
+                    if threshold_ <= 0:
+                        return False
+                    for exact in (self, other):
+                        if exact.cells is None:
+                            exact.calc_cells(threshold_)
+                    return self.covers(other, threshold_) and other.covers(self, threshold_)
 
             # reduce islands by len
             islands_by_len: defaultdict[int, list[AdvIsland]] = defaultdict(list)
@@ -2199,11 +2161,17 @@ class UnionIslands(Islands):
                     single_islands.append(single_island)
 
             for finished_reduced_islands in islands_by_ngons_.values():
-                exact_islands = []
+                # Islands with identical corners overlap the same islands: they are found by
+                # dictionary lookup and compared once, through the first of them
+                exact_by_signature: dict[bytes | int, ExactOverlap] = {}
                 for fin_isl in finished_reduced_islands:
                     exact_isl = ExactOverlap(fin_isl)
                     exact_isl.calc_coords()
-                    exact_islands.append(exact_isl)
+                    if threshold > 0 and (same := exact_by_signature.get(exact_isl.signature)) is not None:
+                        same.duplicates.append(exact_isl)
+                    else:
+                        exact_by_signature[exact_isl.signature if threshold > 0 else id(exact_isl)] = exact_isl
+                exact_islands = list(exact_by_signature.values())
 
                 for island_first in exact_islands:
                     if not island_first.island.tag:
@@ -2214,10 +2182,13 @@ class UnionIslands(Islands):
                     compare_index = 0
                     while True:
                         if compare_index > len(union_islands) - 1:
-                            if len(union_islands) == 1:
-                                single_islands.append(union_islands[0].island)
+                            grouped = [dup.island for exact_ in union_islands for dup in exact_.duplicates]
+                            for isl in grouped:
+                                isl.tag = False
+                            if len(grouped) == 1:
+                                single_islands.append(grouped[0])
                             else:
-                                islands_group.append(UnionIslands([exact_.island for exact_ in union_islands]))
+                                islands_group.append(UnionIslands(grouped))
                             union_islands = []
                             break
 
@@ -2230,26 +2201,14 @@ class UnionIslands(Islands):
                         compare_index += 1
 
         else:
-            for island_first in adv_islands:
-                if not island_first.tag:
-                    continue
-                island_first.tag = False
-
-                union_islands.append(island_first)
-                compare_index = 0
-                while True:
-                    if compare_index > len(union_islands) - 1:
-                        islands_group.append(UnionIslands(union_islands))
-                        union_islands = []
-                        break
-
-                    for isl in adv_islands:
-                        if not isl.tag:
-                            continue
-                        if union_islands[compare_index].is_overlap(isl):
-                            isl.tag = False
-                            union_islands.append(isl)
-                    compare_index += 1
+            # Grid accelerated pass over all triangles, touching islands are grouped like is_overlap
+            tagged = [isl for isl in adv_islands if isl.tag]
+            labels = uv_overlap.calc_island_groups([isl.calc_flat_tris_array() for isl in tagged])
+            groups: dict[int, list[AdvIsland]] = {}
+            for isl, label in zip(tagged, labels.tolist()):
+                isl.tag = False
+                groups.setdefault(label, []).append(isl)
+            islands_group.extend(UnionIslands(group) for group in groups.values())
         islands_group.extend(single_islands)
         return islands_group
 
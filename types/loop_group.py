@@ -38,6 +38,8 @@ class LoopGroup:
         """
         self.umesh = umesh
         self.corners: List[BMLoop] = []
+        self.loops: Optional[np.ndarray] = None  # Mesh loop indices of the corners in the boundary pair index
+        self.pairs = None  # BoundaryPairs the loops come from
         self.tag = True
         self.value: Any = None
         self.dirt = False
@@ -164,6 +166,8 @@ class LoopGroup:
 
     def calc_shared_group_for_stitch(self) -> 'LoopGroup':
         """Find the shared edge group on the neighbor island for stitching."""
+        if self.loops is not None:
+            return self.calc_shared_group_for_stitch_by_index()
         shared_group = []
         is_flipped = self._is_flipped_3d
         if is_flipped:
@@ -178,6 +182,20 @@ class LoopGroup:
         lg.corners = shared_group
         return lg
 
+    def calc_shared_group_for_stitch_by_index(self) -> 'LoopGroup':
+        """Same as calc_shared_group_for_stitch, the opposite corners come from the boundary pair index."""
+        pairs = self.pairs
+        opposite = pairs.opposite[self.loops]
+        is_flipped = bool(pairs.flipped_3d[self.loops[0]])
+        shared_loops = opposite if is_flipped else pairs.arrays.loop_next[opposite]
+        lg = LoopGroup(self.umesh)
+        lg.is_shared = True
+        lg.is_flipped_3d = is_flipped
+        lg.corners = pairs.to_corners(shared_loops)
+        lg.loops = shared_loops
+        lg.pairs = pairs
+        return lg
+
     def calc_begin_end_pt(self):
         """Calculate begin and end points for loop groups."""
         uv = self.umesh.uv
@@ -390,6 +408,9 @@ class LoopGroup:
 
     def calc_length_3d(self):
         """Calculate 3D length."""
+        if self.loops is not None:
+            self._length_3d = float(self.pairs.length_3d[self.loops].sum())
+            return self._length_3d
         length = 0.0
         for crn in self:
             length += crn.edge.calc_length()
@@ -612,8 +633,20 @@ class LoopGroups:
         return cls(loop_groups, isl.umesh)
 
     @classmethod
-    def calc_by_boundary_crn_tags_v2(cls, isl):
-        """Calculate loop groups from boundary corner tags (version 2)."""
+    def calc_by_boundary_crn_tags_v2(cls, isl, pairs=None, loops: Optional[np.ndarray] = None):
+        """Calculate loop groups from boundary corner tags (version 2).
+        With a boundary pair index the corners are its loops instead of the tagged corners.
+        """
+        if pairs is not None:
+            loop_groups = []
+            for chain in pairs.calc_chains(loops):
+                lg = LoopGroup(isl.umesh)
+                lg.corners = pairs.to_corners(chain)
+                lg.loops = chain
+                lg.pairs = pairs
+                loop_groups.append(lg)
+            return cls(loop_groups, isl.umesh)
+
         uv = isl.umesh.uv
         loop_groups = []
         for crn in isl.iter_corners_by_tag():
@@ -40,6 +40,8 @@ class UMesh:
     def update(self, force=False):
         if not self.update_tag:
             return False
+        utils.island_cache.invalidate(self.obj.data)
+        utils.bvh_cache.invalidate(self.obj.data)
         if self.is_edit_bm:
             bmesh.update_edit_mesh(self.obj.data, loop_triangles=force, destructive=force)
         else:
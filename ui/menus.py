@@ -923,6 +923,8 @@ class UVV_PT_pack(UVVPanel):
         row = col.row(align=True)
         coverage_value = round(settings.uv_coverage, 2)
         row.label(text=f"Fill: {coverage_value}%")
+        if settings.uv_overlap > 0.0:
+            row.label(text=f"Overlap: {round(settings.uv_overlap, 2)}%")
         
         # Average Texel Density display in same row
         from ..utils.units_converter import get_td_round_value, get_current_units_string
@@ -41,6 +41,10 @@ from . import transform
 from . import projection
 from . import generic_helpers
 from . import island_utils
+from . import island_cache
+from . import bvh_cache
+from . import trace
+from . import island_engine
 from . import base_clusters
 from . import quadrify_utils
 from .quadrify_utils import (
@@ -0,0 +1,200 @@
+"""
+Boundary pair index
+
+Maps every corner of a manifold edge to the corner on the other side, together
+with the island of each face, the edge selection and the 3D edge lengths, built
+once per mesh from a MeshArrays snapshot. Weld and stitch query it for the
+corners that border another island instead of walking link_loop_radial_prev
+over every face.
+
+Islands are the face lists the operator passes in, faces outside of them get
+island -1. The index only covers topology and selection, UVs are read from the
+BMesh for the corners a query returns, stitch moves islands between queries.
+Edges with more than two faces are treated as borders.
+"""
+
+import bmesh
+import numpy as np
+
+from . import trace
+from .island_engine import MeshArrays, get_attribute, scratch_mesh
+
+
+def get_corner_uv_edge_select(attributes, uv_name: str, count: int) -> np.ndarray:
+    """UV edge selection per corner (Blender 5.0+ stores it once, older versions per UV map)"""
+    name = '.uv_select_edge' if '.uv_select_edge' in attributes else f'.es.{uv_name}'
+    return get_attribute(attributes, name, count, bool, 'value')
+
+
+class BoundaryPairs:
+    def __init__(self, bm: bmesh.types.BMesh, uv: bmesh.types.BMLayerItem, arrays: MeshArrays,
+                 island_faces: np.ndarray, island_sizes: np.ndarray, edge_select: np.ndarray):
+        self.bm = bm
+        self.uv = uv
+        self.arrays = arrays
+        self.uv_co = arrays.uv_co  # UVs at build time
+        self.edge_select = edge_select  # Per corner
+
+        island_count = len(island_sizes)
+        self.face_islands = np.full(arrays.face_count, -1, dtype='int32')
+        self.face_islands[island_faces] = np.repeat(np.arange(island_count, dtype='int32'), island_sizes)
+
+        # Corners in island face order, island_loops[island_starts[i]:island_starts[i + 1]]
+        sizes = arrays.loop_total[island_faces]
+        offsets = np.cumsum(sizes) - sizes
+        self.island_loops = (np.repeat(arrays.loop_start[island_faces] - offsets, sizes)
+                             + np.arange(sizes.sum(), dtype='int32'))
+        loop_sizes = np.bincount(self.face_islands[island_faces], weights=sizes, minlength=island_count)
+        self.island_starts = np.concatenate(((0,), np.cumsum(loop_sizes))).astype('int64')
+
+        crn_a, crn_b = arrays.radial_pairs
+        edge_users = np.bincount(arrays.loop_edge, minlength=len(arrays.edge_seam))
+        manifold = edge_users[arrays.loop_edge[crn_a]] == 2
+        crn_a = crn_a[manifold]
+        crn_b = crn_b[manifold]
+        self.opposite = np.full(len(arrays.loop_face), -1, dtype='int32')
+        self.opposite[crn_a] = crn_b
+        self.opposite[crn_b] = crn_a
+
+        has_pair = self.opposite != -1
+        self.opposite_islands = np.full(len(arrays.loop_face), -1, dtype='int32')
+        self.opposite_islands[has_pair] = self.face_islands[arrays.loop_face[self.opposite[has_pair]]]
+        # Both corners start at the same vertex, one of the faces has flipped normals
+        self.flipped_3d = np.zeros(len(arrays.loop_face), dtype=bool)
+        self.flipped_3d[has_pair] = arrays.loop_vert[has_pair] == arrays.loop_vert[self.opposite[has_pair]]
+        self._length_3d: np.ndarray | None = None
+
+    @classmethod
+    @trace.traced('WELD')
+    def from_islands(cls, bm: bmesh.types.BMesh, uv: bmesh.types.BMLayerItem, islands,
+                     sync: bool) -> 'BoundaryPairs | None':
+        """Call before face.index is used for island indexing.
+        Return None when the scratch mesh can't be written (e.g. restricted draw context)
+        """
+        try:
+            me = scratch_mesh()
+            bm.to_mesh(me)
+        except (AttributeError, RuntimeError, ValueError):
+            return None
+
+        try:
+            if (arrays := MeshArrays.from_mesh(me, uv.name)) is None:
+                return None
+            loop_count = len(me.loops)
+            if sync:
+                edge_select = get_attribute(me.attributes, '.select_edge', len(me.edges), bool, 'value')
+                edge_select = edge_select[arrays.loop_edge]
+            else:
+                edge_select = get_corner_uv_edge_select(me.attributes, uv.name, loop_count)
+        finally:
+            me.clear_geometry()
+
+        bm.faces.index_update()
+        island_sizes = np.fromiter((len(isl) for isl in islands), dtype='int64', count=len(islands))
+        island_faces = np.fromiter((f.index for isl in islands for f in isl), dtype='int32',
+                                   count=int(island_sizes.sum()))
+        self = cls(bm, uv, arrays, island_faces, island_sizes, edge_select)
+        trace.debug('WELD', "Boundary pairs for %s islands, %s corners", len(island_sizes), len(self.island_loops))
+        return self
+
+    @property
+    def length_3d(self) -> np.ndarray:
+        """3D length of the edge of every corner"""
+        if self._length_3d is None:
+            arrays = self.arrays
+            vert_co = arrays.vert_co.astype('float64')
+            vec = vert_co[arrays.loop_vert[arrays.loop_next]] - vert_co[arrays.loop_vert]
+            self._length_3d = np.linalg.norm(vec, axis=1)
+        return self._length_3d
+
+    def calc_island_loops(self, island: int) -> np.ndarray:
+        return self.island_loops[self.island_starts[island]:self.island_starts[island + 1]]
+
+    def to_corners(self, loops: np.ndarray) -> list[bmesh.types.BMLoop]:
+        faces = self.bm.faces
+        faces.ensure_lookup_table()
+        loop_face = self.arrays.loop_face[loops]
+        positions = loops - self.arrays.loop_start[loop_face]
+        return [faces[f].loops[pos] for f, pos in zip(loop_face.tolist(), positions.tolist())]
+
+    def calc_stitch_loops(self, island: int, exclude_islands, selected: bool) -> np.ndarray:
+        """Corners of the island whose edge leads to an island that isn't excluded,
+        the same as set_selected_boundary_tag_with_exclude_face_idx without the UV split test.
+        """
+        loops = self.calc_island_loops(island)
+        other = self.opposite_islands[loops]
+        mask = (other != -1) & ~np.isin(other, np.fromiter(exclude_islands, dtype='int32'))
+        if selected:
+            mask &= self.edge_select[loops]
+        return loops[mask]
+
+    def filter_boundary(self, loops: np.ndarray) -> np.ndarray:
+        """Corners with a seam or a UV split to the opposite corner"""
+        if not len(loops):
+            return loops
+        uv = self.uv
+        mask = np.empty(len(loops), dtype=bool)
+        for i, (crn, pair) in enumerate(zip(self.to_corners(loops), self.to_corners(self.opposite[loops]))):
+            mask[i] = crn.edge.seam or not (crn[uv].uv == pair.link_loop_next[uv].uv and
+                                            crn.link_loop_next[uv].uv == pair[uv].uv)
+        return loops[mask]
+
+    def calc_chains(self, loops: np.ndarray) -> list[np.ndarray]:
+        """Chain corners into edge loops like LoopGroups.calc_by_boundary_crn_tags_v2:
+        through the next (previous) corner of the face or a corner at the same vertex and UV.
+        """
+        if not len(loops):
+            return []
+        uv = self.uv
+        arrays = self.arrays
+        nxt = arrays.loop_next
+        corners = self.to_corners(loops)
+        verts = arrays.loop_vert[loops].tolist()
+        next_verts = arrays.loop_vert[nxt[loops]].tolist()
+
+        remaining = dict.fromkeys(loops.tolist())
+        prev_of = {}  # Corner before the key corner in its face
+        start_keys = {}
+        end_keys = {}
+        by_start = {}
+        by_end = {}
+        for loop, crn, vert, next_vert in zip(loops.tolist(), corners, verts, next_verts):
+            prev_of[int(nxt[loop])] = loop
+            start_keys[loop] = start = (vert, crn[uv].uv.to_tuple())
+            end_keys[loop] = end = (next_vert, crn.link_loop_next[uv].uv.to_tuple())
+            by_start.setdefault(start, []).append(loop)
+            by_end.setdefault(end, []).append(loop)
+
+        def take(candidates):
+            for candidate in candidates:
+                if candidate in remaining:
+                    del remaining[candidate]
+                    return candidate
+            return None
+
+        chains = []
+        for loop in loops.tolist():
+            if loop not in remaining:
+                continue
+            del remaining[loop]
+            forward = [loop]
+            temp = loop
+            while True:
+                if (next_loop := int(nxt[temp])) in remaining:
+                    del remaining[next_loop]
+                elif (next_loop := take(by_start.get(end_keys[temp], ()))) is None:
+                    break
+                forward.append(next_loop)
+                temp = next_loop
+
+            backward = []
+            temp = loop
+            while True:
+                if (prev_loop := prev_of.get(temp, -1)) in remaining:
+                    del remaining[prev_loop]
+                elif (prev_loop := take(by_end.get(start_keys[temp], ()))) is None:
+                    break
+                backward.append(prev_loop)
+                temp = prev_loop
+            chains.append(np.array(backward[::-1] + forward, dtype='int32'))
+        return chains
@@ -0,0 +1,149 @@
+"""
+Per-object BVH cache for 3D viewport picking
+
+RayCast.ray_cast_umeshes used to build a BVHTree from every edit BMesh on every
+pick, and a second one without hidden faces when the first hit a hidden face.
+Trees are now built once from loop_triangles arrays (one foreach_get per array)
+and kept per mesh, keyed on the geometry UUID stamped by the depsgraph handler,
+which also drops the entries of meshes with geometry updates (hide included).
+"""
+
+from collections import OrderedDict
+
+import bpy
+import bmesh
+import numpy as np
+from mathutils.bvhtree import BVHTree
+
+from . import island_cache
+from . import island_engine
+from . import trace
+
+
+MAX_ENTRIES = 32
+
+
+class BVHCacheEntry:
+    __slots__ = ('bvh', 'tri_face')
+
+    def __init__(self, bvh: BVHTree, tri_face: np.ndarray):
+        self.bvh = bvh
+        # BMesh face index (iteration order) per tree triangle
+        self.tri_face = tri_face
+
+    def ray_cast(self, origin, direction, distance):
+        """Same as BVHTree.ray_cast, the index is a BMesh face index"""
+        hit, normal, index, dist = self.bvh.ray_cast(origin, direction, distance)
+        if hit is None:
+            return hit, normal, index, dist
+        return hit, normal, int(self.tri_face[index]), dist
+
+
+class BVHCache:
+    """LRU of picking trees, a mesh has up to two entries (with and without hidden faces)"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple, BVHCacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key) -> BVHCacheEntry | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry: BVHCacheEntry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, mesh_pointer: int | None = None):
+        if mesh_pointer is None:
+            self.entries.clear()
+            return
+        for key in [key for key in self.entries if key[0] == mesh_pointer]:
+            del self.entries[key]
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+bvh_cache = BVHCache()
+
+
+def make_key(umesh, skip_hidden: bool) -> tuple | None:
+    try:
+        mesh = umesh.obj.data
+        mesh_pointer = mesh.as_pointer()
+    except (AttributeError, ReferenceError):
+        return None
+    # Unstamped meshes weren't changed since load, the first update stamps them
+    stamp = island_cache.get_mesh_stamp(mesh) or ('', '')
+    bm = umesh.bm
+    return mesh_pointer, stamp[0], len(bm.faces), len(bm.verts), skip_hidden
+
+
+def build(bm: bmesh.types.BMesh, skip_hidden: bool) -> BVHCacheEntry | None:
+    """Triangulate through the island engine scratch mesh, None when it can't be written"""
+    try:
+        me = island_engine.scratch_mesh()
+        bm.to_mesh(me)
+    except (AttributeError, RuntimeError, ValueError):
+        return None
+
+    try:
+        me.calc_loop_triangles()
+        tri_count = len(me.loop_triangles)
+        tri_verts = np.empty(tri_count * 3, dtype='int32')
+        me.loop_triangles.foreach_get('vertices', tri_verts)
+        tri_face = np.empty(tri_count, dtype='int32')
+        me.loop_triangles.foreach_get('polygon_index', tri_face)
+        vert_co = island_engine.get_attribute(me.attributes, 'position', len(me.vertices), 'float32', 'vector', 3)
+        if skip_hidden:
+            face_hide = island_engine.get_attribute(me.attributes, '.hide_poly', len(me.polygons), bool, 'value')
+            visible = ~face_hide[tri_face]
+            tri_face = tri_face[visible]
+            tri_verts = tri_verts.reshape(-1, 3)[visible]
+    finally:
+        me.clear_geometry()
+
+    bvh = BVHTree.FromPolygons(vert_co.tolist(), tri_verts.reshape(-1, 3).tolist(), all_triangles=True)
+    return BVHCacheEntry(bvh, tri_face)
+
+
+def get_bvh(umesh, skip_hidden: bool = False) -> BVHCacheEntry | None:
+    """Cached picking tree of the umesh BMesh, optionally without hidden faces"""
+    key = make_key(umesh, skip_hidden)
+    if key is not None and (entry := bvh_cache.get(key)) is not None:
+        return entry
+    with trace.span('PICK', 'bvh_build', faces=len(umesh.bm.faces), skip_hidden=skip_hidden):
+        entry = build(umesh.bm, skip_hidden)
+    if key is not None and entry is not None:
+        bvh_cache.put(key, entry)
+    return entry
+
+
+def invalidate(mesh: bpy.types.Mesh | None = None):
+    if mesh is None:
+        bvh_cache.invalidate()
+        return
+    try:
+        bvh_cache.invalidate(mesh.as_pointer())
+    except ReferenceError:
+        pass
+
+
+def stats() -> dict:
+    return bvh_cache.stats()
@@ -10,11 +10,14 @@ assigning UV islands to trim rectangles based on similarity matching.
 """
 
 import bmesh
+import numpy as np
 from dataclasses import dataclass, field
 from typing import List, Optional, Set, Dict, Any
 from mathutils import Vector
 from math import pi, sqrt
 
+from . import trace
+
 
 @dataclass
 class BoundingBox2d:
@@ -218,12 +221,206 @@ class HspIsland:
                 self.aspect = 1.0
                 self.aspect_inverted = 1.0
         except Exception as e:
-            print(f"Error calculating bbox for island: {e}")
+            trace.warning('HOTSPOT', "Error calculating bbox for island: %s", e)
             self.bbox = BoundingBox2d()
             self.aspect = 1.0
             self.aspect_inverted = 1.0
 
 
+# Match tolerances of get_area_suited_trims / get_world_size_suited_trims
+AREA_MATCH_FACTOR = 1.5
+WORLD_AREA_MATCH_FACTOR = 2.0
+
+# Max island/trim candidate pairs expanded at once by HspTrimIndex
+MAX_CANDIDATES = 4_000_000
+
+
+def calc_adaptive_aspect_tolerance(aspect: np.ndarray, tolerance: float) -> np.ndarray:
+    """Vectorized adaptive tolerance of get_aspect_suited_trims"""
+    tol = np.full(len(aspect), tolerance)
+    extreme = (aspect > 5.0) | (aspect < 0.2)
+    wide = ~extreme & ((aspect > 1.5) | (aspect < 0.7))
+    tol[extreme] = np.maximum(tolerance, aspect[extreme] * 0.2)
+    tol[wide] = np.maximum(tolerance, aspect[wide] * 0.3)
+    return tol
+
+
+def expand_ranges(lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Row and position of every element of the [lo, hi) ranges"""
+    counts = np.maximum(hi - lo, 0)
+    rows = np.repeat(np.arange(len(lo)), counts)
+    starts = np.cumsum(counts) - counts
+    positions = np.arange(counts.sum()) - np.repeat(starts - lo, counts)
+    return rows, positions
+
+
+def calc_nearest_diff(sorted_values: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Distance from every target to the nearest sorted value"""
+    idx = np.searchsorted(sorted_values, targets)
+    right = np.abs(sorted_values[np.minimum(idx, len(sorted_values) - 1)] - targets)
+    left = np.abs(sorted_values[np.maximum(idx - 1, 0)] - targets)
+    return np.minimum(left, right)
+
+
+class HspTrimIndex:
+    """Trim arrays sorted by aspect (plain and with rotated aspects) and by area.
+
+    Answers the get_trims_by_*_priority queries for many islands at once: the
+    first stage is a binary search window on the sorted keys, the second stage
+    filters the expanded island/trim pairs. Results are ordered like the
+    per-island methods, ties keep the trim order of the storage.
+    """
+
+    def __init__(self, trims):
+        self.trims: List[HspTrim] = list(trims)
+        count = len(self.trims)
+        self.aspect = np.array([t.aspect for t in self.trims], dtype='float64')
+        self.aspect_inverted = np.array([t.aspect_inverted for t in self.trims], dtype='float64')
+        self.area = np.array([t.area for t in self.trims], dtype='float64')
+        self.world_area = np.array([HspStorage._get_trim_world_area(t) or np.nan for t in self.trims], dtype='float64')
+
+        ids = np.arange(count)
+        self.aspect_order = np.argsort(self.aspect, kind='stable')
+        self.aspect_sorted = self.aspect[self.aspect_order]
+
+        rotated_keys = np.concatenate((self.aspect, self.aspect_inverted))
+        rotated_order = np.argsort(rotated_keys, kind='stable')
+        self.rotated_sorted = rotated_keys[rotated_order]
+        self.rotated_ids = np.concatenate((ids, ids))[rotated_order]
+
+        self.area_order = np.argsort(self.area, kind='stable')
+        self.area_sorted = self.area[self.area_order]
+
+        with_world_area = np.flatnonzero(~np.isnan(self.world_area))
+        self.world_area_order = with_world_area[np.argsort(self.world_area[with_world_area], kind='stable')]
+        self.world_area_sorted = self.world_area[self.world_area_order]
+
+    def __len__(self):
+        return len(self.trims)
+
+    def aspect_mask(self, trim_ids: np.ndarray, aspect: np.ndarray, tol: np.ndarray, allow_rotation: bool) -> np.ndarray:
+        mask = np.abs(self.aspect[trim_ids] - aspect) <= tol
+        if allow_rotation:
+            mask |= np.abs(self.aspect_inverted[trim_ids] - aspect) <= tol
+        return mask
+
+    def match_aspect_first(self, aspect, target_area, allow_rotation, tol):
+        """Aspect window, then the area stage. Returns sorted (island, trim) pairs"""
+        if allow_rotation:
+            keys, ids = self.rotated_sorted, self.rotated_ids
+        else:
+            keys, ids = self.aspect_sorted, self.aspect_order
+        # The window is widened by an ulp-sized margin, the exact test follows
+        margin = 1e-9 * np.maximum(1.0, np.abs(aspect))
+        lo = np.searchsorted(keys, aspect - tol - margin, side='left')
+        hi = np.searchsorted(keys, aspect + tol + margin, side='right')
+
+        pairs = []
+        for chunk in self.chunks(hi - lo):
+            rows, positions = expand_ranges(lo[chunk], hi[chunk])
+            rows += chunk.start
+            trim_ids = ids[positions]
+            keep = np.abs(keys[positions] - aspect[rows]) <= tol[rows]
+            rows, trim_ids = rows[keep], trim_ids[keep]
+            if allow_rotation:
+                # A trim can match with both orientations, it's listed once
+                unique_keys = np.unique(rows.astype('int64') * len(self.trims) + trim_ids)
+                rows, trim_ids = np.divmod(unique_keys, len(self.trims))
+            diff = np.abs(self.area[trim_ids] - target_area[rows])
+            pairs.append(self.keep_best(rows, trim_ids, diff, len(aspect), AREA_MATCH_FACTOR))
+        return self.concat_pairs(pairs)
+
+    def match_area_first(self, target_area, sorted_values, order, values, factor, aspect=None, tol=None, allow_rotation=False):
+        """Area window around the nearest area, then the aspect stage (skipped when aspect is None)"""
+        if not len(sorted_values):
+            empty = np.empty(0, dtype='int64')
+            return empty, empty
+        max_diff = calc_nearest_diff(sorted_values, target_area) * factor
+        margin = 1e-9 * np.maximum(1.0, np.abs(target_area))
+        lo = np.searchsorted(sorted_values, target_area - max_diff - margin, side='left')
+        hi = np.searchsorted(sorted_values, target_area + max_diff + margin, side='right')
+
+        pairs = []
+        for chunk in self.chunks(hi - lo):
+            rows, positions = expand_ranges(lo[chunk], hi[chunk])
+            rows += chunk.start
+            trim_ids = order[positions]
+            diff = np.abs(values[trim_ids] - target_area[rows])
+            keep = diff <= max_diff[rows]
+            if aspect is not None:
+                keep &= self.aspect_mask(trim_ids, aspect[rows], tol[rows], allow_rotation)
+            rows, trim_ids, diff = rows[keep], trim_ids[keep], diff[keep]
+            order_ = np.lexsort((trim_ids, diff, rows))
+            pairs.append((rows[order_], trim_ids[order_]))
+        return self.concat_pairs(pairs)
+
+    @staticmethod
+    def keep_best(rows, trim_ids, diff, island_count, factor):
+        """Pairs within factor * best diff of their island, sorted by island, diff, trim order"""
+        best = np.full(island_count, np.inf)
+        if len(rows):
+            order = np.lexsort((trim_ids, rows))
+            rows, trim_ids, diff = rows[order], trim_ids[order], diff[order]
+            starts = np.flatnonzero(np.diff(rows, prepend=-1))
+            best[rows[starts]] = np.minimum.reduceat(diff, starts)
+        keep = diff <= best[rows] * factor
+        rows, trim_ids, diff = rows[keep], trim_ids[keep], diff[keep]
+        order = np.lexsort((trim_ids, diff, rows))
+        return rows[order], trim_ids[order]
+
+    @staticmethod
+    def chunks(counts: np.ndarray):
+        """Island slices whose expanded pair count stays below MAX_CANDIDATES"""
+        start = 0
+        total = np.cumsum(counts)
+        while start < len(counts):
+            base = total[start - 1] if start else 0
+            end = int(np.searchsorted(total, base + MAX_CANDIDATES, side='right'))
+            end = max(end, start + 1)
+            yield slice(start, end)
+            start = end
+
+    @staticmethod
+    def concat_pairs(pairs):
+        if not pairs:
+            empty = np.empty(0, dtype='int64')
+            return empty, empty
+        return np.concatenate([p[0] for p in pairs]), np.concatenate([p[1] for p in pairs])
+
+    def match(self, aspects, areas, priority: str, scalar: float, allow_rotation: bool, tolerance: float = 0.1,
+              aspect_precision: float = 0.0, world_areas=None) -> tuple[np.ndarray, np.ndarray]:
+        """Suited trims for all islands. Priority is 'ASPECT', 'AREA', 'WORLD_SIZE' or 'AREA_ONLY' (radials).
+        Returns (island, trim) index pairs sorted by island and match quality.
+        """
+        aspect = np.asarray(aspects, dtype='float64') + aspect_precision
+        target_area = np.asarray(areas, dtype='float64') * scalar
+        empty = np.empty(0, dtype='int64')
+        if not len(self.trims) or not len(aspect):
+            return empty, empty
+        tol = calc_adaptive_aspect_tolerance(aspect, tolerance)
+
+        if priority == 'ASPECT':
+            return self.match_aspect_first(aspect, target_area, allow_rotation, tol)
+        if priority == 'AREA':
+            return self.match_area_first(target_area, self.area_sorted, self.area_order, self.area,
+                                         AREA_MATCH_FACTOR, aspect, tol, allow_rotation)
+        if priority == 'AREA_ONLY':
+            return self.match_area_first(target_area, self.area_sorted, self.area_order, self.area, AREA_MATCH_FACTOR)
+        # WORLD_SIZE
+        target_world_area = np.asarray(world_areas, dtype='float64') * scalar
+        return self.match_area_first(target_world_area, self.world_area_sorted, self.world_area_order,
+                                     self.world_area, WORLD_AREA_MATCH_FACTOR, aspect, tol, allow_rotation)
+
+    def match_lists(self, *args, island_count: int, **kwargs) -> List[List[HspTrim]]:
+        """match() as a list of suited trims per island"""
+        rows, trim_ids = self.match(*args, **kwargs)
+        result: List[List[HspTrim]] = [[] for _ in range(island_count)]
+        trims = self.trims
+        for row, trim_id in zip(rows.tolist(), trim_ids.tolist()):
+            result[row].append(trims[trim_id])
+        return result
+
+
 class HspStorage:
     """Central manager for hotspot matching operations"""
     
@@ -236,6 +433,9 @@ class HspStorage:
         
         self._trims_count = 0
         self._islands_count = 0
+
+        self._trim_index: Optional[HspTrimIndex] = None
+        self._radial_trim_index: Optional[HspTrimIndex] = None
     
     @property
     def trims_count(self) -> int:
@@ -253,8 +453,10 @@ class HspStorage:
         """Collect trims from material and categorize them"""
         self.trims.clear()
         self.radial_trims.clear()
+        self._trim_index = None
+        self._radial_trim_index = None
         
-        print(f"Collecting trims from {len(trim_list)} trim objects")
+        trace.info('HOTSPOT', "Collecting trims from %s trim objects", len(trim_list))
         for i, trim in enumerate(trim_list):
             # Apply tag filtering
             if category_filter and hasattr(trim, 'category') and trim.category != category_filter:
@@ -264,14 +466,14 @@ class HspStorage:
             
             hsp_trim = HspTrim(trim)
             self.trims.add(hsp_trim)
-            print(f"  Trim {i+1}: aspect={hsp_trim.aspect:.3f}, area={hsp_trim.area:.3f}")
+            trace.debug('HOTSPOT', "  Trim %s: aspect=%.3f, area=%.3f", i+1, hsp_trim.aspect, hsp_trim.area)
         
         if detect_radial:
             # Separate radial trims
             self.radial_trims = {trim for trim in self.trims if trim.radial}
             self.trims = self.trims.difference(self.radial_trims)
     
-    def collect_islands(self, context, bm: bmesh.types.BMesh, uv_layer, detect_radial: bool = False) -> None:
+    def collect_islands(self, context, bm: bmesh.types.BMesh, uv_layer, detect_radial: bool = False, obj=None) -> None:
         """Collect islands from bmesh and categorize them"""
         self.islands.clear()
         self.radial_islands.clear()
@@ -281,47 +483,47 @@ class HspStorage:
         
         # Check sync mode and report
         uv_sync_mode = self._is_uv_sync_mode(bm, uv_layer)
-        print(f"UV Sync Mode: {'Enabled' if uv_sync_mode else 'Disabled'}")
+        trace.debug('HOTSPOT', "UV Sync Mode: %s", 'Enabled' if uv_sync_mode else 'Disabled')
         
         try:
-            # First try: Use zen_get_islands from island_utils
-            from ..utils.island_utils import zen_get_islands
-            
-            # Get selected faces based on sync mode
-            if self._is_uv_sync_mode(bm, uv_layer):
-                selected_faces = [f for f in bm.faces if f.select]
-                print(f"Using 3D view selection: {len(selected_faces)} faces")
-            else:
-                selected_faces = [f for f in bm.faces if self._is_face_selected_in_uv(f, uv_layer)]
-                print(f"Using UV editor selection: {len(selected_faces)} faces")
-            
-            if selected_faces:
-                islands = zen_get_islands(bm, selected_faces, has_selected_faces=True)
+            # First try: UVV islands extended from the selection (cached per mesh state)
+            from ..types import Islands, UMesh
+
+            obj = obj or context.edit_object
+            umesh = UMesh(bm, obj)
+            umesh.uv = uv_layer
+            islands = [island.faces for island in Islands.calc_extended(umesh)]
+            trace.info('HOTSPOT', "Using %s selection: %s islands", '3D view' if uv_sync_mode else 'UV editor', len(islands))
         except (ImportError, AttributeError, Exception) as e:
-            print(f"zen_get_islands failed: {e}")
-            # Fallback: Use AdvIslands system
+            trace.warning('HOTSPOT', "Islands.calc_extended failed: %s", e)
+            # Fallback: zen_get_islands from island_utils
             try:
-                from ..types.adv_island import AdvIslands
-                adv_islands = AdvIslands.calc_visible_with_mark_seam(bm, uv_layer)
-                islands = [island.faces for island in adv_islands]
+                from ..utils.island_utils import zen_get_islands
+
+                if uv_sync_mode:
+                    selected_faces = [f for f in bm.faces if f.select]
+                else:
+                    selected_faces = [f for f in bm.faces if self._is_face_selected_in_uv(f, uv_layer)]
+                if selected_faces:
+                    islands = zen_get_islands(bm, selected_faces, has_selected_faces=True)
             except (ImportError, AttributeError, Exception) as e:
-                print(f"AdvIslands failed: {e}")
+                trace.warning('HOTSPOT', "zen_get_islands failed: %s", e)
                 # Last resort: Simple island detection
                 islands = self._simple_island_detection(bm, uv_layer)
         
         # Convert to HspIsland objects
-        print(f"Found {len(islands)} islands to process")
+        trace.info('HOTSPOT', "Found %s islands to process", len(islands))
         for i, island_faces in enumerate(islands):
             if island_faces:  # Skip empty islands
-                print(f"Processing island {i+1} with {len(island_faces)} faces")
+                trace.debug('HOTSPOT', "Processing island %s with %s faces", i+1, len(island_faces))
                 hsp_island = HspIsland(list(island_faces))
                 # Calculate bbox with UV layer
                 hsp_island._calculate_bbox_with_uv_layer(uv_layer)
                 if hsp_island.bbox and hsp_island.bbox.area > 0:
-                    print(f"Island {i+1} bbox: {hsp_island.bbox.width:.3f}x{hsp_island.bbox.height:.3f}")
+                    trace.debug('HOTSPOT', "Island %s bbox: %.3fx%.3f", i+1, hsp_island.bbox.width, hsp_island.bbox.height)
                     self.islands.add(hsp_island)
                 else:
-                    print(f"Island {i+1} has invalid bbox, skipping")
+                    trace.debug('HOTSPOT', "Island %s has invalid bbox, skipping", i+1)
         
         if detect_radial:
             # Separate radial islands
@@ -420,7 +622,7 @@ class HspStorage:
         
         # Apply aspect precision correction
         if aspect is None:
-            print(f"Warning: Island aspect is None, using default 1.0")
+            trace.warning('HOTSPOT', "Island aspect is None, using default 1.0")
             aspect = 1.0
         corrected_aspect = aspect + aspect_precision
         
@@ -431,15 +633,15 @@ class HspStorage:
         elif corrected_aspect > 1.5 or corrected_aspect < 0.7:  # Wide or tall
             adaptive_tolerance = max(tolerance, corrected_aspect * 0.3)  # 30% of aspect ratio
         
-        print(f"Looking for trims with aspect {corrected_aspect:.3f} (original: {aspect:.3f}, precision: {aspect_precision:.3f})")
-        print(f"Using tolerance: {adaptive_tolerance:.3f} (base: {tolerance:.3f})")
+        trace.debug('HOTSPOT', "Looking for trims with aspect %.3f (original: %.3f, precision: %.3f)", corrected_aspect, aspect, aspect_precision)
+        trace.debug('HOTSPOT', "Using tolerance: %.3f (base: %.3f)", adaptive_tolerance, tolerance)
         
         for trim in container:
             # Check normal orientation
             aspect_diff = abs(trim.aspect - corrected_aspect)
             if aspect_diff <= adaptive_tolerance:
                 suited_trims.append(trim)
-                print(f"  Found trim with aspect {trim.aspect:.3f} (diff: {aspect_diff:.3f})")
+                trace.debug('HOTSPOT', "  Found trim with aspect %.3f (diff: %.3f)", trim.aspect, aspect_diff)
                 continue
             
             # Check rotated orientation if allowed
@@ -447,9 +649,9 @@ class HspStorage:
                 aspect_diff_rotated = abs(trim.aspect_inverted - corrected_aspect)
                 if aspect_diff_rotated <= adaptive_tolerance:
                     suited_trims.append(trim)
-                    print(f"  Found rotated trim with aspect {trim.aspect_inverted:.3f} (diff: {aspect_diff_rotated:.3f})")
+                    trace.debug('HOTSPOT', "  Found rotated trim with aspect %.3f (diff: %.3f)", trim.aspect_inverted, aspect_diff_rotated)
         
-        print(f"Found {len(suited_trims)} aspect-suited trims out of {len(container)} total trims")
+        trace.debug('HOTSPOT', "Found %s aspect-suited trims out of %s total trims", len(suited_trims), len(container))
         return suited_trims
     
     def get_area_suited_trims(self, container: List[HspTrim], island: HspIsland, scalar: float, allow_rotation: bool) -> List[HspTrim]:
@@ -460,14 +662,14 @@ class HspStorage:
         # Calculate target area
         island_area = island.area if island.area is not None else 0.0
         target_area = island_area * scalar
-        print(f"  Area matching: island area={island_area:.3f}, scalar={scalar:.3f}, target={target_area:.3f}")
+        trace.debug('HOTSPOT', "  Area matching: island area=%.3f, scalar=%.3f, target=%.3f", island_area, scalar, target_area)
         
         # Calculate area differences
         area_diffs = []
         for trim in container:
             area_diff = abs(trim.area - target_area)
             area_diffs.append((area_diff, trim))
-            print(f"    Trim area={trim.area:.3f}, diff={area_diff:.3f}")
+            trace.debug('HOTSPOT', "    Trim area=%.3f, diff=%.3f", trim.area, area_diff)
         
         # Sort by area difference and return trims within reasonable range
         area_diffs.sort(key=lambda x: x[0])
@@ -478,10 +680,10 @@ class HspStorage:
         
         best_diff = area_diffs[0][0]
         max_diff = best_diff * 1.5  # 50% tolerance
-        print(f"  Best area diff: {best_diff:.3f}, max allowed: {max_diff:.3f}")
+        trace.debug('HOTSPOT', "  Best area diff: %.3f, max allowed: %.3f", best_diff, max_diff)
         
         suited_trims = [trim for diff, trim in area_diffs if diff <= max_diff]
-        print(f"  Found {len(suited_trims)} area-suited trims out of {len(container)} aspect-suited trims")
+        trace.debug('HOTSPOT', "  Found %s area-suited trims out of %s aspect-suited trims", len(suited_trims), len(container))
         return suited_trims
         
     def get_world_size_suited_trims(self, context, container: List[HspTrim], island: HspIsland, scalar: float, allow_rotation: bool) -> List[HspTrim]:
@@ -517,7 +719,8 @@ class HspStorage:
         suited_trims = [trim for diff, trim in world_area_diffs if diff <= max_diff]
         return suited_trims
     
-    def _get_trim_world_area(self, trim: HspTrim) -> Optional[float]:
+    @staticmethod
+    def _get_trim_world_area(trim: HspTrim) -> Optional[float]:
         """Get world area for trim if available"""
         # Check if trim has world size properties
         if hasattr(trim.trim, 'world_size_x') and hasattr(trim.trim, 'world_size_y'):
@@ -555,6 +758,39 @@ class HspStorage:
         # Stage 2: Filter by aspect from area-matched trims
         return self.get_aspect_suited_trims(set(area_suited_trims), island.aspect, allow_rotation, tolerance)
     
+    @property
+    def trim_index(self) -> HspTrimIndex:
+        """Index of the regular trims, built on first use after collect_trims"""
+        if self._trim_index is None:
+            self._trim_index = HspTrimIndex(self.trims)
+        return self._trim_index
+
+    @property
+    def radial_trim_index(self) -> HspTrimIndex:
+        """Index of the radial trims, falls back to the regular trims when there are none"""
+        if self._radial_trim_index is None:
+            self._radial_trim_index = HspTrimIndex(self.radial_trims) if self.radial_trims else self.trim_index
+        return self._radial_trim_index
+
+    def match_islands(self, islands: List[HspIsland], priority: str, scalar: float, allow_rotation: bool,
+                      tolerance: float = 0.1, aspect_precision: float = 0.0) -> List[List[HspTrim]]:
+        """Batched get_trims_by_*_priority: suited trims for every island, best first"""
+        aspects = np.array([1.0 if island.aspect is None else island.aspect for island in islands], dtype='float64')
+        areas = np.array([island.area for island in islands], dtype='float64')
+        world_areas = None
+        if priority == 'WORLD_SIZE':
+            world_areas = np.array([sum(face.calc_area() for face in island.faces) for island in islands], dtype='float64')
+        with trace.span('HOTSPOT', "match_islands", islands=len(islands), trims=len(self.trim_index), priority=priority):
+            return self.trim_index.match_lists(aspects, areas, priority, scalar, allow_rotation, tolerance,
+                                               aspect_precision, world_areas, island_count=len(islands))
+
+    def match_radial_islands(self, islands: List[HspIsland], scalar: float) -> List[List[HspTrim]]:
+        """Batched area matching of radial islands against the radial trims"""
+        aspects = np.ones(len(islands), dtype='float64')
+        areas = np.array([island.area for island in islands], dtype='float64')
+        return self.radial_trim_index.match_lists(aspects, areas, 'AREA_ONLY', scalar, False,
+                                                  island_count=len(islands))
+
     def calculate_rotation_angle(self, island: HspIsland, trim: HspTrim, allow_rotation: bool) -> float:
         """Calculate rotation angle needed to match island to trim"""
         if not allow_rotation:
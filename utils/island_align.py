@@ -7,7 +7,10 @@ UV islands snap together properly during weld operations.
 """
 
 import math
+
+import numpy as np
 from mathutils import Vector
+from . import trace
 from .transform import (
     move_island,
     rotate_island_with_aspect,
@@ -30,13 +33,13 @@ def calc_edge_endpoints(edge_corners, uv_layer):
         tuple: (pt1, pt2) - Start and end UV coordinates
     """
     if len(edge_corners) != 2:
-        print(f"[ALIGN] ERROR: Expected 2 corners for edge, got {len(edge_corners)}")
+        trace.warning('WELD', "Expected 2 corners for edge, got %s", len(edge_corners))
         return None, None
 
     pt1 = edge_corners[0][uv_layer].uv
     pt2 = edge_corners[1][uv_layer].uv
 
-    print(f"[ALIGN] Edge endpoints: pt1={pt1}, pt2={pt2}")
+    trace.debug('WELD', "Edge endpoints: pt1=%s, pt2=%s", pt1, pt2)
     return pt1, pt2
 
 
@@ -131,18 +134,17 @@ def reorient_island_to_target(ref_island, trans_island, ref_pt1, ref_pt2, trans_
     return True
 
 
-def find_welded_edge_pairs(all_islands, face_to_island_idx, uv_layer, tolerance=1e-5):
+@trace.traced('WELD')
+def find_welded_edge_pairs(pairs, tolerance=1e-5):
     """
     Find pairs of edges that were welded together.
 
-    This scans all edges in all islands to find edges where:
-    1. Both vertices have the same UV coordinates (were welded)
-    2. The edges belong to different islands
+    Candidates come from the boundary pair index: edges between two different
+    islands, seen from the island with the lower index. An edge counts as welded
+    when both vertices have the same UV coordinates on both sides.
 
     Args:
-        all_islands: List of islands (each island is a list of BMFaces)
-        face_to_island_idx: Dictionary mapping face -> island index
-        uv_layer: UV layer
+        pairs: BoundaryPairs of the islands
         tolerance: UV coordinate matching tolerance
 
     Returns:
@@ -151,68 +153,52 @@ def find_welded_edge_pairs(all_islands, face_to_island_idx, uv_layer, tolerance=
             - 'trans_island_idx': Index of transform island
             - 'ref_edge_corners': [corner1, corner2] of reference edge
             - 'trans_edge_corners': [corner1, corner2] of transform edge
+            - 'edge_loop': Mesh loop index of the first corner of the edge
     """
-    print(f"\n[ALIGN] ========== find_welded_edge_pairs START ==========")
-    print(f"[ALIGN] Searching for welded edges across {len(all_islands)} islands...")
-
+    loops = pairs.island_loops
+    islands = pairs.face_islands[pairs.arrays.loop_face[loops]]
+    shared_islands = pairs.opposite_islands[loops]
+    mask = (shared_islands != -1) & (islands < shared_islands)
+    ref_loops = loops[mask]
+    shared_loops = pairs.opposite[ref_loops]
+    trace.info('WELD', "Searching for welded edges across %s island border edges...", len(ref_loops))
+
+    uv_layer = pairs.uv
     welded_pairs = []
-    processed_edges = set()
-
-    for island_idx, island in enumerate(all_islands):
-        for face in island:
-            for loop in face.loops:
-                edge = loop.edge
-
-                # Skip if we've already processed this edge
-                if edge.index in processed_edges:
-                    continue
-
-                # Get the two corners of this edge
-                corner1 = loop
-                corner2 = loop.link_loop_next
-
-                uv1 = corner1[uv_layer].uv
-                uv2 = corner2[uv_layer].uv
-
-                # Check the radial neighbor (other side of the edge)
-                shared_loop = loop.link_loop_radial_prev
-                if shared_loop == loop:
-                    # Boundary edge, skip
-                    continue
-
-                shared_face = shared_loop.face
-                shared_island_idx = face_to_island_idx.get(shared_face, -1)
-
-                # Skip if same island or no island
-                if shared_island_idx == island_idx or shared_island_idx == -1:
-                    continue
-
-                # Get UV coordinates of shared edge
-                shared_corner1 = shared_loop.link_loop_next  # Reversed order
-                shared_corner2 = shared_loop
-
-                shared_uv1 = shared_corner1[uv_layer].uv
-                shared_uv2 = shared_corner2[uv_layer].uv
-
-                # Check if UVs match (indicating weld happened)
-                uv1_matches = (uv1 - shared_uv1).length < tolerance
-                uv2_matches = (uv2 - shared_uv2).length < tolerance
-
-                if uv1_matches and uv2_matches:
-                    print(f"[ALIGN] Found welded edge between islands {island_idx} and {shared_island_idx}")
-                    print(f"[ALIGN]   Edge UVs: {uv1} - {uv2}")
-                    print(f"[ALIGN]   Shared UVs: {shared_uv1} - {shared_uv2}")
-
-                    welded_pairs.append({
-                        'ref_island_idx': island_idx,
-                        'trans_island_idx': shared_island_idx,
-                        'ref_edge_corners': [corner1, corner2],
-                        'trans_edge_corners': [shared_corner1, shared_corner2]
-                    })
-
-                    processed_edges.add(edge.index)
-
-    print(f"[ALIGN] Found {len(welded_pairs)} welded edge pair(s)")
-    print(f"[ALIGN] ========== find_welded_edge_pairs END ==========\n")
+    for island_idx, shared_island_idx, edge_loop, loop, shared_loop in zip(
+            islands[mask].tolist(), shared_islands[mask].tolist(), np.minimum(ref_loops, shared_loops).tolist(),
+            pairs.to_corners(ref_loops), pairs.to_corners(shared_loops)):
+        # Get the two corners of this edge
+        corner1 = loop
+        corner2 = loop.link_loop_next
+
+        uv1 = corner1[uv_layer].uv
+        uv2 = corner2[uv_layer].uv
+
+        # Get UV coordinates of shared edge
+        shared_corner1 = shared_loop.link_loop_next  # Reversed order
+        shared_corner2 = shared_loop
+
+        shared_uv1 = shared_corner1[uv_layer].uv
+        shared_uv2 = shared_corner2[uv_layer].uv
+
+        # Check if UVs match (indicating weld happened)
+        uv1_matches = (uv1 - shared_uv1).length < tolerance
+        uv2_matches = (uv2 - shared_uv2).length < tolerance
+
+        if uv1_matches and uv2_matches:
+            trace.debug('WELD', "Found welded edge between islands %s and %s", island_idx, shared_island_idx)
+            trace.debug('WELD', "  Edge UVs: %s - %s", uv1, uv2)
+            trace.debug('WELD', "  Shared UVs: %s - %s", shared_uv1, shared_uv2)
+
+            welded_pairs.append({
+                'ref_island_idx': island_idx,
+                'trans_island_idx': shared_island_idx,
+                'ref_edge_corners': [corner1, corner2],
+                'trans_edge_corners': [shared_corner1, shared_corner2],
+                'edge_loop': edge_loop
+            })
+
+    trace.info('WELD', "Found %s welded edge pair(s)", len(welded_pairs))
 
     return welded_pairs
@@ -0,0 +1,136 @@
+"""
+Persistent island cache
+
+Keeps the last island partitions (face order + island starts, as produced by
+island_engine) per mesh, keyed on the geometry/shading UUIDs that the depsgraph
+handler stamps into bpy.app.driver_namespace, plus the island mode, the tagged
+face mask and a digest of the mesh arrays the partition depends on. The stamps
+only change when the depsgraph is evaluated, the digest catches operators that
+edit seams or UVs right before the next one runs. Redraw-driven overlays and
+chained operators reuse the partition while the mesh is unchanged.
+"""
+
+import hashlib
+import weakref
+
+from collections import OrderedDict
+
+import bpy
+import numpy as np
+
+
+MAX_ENTRIES = 64
+
+
+class IslandCacheEntry:
+    __slots__ = ('face_order', 'starts', 'owner')
+
+    def __init__(self, face_order: np.ndarray, starts: np.ndarray, owner):
+        self.face_order = face_order
+        self.starts = starts
+        # UMesh that produced the partition, it can be edited before the next depsgraph update
+        self.owner = owner
+
+
+class IslandCache:
+    """LRU of island partitions with hit/miss counters"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple, IslandCacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key, umesh) -> IslandCacheEntry | None:
+        if key is None:
+            return None
+        entry = self.entries.get(key)
+        if entry is None or entry.owner() is umesh:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, face_order: np.ndarray, starts: np.ndarray, umesh):
+        if key is None:
+            return
+        self.entries[key] = IslandCacheEntry(face_order.astype('int32'), starts.astype('int32'), weakref.ref(umesh))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, mesh_pointer: int | None = None):
+        if mesh_pointer is None:
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            return
+        for key in [key for key in self.entries if key[0] == mesh_pointer]:
+            del self.entries[key]
+            self.invalidations += 1
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+island_cache = IslandCache()
+
+
+def get_mesh_stamp(mesh: bpy.types.Mesh) -> tuple[str, str] | None:
+    """[geom_uuid, shade_uuid] stamped by checker.gizmo_draw.uvv_depsgraph_ui_update"""
+    from ..checker.gizmo_draw import LITERAL_UVV_UPDATE
+    stamp = bpy.app.driver_namespace.get(LITERAL_UVV_UPDATE, {}).get(mesh)
+    if not stamp or not all(stamp):
+        return None
+    return stamp[0], stamp[1]
+
+
+def calc_content_digest(arrays) -> bytes:
+    """Digest of the topology, seams, sharp edges, materials, normals and UVs of island_engine.MeshArrays"""
+    digest = hashlib.blake2b(digest_size=16)
+    for arr in (arrays.loop_start, arrays.loop_vert, arrays.loop_edge, arrays.uv_co, arrays.edge_seam,
+                arrays.edge_sharp, arrays.face_material, arrays.face_normal):
+        digest.update(np.ascontiguousarray(arr))
+    return digest.digest()
+
+
+def make_key(umesh, mode: str, angle: float, face_tags: np.ndarray, arrays) -> tuple | None:
+    """None when the mesh has no depsgraph stamp yet, such meshes are never cached"""
+    try:
+        mesh = umesh.obj.data
+        mesh_pointer = mesh.as_pointer()
+    except (AttributeError, ReferenceError):
+        return None
+    if (stamp := get_mesh_stamp(mesh)) is None:
+        return None
+    tags_digest = hashlib.blake2b(np.packbits(face_tags).tobytes(), digest_size=16).digest()
+    return (mesh_pointer, *stamp, umesh.uv.name, mode, round(angle, 6),
+            arrays.face_count, len(arrays.loop_edge), len(arrays.edge_seam), tags_digest,
+            calc_content_digest(arrays))
+
+
+def invalidate(mesh: bpy.types.Mesh | None = None):
+    if mesh is None:
+        island_cache.invalidate()
+        return
+    try:
+        island_cache.invalidate(mesh.as_pointer())
+    except ReferenceError:
+        pass
+
+
+def stats() -> dict:
+    return island_cache.stats()
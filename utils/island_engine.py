@@ -0,0 +1,311 @@
+"""
+Vectorized UV island engine
+
+Copies a BMesh into a reusable scratch mesh once, pulls loop UVs, radial links,
+seam, sharp, material and face normal data into NumPy arrays via foreach_get,
+and labels UV islands with a vectorized union-find over linked corner pairs.
+The result is a list of face-index arrays that Islands/AdvIslands can wrap.
+Partitions are memoized in island_cache while the mesh UUID stamps and the
+content digest of the arrays are unchanged.
+"""
+
+import math
+
+import bpy
+import bmesh
+import numpy as np
+
+from . import island_cache
+from . import trace
+
+
+SCRATCH_MESH_NAME = '.uvv_island_engine'
+
+FLT_EPSILON = float(np.finfo(np.float32).eps)
+
+# Below this face count the Python flood fill is cheaper than the mesh copy
+MIN_FACES = 1000
+
+# Island connectivity modes (match IslandsBase.calc_*_iter_ex variants)
+MODE_UV = 'UV'
+MODE_NON_MANIFOLD = 'NON_MANIFOLD'
+MODE_SEAM = 'SEAM'
+MODE_SEAM_MATERIAL = 'SEAM_MATERIAL'
+MODE_ALL = 'ALL'
+
+
+def scratch_mesh() -> bpy.types.Mesh:
+    """Reuse a single orphan mesh, creating and removing meshes tags the depsgraph"""
+    me = bpy.data.meshes.get(SCRATCH_MESH_NAME)
+    if me is None:
+        me = bpy.data.meshes.new(SCRATCH_MESH_NAME)
+    return me
+
+
+def get_attribute(attributes, name: str, count: int, dtype, prop: str, width: int = 1) -> np.ndarray:
+    """Read a generic attribute, missing attributes are zero/False (default value)"""
+    shape = (count, width) if width > 1 else count
+    if (attr := attributes.get(name)) is None:
+        return np.zeros(shape, dtype=dtype)
+    arr = np.empty(count * width, dtype=dtype)
+    attr.data.foreach_get(prop, arr)
+    return arr.reshape(shape)
+
+
+def uv_ulp_keys(uv_co: np.ndarray) -> np.ndarray:
+    """Map float32 UVs to ordered integers, |a - b| <= 1 is the 1 ULP step of mathutils Vector equality"""
+    bits = np.ascontiguousarray(uv_co, dtype='float32').view('int32').astype('int64')
+    return np.where(bits < 0, -(bits & 0x7fffffff), bits)
+
+
+def uv_keys_to_floats(keys: np.ndarray) -> np.ndarray:
+    """Inverse of uv_ulp_keys (-0.0 comes back as 0.0)"""
+    bits = np.where(keys < 0, -keys | 0x80000000, keys)
+    return bits.astype('uint32').view('float32')
+
+
+def uv_keys_equal(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Rows equal like mathutils Vector equality (compare_ff_relative):
+    every component within FLT_EPSILON or 1 ULP apart.
+    """
+    close = np.abs(a - b) <= 1
+    if not close.all():
+        far = ~close
+        diff = np.abs(uv_keys_to_floats(a[far]) - uv_keys_to_floats(b[far]))
+        close[far] = diff <= FLT_EPSILON
+    return close.all(axis=1)
+
+
+class MeshArrays:
+    """Flattened snapshot of BMesh topology and UV data.
+
+    Face, loop, edge and vert order follows BMesh iteration order (not elem.index,
+    which is often reused for island indexing).
+    """
+
+    def __init__(self):
+        self.face_count = 0
+        self.loop_start: np.ndarray = np.empty(0, dtype='int32')
+        self.loop_total: np.ndarray = np.empty(0, dtype='int32')
+        self.loop_face: np.ndarray = np.empty(0, dtype='int32')
+        self.loop_next: np.ndarray = np.empty(0, dtype='int32')
+        self.loop_edge: np.ndarray = np.empty(0, dtype='int32')
+        self.loop_vert: np.ndarray = np.empty(0, dtype='int32')
+        self.uv_co: np.ndarray = np.empty((0, 2), dtype='float32')
+        self.vert_co: np.ndarray = np.empty((0, 3), dtype='float32')
+        self.edge_seam: np.ndarray = np.empty(0, dtype=bool)
+        self.edge_sharp: np.ndarray = np.empty(0, dtype=bool)
+        self.face_material: np.ndarray = np.empty(0, dtype='int32')
+        self.face_hide: np.ndarray = np.empty(0, dtype=bool)
+        self.face_select: np.ndarray = np.empty(0, dtype=bool)
+        self.face_normal: np.ndarray = np.empty((0, 3), dtype='float32')
+        self._uv_keys: np.ndarray | None = None
+        self._radial_pairs: tuple[np.ndarray, np.ndarray] | None = None
+
+    @classmethod
+    def from_bmesh(cls, bm: bmesh.types.BMesh, uv: bmesh.types.BMLayerItem) -> 'MeshArrays | None':
+        """Return None when the scratch mesh can't be written (e.g. restricted draw context)"""
+        try:
+            me = scratch_mesh()
+            bm.to_mesh(me)
+        except (AttributeError, RuntimeError, ValueError):
+            return None
+
+        try:
+            return cls.from_mesh(me, uv.name)
+        finally:
+            me.clear_geometry()
+
+    @classmethod
+    def from_mesh(cls, me: bpy.types.Mesh, uv_name: str) -> 'MeshArrays | None':
+        """Return None when the mesh has no such UV map"""
+        attributes = me.attributes
+        if uv_name not in attributes:
+            return None
+        self = cls()
+        face_count = len(me.polygons)
+        loop_count = len(me.loops)
+        edge_count = len(me.edges)
+
+        self.face_count = face_count
+        self.loop_start = np.empty(face_count, dtype='int32')
+        me.polygons.foreach_get('loop_start', self.loop_start)
+        self.loop_total = np.diff(self.loop_start, append=np.int32(loop_count)).astype('int32')
+
+        self.face_material = get_attribute(attributes, 'material_index', face_count, 'int32', 'value')
+        self.face_hide = get_attribute(attributes, '.hide_poly', face_count, bool, 'value')
+        self.face_select = get_attribute(attributes, '.select_poly', face_count, bool, 'value')
+        self.face_normal = np.empty(face_count * 3, dtype='float32')
+        if hasattr(me, 'polygon_normals'):
+            me.polygon_normals.foreach_get('vector', self.face_normal)
+        else:
+            me.polygons.foreach_get('normal', self.face_normal)
+        self.face_normal.shape = (face_count, 3)
+
+        self.loop_edge = get_attribute(attributes, '.corner_edge', loop_count, 'int32', 'value')
+        self.loop_vert = get_attribute(attributes, '.corner_vert', loop_count, 'int32', 'value')
+        self.uv_co = get_attribute(attributes, uv_name, loop_count, 'float32', 'vector', 2)
+        self.vert_co = get_attribute(attributes, 'position', len(me.vertices), 'float32', 'vector', 3)
+
+        if 'uv_seam' in attributes:  # Blender 4.5+
+            self.edge_seam = get_attribute(attributes, 'uv_seam', edge_count, bool, 'value')
+        else:
+            self.edge_seam = np.empty(edge_count, dtype=bool)
+            me.edges.foreach_get('use_seam', self.edge_seam)
+        self.edge_sharp = get_attribute(attributes, 'sharp_edge', edge_count, bool, 'value')
+
+        self.loop_face = np.repeat(np.arange(face_count, dtype='int32'), self.loop_total)
+        self.loop_next = np.arange(1, loop_count + 1, dtype='int32')
+        self.loop_next[self.loop_start + self.loop_total - 1] = self.loop_start
+        return self
+
+    @property
+    def uv_keys(self) -> np.ndarray:
+        if self._uv_keys is None:
+            self._uv_keys = uv_ulp_keys(self.uv_co)
+        return self._uv_keys
+
+    @property
+    def radial_pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """Every unordered pair of corners that share an edge"""
+        if self._radial_pairs is None:
+            order = np.argsort(self.loop_edge, kind='stable')
+            edges = self.loop_edge[order]
+            pairs_a = []
+            pairs_b = []
+            offset = 1
+            while offset < len(order):
+                same = edges[:-offset] == edges[offset:]
+                if not same.any():
+                    break
+                pairs_a.append(order[:-offset][same])
+                pairs_b.append(order[offset:][same])
+                offset += 1
+            if pairs_a:
+                self._radial_pairs = (np.concatenate(pairs_a), np.concatenate(pairs_b))
+            else:
+                empty = np.empty(0, dtype=order.dtype)
+                self._radial_pairs = (empty, empty)
+        return self._radial_pairs
+
+    def calc_face_angles(self, face_a: np.ndarray, face_b: np.ndarray) -> np.ndarray:
+        """Same as angle_normalized_v3v3, which BMEdge.calc_face_angle uses"""
+        no_a = self.face_normal[face_a]
+        no_b = self.face_normal[face_b]
+        dot = np.einsum('ij,ij->i', no_a, no_b)
+        same_side = 2.0 * np.arcsin(np.clip(np.linalg.norm(no_a - no_b, axis=1) * 0.5, 0.0, 1.0))
+        opposite = math.pi - 2.0 * np.arcsin(np.clip(np.linalg.norm(no_a + no_b, axis=1) * 0.5, 0.0, 1.0))
+        return np.where(dot >= 0.0, same_side, opposite)
+
+    def calc_linked_face_pairs(self, face_tags: np.ndarray, mode: str, angle: float = math.pi) -> tuple[np.ndarray, np.ndarray]:
+        """Pairs of tagged faces that are UV-connected through a shared edge"""
+        crn_a, crn_b = self.radial_pairs
+        face_a = self.loop_face[crn_a]
+        face_b = self.loop_face[crn_b]
+        mask = face_tags[face_a] & face_tags[face_b] & (face_a != face_b)
+
+        if mode in (MODE_SEAM, MODE_SEAM_MATERIAL, MODE_ALL):
+            mask &= ~self.edge_seam[self.loop_edge[crn_a]]
+        if mode in (MODE_SEAM_MATERIAL, MODE_ALL):
+            mask &= self.face_material[face_a] == self.face_material[face_b]
+        if mode == MODE_ALL:
+            edges = self.loop_edge[crn_a]
+            mask &= ~self.edge_sharp[edges]
+            # Face angle is only defined for manifold edges
+            mask &= np.bincount(self.loop_edge, minlength=len(self.edge_seam))[edges] == 2
+            candidates = np.flatnonzero(mask)
+            mask[candidates] = self.calc_face_angles(face_a[candidates], face_b[candidates]) < angle
+
+        crn_a = crn_a[mask]
+        crn_b = crn_b[mask]
+        keys = self.uv_keys
+        nxt = self.loop_next
+        linked_start = uv_keys_equal(keys[crn_a], keys[nxt[crn_b]])
+        linked_end = uv_keys_equal(keys[nxt[crn_a]], keys[crn_b])
+        if mode == MODE_NON_MANIFOLD:
+            linked = linked_start | linked_end
+        else:
+            linked = linked_start & linked_end
+        return face_a[mask][linked], face_b[mask][linked]
+
+
+def calc_components(count: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Union-find by hooking roots to the smaller root and pointer jumping.
+    Every element ends up pointing to the smallest index of its component.
+    """
+    parent = np.arange(count)
+    a = np.asarray(a, dtype=parent.dtype)
+    b = np.asarray(b, dtype=parent.dtype)
+    while len(a):
+        root_a = parent[a]
+        root_b = parent[b]
+        unlinked = root_a != root_b
+        if not unlinked.any():
+            break
+        a = a[unlinked]
+        b = b[unlinked]
+        root_a = root_a[unlinked]
+        root_b = root_b[unlinked]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+    return parent
+
+
+def calc_island_face_order(arrays: MeshArrays, face_tags: np.ndarray, mode: str,
+                           angle: float = math.pi) -> tuple[np.ndarray, np.ndarray]:
+    """Tagged face indices grouped by island and the island start offsets into them.
+    Islands are ordered by their first face, faces inside an island by index.
+    """
+    tagged = np.flatnonzero(face_tags)
+    if not len(tagged):
+        return tagged, np.empty(0, dtype=tagged.dtype)
+    face_a, face_b = arrays.calc_linked_face_pairs(face_tags, mode, angle)
+    labels = calc_components(arrays.face_count, face_a, face_b)[tagged]
+    order = np.argsort(labels, kind='stable')
+    labels = labels[order]
+    starts = np.flatnonzero(np.diff(labels, prepend=-1))
+    return tagged[order], starts
+
+
+def calc_island_face_indices(arrays: MeshArrays, face_tags: np.ndarray, mode: str,
+                             angle: float = math.pi) -> list[np.ndarray]:
+    """Face indices per island"""
+    face_order, starts = calc_island_face_order(arrays, face_tags, mode, angle)
+    return np.split(face_order, starts[1:])
+
+
+@trace.traced('ISLAND')
+def calc_islands(umesh, mode: str) -> list[list[bmesh.types.BMFace]] | None:
+    """Drop-in for the IslandsBase flood fills: islands from tagged faces, resets face tags.
+    Returns None when the engine can't be used and the caller should fall back.
+    """
+    bm = umesh.bm
+    if not isinstance(bm, bmesh.types.BMesh) or len(bm.faces) < MIN_FACES:
+        return None
+
+    faces = list(bm.faces)
+    face_tags = np.fromiter((f.tag for f in faces), dtype=bool, count=len(faces))
+    if not face_tags.any():
+        return []
+
+    if (arrays := MeshArrays.from_bmesh(bm, umesh.uv)) is None:
+        return None
+    angle = umesh.value if mode == MODE_ALL else math.pi
+    # A hit skips the linking and the union-find, the mesh copy is needed for the content digest
+    key = island_cache.make_key(umesh, mode, angle, face_tags, arrays)
+    if (entry := island_cache.island_cache.get(key, umesh)) is not None:
+        face_order, starts = entry.face_order, entry.starts
+    else:
+        face_order, starts = calc_island_face_order(arrays, face_tags, mode, angle)
+        island_cache.island_cache.put(key, face_order, starts, umesh)
+
+    ordered_faces = [faces[i] for i in face_order.tolist()]
+    for f in ordered_faces:
+        f.tag = False
+    bounds = starts.tolist()
+    bounds.append(len(ordered_faces))
+    return [ordered_faces[start:end] for start, end in zip(bounds, bounds[1:])]
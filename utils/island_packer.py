@@ -0,0 +1,382 @@
+"""
+Built-in island packer
+
+Packs the bounding rectangles of UV islands with a bottom-left skyline in pixel
+space (U and V scaled by the texture size, so padding is exact in pixels and
+90 degree rotations keep the texel density on non-square textures). The skyline
+is a pair of segment arrays, every placement scores all segment anchors for
+both orientations in a single vectorized pass. Past a few thousand rects the
+small ones are laid out in shelves first (cumulative widths split with
+searchsorted), so the skyline only sees a bounded number of items. When scaling
+is enabled, the largest island scale that still fits the target is found with a
+few packing passes seeded from the island areas. Needs no dialogs, operators or
+add-ons.
+"""
+
+import math
+
+import bmesh
+import numpy as np
+from mathutils.geometry import box_fit_2d
+
+from . import island_engine
+from . import trace
+
+
+# Packing passes while searching the largest scale that fits
+MAX_SCALE_PASSES = 8
+# Stop the scale search once the layout fills this much of the target height
+SCALE_FIT_TOLERANCE = 0.98
+# Fill estimate for the first scale pass
+INITIAL_FILL = 0.75
+# Above this many rects the small ones are grouped into shelves before the skyline
+MAX_SKYLINE_RECTS = 2000
+
+
+class PackMesh:
+    """Corners of the islands of one mesh that are packed, in island order"""
+
+    def __init__(self, umesh):
+        self.umesh = umesh
+        self.faces: np.ndarray = np.empty(0, dtype='int64')  # Face indices in island order, corners follow them
+        self.corner_indices: np.ndarray = np.empty(0, dtype='int32')
+        self.corner_islands: np.ndarray = np.empty(0, dtype='int32')  # Local island index per corner
+        self.uv_co: np.ndarray = np.empty((0, 2), dtype='float64')  # UVs of the corners
+        self.island_count = 0
+        self.island_area_3d: np.ndarray = np.empty(0, dtype='float64')
+        self.island_area_uv: np.ndarray = np.empty(0, dtype='float64')
+        self.island_groups: np.ndarray = np.empty(0, dtype='int64')  # Stack group id, -1 when not stacked
+
+
+def collect_pack_mesh(umesh, island_faces: list[list[bmesh.types.BMFace]], face_groups: dict[int, int] | None = None) -> PackMesh | None:
+    """Corner arrays of the islands, face_groups maps a face index to a stack group id"""
+    from ..checker.td_utils import TexelDensityFactory
+
+    bm = umesh.bm
+    if (arrays := island_engine.MeshArrays.from_bmesh(bm, umesh.uv)) is None:
+        return None
+    bm.faces.index_update()
+
+    sizes = np.fromiter((len(faces) for faces in island_faces), dtype='int64', count=len(island_faces))
+    faces = np.fromiter((f.index for faces in island_faces for f in faces), dtype='int64', count=int(sizes.sum()))
+    face_islands = np.repeat(np.arange(len(sizes)), sizes)
+
+    corner_counts = arrays.loop_total[faces]
+    corners = np.repeat(arrays.loop_start[faces] - (np.cumsum(corner_counts) - corner_counts), corner_counts) + np.arange(corner_counts.sum())
+
+    data = PackMesh(umesh)
+    data.island_count = len(sizes)
+    data.faces = faces
+    data.corner_indices = corners.astype('int32')
+    data.corner_islands = np.repeat(face_islands, corner_counts).astype('int32')
+    data.uv_co = arrays.uv_co[corners].astype('float64')
+
+    area_3d, area_uv = TexelDensityFactory.calc_faces_areas(arrays)
+    data.island_area_3d = np.bincount(face_islands, area_3d[faces], minlength=data.island_count)
+    data.island_area_uv = np.bincount(face_islands, area_uv[faces], minlength=data.island_count)
+
+    data.island_groups = np.full(data.island_count, -1, dtype='int64')
+    if face_groups:
+        group_faces = np.fromiter(face_groups.keys(), dtype='int64', count=len(face_groups))
+        group_ids = np.fromiter(face_groups.values(), dtype='int64', count=len(face_groups))
+        valid = group_faces < arrays.face_count
+        groups = np.full(arrays.face_count, -1, dtype='int64')
+        groups[group_faces[valid]] = group_ids[valid]
+        np.maximum.at(data.island_groups, face_islands, groups[faces])
+    return data
+
+
+def _pack_skyline(sizes: np.ndarray, width: float, can_rotate: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Bottom-left skyline in a strip of the given width, rects are placed in the given order.
+    Rects wider than the strip are placed at the left border above everything else.
+    """
+    count = len(sizes)
+    positions = np.zeros((count, 2), dtype='float64')
+    rotated = np.zeros(count, dtype=bool)
+    eps = width * 1e-9
+
+    # Segment i covers [seg_x[i], seg_x[i + 1]) at height seg_y[i], seg_y has a trailing sentinel for reduceat
+    seg_x = np.zeros(1, dtype='float64')
+    seg_y = np.zeros(2, dtype='float64')
+
+    for i, ((rect_w, rect_h), rotatable) in enumerate(zip(sizes.tolist(), can_rotate.tolist())):
+        if rotatable and rect_w != rect_h:
+            rect_ws = np.array((rect_w, rect_h))
+            rect_hs = np.array((rect_h, rect_w))
+        else:
+            rect_ws = np.array((rect_w,))
+            rect_hs = np.array((rect_h,))
+        seg_count = len(seg_x)
+        starts = np.tile(np.arange(seg_count), len(rect_ws))
+        ends = np.repeat(rect_ws, seg_count) + seg_x[starts]
+        fits = ends <= width + eps
+        if fits.any():
+            starts = starts[fits]
+            stops = np.searchsorted(seg_x, ends[fits] - eps)
+            bottoms = np.maximum.reduceat(seg_y, np.stack((starts, stops), axis=1).ravel())[::2]
+            orient = np.repeat(np.arange(len(rect_ws)), seg_count)[fits]
+            best = int(np.argmin(bottoms + rect_hs[orient]))
+            anchor = int(starts[best])
+            stop = int(stops[best])
+            x = float(seg_x[anchor])
+            y = float(bottoms[best])
+            is_rotated = bool(orient[best])
+        else:
+            # Too wide for the strip, place the narrower side along the width
+            is_rotated = bool(rotatable and rect_h < rect_w)
+            anchor = 0
+            stop = seg_count
+            x = 0.0
+            y = float(seg_y[:-1].max())
+
+        if is_rotated:
+            rect_w, rect_h = rect_h, rect_w
+        positions[i] = x, y
+        rotated[i] = is_rotated
+        top = y + rect_h
+        end = x + rect_w
+
+        # Replace the covered segments, the last one continues after the rect when it's longer
+        tail_x = seg_x[stop] if stop < seg_count else width
+        new_x = [x]
+        new_y = [top]
+        if end < tail_x - eps:
+            new_x.append(end)
+            new_y.append(float(seg_y[stop - 1]))
+        seg_x = np.concatenate((seg_x[:anchor], new_x, seg_x[stop:]))
+        seg_y = np.concatenate((seg_y[:anchor], new_y, seg_y[stop:]))
+        # Neighbours at the same height are one segment
+        keep = np.empty(len(seg_x), dtype=bool)
+        keep[0] = True
+        np.not_equal(seg_y[1:-1], seg_y[:-2], out=keep[1:])
+        if not keep.all():
+            seg_x = seg_x[keep]
+            seg_y = seg_y[np.append(keep, True)]
+
+    return positions, rotated
+
+
+def _build_shelves(sizes: np.ndarray, shelf_width: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Next fit rows of rects sorted by height, returns the shelf sizes, the shelf and x offset per rect"""
+    ends = np.cumsum(sizes[:, 0])
+    row_starts = []
+    start = 0
+    while start < len(sizes):
+        row_starts.append(start)
+        base = ends[start] - sizes[start, 0]
+        start = max(int(np.searchsorted(ends, base + shelf_width, side='right')), start + 1)
+    row_starts = np.array(row_starts)
+    row_ends = np.append(row_starts[1:], len(sizes))
+
+    row_base = ends[row_starts] - sizes[row_starts, 0]
+    shelf_sizes = np.stack((ends[row_ends - 1] - row_base, sizes[row_starts, 1]), axis=1)
+    rect_shelves = np.repeat(np.arange(len(row_starts)), row_ends - row_starts)
+    offsets = ends - sizes[:, 0] - row_base[rect_shelves]
+    return shelf_sizes, rect_shelves, offsets
+
+
+def pack_rects(sizes: np.ndarray, width: float, rotate: bool) -> tuple[np.ndarray, np.ndarray, float]:
+    """Pack rects (N, 2) into a strip of the given width, largest first.
+    Returns the positions (N, 2), the rects placed rotated by 90 degrees and the used height.
+
+    Above MAX_SKYLINE_RECTS only the largest rects are placed one by one, the rest is
+    laid out in shelves of similar height first, which then go into the skyline as one rect.
+    """
+    count = len(sizes)
+    if not count:
+        return np.zeros((0, 2), dtype='float64'), np.zeros(0, dtype=bool), 0.0
+
+    sizes = np.asarray(sizes, dtype='float64')
+    sort_key = sizes.max(axis=1) if rotate else sizes[:, 1]
+    order = np.lexsort((np.arange(count), -sizes.min(axis=1), -sort_key))
+    positions = np.empty((count, 2), dtype='float64')
+    rotated = np.zeros(count, dtype=bool)
+
+    single = order[:MAX_SKYLINE_RECTS // 2] if count > MAX_SKYLINE_RECTS else order
+    shelved = order[len(single):]
+
+    items = sizes[single]
+    can_rotate = np.full(len(single), rotate)
+    if len(shelved):
+        shelved_sizes = sizes[shelved]
+        if rotate:
+            # Landscape keeps shelves low
+            shelved_rotated = shelved_sizes[:, 1] > shelved_sizes[:, 0]
+            shelved_sizes = np.where(shelved_rotated[:, None], shelved_sizes[:, ::-1], shelved_sizes)
+            rotated[shelved] = shelved_rotated
+        by_height = np.lexsort((np.arange(len(shelved)), -shelved_sizes[:, 0], -shelved_sizes[:, 1]))
+        shelved = shelved[by_height]
+        shelved_sizes = shelved_sizes[by_height]
+
+        # Shelves a whole fraction of the strip wide tile it without gaps
+        shelf_width = max(shelved_sizes[:, 0].sum() / (MAX_SKYLINE_RECTS // 2), shelved_sizes[:, 0].max())
+        shelf_width = width / max(math.floor(width / shelf_width), 1) if shelf_width < width else shelf_width
+        shelf_sizes, rect_shelves, offsets = _build_shelves(shelved_sizes, shelf_width)
+        items = np.concatenate((items, shelf_sizes))
+        can_rotate = np.concatenate((can_rotate, np.zeros(len(shelf_sizes), dtype=bool)))
+
+    item_positions, item_rotated = _pack_skyline(items, width, can_rotate)
+    positions[single] = item_positions[:len(single)]
+    rotated[single] = item_rotated[:len(single)]
+    if len(shelved):
+        positions[shelved] = item_positions[len(single):][rect_shelves]
+        positions[shelved, 0] += offsets
+
+    placed = np.where(rotated[:, None], sizes[:, ::-1], sizes)
+    return positions, rotated, float((positions[:, 1] + placed[:, 1]).max())
+
+
+def calc_target_bounds(meshes: list[PackMesh], udim_source: str, active_tile: tuple[int, int] = (0, 0)) -> tuple[np.ndarray, np.ndarray]:
+    """Min and max UV of the area the islands are packed into"""
+    if udim_source == 'ORIGINAL_AABB':
+        uv_co = np.concatenate([data.uv_co for data in meshes])
+        bbox_min = uv_co.min(axis=0)
+        bbox_max = uv_co.max(axis=0)
+        if (bbox_max - bbox_min).min() > 0.0:
+            return bbox_min, bbox_max
+        tile = np.floor(bbox_min)
+    elif udim_source == 'ACTIVE_UDIM':
+        tile = np.array(active_tile, dtype='float64')
+    else:
+        # Tile under the center of the selection
+        uv_co = np.concatenate([data.uv_co for data in meshes])
+        tile = np.floor((uv_co.min(axis=0) + uv_co.max(axis=0)) / 2)
+        tile = np.array((min(max(tile[0], 0.0), 9.0), max(tile[1], 0.0)))
+    return tile, tile + 1.0
+
+
+def _calc_orient_angles(uv_co: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Angle per island that rotates it to its minimal bounding rectangle"""
+    bounds = np.append(starts, len(uv_co)).tolist()
+    return np.array([box_fit_2d(uv_co[start:end].tolist()) if end - start > 2 else 0.0
+                     for start, end in zip(bounds[:-1], bounds[1:])], dtype='float64')
+
+
+def _calc_max_scale(sizes: np.ndarray, padding: float, width: float, height: float, rotate: bool) -> float:
+    """Largest scale at which every rect fits the target on its own"""
+    with np.errstate(divide='ignore'):
+        fit = np.minimum((width - padding) / sizes[:, 0], (height - padding) / sizes[:, 1])
+        if rotate:
+            fit = np.maximum(fit, np.minimum((width - padding) / sizes[:, 1], (height - padding) / sizes[:, 0]))
+    return float(fit.min())
+
+
+def _calc_initial_scale(sizes: np.ndarray, padding: float, width: float, height: float) -> float:
+    """Scale at which the padded rect areas add up to INITIAL_FILL of the target"""
+    area = float((sizes[:, 0] * sizes[:, 1]).sum())
+    perimeter = float(sizes.sum()) * padding
+    rest = len(sizes) * padding * padding - width * height * INITIAL_FILL
+    return (-perimeter + math.sqrt(max(perimeter * perimeter - 4.0 * area * rest, 0.0))) / (2.0 * area)
+
+
+def fit_rects(sizes: np.ndarray, padding: float, width: float, height: float, rotate: bool) -> tuple[float, np.ndarray, np.ndarray, float]:
+    """Search the largest scale at which the padded rects fit into width x height.
+    Returns the scale, positions, rotated flags and a factor < 1 for the whole layout
+    when even the smallest tried scale overflows (padding alone fills the target).
+    """
+    max_scale = _calc_max_scale(sizes, padding, width, height, rotate)
+    if not sizes.any() or max_scale <= 0.0:
+        positions, rotated, used = pack_rects(sizes + padding, width, rotate)
+        return 1.0, positions, rotated, min(height / used, 1.0) if used > 0.0 else 1.0
+
+    scale = min(_calc_initial_scale(sizes, padding, width, height), max_scale)
+    fits_scale = 0.0
+    fails_scale = math.inf
+    best = None
+    last = None
+    for _ in range(MAX_SCALE_PASSES):
+        positions, rotated, used = pack_rects(sizes * scale + padding, width, rotate)
+        last = scale, positions, rotated, used
+        if used <= height * (1.0 + 1e-9):
+            fits_scale = scale
+            best = scale, positions, rotated
+            if used >= height * SCALE_FIT_TOLERANCE or scale >= max_scale:
+                break
+        else:
+            fails_scale = scale
+
+        # With a fixed width the used height grows with the island area
+        scale *= math.sqrt(height / used) if used > 0.0 else 2.0
+        if not fits_scale < scale < fails_scale:
+            scale = (fits_scale + fails_scale) / 2 if fails_scale < math.inf else fits_scale * 1.1
+        scale = min(scale, max_scale)
+        if fails_scale < math.inf and fails_scale - fits_scale <= fails_scale * 1e-3:
+            break
+
+    if best is not None:
+        return *best, 1.0
+    scale, positions, rotated, used = last
+    return scale, positions, rotated, height / used
+
+
+@trace.traced('PACK')
+def pack_islands(meshes: list[PackMesh], bounds: tuple[np.ndarray, np.ndarray], image_size: tuple[int, int], padding: float,
+                 scale=True, normalize=False, rotate=True, orient=False):
+    """Pack the islands of all meshes into bounds (UV min, max).
+
+    Islands with the same stack group id are packed as one rect and stacked on their centers.
+    Orient pre-rotates every island to its minimal bounding rectangle,
+    rotate allows 90 degree steps during placement.
+    """
+    size = np.array(image_size, dtype='float64')
+    uv_co = np.concatenate([data.uv_co for data in meshes]) * size
+    island_offsets = np.cumsum([0] + [data.island_count for data in meshes])
+    corner_islands = np.concatenate([data.corner_islands + offset for data, offset in zip(meshes, island_offsets)])
+    island_count = int(island_offsets[-1])
+    starts = np.searchsorted(corner_islands, np.arange(island_count))
+
+    if scale and normalize:
+        area_3d = np.concatenate([data.island_area_3d for data in meshes])
+        area_uv = np.concatenate([data.island_area_uv for data in meshes]) * size.prod()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            factors = np.sqrt(area_3d / area_uv)
+        valid = np.isfinite(factors) & (factors > 0.0)
+        factors = np.where(valid, factors / (np.median(factors[valid]) if valid.any() else 1.0), 1.0)
+        uv_co *= factors[corner_islands, None]
+
+    if orient:
+        angles = _calc_orient_angles(uv_co, starts)[corner_islands]
+        cos = np.cos(angles)
+        sin = np.sin(angles)
+        uv_co = np.stack((uv_co[:, 0] * cos - uv_co[:, 1] * sin, uv_co[:, 0] * sin + uv_co[:, 1] * cos), axis=1)
+
+    island_min = np.minimum.reduceat(uv_co, starts)
+    island_size = np.maximum.reduceat(uv_co, starts) - island_min
+
+    # Stacked islands share one rect, the largest of their sizes
+    groups = np.concatenate([data.island_groups for data in meshes])
+    keys = np.where(groups >= 0, groups, groups.max(initial=-1) + 1 + np.arange(island_count))
+    _, island_units = np.unique(keys, return_inverse=True)
+    unit_size = np.zeros((island_units.max() + 1, 2), dtype='float64')
+    np.maximum.at(unit_size, island_units, island_size)
+
+    target_min = bounds[0] * size
+    width, height = (bounds[1] - bounds[0]) * size
+    if scale:
+        factor, positions, rotated, layout_factor = fit_rects(unit_size, padding, width, height, rotate)
+    else:
+        factor = layout_factor = 1.0
+        positions, rotated, _ = pack_rects(unit_size + padding, width, rotate)
+
+    corner_units = island_units[corner_islands]
+    local = (uv_co - island_min[corner_islands]) * factor
+    local += (unit_size[corner_units] - island_size[corner_islands]) * (factor / 2)
+    corner_rotated = rotated[corner_units]
+    unit_height = unit_size[corner_units, 1] * factor
+    local[corner_rotated] = np.stack((unit_height[corner_rotated] - local[corner_rotated, 1], local[corner_rotated, 0]), axis=1)
+    packed = (positions[corner_units] + padding / 2 + local) * layout_factor
+    packed = (packed + target_min) / size
+
+    for data, packed_uv in zip(meshes, np.split(packed, np.cumsum([len(data.uv_co) for data in meshes])[:-1])):
+        _write_corner_uvs(data, packed_uv)
+
+
+def _write_corner_uvs(data: PackMesh, corner_uvs: np.ndarray):
+    """Write the packed UVs through the loops of the packed faces, in the order they were collected"""
+    uv = data.umesh.uv
+    bm_faces = data.umesh.bm.faces
+    bm_faces.ensure_lookup_table()
+    coords = iter(corner_uvs.tolist())
+    for face_index in data.faces.tolist():
+        for crn in bm_faces[face_index].loops:
+            crn[uv].uv = next(coords)
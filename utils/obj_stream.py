@@ -0,0 +1,220 @@
+"""
+Streaming OBJ bridge for external unwrappers
+
+Dumps the selected faces of edit meshes into a minimal OBJ (positions, normals,
+faces) straight from foreach_get arrays of the island engine scratch mesh, with
+vertices split along seams the way bmesh.ops.split_edges would. The unwrapped
+OBJ is parsed back into per-corner UVs with NumPy and written through the loops
+of the exported faces, so no temporary objects, mode switches or OBJ importer
+are involved.
+"""
+
+import bpy
+import bmesh
+import numpy as np
+
+from . import island_engine
+
+
+# Rows formatted per string operation when writing
+WRITE_CHUNK_SIZE = 1 << 16
+
+
+class UnwrapMeshData:
+    """Selected faces of one mesh in the order they are written to the OBJ"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.positions: np.ndarray = np.empty((0, 3), dtype='float32')
+        self.normals: np.ndarray = np.empty((0, 3), dtype='float32')
+        self.face_sizes: np.ndarray = np.empty(0, dtype='int32')
+        self.faces: np.ndarray = np.empty(0, dtype='int32')  # Mesh face per written face
+        self.corner_indices: np.ndarray = np.empty(0, dtype='int32')  # Mesh loop per written corner
+        self.corner_verts: np.ndarray = np.empty(0, dtype='int32')  # Index into positions
+        self.corner_normals: np.ndarray = np.empty(0, dtype='int32')  # Index into normals
+
+    @property
+    def face_count(self) -> int:
+        return len(self.face_sizes)
+
+    @property
+    def corner_count(self) -> int:
+        return len(self.corner_indices)
+
+
+def _calc_split_vert_keys(arrays: island_engine.MeshArrays, loops: np.ndarray, face_tags: np.ndarray) -> np.ndarray:
+    """Per corner vertex key, vertices on seams are split into fans that are connected through non-seam edges"""
+    vert_count = len(arrays.vert_co)
+    corner_vert = arrays.loop_vert
+
+    # Only edges between two selected faces keep their vertices welded
+    crn_a, crn_b = arrays.radial_pairs
+    face_a = arrays.loop_face[crn_a]
+    face_b = arrays.loop_face[crn_b]
+    inner = face_tags[face_a] & face_tags[face_b] & (face_a != face_b)
+    seam = inner & arrays.edge_seam[arrays.loop_edge[crn_a]]
+
+    seam_verts = np.zeros(vert_count, dtype=bool)
+    seam_edge_corners = crn_a[seam]
+    seam_verts[corner_vert[seam_edge_corners]] = True
+    seam_verts[corner_vert[arrays.loop_next[seam_edge_corners]]] = True
+
+    crn_a = crn_a[inner & ~seam]
+    crn_b = crn_b[inner & ~seam]
+    nxt = arrays.loop_next
+    link_a = []
+    link_b = []
+    for side_a in (crn_a, nxt[crn_a]):
+        for side_b in (crn_b, nxt[crn_b]):
+            same = corner_vert[side_a] == corner_vert[side_b]
+            link_a.append(side_a[same])
+            link_b.append(side_b[same])
+    labels = island_engine.calc_components(len(corner_vert), np.concatenate(link_a), np.concatenate(link_b))
+
+    verts = corner_vert[loops]
+    return np.where(seam_verts[verts], vert_count + labels[loops], verts)
+
+
+def _calc_normals(me: bpy.types.Mesh) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vertex normals, face normals and per face smooth flags"""
+    face_count = len(me.polygons)
+    vert_normals = np.empty(len(me.vertices) * 3, dtype='float32')
+    if hasattr(me, 'vertex_normals'):
+        me.vertex_normals.foreach_get('vector', vert_normals)
+    else:
+        me.vertices.foreach_get('normal', vert_normals)
+
+    face_normals = np.empty(face_count * 3, dtype='float32')
+    if hasattr(me, 'polygon_normals'):
+        me.polygon_normals.foreach_get('vector', face_normals)
+    else:
+        me.polygons.foreach_get('normal', face_normals)
+
+    if bpy.app.version >= (4, 1, 0):
+        smooth = ~island_engine.get_attribute(me.attributes, 'sharp_face', face_count, bool, 'value')
+    else:
+        smooth = np.empty(face_count, dtype=bool)
+        me.polygons.foreach_get('use_smooth', smooth)
+    return vert_normals.reshape(-1, 3), face_normals.reshape(-1, 3), smooth
+
+
+def collect_unwrap_data(bm: bmesh.types.BMesh, name: str) -> UnwrapMeshData | None:
+    """Selected faces of the bmesh, None when nothing is selected.
+    Faces are grouped by size, so that every group is written with a single format string.
+    """
+    uv = bm.loops.layers.uv.verify()
+    arrays = island_engine.MeshArrays.from_bmesh(bm, uv)
+    if arrays is None:
+        return None
+
+    me = island_engine.scratch_mesh()
+    try:
+        bm.to_mesh(me)
+        face_tags = island_engine.get_attribute(me.attributes, '.select_poly', len(me.polygons), bool, 'value')
+        vert_normals, face_normals, smooth = _calc_normals(me)
+    finally:
+        me.clear_geometry()
+
+    faces = np.flatnonzero(face_tags)
+    if not len(faces):
+        return None
+    faces = faces[np.argsort(arrays.loop_total[faces], kind='stable')]
+
+    sizes = arrays.loop_total[faces]
+    corner_face = np.repeat(faces, sizes)
+    loops = np.repeat(arrays.loop_start[faces] - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+
+    data = UnwrapMeshData(name)
+    data.face_sizes = sizes.astype('int32')
+    data.faces = faces.astype('int32')
+    data.corner_indices = loops.astype('int32')
+
+    vert_keys, corner_verts = np.unique(_calc_split_vert_keys(arrays, loops, face_tags), return_inverse=True)
+    vert_count = len(arrays.vert_co)
+    source_verts = np.where(vert_keys < vert_count, vert_keys, arrays.loop_vert[np.maximum(vert_keys - vert_count, 0)])
+    data.positions = arrays.vert_co[source_verts]
+    data.corner_verts = corner_verts.astype('int32')
+
+    # Smooth faces use the normals of their (split) vertices, flat faces their face normal
+    data.normals = np.concatenate((vert_normals[source_verts], face_normals[faces]))
+    face_slot = np.repeat(np.arange(len(faces)), sizes)
+    data.corner_normals = np.where(smooth[corner_face], corner_verts, len(source_verts) + face_slot).astype('int32')
+    return data
+
+
+def _write_rows(file, fmt: str, rows: np.ndarray):
+    """Format every row with the same format string, a chunk at a time"""
+    rows = rows.reshape(len(rows), -1)
+    for start in range(0, len(rows), WRITE_CHUNK_SIZE):
+        chunk = rows[start:start + WRITE_CHUNK_SIZE]
+        file.write((fmt * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def write_obj(filepath: str, meshes: list[UnwrapMeshData]):
+    """Minimal Y-up OBJ with one object per mesh, same axes as the OBJ exporter defaults"""
+    with open(filepath, 'w', encoding='utf-8', newline='\n') as file:
+        vert_offset = 1
+        normal_offset = 1
+        for data in meshes:
+            file.write(f"o {data.name}\n")
+            _write_rows(file, "v %.6f %.6f %.6f\n", data.positions[:, (0, 2, 1)] * (1, 1, -1))
+            _write_rows(file, "vn %.4f %.4f %.4f\n", data.normals[:, (0, 2, 1)] * (1, 1, -1))
+
+            corners = np.stack((data.corner_verts + vert_offset, data.corner_normals + normal_offset), axis=1)
+            face_ends = np.cumsum(data.face_sizes)
+            group_starts = np.flatnonzero(np.diff(data.face_sizes, prepend=-1))
+            for group_start, group_end in zip(group_starts, np.append(group_starts[1:], data.face_count)):
+                size = int(data.face_sizes[group_start])
+                corner_start = face_ends[group_start] - size
+                group = corners[corner_start:face_ends[group_end - 1]].reshape(-1, size * 2)
+                _write_rows(file, "f" + " %d//%d" * size + "\n", group)
+
+            vert_offset += len(data.positions)
+            normal_offset += len(data.normals)
+
+
+def read_obj_uvs(filepath: str) -> tuple[np.ndarray, np.ndarray]:
+    """Per corner UVs and face sizes of all faces in file order"""
+    with open(filepath, 'rb') as file:
+        lines = file.read().splitlines()
+
+    uv_lines = [line[3:] for line in lines if line.startswith(b'vt ')]
+    face_lines = [line[2:] for line in lines if line.startswith(b'f ')]
+    if not uv_lines or not face_lines:
+        raise ValueError("No UVs in unwrapped OBJ")
+
+    uv_width = len(uv_lines[0].split())
+    uv_co = np.fromstring(b' '.join(uv_lines), dtype='float64', sep=' ').reshape(-1, uv_width)[:, :2]
+
+    face_sizes = np.array([len(line.split()) for line in face_lines], dtype='int32')
+    first_corner = face_lines[0].split()[0]
+    if first_corner.count(b'/') == 0 or b'//' in first_corner:
+        raise ValueError("Unwrapped OBJ faces have no UV indices")
+    fields = first_corner.count(b'/') + 1
+    corners = np.fromstring(b' '.join(face_lines).replace(b'/', b' '), dtype='int64', sep=' ')
+    uv_indices = corners.reshape(-1, fields)[:, 1]
+    # Negative indices are relative to the end of the list
+    uv_indices = np.where(uv_indices < 0, uv_indices + len(uv_co), uv_indices - 1)
+    return uv_co[uv_indices].astype('float32'), face_sizes
+
+
+def split_corner_uvs(meshes: list[UnwrapMeshData], corner_uvs: np.ndarray, face_sizes: np.ndarray) -> list[np.ndarray]:
+    """Split the UVs of a multi-object OBJ back into per mesh arrays, the face order must be unchanged"""
+    expected = np.concatenate([data.face_sizes for data in meshes])
+    if not np.array_equal(face_sizes, expected):
+        raise ValueError("Unwrapped OBJ topology doesn't match the exported faces")
+    return np.split(corner_uvs, np.cumsum([data.corner_count for data in meshes])[:-1])
+
+
+def apply_corner_uvs(obj: bpy.types.Object, data: UnwrapMeshData, corner_uvs: np.ndarray):
+    """Write the UVs of the exported corners into the active UV map of the edit mesh.
+    The corners of a written face follow its loops, so they are set face by face.
+    """
+    bm = bmesh.from_edit_mesh(obj.data)
+    uv = bm.loops.layers.uv.verify()
+    bm.faces.ensure_lookup_table()
+    coords = iter(corner_uvs.tolist())
+    for face_index in data.faces.tolist():
+        for crn in bm.faces[face_index].loops:
+            crn[uv].uv = next(coords)
+    bmesh.update_edit_mesh(obj.data)
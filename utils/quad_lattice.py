@@ -0,0 +1,315 @@
+"""
+Quad grid lattice engine
+
+Straightens quad islands into rectangular grids on NumPy index arrays. Every
+face of an island gets a (u_index, v_index) cell on an integer lattice and the
+loop that sits on the lower left of the cell, found by a breadth first search
+over the edge rings that starts at the largest face of the island. Faces are
+connected through inner edges: no seam and both sides share their UVs.
+
+Columns and rows are sized by the mean 3D length of their edges, the grid lines
+are the cumulative sums of those sizes scaled to the start face, which keeps its
+UV width and height. Corners are written into a UV array in mesh loop order, so
+the caller writes the changed faces back through uv_transform.CornerUVs.
+"""
+
+import numpy as np
+
+from . import trace
+from .island_engine import MeshArrays, uv_keys_equal
+
+
+# Lattice offset of the cell corners: left down, right down, right up, left up
+CORNER_OFFSETS = np.array(((0, 0), (1, 0), (1, 1), (0, 1)), dtype='int64')
+# Cell corner by offset x + 2 * y
+CORNER_BY_OFFSET = np.array((0, 1, 3, 2), dtype='int64')
+# Neighbour cell across the edge from corner e to e + 1: bottom, right, top, left
+EDGE_DELTAS = np.array(((0, -1), (1, 0), (0, 1), (-1, 0)), dtype='int64')
+
+NORMALIZE_ITERATIONS = 10
+NORMALIZE_TOLERANCE = 1e-5  # Trade accuracy for performance
+
+
+def cross_2d(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]
+
+
+def calc_face_corners(arrays: MeshArrays, faces: np.ndarray) -> np.ndarray:
+    """Mesh loop indices (F, 4) of quad faces"""
+    return arrays.loop_start[faces][:, None] + np.arange(4)
+
+
+def calc_twins(arrays: MeshArrays, faces: np.ndarray, face_islands: np.ndarray) -> np.ndarray:
+    """Loop on the other side of every inner edge of the islands, -1 elsewhere.
+    On non-manifold edges the first UV connected pair wins.
+    """
+    island_of_face = np.full(arrays.face_count, -1, dtype='int64')
+    island_of_face[faces] = face_islands
+
+    crn_a, crn_b = arrays.radial_pairs
+    face_a = arrays.loop_face[crn_a]
+    face_b = arrays.loop_face[crn_b]
+    isl_a = island_of_face[face_a]
+    mask = (isl_a != -1) & (isl_a == island_of_face[face_b]) & (face_a != face_b)
+    mask &= ~arrays.edge_seam[arrays.loop_edge[crn_a]]
+    crn_a = crn_a[mask]
+    crn_b = crn_b[mask]
+
+    keys = arrays.uv_keys
+    nxt = arrays.loop_next
+    linked = uv_keys_equal(keys[crn_a], keys[nxt[crn_b]]) & uv_keys_equal(keys[nxt[crn_a]], keys[crn_b])
+    # Reversed, so that the first pair is written last
+    crn_a = crn_a[linked][::-1]
+    crn_b = crn_b[linked][::-1]
+
+    twins = np.full(len(arrays.loop_face), -1, dtype='int64')
+    twins[crn_b] = crn_a
+    twins[crn_a] = crn_b
+    return twins
+
+
+def calc_seed_faces(uv_co: np.ndarray, corners: np.ndarray, face_islands: np.ndarray) -> np.ndarray:
+    """Position of the first face with the largest UV area in every island"""
+    co = uv_co[corners]
+    vec_a = co[:, 1] - co[:, 0]
+    vec_b = co[:, 2] - co[:, 0]
+    vec_c = co[:, 3] - co[:, 2]
+    vec_d = co[:, 0] - co[:, 2]
+    areas = np.abs(cross_2d(vec_a, vec_b)) + np.abs(cross_2d(vec_c, vec_d))
+
+    order = np.lexsort((-areas, face_islands))
+    return order[np.flatnonzero(np.diff(face_islands[order], prepend=-1))]
+
+
+def calc_seed_shapes(co: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Loop position of the lower left corner, winding and the upper left, upper right and
+    lower left UV (S, 3, 2) of faces (S, 4, 2). The two highest corners are the upper ones,
+    the one with the lower x of a pair is left.
+    """
+    rows = np.arange(len(co))
+    by_height = np.argsort(-co[:, :, 1], axis=1, kind='stable')
+
+    def left_right(pair):
+        first_left = co[rows, pair[:, 0], 0] < co[rows, pair[:, 1], 0]
+        return np.where(first_left, pair[:, 0], pair[:, 1]), np.where(first_left, pair[:, 1], pair[:, 0])
+
+    left_up, right_up = left_right(by_height[:, :2])
+    left_down, right_down = left_right(np.sort(by_height[:, 2:], axis=1))
+
+    ccw = ((right_down - left_down) % 4 == 1) | ((left_up - left_down) % 4 == 3)
+    shape = np.stack((co[rows, left_up], co[rows, right_up], co[rows, left_down]), axis=1)
+    return left_down, np.where(ccw, 1, -1), shape
+
+
+def calc_lattice(arrays: MeshArrays, faces: np.ndarray, twins: np.ndarray, seeds: np.ndarray,
+                 seed_first: np.ndarray, seed_direction: np.ndarray):
+    """Breadth first search over the twins, all islands at once.
+    Returns the cell (F, 2), the loop position of the lower left corner and the
+    winding of every face (1 when the loops run counter-clockwise on the lattice)
+    and the mask of reached faces.
+    """
+    count = len(faces)
+    local = np.full(arrays.face_count, -1, dtype='int64')
+    local[faces] = np.arange(count)
+    starts = arrays.loop_start[faces]
+
+    cells = np.zeros((count, 2), dtype='int64')
+    first = np.zeros(count, dtype='int64')
+    direction = np.ones(count, dtype='int64')
+    reached = np.zeros(count, dtype='bool')
+    first[seeds] = seed_first
+    direction[seeds] = seed_direction
+    reached[seeds] = True
+
+    frontier = seeds
+    while len(frontier):
+        loops = (starts[frontier][:, None] + np.arange(4)).ravel()
+        other = twins[loops]
+        neighbours = np.full(len(loops), -1, dtype='int64')
+        has_twin = other != -1
+        neighbours[has_twin] = local[arrays.loop_face[other[has_twin]]]
+        valid = neighbours != -1
+        valid[valid] = ~reached[neighbours[valid]]
+
+        # First discovery of a face wins, the new frontier keeps the discovery order
+        candidates = np.flatnonzero(valid)
+        _, keep = np.unique(neighbours[candidates], return_index=True)
+        candidates = candidates[np.sort(keep)]
+        src = frontier[candidates // 4]
+        pos = candidates % 4
+        dst = neighbours[candidates]
+
+        src_dir = direction[src]
+        crn_start = (src_dir * (pos - first[src])) % 4
+        crn_end = (src_dir * (pos + 1 - first[src])) % 4
+        delta = EDGE_DELTAS[np.where(crn_end == (crn_start + 1) % 4, crn_start, crn_end)]
+
+        # The twin runs from the end to the start of the shared edge
+        offset = CORNER_OFFSETS[crn_end] - delta
+        dst_crn = CORNER_BY_OFFSET[offset[:, 0] + 2 * offset[:, 1]]
+        offset = CORNER_OFFSETS[crn_start] - delta
+        dst_crn_next = CORNER_BY_OFFSET[offset[:, 0] + 2 * offset[:, 1]]
+        dst_dir = np.where((dst_crn_next - dst_crn) % 4 == 1, 1, -1)
+
+        cells[dst] = cells[src] + delta
+        direction[dst] = dst_dir
+        first[dst] = (other[candidates] - starts[dst] - dst_dir * dst_crn) % 4
+        reached[dst] = True
+        frontier = dst
+    return cells, first, direction, reached
+
+
+def calc_edge_lengths(arrays: MeshArrays, corners: np.ndarray, first: np.ndarray, direction: np.ndarray,
+                      edge: int) -> np.ndarray:
+    """3D length of the edge from cell corner edge to edge + 1 of every face"""
+    positions = (first + direction * (edge + (direction == -1))) % 4
+    loops = corners[np.arange(len(corners)), positions]
+    co = arrays.vert_co
+    return np.linalg.norm(co[arrays.loop_vert[arrays.loop_next[loops]]] - co[arrays.loop_vert[loops]], axis=1)
+
+
+def calc_grid_lines(sizes: np.ndarray, cell_counts: np.ndarray, seed_cells: np.ndarray, origins: np.ndarray,
+                    seed_lengths: np.ndarray) -> np.ndarray:
+    """Positions of the grid lines along one axis, one line more than cells per island.
+    The line at the seed cell is at origin, the seed cell is seed_length long. Islands
+    whose seed cell has no 3D size are scaled by their mean size.
+    """
+    island_count = len(cell_counts)
+    size_islands = np.repeat(np.arange(island_count), cell_counts)
+    size_bases = np.cumsum(cell_counts) - cell_counts
+    positive = sizes > 0
+    size_sums = np.bincount(size_islands, np.where(positive, sizes, 0.0), minlength=island_count)
+    size_counts = np.bincount(size_islands, positive, minlength=island_count)
+    references = sizes[size_bases + seed_cells]
+    references = np.where(references > 0, references,
+                          np.divide(size_sums, size_counts, out=np.ones(island_count), where=size_counts > 0))
+
+    line_islands = np.repeat(np.arange(island_count), cell_counts + 1)
+    steps = np.zeros(len(line_islands), dtype='float64')
+    steps[np.arange(len(sizes)) + size_islands + 1] = sizes
+    lines = np.cumsum(steps)
+    lines -= lines[size_bases + np.arange(island_count) + seed_cells][line_islands]
+    return origins[line_islands] + lines * (seed_lengths / references)[line_islands]
+
+
+@trace.traced('QUADRIFY')
+def quadrify_islands(arrays: MeshArrays, uv_co: np.ndarray, faces: np.ndarray, face_islands: np.ndarray,
+                     island_count: int) -> np.ndarray:
+    """Straighten quad islands in uv_co (mesh loop order) into rectangular grids.
+    Faces of an island must be contiguous. Returns the mask of reached faces,
+    faces that aren't connected to the seed face keep their UVs.
+    """
+    corners = calc_face_corners(arrays, faces)
+    twins = calc_twins(arrays, faces, face_islands)
+    seeds = calc_seed_faces(uv_co, corners, face_islands)
+    seed_first, seed_direction, seed_co = calc_seed_shapes(uv_co[corners[seeds]])
+    cells, first, direction, reached = calc_lattice(arrays, faces, twins, seeds, seed_first, seed_direction)
+
+    # Shift the cells of every island to start at zero
+    reached_islands = face_islands[reached]
+    cell_min = np.full((island_count, 2), np.iinfo('int64').max, dtype='int64')
+    cell_max = np.full((island_count, 2), np.iinfo('int64').min, dtype='int64')
+    np.minimum.at(cell_min, reached_islands, cells[reached])
+    np.maximum.at(cell_max, reached_islands, cells[reached])
+    cells -= cell_min[face_islands]
+    cell_counts = cell_max - cell_min + 1
+
+    seed_width = np.linalg.norm(seed_co[:, 0] - seed_co[:, 1], axis=1)
+    seed_height = np.linalg.norm(seed_co[:, 0] - seed_co[:, 2], axis=1)
+    origins = (seed_co[:, 0, 0], seed_co[:, 0, 1] - seed_height)
+
+    lines = []
+    line_bases = []
+    for axis, seed_length, edges in ((0, seed_width, (0, 2)), (1, seed_height, (1, 3))):
+        # Mean 3D length of the edges along the axis in every column (or row)
+        counts = cell_counts[:, axis]
+        size_index = (np.cumsum(counts) - counts)[reached_islands] + cells[reached, axis]
+        lengths = sum(calc_edge_lengths(arrays, corners, first, direction, edge) for edge in edges)[reached]
+        sizes = np.bincount(size_index, lengths, minlength=counts.sum())
+        sizes /= np.maximum(np.bincount(size_index, minlength=counts.sum()) * 2, 1)
+
+        lines.append(calc_grid_lines(sizes, counts, cells[seeds, axis], origins[axis], seed_length))
+        line_bases.append(np.cumsum(counts + 1) - (counts + 1))
+
+    reached_faces = np.flatnonzero(reached)
+    cell_crn = (direction[reached_faces, None] * (np.arange(4) - first[reached_faces, None])) % 4
+    lattice = cells[reached_faces, None] + CORNER_OFFSETS[cell_crn]
+    isl = face_islands[reached_faces, None]
+    loops = corners[reached_faces]
+    uv_co[loops, 0] = lines[0][line_bases[0][isl] + lattice[:, :, 0]]
+    uv_co[loops, 1] = lines[1][line_bases[1][isl] + lattice[:, :, 1]]
+    return reached
+
+
+def calc_triangles(arrays: MeshArrays, faces: np.ndarray) -> np.ndarray:
+    """Mesh loop indices (2F, 3) of the triangles 0-1-2 and 2-3-0 of quad faces"""
+    corners = calc_face_corners(arrays, faces)
+    return np.stack((corners[:, (0, 1, 2)], corners[:, (2, 3, 0)]), axis=1).reshape(-1, 3)
+
+
+def calc_normalize_transforms(arrays: MeshArrays, uv_co: np.ndarray, faces: np.ndarray, face_islands: np.ndarray,
+                              island_count: int, scale=None, aspect: float = 1.0, shear: bool = False,
+                              threshold: float = 1e-8) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per island 2x2 transform (row vector convention: uv @ matrix) that scales U against V,
+    and with shear also unshears, until the UV axes match the 3D proportions.
+    Returns the transforms, the 3D areas and the UV areas after the transforms.
+    :param scale: Object scale applied to the 3D coordinates
+    """
+    tris = calc_triangles(arrays, faces)
+    tri_islands = np.repeat(face_islands, 2)
+
+    co = arrays.vert_co[arrays.loop_vert[tris]].astype('float64')
+    if scale is not None:
+        co *= np.asarray(scale, dtype='float64')
+    weights = np.linalg.norm(np.cross(co[:, 1] - co[:, 0], co[:, 2] - co[:, 0]), axis=1) * 0.5
+    areas_3d = np.bincount(tri_islands, weights, minlength=island_count)
+    vec_ac = co[:, 0] - co[:, 2]
+    vec_bc = co[:, 1] - co[:, 2]
+
+    uv = uv_co[tris]
+    edges_uv = np.stack((uv[:, 0] - uv[:, 2], uv[:, 1] - uv[:, 2]), axis=1)
+    areas_uv = np.bincount(tri_islands, np.abs(cross_2d(edges_uv[:, 0], edges_uv[:, 1])) * 0.5, minlength=island_count)
+
+    transforms = np.tile(np.eye(2), (island_count, 1, 1))
+    active = np.ones(island_count, dtype='bool')
+    for _ in range(NORMALIZE_ITERATIONS):
+        m = edges_uv @ transforms[tri_islands]
+        det = m[:, 0, 0] * m[:, 1, 1] - m[:, 0, 1] * m[:, 1, 0]
+        mask = (np.abs(det) > threshold) & active[tri_islands]
+        active &= np.bincount(tri_islands[mask], minlength=island_count) > 0
+        if not active.any():
+            break
+
+        m = m[mask]
+        det = det[mask]
+        cou = (m[:, 1, 1] / det)[:, None] * vec_ac[mask] - (m[:, 0, 1] / det)[:, None] * vec_bc[mask]
+        cov = (m[:, 0, 0] / det)[:, None] * vec_bc[mask] - (m[:, 1, 0] / det)[:, None] * vec_ac[mask]
+        w = weights[mask]
+        w_islands = tri_islands[mask]
+        len_cou = np.linalg.norm(cou, axis=1)
+        len_cov = np.linalg.norm(cov, axis=1)
+        scale_cou = np.bincount(w_islands, len_cou * w, minlength=island_count)
+        scale_cov = np.bincount(w_islands, len_cov * w, minlength=island_count)
+
+        active &= scale_cou * scale_cov >= 1e-10
+        scale_u = np.sqrt(np.divide(scale_cou, scale_cov * aspect, out=np.ones(island_count), where=active))
+
+        t = np.zeros((island_count, 2, 2))
+        t[:, 0, 0] = scale_u
+        t[:, 1, 1] = 1.0 / scale_u
+        if shear:
+            cou_n = cou / np.where(len_cou > 0, len_cou, 1.0)[:, None]
+            cov_n = cov / np.where(len_cov > 0, len_cov, 1.0)[:, None]
+            cross = np.einsum('ij,ij->i', cou_n, cov_n) * w
+            scale_cross = np.bincount(w_islands, cross, minlength=island_count)
+            ratio = np.divide(scale_cross, areas_3d, out=np.zeros(island_count), where=areas_3d > 0)
+            t[:, 1, 0] = np.clip(ratio * aspect, -0.5 * aspect, 0.5 * aspect)
+            err = np.abs(scale_u - 1.0) + np.abs(t[:, 1, 0]) + np.abs(t[:, 1, 1] - 1.0)
+            active &= err >= NORMALIZE_TOLERANCE
+        else:
+            active &= ~np.isclose(scale_u, 1.0, rtol=0.0, atol=NORMALIZE_TOLERANCE)
+
+        transforms[active] = transforms[active] @ t[active]
+
+    areas_uv *= np.abs(np.linalg.det(transforms))
+    return transforms, areas_3d, areas_uv
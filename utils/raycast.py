@@ -5,11 +5,9 @@ Port of UniV's RayCast functionality for UVV
 
 import bpy
 import bmesh
-import numpy as np
 from math import inf, isclose, nextafter
 from mathutils import Vector
 from mathutils.kdtree import KDTree
-from mathutils.bvhtree import BVHTree
 from bpy_extras import view3d_utils
 from bmesh.types import BMFace, BMLoop
 
@@ -143,27 +141,6 @@ class RayCast:
             self.ray_direction = view3d_utils.region_2d_to_vector_3d(
                 self.region, self.rv3d, Vector(self.mouse_pos_from_3d))
 
-    @staticmethod
-    def get_bvh_from_polygon(umesh) -> tuple[BVHTree, list[BMFace]]:
-        """Get BVH tree from polygon data for hidden faces"""
-        faces = []
-        faces_append = faces.append
-        flat_tris_coords = []
-        flat_tris_coords_append = flat_tris_coords.append
-
-        for crn_a, crn_b, crn_c in umesh.bm.calc_loop_triangles():
-            face = crn_a.face
-            if face.hide:
-                continue
-            faces_append(face)
-            flat_tris_coords_append(crn_a.vert.co)
-            flat_tris_coords_append(crn_b.vert.co)
-            flat_tris_coords_append(crn_c.vert.co)
-
-        indices = np.arange(len(flat_tris_coords), dtype='uint32').reshape(-1, 3).tolist()
-        bvh = BVHTree.FromPolygons(flat_tris_coords, indices, all_triangles=True)
-        return bvh, faces
-
     def ray_cast_umeshes(self):
         """Raycast against all umeshes"""
         ray_target = self.ray_origin + self.ray_direction
@@ -177,7 +154,8 @@ class RayCast:
             ray_origin_obj = world_matrix.inverted() @ self.ray_origin
             ray_direction_obj = world_matrix.inverted().to_3x3() @ self.ray_direction
 
-            bvh = BVHTree.FromBMesh(umesh_iter.bm)
+            if (bvh := utils.bvh_cache.get_bvh(umesh_iter)) is None:
+                continue
             hit, normal, face_index_, distance = bvh.ray_cast(ray_origin_obj, ray_direction_obj, max_dist)
 
             if not hit:
@@ -188,9 +166,10 @@ class RayCast:
             if length_squared < best_length_squared:
                 umesh_iter.ensure()
                 umesh_iter.bm = bmesh.from_edit_mesh(umesh_iter.obj.data)
-                # If a face is hidden, the BVH is computed using FromPolygons.
+                # If a face is hidden, cast again against the tree without hidden faces.
                 if umesh_iter.bm.faces[face_index_].hide:
-                    bvh, faces = self.get_bvh_from_polygon(umesh_iter)  # slow
+                    if (bvh := utils.bvh_cache.get_bvh(umesh_iter, skip_hidden=True)) is None:
+                        continue
                     hit, normal, face_index_, distance = bvh.ray_cast(ray_origin_obj, ray_direction_obj, max_dist)
                     if not hit:
                         continue
@@ -198,8 +177,6 @@ class RayCast:
                     length_squared = (hit_world - self.ray_origin).length_squared
                     if length_squared >= best_length_squared:
                         continue
-                    umesh_iter.bm.faces.index_update()
-                    face_index_ = faces[face_index_].index
 
                 best_length_squared = length_squared
                 umesh = umesh_iter
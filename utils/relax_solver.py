@@ -0,0 +1,273 @@
+"""
+Cotangent Laplacian relax solver
+
+Relaxes UV islands on NumPy index arrays instead of running the unwrap and
+minimize stretch operators on the whole edit selection. Corners that share a
+mesh vertex and a UV position are one UV vertex, faces are fan triangulated and
+the rest shape of every triangle is its 3D shape scaled to the UV area of the
+island.
+
+Two energies are solved:
+- 'CONFORMAL': least squares conformal map, one linear solve.
+- 'ARAP': as-rigid-as-possible local/global iterations. The local step fits a
+  rotation per triangle, the global step solves the cotangent Laplacian.
+
+Linear systems are solved with a Jacobi preconditioned conjugate gradient over
+the free vertices, pinned vertices keep their UVs. Every island has its own step
+sizes and convergence test, so an island stops once it converged and is never
+held back by the conditioning of another one.
+"""
+
+import numpy as np
+
+from . import trace
+from .island_engine import MeshArrays
+
+
+MODE_CONFORMAL = 'CONFORMAL'
+MODE_ARAP = 'ARAP'
+
+DEFAULT_TOLERANCE = 1e-5
+CG_MAX_ITERATIONS = 500
+COT_LIMIT = 1e4  # Weight clamp for degenerate triangles
+
+
+def calc_fan_triangles(loop_total: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Fan triangles of faces with loop_total corners each, stored contiguously.
+    Returns the corner positions (T, 3) and the face of every triangle.
+    """
+    tri_count = np.maximum(loop_total - 2, 0)
+    tri_face = np.repeat(np.arange(len(loop_total)), tri_count)
+    tri_offset = np.arange(len(tri_face)) - np.repeat(np.cumsum(tri_count) - tri_count, tri_count) + 1
+    first = (np.cumsum(loop_total) - loop_total)[tri_face]
+    return np.stack((first, first + tri_offset, first + tri_offset + 1), axis=1), tri_face
+
+
+def calc_rest_triangles(co: np.ndarray) -> np.ndarray:
+    """Triangles (T, 3, 3) laid flat into their own plane (T, 3, 2), counter-clockwise"""
+    e1 = co[:, 1] - co[:, 0]
+    e2 = co[:, 2] - co[:, 0]
+    len1 = np.linalg.norm(e1, axis=1)
+    safe_len1 = np.where(len1 > 0, len1, 1.0)
+    rest = np.zeros((len(co), 3, 2), dtype='float64')
+    rest[:, 1, 0] = len1
+    rest[:, 2, 0] = np.einsum('ij,ij->i', e2, e1) / safe_len1
+    rest[:, 2, 1] = np.linalg.norm(np.cross(e1, e2), axis=1) / safe_len1
+    return rest
+
+
+def calc_signed_areas(tri_co: np.ndarray) -> np.ndarray:
+    """Signed area of 2D triangles (T, 3, 2), positive for counter-clockwise"""
+    a = tri_co[:, 1] - tri_co[:, 0]
+    b = tri_co[:, 2] - tri_co[:, 0]
+    return 0.5 * (a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0])
+
+
+def calc_cot_weights(rest: np.ndarray) -> np.ndarray:
+    """Half cotangent of the angle opposite to edges (1, 2), (2, 0), (0, 1) of every triangle (T, 3)"""
+    weights = np.empty((len(rest), 3), dtype='float64')
+    for k in range(3):
+        a = rest[:, (k + 1) % 3] - rest[:, k]
+        b = rest[:, (k + 2) % 3] - rest[:, k]
+        dot = a[:, 0] * b[:, 0] + a[:, 1] * b[:, 1]
+        cross = np.abs(a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0])
+        cot = np.divide(dot, cross, out=np.full(len(rest), COT_LIMIT), where=cross > 0)
+        weights[:, k] = 0.5 * np.clip(cot, -COT_LIMIT, COT_LIMIT)
+    return weights
+
+
+class RelaxSystem:
+    """UV vertices, triangles and rest shapes of islands, relaxed in place on self.uv"""
+
+    EDGES = ((1, 2), (2, 0), (0, 1))  # Edge opposite to triangle corner 0, 1, 2
+
+    def __init__(self, arrays: MeshArrays, uv_co: np.ndarray, faces: np.ndarray, face_islands: np.ndarray,
+                 island_count: int, free_corners: np.ndarray):
+        """
+        :param uv_co: Corner UVs (L, 2) in mesh loop order
+        :param faces: Faces of all islands, faces of one island contiguous
+        :param free_corners: Corners (L,) that may move, a UV vertex is pinned when one of its corners isn't free
+        """
+        self.island_count = island_count
+        sizes = arrays.loop_total[faces]
+        self.corners = np.repeat(arrays.loop_start[faces] - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+        corner_islands = np.repeat(face_islands, sizes)
+
+        # UV vertices
+        uv_keys = arrays.uv_keys[self.corners]
+        order = np.lexsort((uv_keys[:, 1], uv_keys[:, 0], arrays.loop_vert[self.corners], corner_islands))
+        sorted_keys = np.column_stack((corner_islands[order], arrays.loop_vert[self.corners[order]], uv_keys[order]))
+        is_first = np.ones(len(order), dtype=bool)
+        is_first[1:] = (sorted_keys[1:] != sorted_keys[:-1]).any(axis=1)
+        self.corner_verts = np.empty(len(order), dtype='int64')
+        self.corner_verts[order] = np.cumsum(is_first) - 1
+        self.vert_islands = sorted_keys[is_first, 0]
+        vert_count = len(self.vert_islands)
+        self.uv = np.zeros((vert_count, 2), dtype='float64')
+        self.uv[self.corner_verts] = uv_co[self.corners]
+        self.free = np.bincount(self.corner_verts, ~free_corners[self.corners], minlength=vert_count) == 0
+
+        # Triangles, ones with a repeated UV vertex have no area
+        tri_corners, tri_face = calc_fan_triangles(sizes)
+        tris = self.corner_verts[tri_corners]
+        valid = (tris[:, 0] != tris[:, 1]) & (tris[:, 1] != tris[:, 2]) & (tris[:, 2] != tris[:, 0])
+        tris = tris[valid]
+        tri_islands = face_islands[tri_face[valid]]
+        rest = calc_rest_triangles(arrays.vert_co[arrays.loop_vert[self.corners[tri_corners[valid]]]].astype('float64'))
+
+        # Mirrored islands are solved flipped along V, scale the rest shape to the UV area
+        uv_areas = np.bincount(tri_islands, calc_signed_areas(self.uv[tris]), minlength=island_count)
+        rest_areas = np.bincount(tri_islands, calc_signed_areas(rest), minlength=island_count)
+        self.mirror = np.where(uv_areas < 0, -1.0, 1.0)
+        self.uv[:, 1] *= self.mirror[self.vert_islands]
+        uv_areas = np.abs(uv_areas)
+        valid_scale = (uv_areas > 0) & (rest_areas > 0)
+        scales = np.sqrt(np.divide(uv_areas, rest_areas, out=np.ones(island_count), where=valid_scale))
+        rest *= scales[tri_islands, None, None]
+        self.island_sizes = np.sqrt(np.where(valid_scale, uv_areas, rest_areas * scales ** 2))
+
+        # Half-edges of every triangle with their cotangent weights
+        weights = calc_cot_weights(rest)
+        self.edge_a = np.concatenate([tris[:, a] for a, _b in self.EDGES])
+        self.edge_b = np.concatenate([tris[:, b] for _a, b in self.EDGES])
+        self.edge_weights = np.concatenate([weights[:, k] for k in range(3)])
+        self.edge_rest = np.concatenate([rest[:, a] - rest[:, b] for a, b in self.EDGES])
+
+        # Off-diagonal Laplacian entries as sorted rows (CSR), shared edges merged
+        edge_keys = self.edge_a.astype('int64') * vert_count + self.edge_b
+        reverse_keys = self.edge_b.astype('int64') * vert_count + self.edge_a
+        entry_keys = np.concatenate((edge_keys, reverse_keys))
+        entry_weights = np.concatenate((self.edge_weights, self.edge_weights))
+        order = np.argsort(entry_keys, kind='stable')
+        entry_keys = entry_keys[order]
+        is_first = np.ones(len(entry_keys), dtype=bool)
+        is_first[1:] = entry_keys[1:] != entry_keys[:-1]
+        starts = np.flatnonzero(is_first)
+        self.lap_cols = entry_keys[starts] % vert_count
+        self.lap_weights = np.add.reduceat(entry_weights[order], starts) if len(starts) else entry_weights[:0]
+        lap_rows = entry_keys[starts] // vert_count
+        self.lap_row_starts = np.searchsorted(lap_rows, np.arange(vert_count))
+        self.lap_has_row = np.bincount(lap_rows, minlength=vert_count) > 0
+        self.lap_diag = np.bincount(lap_rows, self.lap_weights, minlength=vert_count)
+        self.inv_diag = np.divide(1.0, self.lap_diag, out=np.ones(vert_count), where=self.lap_diag > 0)
+
+        # Island boundary half-edges (a -> b in winding order without a b -> a twin), for the conformal area term
+        sorted_edge_keys = np.sort(edge_keys)
+        twin = np.minimum(np.searchsorted(sorted_edge_keys, reverse_keys), max(len(edge_keys) - 1, 0))
+        boundary = sorted_edge_keys[twin] != reverse_keys if len(edge_keys) else np.zeros(0, dtype=bool)
+        self.boundary_a = self.edge_a[boundary]
+        self.boundary_b = self.edge_b[boundary]
+
+    def __len__(self):
+        return len(self.uv)
+
+    def island_sum(self, values: np.ndarray) -> np.ndarray:
+        return np.bincount(self.vert_islands, values.sum(axis=1), minlength=self.island_count)
+
+    def laplacian(self, x: np.ndarray) -> np.ndarray:
+        out = x * self.lap_diag[:, None]
+        if len(self.lap_cols):
+            neighbors = np.add.reduceat(x[self.lap_cols] * self.lap_weights[:, None], self.lap_row_starts[self.lap_has_row])
+            out[self.lap_has_row] -= neighbors
+        return out
+
+    def conformal(self, x: np.ndarray) -> np.ndarray:
+        """Hessian of the conformal energy: Dirichlet energy minus the signed UV area"""
+        a, b = self.boundary_a, self.boundary_b
+        area_grad = np.empty_like(x)
+        area_grad[:, 0] = 0.5 * (np.bincount(a, x[b, 1], minlength=len(x)) - np.bincount(b, x[a, 1], minlength=len(x)))
+        area_grad[:, 1] = 0.5 * (np.bincount(b, x[a, 0], minlength=len(x)) - np.bincount(a, x[b, 0], minlength=len(x)))
+        return self.laplacian(x) - area_grad
+
+    def arap_rhs(self) -> np.ndarray:
+        """Local step: best fitting rotation per triangle, returns the right hand side of the global step"""
+        tri_count = len(self.edge_a) // 3
+        w = self.edge_weights[:, None]
+        du = (self.uv[self.edge_a] - self.uv[self.edge_b]) * w
+        dq = self.edge_rest
+        cov = (du[:, :, None] * dq[:, None, :]).reshape(3, tri_count, 2, 2).sum(axis=0)
+        angles = np.arctan2(cov[:, 1, 0] - cov[:, 0, 1], cov[:, 0, 0] + cov[:, 1, 1])
+        cos_a = np.tile(np.cos(angles), 3)
+        sin_a = np.tile(np.sin(angles), 3)
+        rotated = np.column_stack((cos_a * dq[:, 0] - sin_a * dq[:, 1], sin_a * dq[:, 0] + cos_a * dq[:, 1])) * w
+
+        rhs = np.empty_like(self.uv)
+        for axis in range(2):
+            rhs[:, axis] = (np.bincount(self.edge_a, rotated[:, axis], minlength=len(self)) -
+                            np.bincount(self.edge_b, rotated[:, axis], minlength=len(self)))
+        return rhs
+
+    def solve_linear(self, matvec, rhs: np.ndarray, active: np.ndarray, tolerance: float) -> np.ndarray:
+        """Jacobi preconditioned CG for the free vertices of active islands, starting from self.uv"""
+        x = self.uv.copy()
+        free = self.free[:, None]
+        r = (rhs - matvec(x)) * free
+        z = r * self.inv_diag[:, None]
+        d = z.copy()
+        rz = self.island_sum(r * z)
+        limit = tolerance ** 2 * np.maximum(self.island_sum(rhs * rhs * free), self.island_sum(r * r))
+        active = active & (rz > 0)
+
+        for _ in range(CG_MAX_ITERATIONS):
+            if not active.any():
+                break
+            ad = matvec(d) * free
+            dad = self.island_sum(d * ad)
+            active &= dad > 0  # Island without pins or curvature, keep what it has
+            alpha = np.divide(rz, dad, out=np.zeros(self.island_count), where=active)[self.vert_islands, None]
+            x += alpha * d
+            r -= alpha * ad
+            active &= self.island_sum(r * r) > limit
+            z = r * self.inv_diag[:, None]
+            rz_next = self.island_sum(r * z)
+            beta = np.divide(rz_next, rz, out=np.zeros(self.island_count), where=active & (rz > 0))
+            d = z + beta[self.vert_islands, None] * d
+            rz = rz_next
+        return x
+
+    def pin_extremes(self) -> np.ndarray:
+        """Temporarily pin the leftmost and rightmost vertex of islands with less than two pins,
+        so the conformal map has a unique solution. Returns the new pins.
+        """
+        pinned_count = np.bincount(self.vert_islands, ~self.free, minlength=self.island_count)
+        order = np.lexsort((self.uv[:, 0], self.vert_islands))
+        starts = np.searchsorted(self.vert_islands[order], np.arange(self.island_count))
+        ends = np.searchsorted(self.vert_islands[order], np.arange(self.island_count), side='right') - 1
+        needs = (pinned_count < 2) & (ends > starts)
+        new_pins = np.concatenate((order[starts[needs]], order[ends[needs]]))
+        new_pins = new_pins[self.free[new_pins]]
+        self.free[new_pins] = False
+        return new_pins
+
+    @trace.traced('RELAX')
+    def solve(self, mode: str = MODE_ARAP, iterations: int = 10, tolerance: float = DEFAULT_TOLERANCE):
+        """Relax the free vertices.
+        :param iterations: Local/global iterations of 'ARAP', an island stops earlier when no vertex
+            moved more than tolerance times the island size
+        """
+        active = np.ones(self.island_count, dtype=bool)
+        if mode == MODE_CONFORMAL:
+            new_pins = self.pin_extremes()
+            self.uv = self.solve_linear(self.conformal, np.zeros_like(self.uv), active, tolerance)
+            self.free[new_pins] = True
+            return
+
+        for _ in range(iterations):
+            uv = self.solve_linear(self.laplacian, self.arap_rhs(), active, tolerance)
+            moved = np.zeros(self.island_count)
+            np.maximum.at(moved, self.vert_islands, np.abs(uv - self.uv).max(axis=1))
+            self.uv = uv
+            active &= moved > tolerance * self.island_sizes
+            if not active.any():
+                break
+
+    def blend(self, uv_before: np.ndarray, factors):
+        """Mix the relaxed UVs with uv_before (V, 2) by factors, scalar or one per vertex"""
+        factors = np.broadcast_to(np.asarray(factors, dtype='float64'), len(self))[:, None]
+        self.uv = uv_before + (self.uv - uv_before) * factors
+
+    def calc_corner_uvs(self) -> np.ndarray:
+        """Relaxed UVs (N, 2) of self.corners"""
+        uv = self.uv.copy()
+        uv[:, 1] *= self.mirror[self.vert_islands]
+        return uv[self.corner_verts]
@@ -10,9 +10,12 @@ import gpu
 from gpu_extras.batch import batch_for_shader
 from mathutils import Vector
 import numpy as np
+import hashlib
 import uuid
 import ctypes
 
+from . import trace
+
 
 # Global handler references
 _draw_handler = None
@@ -142,6 +145,77 @@ def is_modal_procedure(context):
         return True
 
 
+class StackGroupGeometry:
+    """Merged UV triangles, island border segments and island centers of one stack group"""
+    __slots__ = ('tris', 'borders', 'centers', 'digest')
+
+    def __init__(self, tris, borders, centers, digest):
+        self.tris: np.ndarray = tris  # (T, 3, 2) float32
+        self.borders: np.ndarray = borders  # (2 * E, 2) float32 line segment points
+        self.centers: list[tuple[float, float]] = centers
+        self.digest: bytes = digest
+
+
+class StackOverlayMeshSnapshot:
+    """Fan triangulated UVs and island face sets of one mesh state"""
+    __slots__ = ('stamp', 'uv_co', 'face_tri_start', 'face_tri_count', 'tri_corners', 'islands')
+
+    def __init__(self, stamp, arrays, islands):
+        self.stamp = stamp
+        self.uv_co: np.ndarray = arrays.uv_co + np.float32(0.0)  # -0.0 -> 0.0 for exact edge matching
+        self.islands: set[tuple[int, ...]] = islands
+
+        # Fan triangulation (v0, vi, vi+1), as the overlay always did
+        self.face_tri_count = np.maximum(arrays.loop_total - 2, 0)
+        self.face_tri_start = np.cumsum(self.face_tri_count) - self.face_tri_count
+        tri_face = np.repeat(np.arange(arrays.face_count), self.face_tri_count)
+        tri_offset = np.arange(len(tri_face)) - self.face_tri_start[tri_face] + 1
+        first = arrays.loop_start[tri_face]
+        self.tri_corners = np.stack((first, first + tri_offset, first + tri_offset + 1), axis=1)
+
+    def calc_group_geometry(self, islands_faces) -> StackGroupGeometry:
+        island_sizes = np.fromiter((len(faces) for faces in islands_faces), dtype='int64', count=len(islands_faces))
+        faces = np.fromiter((i for faces in islands_faces for i in faces), dtype='int64', count=int(island_sizes.sum()))
+        face_island = np.repeat(np.arange(len(islands_faces)), island_sizes)
+
+        tri_count = self.face_tri_count[faces]
+        tri_first = np.cumsum(tri_count) - tri_count
+        tris_idx = np.repeat(self.face_tri_start[faces] - tri_first, tri_count) + np.arange(tri_count.sum())
+        tri_island = np.repeat(face_island, tri_count)
+        tris = self.uv_co[self.tri_corners[tris_idx]]
+
+        # Island center: mean of its triangle vertices
+        weights = np.bincount(tri_island, minlength=len(islands_faces)) * 3
+        sums = tris.sum(axis=1, dtype='float64')
+        centers_u = np.bincount(tri_island, weights=sums[:, 0], minlength=len(islands_faces))
+        centers_v = np.bincount(tri_island, weights=sums[:, 1], minlength=len(islands_faces))
+        valid = weights > 0
+        centers = list(zip((centers_u[valid] / weights[valid]).tolist(), (centers_v[valid] / weights[valid]).tolist()))
+
+        # Border: triangle edges used once inside their island (exact UV match)
+        bits = tris.view('uint32').astype('uint64')
+        points = (bits[:, :, 0] << np.uint64(32)) | bits[:, :, 1]  # (T, 3)
+        edge_a = points.ravel()
+        edge_b = points[:, (1, 2, 0)].ravel()
+        edge_lo = np.minimum(edge_a, edge_b)
+        edge_hi = np.maximum(edge_a, edge_b)
+        edge_island = np.repeat(tri_island, 3)
+        order = np.lexsort((edge_hi, edge_lo, edge_island))
+        s_island, s_lo, s_hi = edge_island[order], edge_lo[order], edge_hi[order]
+        is_new = np.ones(len(order), dtype=bool)
+        is_new[1:] = (s_island[1:] != s_island[:-1]) | (s_lo[1:] != s_lo[:-1]) | (s_hi[1:] != s_hi[:-1])
+        starts = np.flatnonzero(is_new)
+        counts = np.diff(starts, append=len(order))
+        border_edges = order[starts[counts == 1]]
+        border_tris, border_sides = np.divmod(border_edges, 3)
+        borders = np.stack((tris[border_tris, border_sides], tris[border_tris, (border_sides + 1) % 3]), axis=1)
+
+        digest = hashlib.blake2b(tris.tobytes(), digest_size=16)
+        digest.update(island_sizes.tobytes())
+        return StackGroupGeometry(np.ascontiguousarray(tris), np.ascontiguousarray(borders.reshape(-1, 2)),
+                                  centers, digest.digest())
+
+
 class StackOverlayManager:
     """Singleton manager for stack group GPU overlays"""
 
@@ -154,6 +228,8 @@ class StackOverlayManager:
         self.mark_build = 0  # Build state: -1=force, 0=clean, 1=needs rebuild
         self.custom_shapes = []  # For compatibility
         self.label_data = []  # [(group_name, center_uv, color), ...] for drawing labels
+        self.mesh_snapshot = None  # StackOverlayMeshSnapshot of the active object
+        self.group_batches = {}  # (object pointer, group_id) -> (signature, [(batch, color, type), ...])
 
         # Highlight cache for performance
         self.highlight_cached_batches = []  # Cached highlight batches
@@ -261,6 +337,8 @@ class StackOverlayManager:
         self.enabled = False
         self.cached_batches.clear()
         self.mesh_data.clear()
+        self.mesh_snapshot = None
+        self.group_batches.clear()
         self.mark_build = 0
 
         # Clear highlight cache
@@ -394,56 +472,15 @@ class StackOverlayManager:
 
         # Need to rebuild - different group selected
         try:
-            from .stack_utils import StackSystem
-
-            scene = context.scene
-            settings = scene.uvv_settings if hasattr(scene, 'uvv_settings') else None
-            obj = context.active_object
-            if not obj:
-                return []
-
-            # Find the stack group on active object
-            stack_group = None
-            for sg in obj.uvv_stack_groups:
-                if sg.group_id == group_id:
-                    stack_group = sg
-                    break
-
-            if not stack_group:
+            geometry = self.calc_group_geometries(context).get(group_id)
+            if geometry is None or not len(geometry.borders):
                 return []
 
-            # Get islands in this group
-            stack_system = StackSystem(context)
-            islands = stack_system.get_group_islands(group_id, obj=obj)
-
-            if not islands:
-                return []
-
-            # Build border batches for these islands
-            shader = gpu.shader.from_builtin('UNIFORM_COLOR')
-            highlight_batches = []
-
             # Use bright white for permanent highlight
+            shader = gpu.shader.from_builtin('UNIFORM_COLOR')
             highlight_color = (1.0, 1.0, 1.0, 1.0)  # Solid white
-
-            for island in islands:
-                try:
-                    vertices = self._extract_island_uv_triangles(island)
-                    if len(vertices) < 3:
-                        continue
-
-                    verts_uv = [(v.x, v.y) for v in vertices]
-                    border_edges = self._extract_border_edges(verts_uv)
-
-                    if border_edges:
-                        batch_border = batch_for_shader(
-                            shader,
-                            'LINES',
-                            {"pos": border_edges}
-                        )
-                        highlight_batches.append((batch_border, highlight_color))
-                except Exception:
-                    continue
+            batch_border = batch_for_shader(shader, 'LINES', {"pos": geometry.borders})
+            highlight_batches = [(batch_border, highlight_color)]
 
             # CACHE the result for this group
             self.highlight_cached_batches = highlight_batches
@@ -493,162 +530,64 @@ class StackOverlayManager:
         except:
             return False
 
-    def get_island_shapes(self, context):
-        """Extract UV island shapes from stack groups
+    def get_mesh_snapshot(self, context, obj):
+        """Triangulated UVs and island set of obj, reused while its UUID stamp is unchanged"""
+        from .island_engine import MeshArrays
+        from ..types import Islands, UMesh
+
+        bm = bmesh.from_edit_mesh(obj.data)
+        uv_layer = bm.loops.layers.uv.active
+        if not uv_layer:
+            return None
+
+        t_updates = bpy.app.driver_namespace.get(LITERAL_UVV_UPDATE, {})
+        stamp = (obj.data.as_pointer(), uv_layer.name, *t_updates.get(obj.data, ['', '']))
+        snapshot = self.mesh_snapshot
+        if snapshot is not None and all(stamp[2:]) and snapshot.stamp == stamp:
+            return snapshot
+
+        if (arrays := MeshArrays.from_bmesh(bm, uv_layer)) is None:
+            return None
+        bm.faces.index_update()
+        islands = {tuple(sorted(f.index for f in island)) for island in Islands.calc_visible(UMesh(bm, obj))}
+        self.mesh_snapshot = StackOverlayMeshSnapshot(stamp, arrays, islands)
+        return self.mesh_snapshot
+
+    def calc_group_geometries(self, context):
+        """Merged UV geometry of every stack group of the active object
 
         Returns:
-            dict: {group_id: [(vertices, color), ...]}
+            dict: {group_id: StackGroupGeometry}
         """
-        from .stack_utils import StackSystem
+        from .stack_utils import get_group_face_indices
 
         if not context.mode == 'EDIT_MESH':
             return {}
 
-        # Get active object and settings
         obj = context.active_object
-        if not obj or obj.type != 'MESH':
-            return {}
-        
-        # All objects have uvv_stack_groups property (registered on Object type)
-        stack_groups = obj.uvv_stack_groups
-        if len(stack_groups) == 0:
-            return {}
-        
-        scene = context.scene
-        settings = scene.uvv_settings if hasattr(scene, 'uvv_settings') else None
-        if not settings:
+        if not obj or obj.type != 'MESH' or len(obj.uvv_stack_groups) == 0:
             return {}
 
-        # Initialize StackSystem
-        try:
-            stack_system = StackSystem(context)
-        except Exception as e:
-            print(f"Stack overlay error: Failed to initialize StackSystem: {e}")
+        snapshot = self.get_mesh_snapshot(context, obj)
+        if snapshot is None:
             return {}
 
-        shapes_by_group = {}
-
-        # Process each stack group
-        for stack_group in stack_groups:
-            group_id = stack_group.group_id
-            color = (*stack_group.color, settings.stack_overlay_opacity)
-
-            # Get islands in this group
-            try:
-                islands = stack_system.get_group_islands(group_id, obj=obj)
-            except Exception as e:
-                print(f"Stack overlay error: Failed to get islands for group {group_id}: {e}")
-                continue
-
-            if not islands:
-                continue
-
-            group_shapes = []
-
-            # Extract UV coordinates for each island
-            for island in islands:
-                try:
-                    vertices = self._extract_island_uv_triangles(island)
-                    if vertices and len(vertices) >= 3:
-                        group_shapes.append((vertices, color))
-                except Exception as e:
-                    print(f"Stack overlay error: Failed to extract island UVs: {e}")
-                    continue
-
-            if group_shapes:
-                shapes_by_group[group_id] = group_shapes
-
-        return shapes_by_group
-
-    def _extract_island_uv_triangles(self, island):
-        """Extract UV coordinates as triangles for an island
-
-        Args:
-            island: IslandData object
-
-        Returns:
-            list: List of (x, y) tuples representing triangle vertices
-        """
-        try:
-            # Get fresh BMesh data
-            bm = bmesh.from_edit_mesh(island.obj.data)
-            bm.faces.ensure_lookup_table()
-
-            # Get faces for this island
-            faces = [bm.faces[idx] for idx in island.face_indices]
-
-            vertices = []
-
-            # Extract UV coordinates for each face (triangulate on the fly)
-            for face in faces:
-                # Get UV coordinates for this face
-                face_uvs = [loop[island.uv_layer].uv.copy() for loop in face.loops]
-
-                # Triangulate face
-                if len(face_uvs) == 3:
-                    # Already a triangle
-                    vertices.extend(face_uvs)
-                elif len(face_uvs) == 4:
-                    # Quad - split into 2 triangles
-                    vertices.extend([face_uvs[0], face_uvs[1], face_uvs[2]])
-                    vertices.extend([face_uvs[0], face_uvs[2], face_uvs[3]])
-                else:
-                    # N-gon - fan triangulation
-                    for i in range(1, len(face_uvs) - 1):
-                        vertices.extend([face_uvs[0], face_uvs[i], face_uvs[i + 1]])
-
-            return vertices
-
-        except (ReferenceError, IndexError) as e:
-            print(f"Stack overlay error: Invalid face reference: {e}")
-            return []
-
-    def _extract_border_edges(self, triangle_verts):
-        """Extract unique border edges from triangulated vertices
-
-        This finds the outer perimeter edges of a UV island by identifying
-        edges that appear only once (not shared between triangles).
-
-        Args:
-            triangle_verts: List of vertex tuples [(x,y), ...] in groups of 3
-
-        Returns:
-            list: List of vertex tuples for line segments (pairs of vertices)
-        """
-        # Count edge occurrences
-        edge_count = {}
-
-        # Process triangles (every 3 vertices)
-        for i in range(0, len(triangle_verts), 3):
-            if i + 2 >= len(triangle_verts):
-                break
-
-            v0, v1, v2 = triangle_verts[i], triangle_verts[i+1], triangle_verts[i+2]
-
-            # Create edges (normalize by sorting to make them undirected)
-            edges = [
-                tuple(sorted([v0, v1], key=lambda v: (v[0], v[1]))),
-                tuple(sorted([v1, v2], key=lambda v: (v[0], v[1]))),
-                tuple(sorted([v2, v0], key=lambda v: (v[0], v[1])))
-            ]
-
-            for edge in edges:
-                edge_count[edge] = edge_count.get(edge, 0) + 1
-
-        # Border edges appear only once (not shared)
-        border_verts = []
-        for edge, count in edge_count.items():
-            if count == 1:
-                # Add both vertices of the edge
-                border_verts.extend(edge)
-
-        return border_verts
+        geometries = {}
+        for stack_group in obj.uvv_stack_groups:
+            # Only islands that still exist unchanged (same rule as StackSystem.get_group_islands)
+            islands_faces = [face_indices for face_indices in get_group_face_indices(stack_group, obj)
+                             if tuple(face_indices) in snapshot.islands]
+            if islands_faces:
+                geometries[stack_group.group_id] = snapshot.calc_group_geometry(islands_faces)
+        return geometries
 
+    @trace.traced('GPU')
     def build(self, context):
-        """Build GPU batches from island shapes (ZenUV approach)
+        """Build GPU batches from stack group geometry (ZenUV approach)
 
-        This is the main build method that creates GPU batches from UV island data.
-        Called when mark_build indicates a rebuild is needed.
+        Called when mark_build indicates a rebuild is needed. Every group gets one
+        merged fill and one merged border batch, batches of groups whose geometry,
+        color and display flags didn't change are reused.
         """
         # Reset build flag
         self.mark_build = 0
@@ -662,76 +601,61 @@ class StackOverlayManager:
         self.highlight_cached_batches.clear()
         self.highlight_cached_group_id = None
 
-        # Get island shapes in UV coordinates (0-1)
-        shapes = self.get_island_shapes(context)
-
         settings = context.scene.uvv_settings if hasattr(context.scene, 'uvv_settings') else None
         if not settings:
             return
 
-        # Get shader
-        shader = gpu.shader.from_builtin('UNIFORM_COLOR')
-
         # Get overlay display settings
         show_fill = settings.stack_overlay_show_fill
         show_border = settings.stack_overlay_show_border
         show_labels = settings.stack_overlay_show_labels
 
-        # Build batches in UV space (0-1), will transform during drawing
-        # Also collect label positions if enabled (one label per island)
-        for group_id, group_shapes in shapes.items():
-            # Get group name for labels
-            group_name = None
-            obj = context.active_object
-            if show_labels and obj:
-                for sg in obj.uvv_stack_groups:
-                    if sg.group_id == group_id:
-                        group_name = sg.name
-                        break
-
-            for vertices, color in group_shapes:
-                if len(vertices) < 3:
-                    continue
+        obj = context.active_object
+        try:
+            geometries = self.calc_group_geometries(context)
+        except Exception as e:
+            print(f"Stack overlay error: Failed to collect group geometry: {e}")
+            geometries = {}
+
+        # Get shader
+        shader = gpu.shader.from_builtin('UNIFORM_COLOR')
 
+        group_batches = {}
+        for stack_group in (obj.uvv_stack_groups if geometries else ()):
+            geometry = geometries.get(stack_group.group_id)
+            if geometry is None:
+                continue
+            color = (*stack_group.color, settings.stack_overlay_opacity)
+            key = (obj.as_pointer(), stack_group.group_id)
+            signature = (geometry.digest, color, show_fill, show_border)
+
+            cached = self.group_batches.get(key)
+            if cached is not None and cached[0] == signature:
+                batches = cached[1]
+            else:
+                batches = []
                 try:
-                    # Keep vertices in UV space (0-1), convert Vector to tuple
-                    verts_uv = [(v.x, v.y) for v in vertices]
-
-                    # Calculate center of this island for label placement
-                    if show_labels and group_name:
-                        sum_x = sum(v[0] for v in verts_uv)
-                        sum_y = sum(v[1] for v in verts_uv)
-                        count = len(verts_uv)
-                        island_center = (sum_x / count, sum_y / count)
-                        # Store one label per island
-                        self.label_data.append((group_name, island_center, color))
-
-                    # Create fill batch if enabled
+                    # Batches are in UV space (0-1), transformed during drawing
                     if show_fill:
-                        batch_fill = batch_for_shader(
-                            shader,
-                            'TRIS',
-                            {"pos": verts_uv}
-                        )
-                        self.cached_batches.append((batch_fill, color, 'FILL'))
-
-                    # Create border batch if enabled
-                    if show_border:
-                        # Extract unique edges from triangles
-                        border_edges = self._extract_border_edges(verts_uv)
-                        if border_edges:
-                            batch_border = batch_for_shader(
-                                shader,
-                                'LINES',
-                                {"pos": border_edges}
-                            )
-                            # Make border slightly more opaque for visibility
-                            border_color = (color[0], color[1], color[2], min(1.0, color[3] * 2.0))
-                            self.cached_batches.append((batch_border, border_color, 'BORDER'))
-
+                        batch_fill = batch_for_shader(shader, 'TRIS', {"pos": geometry.tris.reshape(-1, 2)})
+                        batches.append((batch_fill, color, 'FILL'))
+
+                    if show_border and len(geometry.borders):
+                        batch_border = batch_for_shader(shader, 'LINES', {"pos": geometry.borders})
+                        # Make border slightly more opaque for visibility
+                        border_color = (color[0], color[1], color[2], min(1.0, color[3] * 2.0))
+                        batches.append((batch_border, border_color, 'BORDER'))
                 except Exception as e:
                     print(f"Stack overlay error: Failed to create batch: {e}")
                     continue
+            group_batches[key] = (signature, batches)
+            self.cached_batches.extend(batches)
+
+            # One label per island
+            if show_labels:
+                self.label_data.extend((stack_group.name, center, color) for center in geometry.centers)
+
+        self.group_batches = group_batches
 
         # Cache mesh data for change detection (UUID approach)
         t_updates = bpy.app.driver_namespace.get(LITERAL_UVV_UPDATE, {})
@@ -9,24 +9,147 @@ Uses ZenUV-style similarity index calculation:
 
 import bpy
 import bmesh
+import base64
+import functools
 import json
 import hashlib
 from mathutils import Vector, Matrix
 from math import sqrt, pi, cos, sin, atan2
 from collections import defaultdict
 
+import numpy as np
+
+from . import trace
+
+
+def calc_islands_properties(arrays, islands_face_indices):
+    """Per island (bbox_min, bbox_max, vert_count, edge_count, mesh_area, perimeter, improver),
+    same values as IslandData._calc_properties, from island_engine.MeshArrays.
+    improver is the sim_index diagonal term of single quad islands, 0.0 for the others.
+    """
+    from .island_engine import uv_keys_equal
+
+    island_sizes = np.fromiter((len(faces) for faces in islands_face_indices), dtype='int64',
+                               count=len(islands_face_indices))
+    island_count = len(island_sizes)
+    face_idx = np.fromiter((i for faces in islands_face_indices for i in faces), dtype='int64',
+                           count=int(island_sizes.sum()))
+    face_island = np.repeat(np.arange(island_count), island_sizes)
+
+    # Corners of the island faces, grouped by island
+    loop_total = arrays.loop_total[face_idx].astype('int64')
+    face_first = np.cumsum(loop_total) - loop_total
+    loops = np.repeat(arrays.loop_start[face_idx].astype('int64') - face_first, loop_total) + np.arange(loop_total.sum())
+    loop_island = np.repeat(face_island, loop_total)
+    island_first_face = np.cumsum(island_sizes) - island_sizes
+    island_first_loop = np.cumsum(np.bincount(face_island, weights=loop_total, minlength=island_count)).astype('int64')
+    island_first_loop = np.concatenate(([0], island_first_loop[:-1]))
+
+    uv = arrays.uv_co[loops]
+    bbox_min = np.minimum.reduceat(uv, island_first_loop, axis=0)
+    bbox_max = np.maximum.reduceat(uv, island_first_loop, axis=0)
+
+    # Unique verts and edges per island
+    vert_count = len(arrays.vert_co)
+    edge_count = len(arrays.edge_seam)
+    island_verts = np.unique(loop_island * vert_count + arrays.loop_vert[loops])
+    island_edges = np.unique(loop_island * edge_count + arrays.loop_edge[loops])
+    vert_counts = np.bincount(island_verts // vert_count, minlength=island_count)
+    edge_counts = np.bincount(island_edges // edge_count, minlength=island_count)
+
+    # Face area, float32 Newell normal like BM_face_calc_area
+    co_prev = arrays.vert_co[arrays.loop_vert[loops]]
+    co_curr = arrays.vert_co[arrays.loop_vert[arrays.loop_next[loops]]]
+    co_diff = co_prev - co_curr
+    co_sum = co_prev + co_curr
+    newell = co_diff[:, (1, 2, 0)] * co_sum[:, (2, 0, 1)]
+    face_normals = np.add.reduceat(newell, face_first, axis=0)
+    face_areas = np.sqrt(np.einsum('ij,ij->i', face_normals, face_normals)) * np.float32(0.5)
+    areas = np.bincount(face_island, weights=face_areas, minlength=island_count)
+
+    # UV boundary edges, as island_utils.uv_bound_edges_indexes: first and last corner of an edge
+    # compared with the next corner of their radial neighbour
+    order = np.argsort(arrays.loop_edge, kind='stable')
+    edge_loops = np.bincount(arrays.loop_edge, minlength=edge_count)
+    edge_first = np.concatenate(([0], np.cumsum(edge_loops)[:-1]))
+    linked = edge_loops > 0
+    crn_first = order[edge_first[linked]]
+    crn_last = order[edge_first[linked] + edge_loops[linked] - 1]
+    crn_second = order[edge_first[linked] + np.minimum(1, edge_loops[linked] - 1)]
+    keys = arrays.uv_keys
+    nxt = arrays.loop_next
+    is_bound = np.zeros(edge_count, dtype=bool)
+    is_bound[linked] = ~uv_keys_equal(keys[crn_first], keys[nxt[crn_second]]) | \
+        ~uv_keys_equal(keys[crn_last], keys[nxt[crn_first]])
+
+    island_edge_idx = island_edges % edge_count
+    bound = is_bound[island_edge_idx]
+    edge_verts = np.empty((edge_count, 2), dtype='int64')
+    edge_verts[arrays.loop_edge, 0] = arrays.loop_vert
+    edge_verts[arrays.loop_edge, 1] = arrays.loop_vert[nxt]
+    bound_edges = edge_verts[island_edge_idx[bound]]
+    co = arrays.vert_co
+    lengths = np.linalg.norm(co[bound_edges[:, 0]] - co[bound_edges[:, 1]], axis=1)
+    perimeters = np.bincount(island_edges[bound] // edge_count, weights=lengths, minlength=island_count)
+
+    # Diagonal improver of single quad islands
+    improvers = np.zeros(island_count)
+    single_quads = np.flatnonzero((island_sizes == 1) & (loop_total[island_first_face] == 4))
+    if len(single_quads):
+        quad_loops = island_first_loop[single_quads][:, None] + np.arange(4)
+        quad_co = arrays.vert_co[arrays.loop_vert[loops[quad_loops]]]
+        diagonals = np.linalg.norm(quad_co[:, 0] - quad_co[:, 2], axis=1).astype('float64') + \
+            np.linalg.norm(quad_co[:, 1] - quad_co[:, 3], axis=1)
+        improvers[single_quads] = diagonals
+
+    return [(bb_min, bb_max, v_count, e_count, round(area, 3), round(perimeter, 3), round(improver, 3))
+            for bb_min, bb_max, v_count, e_count, area, perimeter, improver in zip(
+                bbox_min.tolist(), bbox_max.tolist(), vert_counts.tolist(), edge_counts.tolist(),
+                areas.tolist(), perimeters.tolist(), improvers.tolist())]
+
 
 class IslandData:
     """Represents a UV island with its properties"""
 
-    def __init__(self, obj, faces, uv_layer):
+    def __init__(self, obj, faces, uv_layer, properties=None):
         self.obj = obj
         self.faces = faces
         self.uv_layer = uv_layer
         self.face_indices = [f.index for f in faces]
 
-        # Calculate properties
-        self._calc_properties()
+        # Calculate properties (or take the ones from calc_islands_properties)
+        if properties is None:
+            self._calc_properties()
+        else:
+            self._set_properties(*properties)
+
+    @classmethod
+    def calc_batch(cls, obj, bm, uv_layer, islands_faces):
+        """IslandData for all islands of one mesh, properties computed in one NumPy pass.
+        Face indices must match BMesh iteration order (bm.faces.index_update()).
+        """
+        from .island_engine import MeshArrays
+
+        arrays = MeshArrays.from_bmesh(bm, uv_layer) if islands_faces else None
+        if arrays is None:
+            return [cls(obj, faces, uv_layer) for faces in islands_faces]
+
+        islands_face_indices = [[f.index for f in faces] for faces in islands_faces]
+        properties = calc_islands_properties(arrays, islands_face_indices)
+        return [cls(obj, faces, uv_layer, props) for faces, props in zip(islands_faces, properties)]
+
+    def _set_properties(self, bbox_min, bbox_max, vert_count, edge_count, mesh_area, perimeter, improver):
+        self.bbox_min = Vector(bbox_min)
+        self.bbox_max = Vector(bbox_max)
+        self.bbox_size = self.bbox_max - self.bbox_min
+        self.center = (self.bbox_min + self.bbox_max) / 2.0
+
+        self.face_count = len(self.faces)
+        self.vert_count = vert_count
+        self.edge_count = edge_count
+        self.mesh_area = mesh_area
+        self.perimeter = perimeter
+        self.sim_index = self._calc_sim_index(improver)
 
     def _calc_properties(self):
         """Calculate island properties for comparison - ZenUV style"""
@@ -61,17 +184,17 @@ class IslandData:
 
     def _calc_perimeter(self):
         """Calculate perimeter from UV boundary edges - Exact ZenUV copy"""
-        from ZenUV.utils import get_uv_islands as island_util
+        from .island_utils import uv_bound_edges_indexes
 
-        # Use ZenUV's exact boundary edge detection
-        edge_indices = island_util.get_uv_bound_edges_indexes(self.faces, self.uv_layer)
+        # ZenUV's boundary edge detection (ported in island_utils)
+        edge_indices = set(uv_bound_edges_indexes(self.faces, self.uv_layer))
 
         # Calculate perimeter from boundary edges
         edges = {e for f in self.faces for e in f.edges if e.index in edge_indices}
         perimeter = round(sum([e.calc_length() for e in edges]), 3)
         return perimeter
 
-    def _calc_sim_index(self):
+    def _calc_sim_index(self, improver=None):
         """Calculate ZenUV-style similarity index"""
         # Geometry factor: total count of verts + edges + faces
         geometry_factor = self.vert_count + self.edge_count + self.face_count
@@ -82,7 +205,7 @@ class IslandData:
         sim_index_p2 = float('0.' + str(self.mesh_area + self.perimeter).replace('.', ''))
 
         # Special case: quad islands get diagonal improver
-        if self.face_count == 1:
+        if improver is None and self.face_count == 1:
             face = self.faces[0]
             if len(face.verts) == 4:
                 # Calculate diagonal distances
@@ -90,7 +213,8 @@ class IslandData:
                 diagonal1 = (loops[0].vert.co - loops[2].vert.co).magnitude
                 diagonal2 = (loops[1].vert.co - loops[3].vert.co).magnitude
                 improver = round(diagonal1 + diagonal2, 3)
-                sim_index_p2 += improver
+        if improver:
+            sim_index_p2 += improver
 
         return geometry_factor + sim_index_p2
 
@@ -353,9 +477,9 @@ class IslandData:
             rotation_diff = master_angle - self_angle
 
             # Print debug info
-            print(f"[ROTATION] Self angle: {self_angle:.3f} rad ({self_angle * 180 / pi:.1f}°)")
-            print(f"[ROTATION] Master angle: {master_angle:.3f} rad ({master_angle * 180 / pi:.1f}°)")
-            print(f"[ROTATION] Rotation diff: {rotation_diff:.3f} rad ({rotation_diff * 180 / pi:.1f}°)")
+            trace.debug('STACK', "Self angle: %.3f rad (%.1f°)", self_angle, self_angle * 180 / pi)
+            trace.debug('STACK', "Master angle: %.3f rad (%.1f°)", master_angle, master_angle * 180 / pi)
+            trace.debug('STACK', "Rotation diff: %.3f rad (%.1f°)", rotation_diff, rotation_diff * 180 / pi)
 
             # Snap to nearest 90° increment
             angles_90 = [0, pi/2, pi, 3*pi/2]  # 0°, 90°, 180°, 270°
@@ -363,16 +487,16 @@ class IslandData:
             # Find the closest 90° angle to the rotation difference
             best_angle = min(angles_90, key=lambda a: abs((rotation_diff - a + pi) % (2*pi) - pi))
 
-            print(f"[ROTATION] Best snap angle: {best_angle:.3f} rad ({best_angle * 180 / pi:.1f}°)")
+            trace.debug('STACK', "Best snap angle: %.3f rad (%.1f°)", best_angle, best_angle * 180 / pi)
             return best_angle
 
         elif rotation_mode == 'OPTIMAL_MATCH':
             # Test both no-rotation and 90° snapping, pick the one with best match
-            print(f"[ROTATION] OPTIMAL_MATCH mode - testing no-rotation vs 90° snap")
+            trace.debug('STACK', "OPTIMAL_MATCH mode - testing no-rotation vs 90° snap")
 
             # Option 1: No rotation (keep original)
             no_rotation_score = self._calculate_bbox_match_score(master, 0.0)
-            print(f"[ROTATION] No rotation score: {no_rotation_score:.4f}")
+            trace.debug('STACK', "No rotation score: %.4f", no_rotation_score)
 
             # Option 2: Use 90° snapping
             self_angle = self.get_edge_orientation()
@@ -381,14 +505,14 @@ class IslandData:
             angles_90 = [0, pi/2, pi, 3*pi/2]
             snap_angle = min(angles_90, key=lambda a: abs((rotation_diff - a + pi) % (2*pi) - pi))
             snap_score = self._calculate_bbox_match_score(master, snap_angle)
-            print(f"[ROTATION] 90° snap ({snap_angle * 180 / pi:.1f}°) score: {snap_score:.4f}")
+            trace.debug('STACK', "90° snap (%.1f°) score: %.4f", snap_angle * 180 / pi, snap_score)
 
             # Pick the option with lower score (better match)
             if no_rotation_score <= snap_score:
-                print(f"[ROTATION] Choosing no rotation (better match)")
+                trace.debug('STACK', "Choosing no rotation (better match)")
                 return 0.0
             else:
-                print(f"[ROTATION] Choosing 90° snap at {snap_angle * 180 / pi:.1f}° (better match)")
+                trace.debug('STACK', "Choosing 90° snap at %.1f° (better match)", snap_angle * 180 / pi)
                 return snap_angle
 
         elif rotation_mode == 'OPTIMAL':
@@ -532,6 +656,173 @@ class IslandData:
             pass
 
 
+# Stack group membership: per object one base64 int32 array
+# [island count, island sizes..., sorted face indices of every island...]
+
+def pack_group_islands(islands_faces) -> str:
+    sizes = [len(faces) for faces in islands_faces]
+    data = np.empty(1 + len(sizes) + sum(sizes), dtype='<i4')
+    data[0] = len(sizes)
+    data[1:1 + len(sizes)] = sizes
+    if sizes:
+        data[1 + len(sizes):] = np.concatenate([np.sort(np.asarray(faces, dtype='<i4')) for faces in islands_faces])
+    return base64.b64encode(data.tobytes()).decode('ascii')
+
+
+@functools.lru_cache(maxsize=256)
+def unpack_group_islands(packed: str) -> tuple[np.ndarray, ...]:
+    """Sorted face indices per island, cached so redraws don't decode again"""
+    if not packed:
+        return ()
+    data = np.frombuffer(base64.b64decode(packed), dtype='<i4')
+    count = int(data[0])
+    sizes = data[1:1 + count]
+    islands = np.split(data[1 + count:], np.cumsum(sizes)[:-1]) if count else []
+    for faces in islands:
+        faces.flags.writeable = False
+    return tuple(islands)
+
+
+def island_key(face_indices) -> bytes:
+    """Order independent identity of an island face set"""
+    return np.sort(np.asarray(face_indices, dtype='<i4')).tobytes()
+
+
+def get_group_members(stack_group) -> dict[str, list[np.ndarray]]:
+    """Object name -> sorted face index arrays of the islands in a stack group"""
+    if not len(stack_group.members) and stack_group.islands_data not in ('', '[]'):
+        return migrate_group_islands_data(stack_group)
+    return {member.object_name: list(unpack_group_islands(member.packed)) for member in stack_group.members}
+
+
+def set_group_members(stack_group, members: dict[str, list]):
+    stack_group.members.clear()
+    for object_name, islands_faces in members.items():
+        if not islands_faces:
+            continue
+        member = stack_group.members.add()
+        member.object_name = object_name
+        member.packed = pack_group_islands(islands_faces)
+    stack_group.cached_island_count = count_group_islands(members)
+
+
+def count_group_islands(members: dict[str, list]) -> int:
+    return sum(len(islands_faces) for islands_faces in members.values())
+
+
+def migrate_group_islands_data(stack_group) -> dict[str, list[np.ndarray]]:
+    """Members from the JSON storage of older versions, stored packed when the context allows writing"""
+    try:
+        islands_data = json.loads(stack_group.islands_data)
+    except json.JSONDecodeError:
+        islands_data = []
+
+    members: dict[str, list[np.ndarray]] = {}
+    keys: set[tuple[str, bytes]] = set()
+    for stored_data in islands_data:
+        object_name = stored_data.get('object_name', '')
+        faces = np.sort(np.asarray(stored_data.get('face_indices', []), dtype='<i4'))
+        if (object_name, faces.tobytes()) not in keys:
+            keys.add((object_name, faces.tobytes()))
+            members.setdefault(object_name, []).append(faces)
+
+    try:
+        set_group_members(stack_group, members)
+        stack_group.islands_data = '[]'
+    except AttributeError:
+        pass  # Read only context (e.g. drawing), converted on the next write
+    return members
+
+
+def get_group_face_indices(stack_group, obj):
+    """Stored face index lists of a stack group that belong to obj"""
+    for member in stack_group.members:
+        if member.object_name == obj.name:
+            return [faces.tolist() for faces in unpack_group_islands(member.packed)]
+    if not len(stack_group.members):
+        return [faces.tolist() for faces in get_group_members(stack_group).get(obj.name, [])]
+    return []
+
+
+def group_by_sim_index(sim_indices, threshold=0.1):
+    """Greedy grouping with the same result as seeding groups in list order and
+    collecting every later ungrouped island that passes IslandData.is_similar.
+
+    The relative threshold turns the similar set of a positive seed into a value
+    interval, so candidates come from a sorted sweep (O(n log n)) and grouped
+    islands are skipped with path-compressed next pointers.
+    """
+    values = np.asarray(sim_indices, dtype='float64')
+    count = len(values)
+    if not count:
+        return []
+
+    def is_similar(a, b):
+        diff = abs(a - b)
+        avg_sim = (abs(a) + abs(b)) / 2.0
+        return (diff / avg_sim if avg_sim > 0 else diff) <= threshold
+
+    if threshold >= 2.0 or values.min() <= 0.0:
+        # Interval form needs positive values, keep the pairwise scan for degenerate input
+        groups = []
+        grouped = np.zeros(count, dtype=bool)
+        for i in range(count):
+            if grouped[i]:
+                continue
+            group = [i]
+            grouped[i] = True
+            for j in range(i + 1, count):
+                if not grouped[j] and is_similar(values[i], values[j]):
+                    group.append(j)
+                    grouped[j] = True
+            groups.append(group)
+        return groups
+
+    # |a - b| <= t * (a + b) / 2  <=>  a / ratio <= b <= a * ratio, widened for float error
+    ratio = (2.0 + threshold) / (2.0 - threshold)
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    lower = np.searchsorted(sorted_values, values / ratio * (1.0 - 1e-12), side='left').tolist()
+    upper = np.searchsorted(sorted_values, values * ratio * (1.0 + 1e-12), side='right').tolist()
+    order = order.tolist()
+    sorted_values = sorted_values.tolist()
+    values = values.tolist()
+    position = [0] * count
+    for pos, i in enumerate(order):
+        position[i] = pos
+
+    # next_free[pos] -> first not grouped sorted position >= pos
+    next_free = list(range(count + 1))
+
+    def find(pos):
+        root = pos
+        while next_free[root] != root:
+            root = next_free[root]
+        while next_free[pos] != root:
+            next_free[pos], pos = root, next_free[pos]
+        return root
+
+    groups = []
+    for i in range(count):
+        seed_pos = position[i]
+        if find(seed_pos) != seed_pos:
+            continue
+        next_free[seed_pos] = seed_pos + 1
+        # All islands before the seed are grouped already, so free ones are later in the list
+        members = []
+        seed_value = values[i]
+        pos = find(lower[i])
+        end = upper[i]
+        while pos < end:
+            if is_similar(seed_value, sorted_values[pos]):
+                members.append(order[pos])
+                next_free[pos] = pos + 1
+            pos = find(pos + 1)
+        members.sort()
+        groups.append([i] + members)
+    return groups
+
+
 class StackSystem:
     """Manages UV island stacking operations"""
 
@@ -542,9 +833,8 @@ class StackSystem:
         self._collect_islands()
 
     def _collect_islands(self):
-        """Collect all UV islands from objects - ZenUV style"""
-        # Import ZenUV's get_islands function which gets ALL islands (not just selected)
-        from ZenUV.utils import get_uv_islands as island_util
+        """Collect all visible UV islands from objects (cached per mesh state)"""
+        from ..types import Islands, UMesh
 
         for obj in self.context.objects_in_mode_unique_data:
             if obj.type != 'MESH':
@@ -556,13 +846,11 @@ class StackSystem:
             if not uv_layer:
                 continue
 
-            # Get ALL islands using ZenUV's method (not just selected)
-            # This returns all islands in the mesh, respecting context (3D view vs UV editor)
-            islands = island_util.get_islands(self.context, bm, is_include_hidden=False, use_seams_as_separator=False)
-
-            for island_faces in islands:
-                island_data = IslandData(obj, list(island_faces), uv_layer)
-                self.islands.append(island_data)
+            # Get ALL visible islands (not just selected), respecting sync mode
+            umesh = UMesh(bm, obj)
+            bm.faces.index_update()
+            islands_faces = [island.faces for island in Islands.calc_visible(umesh)]
+            self.islands.extend(IslandData.calc_batch(obj, bm, uv_layer, islands_faces))
 
     def group_by_similarity(self):
         """Group islands by similarity using threshold-based matching with user settings"""
@@ -577,39 +865,21 @@ class StackSystem:
         adjust_scale = settings.stack_simi_adjust_scale
         check_holes = settings.stack_simi_check_holes and settings.stack_simi_mode == 'BORDER_SHAPE'
         
-        print(f"\n[DEBUG] Total islands collected: {len(self.islands)}")
-        print(f"[DEBUG] Similarity mode: {settings.stack_simi_mode}, threshold: {threshold}, adjust_scale: {adjust_scale}")
+        trace.info('STACK', "Total islands collected: %s", len(self.islands))
+        trace.info('STACK', "Similarity mode: %s, threshold: %s, adjust_scale: %s", settings.stack_simi_mode, threshold, adjust_scale)
 
         # For now, use threshold-based grouping with sim_index
         # In future, we can enhance this to support different modes (Vertex Position, Topology)
-        processed = set()
+        sim_indices = [island.sim_index for island in self.islands]
         stack_id = 0
-        
-        for i, island in enumerate(self.islands):
-            if id(island) in processed:
-                continue
-            
-            # Start a new group with this island
-            current_group = [island]
-            processed.add(id(island))
-            
-            # Find all similar islands
-            for j, other_island in enumerate(self.islands):
-                if i >= j or id(other_island) in processed:
-                    continue
-                
-                # Check similarity using threshold
-                if island.is_similar(other_island, threshold=threshold):
-                    current_group.append(other_island)
-                    processed.add(id(other_island))
-            
-            # Only create stack if we have 2+ islands
-            if len(current_group) >= 2:
-                self.stacks[stack_id] = current_group
-                print(f"  Stack {stack_id}: {len(current_group)} island(s)")
-                stack_id += 1
-
-        print(f"\n[DEBUG] Final stacks: {len(self.stacks)}")
+        with trace.span('STACK', "group_by_sim_index", islands=len(sim_indices)):
+            for group in group_by_sim_index(sim_indices, threshold):
+                # Only create stack if we have 2+ islands
+                if len(group) >= 2:
+                    self.stacks[stack_id] = [self.islands[i] for i in group]
+                    stack_id += 1
+
+        trace.info('STACK', "Final stacks: %s", len(self.stacks))
         return self.stacks
 
     def get_selected_stacks(self):
@@ -875,30 +1145,19 @@ class StackSystem:
         if not stack_group:
             return False
 
-        # Get current islands in group
-        try:
-            islands_data = json.loads(stack_group.islands_data) if stack_group.islands_data else []
-        except json.JSONDecodeError:
-            islands_data = []
-
-        # Add new islands
+        # Add new islands, islands already in the group are found by their face set
+        members = get_group_members(stack_group)
+        stored_keys = {object_name: {faces.tobytes() for faces in islands_faces}
+                       for object_name, islands_faces in members.items()}
         for island in islands:
-            identifier_data = island.get_identifier_data()
-            # Check if already in group (compare dicts properly)
-            already_in_group = False
-            for stored_data in islands_data:
-                if (identifier_data.get('object_name') == stored_data.get('object_name') and
-                    identifier_data.get('face_indices') == stored_data.get('face_indices')):
-                    already_in_group = True
-                    break
-            if not already_in_group:
-                islands_data.append(identifier_data)
-
-        # Save back to group
-        stack_group.islands_data = json.dumps(islands_data)
-        
-        # Update cached count for UI performance
-        stack_group.cached_island_count = len(islands_data)
+            faces = np.sort(np.asarray(island.face_indices, dtype='<i4'))
+            object_keys = stored_keys.setdefault(island.obj.name, set())
+            if faces.tobytes() not in object_keys:
+                object_keys.add(faces.tobytes())
+                members.setdefault(island.obj.name, []).append(faces)
+
+        # Save back to group (updates the cached count for UI performance)
+        set_group_members(stack_group, members)
 
         return True
 
@@ -919,28 +1178,12 @@ class StackSystem:
         if not stack_group:
             return []
 
-        # Parse stored island identifiers
-        try:
-            islands_data = json.loads(stack_group.islands_data) if stack_group.islands_data else []
-        except json.JSONDecodeError:
+        # Match islands by their face set - only return islands from this object
+        stored_keys = {faces.tobytes() for faces in get_group_members(stack_group).get(obj.name, [])}
+        if not stored_keys:
             return []
-
-        # Match islands by identifier - only return islands from this object
-        group_islands = []
-        for island in self.islands:
-            # Only include islands from the target object
-            if island.obj != obj:
-                continue
-                
-            island_data = island.get_identifier_data()
-            # Compare dicts properly (by checking all keys match)
-            for stored_data in islands_data:
-                if (island_data.get('object_name') == stored_data.get('object_name') and
-                    island_data.get('face_indices') == stored_data.get('face_indices')):
-                    group_islands.append(island)
-                    break
-
-        return group_islands
+        return [island for island in self.islands
+                if island.obj == obj and island_key(island.face_indices) in stored_keys]
 
     def select_group(self, group_id):
         """Select all islands in a specific group"""
@@ -975,27 +1218,17 @@ class StackSystem:
         if not stack_group:
             return False
 
-        # Get current islands in group
-        try:
-            islands_data = json.loads(stack_group.islands_data) if stack_group.islands_data else []
-        except json.JSONDecodeError:
-            return False
-
         # Remove islands
+        members = get_group_members(stack_group)
+        removed_keys: dict[str, set[bytes]] = defaultdict(set)
         for island in islands:
-            identifier_data = island.get_identifier_data()
-            # Remove matching identifier data (compare dicts properly)
-            for i, stored_data in enumerate(islands_data):
-                if (identifier_data.get('object_name') == stored_data.get('object_name') and
-                    identifier_data.get('face_indices') == stored_data.get('face_indices')):
-                    islands_data.pop(i)
-                    break
-
-        # Save back to group
-        stack_group.islands_data = json.dumps(islands_data)
-        
-        # Update cached count for UI performance
-        stack_group.cached_island_count = len(islands_data)
+            removed_keys[island.obj.name].add(island_key(island.face_indices))
+        for object_name, keys in removed_keys.items():
+            if object_name in members:
+                members[object_name] = [faces for faces in members[object_name] if faces.tobytes() not in keys]
+
+        # Save back to group (updates the cached count for UI performance)
+        set_group_members(stack_group, members)
 
         return True
 
@@ -1009,12 +1242,8 @@ class StackSystem:
         # Find the group on this object
         for group in obj.uvv_stack_groups:
             if group.group_id == group_id:
-                try:
-                    # Parse the stored islands data to get count without full island processing
-                    islands_data = json.loads(group.islands_data) if group.islands_data else []
-                    return len(islands_data)
-                except (json.JSONDecodeError, AttributeError):
-                    return 0
+                # Count the stored islands without full island processing
+                return count_group_islands(get_group_members(group))
         
         return 0
 
@@ -1026,11 +1255,7 @@ class StackSystem:
                 continue
 
             for group in obj.uvv_stack_groups:
-                try:
-                    islands_data = json.loads(group.islands_data) if group.islands_data else []
-                    group.cached_island_count = len(islands_data)
-                except (json.JSONDecodeError, AttributeError):
-                    group.cached_island_count = 0
+                group.cached_island_count = count_group_islands(get_group_members(group))
 
 
 def offset_islands_to_tiles(master_island, replica_islands, start_tile=1):
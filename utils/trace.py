@@ -0,0 +1,204 @@
+"""
+UVV tracer
+
+Central replacement for print() debugging in operator hot paths. Messages carry
+a subsystem and a level and are only formatted when tracing is on for that
+subsystem. Timed spans (island calc, transform, GPU batch builds, ...) go into
+a ring buffer that can be exported as Chrome trace JSON (chrome://tracing,
+ui.perfetto.dev). With tracing off a log call returns after one attribute check
+and span() hands out a shared no-op context manager.
+
+Warnings and errors are printed even with tracing off, they are rare.
+"""
+
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVELS = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR}
+
+# Subsystem ids, also the items of the preferences flag enum
+SUBSYSTEMS = (
+    ('ISLAND', "Islands", "Island calculation"),
+    ('TRANSFORM', "Transform", "Bulk UV transforms"),
+    ('GPU', "GPU", "Overlay and gizmo batch builds"),
+    ('PACK', "Pack", "Packing"),
+    ('WELD', "Weld", "Weld and stitch"),
+    ('RELAX', "Relax", "Relax solver"),
+    ('QUADRIFY', "Quadrify", "Quad grid lattice"),
+    ('HOTSPOT', "Hotspot", "Trim hotspotting"),
+    ('STACK', "Stack", "Stack groups and similarity"),
+    ('SEAM_BRUSH', "Seam Brush", "Seam brush tool"),
+    ('PICK', "Pick", "3D viewport picking"),
+)
+
+BUFFER_SIZE = 10000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Times the with-block, args can be added while it runs"""
+    __slots__ = ('tracer', 'subsystem', 'name', 'args', 'start')
+
+    def __init__(self, tracer: 'Tracer', subsystem: str, name: str, args: dict):
+        self.tracer = tracer
+        self.subsystem = subsystem
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args['error'] = repr(exc_val)
+        self.tracer.record('X', self.subsystem, self.name, self.start, end - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        self.args.update(args)
+
+
+class Tracer:
+    def __init__(self, buffer_size: int = BUFFER_SIZE):
+        self.enabled = False
+        self.level = INFO
+        self.subsystems: frozenset[str] | None = None  # None for all
+        self.echo = True  # Print recorded messages to the console
+        self.events: collections.deque = collections.deque(maxlen=buffer_size)
+
+    def configure(self, enabled: bool | None = None, level: int | str | None = None,
+                  subsystems: set[str] | None = ..., buffer_size: int | None = None, echo: bool | None = None):
+        if enabled is not None:
+            self.enabled = enabled
+        if level is not None:
+            self.level = LEVELS[level] if isinstance(level, str) else level
+        if subsystems is not ...:
+            self.subsystems = None if subsystems is None else frozenset(subsystems)
+        if buffer_size is not None and buffer_size != self.events.maxlen:
+            self.events = collections.deque(self.events, maxlen=buffer_size)
+        if echo is not None:
+            self.echo = echo
+
+    def is_enabled(self, subsystem: str, level: int = DEBUG) -> bool:
+        """Guard for expensive message arguments"""
+        return (self.enabled and level >= self.level and
+                (self.subsystems is None or subsystem in self.subsystems))
+
+    def log(self, subsystem: str, level: int, msg: str, *args):
+        if not self.is_enabled(subsystem, level):
+            if level >= WARNING:
+                print(f"UVV [{subsystem}]: {msg % args if args else msg}")
+            return
+        if args:
+            msg = msg % args
+        self.record('i', subsystem, msg, time.perf_counter_ns(), 0, None)
+        if self.echo or level >= WARNING:
+            print(f"UVV [{subsystem}]: {msg}")
+
+    def span(self, subsystem: str, name: str, **args) -> Span | _NullSpan:
+        if not self.enabled or (self.subsystems is not None and subsystem not in self.subsystems):
+            return NULL_SPAN
+        return Span(self, subsystem, name, args)
+
+    def record(self, phase: str, subsystem: str, name: str, start_ns: int, duration_ns: int, args: dict | None):
+        self.events.append((phase, subsystem, name, start_ns, duration_ns, threading.get_ident(), args))
+
+    def clear(self):
+        self.events.clear()
+
+    def chrome_trace_events(self, last: int = 0) -> list[dict]:
+        events = list(self.events)
+        if last > 0:
+            events = events[-last:]
+        pid = os.getpid()
+        trace_events = []
+        for phase, subsystem, name, start_ns, duration_ns, tid, args in events:
+            event = {'name': name, 'cat': subsystem, 'ph': phase, 'ts': start_ns / 1000.0, 'pid': pid, 'tid': tid}
+            if phase == 'X':
+                event['dur'] = duration_ns / 1000.0
+            else:
+                event['s'] = 't'
+            if args:
+                event['args'] = {key: value if isinstance(value, (int, float, str, bool)) else repr(value)
+                                 for key, value in args.items()}
+            trace_events.append(event)
+        return trace_events
+
+    def export_chrome_trace(self, filepath: str, last: int = 0) -> int:
+        """Write the last events (all when 0) as Chrome trace JSON, returns the event count"""
+        trace_events = self.chrome_trace_events(last)
+        with open(filepath, 'w', encoding='utf-8') as file:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, file)
+        return len(trace_events)
+
+
+tracer = Tracer()
+
+
+def debug(subsystem: str, msg: str, *args):
+    if tracer.enabled:
+        tracer.log(subsystem, DEBUG, msg, *args)
+
+
+def info(subsystem: str, msg: str, *args):
+    if tracer.enabled:
+        tracer.log(subsystem, INFO, msg, *args)
+
+
+def warning(subsystem: str, msg: str, *args):
+    tracer.log(subsystem, WARNING, msg, *args)
+
+
+def error(subsystem: str, msg: str, *args):
+    tracer.log(subsystem, ERROR, msg, *args)
+
+
+def span(subsystem: str, name: str, **args) -> Span | _NullSpan:
+    if not tracer.enabled:
+        return NULL_SPAN
+    return tracer.span(subsystem, name, **args)
+
+
+def traced(subsystem: str, name: str | None = None):
+    """Decorator that records every call as a span.
+    Not for Operator methods, Blender checks the argument count of execute/modal/invoke.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            with tracer.span(subsystem, span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
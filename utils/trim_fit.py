@@ -0,0 +1,153 @@
+"""
+Batched trim fitting
+
+Fits any number of islands into their trims at once. Bounds, rotation, the
+per-axis scale of the fit mode and the alignment inside the padded trim are
+computed as arrays and turned into one 2x3 matrix per island, which
+uv_transform applies to all corners and writes back through the loops of the
+fitted faces.
+
+An island is rotated around its bounds center first, then scaled along the
+trim axes and moved into the trim, a rotation close to 90 or 270 degrees swaps
+the width and height the fit is computed from.
+"""
+
+import math
+
+import numpy as np
+
+from . import uv_transform
+
+
+FIT_MODES = ('CONTAIN', 'COVER', 'FILL', 'FIT_WIDTH', 'FIT_HEIGHT', 'NONE')
+AXIS_MODES = ('FILL', 'CONTAIN', 'CUSTOM')
+
+
+class FillOptions:
+    """Per-axis scaling of the 'FILL' fit mode, 'CONTAIN' keeps the aspect of the island"""
+
+    def __init__(self, horizontal_mode='FILL', vertical_mode='FILL', horizontal_custom=100.0, vertical_custom=100.0):
+        self.modes = (horizontal_mode, vertical_mode)
+        self.customs = (horizontal_custom, vertical_custom)
+
+    @classmethod
+    def from_operator(cls, op) -> 'FillOptions':
+        return cls(op.fit_horizontal_mode, op.fit_vertical_mode, op.fit_horizontal_custom, op.fit_vertical_custom)
+
+
+def alignment_factors(alignment: str) -> tuple[float, float]:
+    """-1, 0 or 1 per axis: 'TOP_LEFT' -> (-1, 1), 'CENTER' -> (0, 0)"""
+    x = -1.0 if alignment.endswith('LEFT') else 1.0 if alignment.endswith('RIGHT') else 0.0
+    y = 1.0 if alignment.startswith('TOP') else -1.0 if alignment.startswith('BOTTOM') else 0.0
+    return x, y
+
+
+def is_quarter_turn(angles: np.ndarray) -> np.ndarray:
+    """Angles that turn width into height (45-135 and 225-315 degrees)"""
+    degrees = np.degrees(angles) % 360
+    return ((degrees > 45) & (degrees < 135)) | ((degrees > 225) & (degrees < 315))
+
+
+def calc_rotated_sizes(sizes: np.ndarray, angles: np.ndarray) -> np.ndarray:
+    return np.where(is_quarter_turn(angles)[:, None], sizes[:, ::-1], sizes)
+
+
+def calc_auto_rotation(sizes: np.ndarray, target_sizes: np.ndarray) -> np.ndarray:
+    """0 or 90 degrees per island, whichever brings its aspect closer to the target aspect"""
+    aspect = sizes[:, 0] / sizes[:, 1]
+    target_aspect = target_sizes[:, 0] / target_sizes[:, 1]
+    return np.where(np.abs(1.0 / aspect - target_aspect) < np.abs(aspect - target_aspect), math.pi / 2, 0.0)
+
+
+def calc_fit_scales(sizes: np.ndarray, target_sizes: np.ndarray, fit_modes, fill: FillOptions | None = None) -> np.ndarray:
+    """Scale (N, 2) that fits sizes (N, 2) into target_sizes (N, 2).
+    :param fit_modes: One of FIT_MODES or one per island, unknown modes fit as 'CONTAIN'
+    """
+    ratio = target_sizes / sizes
+    contain = ratio.min(axis=1)
+    cover = ratio.max(axis=1)
+
+    scales = np.repeat(contain[:, None], 2, axis=1)
+    if isinstance(fit_modes, str):
+        fit_modes = np.full(len(sizes), fit_modes)
+    else:
+        fit_modes = np.asarray(fit_modes)
+
+    if (mask := fit_modes == 'COVER').any():
+        scales[mask] = cover[mask, None]
+    if (mask := fit_modes == 'FIT_WIDTH').any():
+        scales[mask] = ratio[mask, 0, None]
+    if (mask := fit_modes == 'FIT_HEIGHT').any():
+        scales[mask] = ratio[mask, 1, None]
+    if (mask := fit_modes == 'NONE').any():
+        scales[mask] = 1.0
+    if (mask := fit_modes == 'FILL').any():
+        fill = fill or FillOptions()
+        for axis, (mode, custom) in enumerate(zip(fill.modes, fill.customs)):
+            if mode == 'CONTAIN':
+                scales[mask, axis] = contain[mask]
+            elif mode == 'CUSTOM':
+                scales[mask, axis] = ratio[mask, axis] * (custom / 100.0)
+            else:
+                scales[mask, axis] = ratio[mask, axis]
+    return scales
+
+
+def calc_fit_matrices(bounds_min: np.ndarray, bounds_max: np.ndarray, rects: np.ndarray, angles: np.ndarray,
+                      fit_modes='CONTAIN', padding=0.0, alignment: str = 'CENTER',
+                      fill: FillOptions | None = None) -> np.ndarray:
+    """(N, 2, 3) matrices that fit island bounds (N, 2) into trim rects (N, 4) of left, bottom, right, top.
+    :param padding: Inset per side as a fraction of the trim size, scalar or one per island
+    """
+    sizes = calc_rotated_sizes(bounds_max - bounds_min, angles)
+    centers = (bounds_min + bounds_max) * 0.5
+    trim_sizes = rects[:, 2:] - rects[:, :2]
+    trim_centers = (rects[:, :2] + rects[:, 2:]) * 0.5
+    padding = np.broadcast_to(np.asarray(padding, dtype='float64'), len(rects))
+    target_sizes = trim_sizes * (1.0 - 2.0 * padding)[:, None]
+
+    scales = calc_fit_scales(sizes, target_sizes, fit_modes, fill)
+    targets = trim_centers + np.array(alignment_factors(alignment)) * (target_sizes - sizes * scales) * 0.5
+
+    # Rotate first, then scale along the trim axes
+    cos_a = np.cos(angles)
+    sin_a = np.sin(angles)
+    matrices = np.empty((len(rects), 2, 3), dtype='float64')
+    matrices[:, 0, 0] = cos_a * scales[:, 0]
+    matrices[:, 0, 1] = -sin_a * scales[:, 0]
+    matrices[:, 1, 0] = sin_a * scales[:, 1]
+    matrices[:, 1, 1] = cos_a * scales[:, 1]
+    matrices[:, :, 2] = targets - np.einsum('nij,nj->ni', matrices[:, :, :2], centers)
+    return matrices
+
+
+def fit_islands(buffer: uv_transform.CornerUVs, islands: uv_transform.IslandCorners, rects: np.ndarray,
+                angles: np.ndarray | None = None, fit_modes='CONTAIN', padding=0.0, alignment: str = 'CENTER',
+                fill: FillOptions | None = None, auto_rotate: bool = False, min_size: float = 0.0) -> np.ndarray:
+    """Fit every island into its trim rect, returns the mask of fitted islands.
+    Islands not wider and higher than min_size are left in place.
+    """
+    bounds_min, bounds_max = islands.calc_bounds(buffer.uv_co)
+    sizes = bounds_max - bounds_min
+    fitted = (sizes > min_size).all(axis=1)
+    if not fitted.any():
+        return fitted
+
+    rects = np.asarray(rects, dtype='float64').reshape(-1, 4)
+    if len(rects) == 1:
+        rects = np.repeat(rects, len(islands), axis=0)
+    if auto_rotate:
+        padding_arr = np.broadcast_to(np.asarray(padding, dtype='float64'), len(rects))
+        target_sizes = (rects[:, 2:] - rects[:, :2]) * (1.0 - 2.0 * padding_arr)[:, None]
+        angles = np.zeros(len(islands))
+        angles[fitted] = calc_auto_rotation(sizes[fitted], target_sizes[fitted])
+    elif angles is None:
+        angles = np.zeros(len(islands))
+
+    # Degenerate islands get a finite placeholder size and an identity matrix
+    safe_min = np.where(fitted[:, None], bounds_min, 0.0)
+    safe_max = np.where(fitted[:, None], bounds_max, 1.0)
+    matrices = calc_fit_matrices(safe_min, safe_max, rects, angles, fit_modes, padding, alignment, fill)
+    matrices[~fitted] = uv_transform.affine_matrix()
+    buffer.transform_islands(islands, matrices)
+    return fitted
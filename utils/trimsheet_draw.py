@@ -3,7 +3,9 @@
 import bpy
 import gpu
 import blf
+import numpy as np
 from gpu_extras.batch import batch_for_shader
+from ..utils import trace
 from ..utils import trimsheet_utils
 from ..utils.geometry import TextRect
 
@@ -15,12 +17,28 @@ if not bpy.app.background:
         shader_line = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
     else:
         shader_line = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
+    shader_flat = gpu.shader.from_builtin('FLAT_COLOR')
+    shader_line_flat = gpu.shader.from_builtin('POLYLINE_FLAT_COLOR')
 
 
 _draw_handler_view = None
 _draw_handler_pixel = None
 _handled_text_rects = set()
 
+CIRCLE_SEGMENTS = 64
+SHAPE_CIRCLE = 1  # Index of 'CIRCLE' in UVV_TrimRect.shape_type items
+MAX_CACHED_MATERIALS = 16
+
+# Drawn UVV_TrimRect properties: (name, size, dtype)
+_TRIM_SIGNATURE_PROPS = (
+    ('left', 1, 'float32'), ('bottom', 1, 'float32'), ('right', 1, 'float32'), ('top', 1, 'float32'),
+    ('center_x', 1, 'float32'), ('center_y', 1, 'float32'), ('radius_x', 1, 'float32'), ('radius_y', 1, 'float32'),
+    ('color', 3, 'float32'), ('enabled', 1, bool), ('locked', 1, bool), ('shape_type', 1, 'int32'),
+)
+
+# Material pointer -> TrimOverlayBatches
+_trim_batches: dict[int, 'TrimOverlayBatches'] = {}
+
 
 def generate_ellipse_vertices(center_x, center_y, radius_x, radius_y, segments=64):
     """Generate vertices for an ellipse in UV space
@@ -50,72 +68,126 @@ def generate_circle_vertices(center_x, center_y, radius, segments=64):
     return generate_ellipse_vertices(center_x, center_y, radius, radius, segments)
 
 
-def draw_circle_trim(trim, is_active, is_selected, opacity, settings, context):
-    """Draw a circular/elliptical trim shape
-
-    Args:
-        trim: UVV_TrimRect object with shape_type='CIRCLE'
-        is_active: Whether this trim is currently active
-        is_selected: Whether this trim is selected
-        opacity: Global opacity multiplier
-        settings: UVV settings object
-        context: Blender context
-    """
-    circle_data = trim.get_circle_data()
-    if not circle_data:
-        return
-
-    center_x, center_y, radius_x, radius_y = circle_data
-
-    # Generate ellipse vertices (with proper closure)
-    circle_verts = generate_ellipse_vertices(center_x, center_y, radius_x, radius_y, segments=64)
-
-    # Draw filled circle using triangle fan
-    fill_alpha = (0.2 if is_active else 0.1) * opacity
-    fill_color = (*trim.color, fill_alpha)
-
-    # Triangle fan: center + all circle vertices + close back to first vertex
-    fill_verts = [(center_x, center_y)] + circle_verts + [circle_verts[0]]
-    fill_batch = batch_for_shader(
-        shader_2d_uniform, 'TRI_FAN', {"pos": fill_verts}
-    )
-
-    shader_2d_uniform.bind()
-    shader_2d_uniform.uniform_float("color", fill_color)
-    fill_batch.draw(shader_2d_uniform)
-
-    # Draw border (skip if in edit mode and this is the active trim)
-    if is_active and settings.trim_edit_mode:
-        # Transform handles will draw the border
-        return
-
-    # Determine border color and width based on active/locked state
-    if is_active:
-        if trim.locked:
-            border_color = (0.5, 0.5, 0.5, 0.8 * opacity)  # Gray for locked
-        else:
-            border_color = (1.0, 1.0, 1.0, 0.5 * opacity)  # White for unlocked
-        line_width = 2.0
-    else:
-        border_color = (*trim.color, 0.8 * opacity)
-        line_width = 1.5
-
-    # Add closing vertex to ensure complete circle border
-    border_verts = circle_verts + [circle_verts[0]]
-    border_batch = batch_for_shader(
-        shader_line, 'LINE_STRIP', {"pos": border_verts}
-    )
-
-    shader_line.bind()
-
-    # Set line width for modern Blender versions
-    if bpy.app.version >= (3, 4, 0):
-        region = context.region
-        shader_line.uniform_float('viewportSize', (region.width, region.height))
-        shader_line.uniform_float('lineWidth', line_width)
-
-    shader_line.uniform_float('color', border_color)
-    border_batch.draw(shader_line)
+class TrimOverlayBatches:
+    """Concatenated fill/border batches of all trims of a material"""
+
+    def __init__(self, signature, fill_batch, border_batch, active_border_batch):
+        self.signature = signature
+        self.fill_batch = fill_batch
+        self.border_batch = border_batch
+        self.active_border_batch = active_border_batch
+
+
+def get_trims_signature(material, trims, opacity, edit_mode):
+    """Snapshot of every drawn UVV_TrimRect property, compared per redraw to detect changes"""
+    count = len(trims)
+    arrays = []
+    for prop_name, size, dtype in _TRIM_SIGNATURE_PROPS:
+        values = np.empty(count * size, dtype=dtype)
+        trims.foreach_get(prop_name, values)
+        arrays.append(values.tobytes())
+    return (count, material.uvv_trims_index, round(opacity, 6), edit_mode, b''.join(arrays))
+
+
+@trace.traced('GPU')
+def calc_trim_overlay_geometry(trims, active_index, opacity, edit_mode, segments=CIRCLE_SEGMENTS):
+    """Fill triangles, border lines and active border lines as (pos, color) arrays"""
+    count = len(trims)
+
+    def get(prop_name, size=1, dtype='float32'):
+        values = np.empty(count * size, dtype=dtype)
+        trims.foreach_get(prop_name, values)
+        return values.reshape(-1, size) if size > 1 else values
+
+    enabled = get('enabled', dtype=bool)
+    locked = get('locked', dtype=bool)
+    is_circle = get('shape_type', dtype='int32') == SHAPE_CIRCLE
+    color = get('color', 3)
+    left, bottom, right, top = get('left'), get('bottom'), get('right'), get('top')
+    center = np.stack((get('center_x'), get('center_y')), axis=1)
+    radius = np.stack((get('radius_x'), get('radius_y')), axis=1)
+
+    is_active = np.zeros(count, dtype=bool)
+    if 0 <= active_index < count:
+        is_active[active_index] = True
+
+    fill_alpha = np.where(is_active, 0.2, 0.1) * opacity
+    fill_color = np.column_stack((color, fill_alpha)).astype('float32')
+    border_color = np.column_stack((color, np.full(count, 0.8 * opacity))).astype('float32')
+    # Active trim: gray if locked, white if unlocked
+    border_color[is_active & locked] = (0.5, 0.5, 0.5, 0.8 * opacity)
+    border_color[is_active & ~locked] = (1.0, 1.0, 1.0, 0.5 * opacity)
+
+    fill_pos = []
+    fill_col = []
+    line_pos = []
+    line_col = []
+    line_active = []
+
+    rects = np.flatnonzero(enabled & ~is_circle)
+    if len(rects):
+        corners = np.stack((
+            np.stack((left[rects], bottom[rects]), axis=1),
+            np.stack((right[rects], bottom[rects]), axis=1),
+            np.stack((right[rects], top[rects]), axis=1),
+            np.stack((left[rects], top[rects]), axis=1)), axis=1)
+        fill_pos.append(corners[:, (0, 1, 2, 0, 2, 3)].reshape(-1, 2))
+        fill_col.append(np.repeat(fill_color[rects], 6, axis=0))
+        line_pos.append(corners[:, (0, 1, 1, 2, 2, 3, 3, 0)].reshape(-1, 2))
+        line_col.append(np.repeat(border_color[rects], 8, axis=0))
+        line_active.append(np.repeat(is_active[rects], 8))
+
+    circles = np.flatnonzero(enabled & is_circle)
+    if len(circles):
+        angles = np.arange(segments) / segments * 2 * np.pi
+        unit = np.stack((np.cos(angles), np.sin(angles)), axis=1)
+        ring = center[circles, None, :] + radius[circles, None, :] * unit[None]
+        ring_next = np.roll(ring, -1, axis=1)
+        centers = np.broadcast_to(center[circles, None, :], ring.shape)
+        fill_pos.append(np.stack((centers, ring, ring_next), axis=2).reshape(-1, 2))
+        fill_col.append(np.repeat(fill_color[circles], segments * 3, axis=0))
+        line_pos.append(np.stack((ring, ring_next), axis=2).reshape(-1, 2))
+        line_col.append(np.repeat(border_color[circles], segments * 2, axis=0))
+        line_active.append(np.repeat(is_active[circles], segments * 2))
+
+    if not fill_pos:
+        return None
+
+    fill = (np.concatenate(fill_pos).astype('float32'), np.concatenate(fill_col))
+    line_pos = np.concatenate(line_pos).astype('float32')
+    line_col = np.concatenate(line_col)
+    line_active = np.concatenate(line_active)
+    # In edit mode the transform handles draw the border of the active trim
+    active_lines = None if edit_mode else (line_pos[line_active], line_col[line_active])
+    lines = (line_pos[~line_active], line_col[~line_active])
+    return fill, lines, active_lines
+
+
+def get_trim_overlay_batches(material, opacity, edit_mode):
+    """Batches are rebuilt only when a trim property, the active trim or the overlay state change"""
+    trims = material.uvv_trims
+    key = material.as_pointer()
+    signature = get_trims_signature(material, trims, opacity, edit_mode)
+    cached = _trim_batches.get(key)
+    if cached is not None and cached.signature == signature:
+        return cached
+
+    geometry = calc_trim_overlay_geometry(trims, material.uvv_trims_index, opacity, edit_mode)
+    fill_batch = border_batch = active_border_batch = None
+    if geometry is not None:
+        fill, lines, active_lines = geometry
+        fill_batch = batch_for_shader(shader_flat, 'TRIS', {"pos": fill[0], "color": fill[1]})
+        if len(lines[0]):
+            border_batch = batch_for_shader(shader_line_flat, 'LINES', {"pos": lines[0], "color": lines[1]})
+        if active_lines is not None and len(active_lines[0]):
+            active_border_batch = batch_for_shader(
+                shader_line_flat, 'LINES', {"pos": active_lines[0], "color": active_lines[1]})
+
+    if cached is None and len(_trim_batches) >= MAX_CACHED_MATERIALS:
+        _trim_batches.clear()
+    batches = TrimOverlayBatches(signature, fill_batch, border_batch, active_border_batch)
+    _trim_batches[key] = batches
+    return batches
 
 
 def draw_trimsheet_rectangles():
@@ -143,83 +215,30 @@ def draw_trimsheet_rectangles():
     opacity = settings.trim_overlay_opacity
 
     try:
+        batches = get_trim_overlay_batches(material, opacity, settings.trim_edit_mode)
+        if batches.fill_batch is None:
+            return
+
         # Enable alpha blending
         gpu.state.blend_set('ALPHA')
 
-        for idx, trim in enumerate(trims):
-            # Skip disabled trims
-            if not trim.enabled:
-                continue
+        shader_flat.bind()
+        batches.fill_batch.draw(shader_flat)
 
-            is_active = (material.uvv_trims_index == idx)
-            is_selected = trim.selected
+        if batches.border_batch or batches.active_border_batch:
+            shader_line_flat.bind()
+            # Set viewport size for modern Blender versions
+            if bpy.app.version >= (3, 4, 0):
+                region = context.region
+                shader_line_flat.uniform_float('viewportSize', (region.width, region.height))
 
-            # Check shape type and draw accordingly
-            if hasattr(trim, 'shape_type') and trim.shape_type == 'CIRCLE':
-                # Draw circular trim
-                draw_circle_trim(trim, is_active, is_selected, opacity, settings, context)
-            else:
-                # Draw rectangular trim (default)
-                # Draw filled rectangle
-                fill_alpha = (0.2 if is_active else 0.1) * opacity
-                fill_color = (*trim.color, fill_alpha)
-
-                fill_verts = [
-                    (trim.left, trim.bottom),
-                    (trim.right, trim.bottom),
-                    (trim.right, trim.top),
-                    (trim.left, trim.top)
-                ]
-
-                fill_batch = batch_for_shader(
-                    shader_2d_uniform, 'TRI_FAN', {"pos": fill_verts}
-                )
-
-                shader_2d_uniform.bind()
-                shader_2d_uniform.uniform_float("color", fill_color)
-                fill_batch.draw(shader_2d_uniform)
-
-                # Draw border (skip if in edit mode and this is the active trim)
-                # In edit mode, the transform handles will draw the border instead
-                if is_active and settings.trim_edit_mode:
-                    # Skip drawing border for active trim in edit mode
-                    # The transform draw handler will show the blue border with handles
+            # Active trim border is wider, so it goes in its own batch
+            for batch, line_width in ((batches.border_batch, 1.5), (batches.active_border_batch, 2.0)):
+                if batch is None:
                     continue
-
-                border_verts = [
-                    (trim.left, trim.bottom),
-                    (trim.right, trim.bottom),
-                    (trim.right, trim.top),
-                    (trim.left, trim.top)
-                ]
-
-                # Determine border color and width based on active/locked state
-                if is_active:
-                    # Active trim: gray if locked, white if unlocked
-                    if trim.locked:
-                        border_color = (0.5, 0.5, 0.5, 0.8 * opacity)  # Gray for locked
-                    else:
-                        border_color = (1.0, 1.0, 1.0, 0.5 * opacity)  # White for unlocked
-                    line_width = 2.0
-                else:
-                    # All other trims: use trim color
-                    border_color = (*trim.color, 0.8 * opacity)
-                    line_width = 1.5
-
-                border_batch = batch_for_shader(
-                    shader_line, 'LINE_LOOP', {"pos": border_verts}
-                )
-
-                shader_line.bind()
-
-                # Set line width for modern Blender versions
                 if bpy.app.version >= (3, 4, 0):
-                    region = context.region
-                    shader_line.uniform_float('viewportSize', (region.width, region.height))
-                    shader_line.uniform_float('lineWidth', line_width)
-
-                shader_line.uniform_float('color', border_color)
-                border_batch.draw(shader_line)
+                    shader_line_flat.uniform_float('lineWidth', line_width)
+                batch.draw(shader_line_flat)
 
         gpu.state.blend_set('NONE')
 
@@ -1453,6 +1472,8 @@ def unregister_draw_handler():
     """Unregister the draw handlers"""
     global _draw_handler_view, _draw_handler_pixel
 
+    _trim_batches.clear()
+
     if _draw_handler_view is not None:
         bpy.types.SpaceImageEditor.draw_handler_remove(_draw_handler_view, 'WINDOW')
         _draw_handler_view = None
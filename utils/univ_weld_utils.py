@@ -11,6 +11,8 @@ import bmesh
 from mathutils import Vector
 from bmesh.types import BMLoop, BMLayerItem
 
+from . import trace
+
 
 def shared_crn(crn: BMLoop) -> BMLoop | None:
     """Get the shared corner (other side of edge). UniV ubm.py:21"""
@@ -67,7 +69,7 @@ def weld_crn_edge_by_idx(crn: BMLoop, crn_pair, idx, uv: BMLayerItem):
         idx: Island index (face.index) to identify which corners belong to same island
         uv: UV layer
     """
-    print(f"WELD FUNCTION: Called with crn={crn.index}, crn_pair={crn_pair.index}, idx={idx}")
+    trace.debug('WELD', "Called with crn=%s, crn_pair=%s, idx=%s", crn.index, crn_pair.index, idx)
     
     coords_sum_a = Vector((0.0, 0.0))
 
@@ -77,7 +79,7 @@ def weld_crn_edge_by_idx(crn: BMLoop, crn_pair, idx, uv: BMLayerItem):
     # Collect all corners at first vertex that share the same UV coordinate AND same island
     # UNIV BEHAVIOR: Only weld corners within the same island
     first_co = crn[uv].uv
-    print(f"WELD FUNCTION: First corner UV = {first_co}")
+    trace.debug('WELD', "First corner UV = %s", first_co)
     for crn_a in crn.vert.link_loops:
         if crn_a.face.index == idx:  # Only same island
             crn_a_uv = crn_a[uv]
@@ -85,11 +87,11 @@ def weld_crn_edge_by_idx(crn: BMLoop, crn_pair, idx, uv: BMLayerItem):
             if crn_a_co == first_co:  # ← Match UV coordinates exactly
                 coords_sum_a += crn_a_co
                 corners_append(crn_a_uv)
-                print(f"WELD FUNCTION: Added corner from first vertex: {crn_a_co} (face.index={crn_a.face.index})")
+                trace.debug('WELD', "Added corner from first vertex: %s (face.index=%s)", crn_a_co, crn_a.face.index)
 
     # Collect all corners at second vertex that share the same UV coordinate AND same island
     second_co = crn_pair[uv].uv
-    print(f"WELD FUNCTION: Second corner UV = {second_co}")
+    trace.debug('WELD', "Second corner UV = %s", second_co)
     for crn_b in crn_pair.vert.link_loops:
         if crn_b.face.index == idx:  # Only same island
             crn_b_uv = crn_b[uv]
@@ -97,17 +99,17 @@ def weld_crn_edge_by_idx(crn: BMLoop, crn_pair, idx, uv: BMLayerItem):
             if crn_b_co == second_co:  # ← Match UV coordinates exactly
                 coords_sum_a += crn_b_co
                 corners_append(crn_b_uv)
-                print(f"WELD FUNCTION: Added corner from second vertex: {crn_b_co} (face.index={crn_b.face.index})")
+                trace.debug('WELD', "Added corner from second vertex: %s (face.index=%s)", crn_b_co, crn_b.face.index)
 
     # Calculate average and apply to all corners (UniV lines 887-890)
     if corners:
         avg_co_a = coords_sum_a / len(corners)
-        print(f"WELD FUNCTION: Calculated average UV = {avg_co_a} for {len(corners)} corners")
+        trace.debug('WELD', "Calculated average UV = %s for %s corners", avg_co_a, len(corners))
         for crn_ in corners:
             crn_.uv = avg_co_a
-        print(f"WELD FUNCTION: Applied average UV to all corners")
+        trace.debug('WELD', "Applied average UV to all corners")
     else:
-        print(f"WELD FUNCTION: No corners found to weld!")
+        trace.warning('WELD', "No corners found to weld!")
 
 
 def weld_crn_edge_by_dict(crn: BMLoop, crn_pair, face_to_island_idx: dict, idx: int, uv: BMLayerItem):
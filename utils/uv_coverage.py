@@ -0,0 +1,190 @@
+"""
+Vectorized UV coverage
+
+Rasterizes triangulated UVs into a per-UDIM pixel count grid with a scanline
+pass: every (triangle, row) pair yields a half-open span of covered pixel
+centers, spans are accumulated as +1/-1 markers and resolved with a cumulative
+sum. Shared edges are evaluated with the same endpoint order, so neighbouring
+triangles never cover the same pixel twice and overlaps are real overlaps.
+"""
+
+import bpy
+import bmesh
+import numpy as np
+
+from . import island_engine
+
+
+DEFAULT_RESOLUTION = 2048
+
+# Number of (triangle, row) spans rasterized at once
+SPAN_CHUNK_SIZE = 1 << 18
+
+
+class UVCoverage:
+    """Coverage and overlap per UDIM tile, in percent of the tile area"""
+
+    def __init__(self, resolution: int = DEFAULT_RESOLUTION):
+        self.resolution = resolution
+        self.tiles: dict[int, tuple[float, float]] = {}  # udim -> (coverage, overlap)
+
+    @property
+    def coverage(self) -> float:
+        return self.tiles.get(1001, (0.0, 0.0))[0]
+
+    @property
+    def overlap(self) -> float:
+        return self.tiles.get(1001, (0.0, 0.0))[1]
+
+
+def _mesh_uv_triangles(me: bpy.types.Mesh, uv_name: str, selected_only: bool) -> np.ndarray:
+    """UVs of the visible (and selected, if any are selected) loop triangles, (T, 3, 2)"""
+    if uv_name not in me.attributes:
+        return np.empty((0, 3, 2), dtype='float32')
+
+    face_count = len(me.polygons)
+    attributes = me.attributes
+    hidden = island_engine.get_attribute(attributes, '.hide_poly', face_count, bool, 'value')
+    visible = ~hidden
+    if selected_only:
+        selected = island_engine.get_attribute(attributes, '.select_poly', face_count, bool, 'value') & visible
+        if selected.any():
+            visible = selected
+
+    me.calc_loop_triangles()
+    tri_count = len(me.loop_triangles)
+    tri_loops = np.empty(tri_count * 3, dtype='int32')
+    me.loop_triangles.foreach_get('loops', tri_loops)
+    tri_faces = np.empty(tri_count, dtype='int32')
+    me.loop_triangles.foreach_get('polygon_index', tri_faces)
+
+    uv_co = island_engine.get_attribute(attributes, uv_name, len(me.loops), 'float32', 'vector', 2)
+    return uv_co[tri_loops.reshape(-1, 3)[visible[tri_faces]]]
+
+
+def calc_object_uv_triangles(obj: bpy.types.Object, selected_only=True) -> np.ndarray:
+    """Edit mode objects are read through the island engine scratch mesh"""
+    if obj.mode != 'EDIT':
+        me = obj.data
+        if (uv := me.uv_layers.active) is None:
+            return np.empty((0, 3, 2), dtype='float32')
+        return _mesh_uv_triangles(me, uv.name, selected_only)
+
+    bm = bmesh.from_edit_mesh(obj.data)
+    if (uv := bm.loops.layers.uv.active) is None:
+        return np.empty((0, 3, 2), dtype='float32')
+    me = island_engine.scratch_mesh()
+    try:
+        bm.to_mesh(me)
+        return _mesh_uv_triangles(me, uv.name, selected_only)
+    finally:
+        me.clear_geometry()
+
+
+def rasterize_triangles(tris: np.ndarray, resolution: int) -> np.ndarray:
+    """Per pixel count of triangles that contain the pixel center, tris in 0-1 space, (T, 3, 2)"""
+    width = resolution + 1  # extra column for span end markers
+    counts = np.zeros(resolution * width, dtype='int32')
+
+    # Vertices sorted by y: every row crosses the long edge v0-v2 and either v0-v1 (below v1) or v1-v2.
+    # Edge params are (x, y) of the lower endpoint and dx/dy, so shared edges evaluate identically.
+    tris = tris.astype('float64') * resolution - 0.5  # pixel centers at integer coordinates
+    tris = np.take_along_axis(tris, np.argsort(tris[:, :, 1], axis=1)[:, :, None], axis=1)
+    row_start = np.clip(np.ceil(tris[:, 0, 1]), 0, resolution).astype('int64')
+    rows_per_tri = np.clip(np.ceil(tris[:, 2, 1]), 0, resolution).astype('int64') - row_start
+    has_rows = rows_per_tri > 0
+    tris = tris[has_rows]
+    row_start = row_start[has_rows]
+    rows_per_tri = rows_per_tri[has_rows]
+
+    v0, v1, v2 = tris[:, 0], tris[:, 1], tris[:, 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope_long = (v2[:, 0] - v0[:, 0]) / (v2[:, 1] - v0[:, 1])
+        slope_low = (v1[:, 0] - v0[:, 0]) / (v1[:, 1] - v0[:, 1])
+        slope_high = (v2[:, 0] - v1[:, 0]) / (v2[:, 1] - v1[:, 1])
+    params = np.stack((v0[:, 0], v0[:, 1], slope_long, slope_low, v1[:, 0], v1[:, 1], slope_high), axis=1)
+    del tris, v0, v1, v2, slope_long, slope_low, slope_high
+
+    tri_first_span = np.cumsum(rows_per_tri) - rows_per_tri
+    total = int(rows_per_tri.sum())
+    # Split at triangle boundaries into chunks of about SPAN_CHUNK_SIZE spans
+    bounds = np.searchsorted(tri_first_span, np.arange(0, total, SPAN_CHUNK_SIZE), side='right') - 1
+    bounds = np.unique(np.append(bounds, len(rows_per_tri))).tolist()
+
+    markers_start = []
+    markers_end = []
+    buffered = 0
+    for tri_a, tri_b in zip(bounds[:-1], bounds[1:]):
+        chunk_rows = rows_per_tri[tri_a:tri_b]
+        span_tri = np.repeat(np.arange(tri_a, tri_b), chunk_rows)
+        span_row = np.arange(len(span_tri)) + np.repeat(row_start[tri_a:tri_b] - (tri_first_span[tri_a:tri_b] - tri_first_span[tri_a]), chunk_rows)
+        span_y = span_row.astype('float64')
+
+        x0, y0, slope_long, slope_low, x1, y1, slope_high = params[span_tri].T
+        x_long = x0 + (span_y - y0) * slope_long
+        below = span_y < y1
+        with np.errstate(invalid='ignore'):
+            x_short = np.where(below, x0 + (span_y - y0) * slope_low, x1 + (span_y - y1) * slope_high)
+        x_min = np.minimum(x_long, x_short)
+        x_max = np.maximum(x_long, x_short)
+
+        valid = np.isfinite(x_min) & np.isfinite(x_max)
+        col_start = np.clip(np.ceil(x_min[valid]), 0, resolution).astype('int64')
+        col_end = np.clip(np.ceil(x_max[valid]), 0, resolution).astype('int64')
+        filled = col_end > col_start
+        offset = span_row[valid][filled] * width
+        markers_start.append(offset + col_start[filled])
+        markers_end.append(offset + col_end[filled])
+        buffered += len(offset)
+
+        # bincount over the whole grid is cheap per marker only when there are many of them
+        if buffered >= counts.size or tri_b == bounds[-1]:
+            counts += np.bincount(np.concatenate(markers_start), minlength=counts.size).astype('int32')
+            counts -= np.bincount(np.concatenate(markers_end), minlength=counts.size).astype('int32')
+            markers_start.clear()
+            markers_end.clear()
+            buffered = 0
+
+    return np.cumsum(counts.reshape(resolution, width), axis=1, dtype='int32')[:, :resolution]
+
+
+def calc_uv_coverage(tris: np.ndarray, resolution: int = DEFAULT_RESOLUTION) -> UVCoverage:
+    """Coverage and overlap of every UDIM tile touched by the triangles"""
+    result = UVCoverage(resolution)
+    if not len(tris):
+        return result
+
+    # Max is exclusive, a triangle touching the tile border doesn't belong to the next tile
+    tile_min = np.floor(np.minimum(np.minimum(tris[:, 0], tris[:, 1]), tris[:, 2])).astype('int64')
+    tile_max = np.ceil(np.maximum(np.maximum(tris[:, 0], tris[:, 1]), tris[:, 2])).astype('int64') - 1
+    tile_max = np.maximum(tile_max, tile_min)
+    spanning = (tile_min[:, 0] != tile_max[:, 0]) | (tile_min[:, 1] != tile_max[:, 1])
+
+    # Triangles inside one tile are rasterized there, others in every tile their bbox touches
+    tile_tris: dict[tuple[int, int], list[np.ndarray]] = {}
+    single = tris[~spanning]
+    if len(single):
+        single_tiles = tile_min[~spanning]
+        tile_keys = (single_tiles[:, 0] << 32) + single_tiles[:, 1]
+        order = np.argsort(tile_keys, kind='stable')
+        tile_keys = tile_keys[order]
+        starts = np.flatnonzero(np.diff(tile_keys, prepend=tile_keys[0] - 1)).tolist()
+        for start, end in zip(starts, starts[1:] + [len(order)]):
+            tile_u, tile_v = single_tiles[order[start]].tolist()
+            tile_tris.setdefault((tile_u, tile_v), []).append(single[order[start:end]])
+    for tri, t_min, t_max in zip(tris[spanning], tile_min[spanning].tolist(), tile_max[spanning].tolist()):
+        for tile_u in range(t_min[0], t_max[0] + 1):
+            for tile_v in range(t_min[1], t_max[1] + 1):
+                tile_tris.setdefault((tile_u, tile_v), []).append(tri[None])
+
+    pixel_count = resolution * resolution
+    for (tile_u, tile_v), chunks in tile_tris.items():
+        if not (0 <= tile_u < 10 and tile_v >= 0):
+            continue  # Outside of UDIM range
+        local = np.concatenate(chunks) - np.array((tile_u, tile_v), dtype='float32')
+        counts = rasterize_triangles(local, resolution)
+        covered = np.count_nonzero(counts)
+        overlapped = np.count_nonzero(counts > 1)
+        result.tiles[1001 + tile_u + tile_v * 10] = (covered / pixel_count * 100.0, overlapped / pixel_count * 100.0)
+    result.tiles = dict(sorted(result.tiles.items()))
+    return result
@@ -0,0 +1,266 @@
+"""
+Grid accelerated UV overlap detection
+
+Bins the bounding boxes of UV triangles into a uniform grid sized from the
+triangle extents, builds candidate pairs per cell with NumPy and keeps a pair
+only in the cell that holds the min corner of the two boxes' intersection, so
+no pair is tested twice. Candidates are resolved with a vectorized separating
+axis test. Triangles with the same group id (face, island) are never paired,
+which turns the same pass into face, island or cross-object overlap queries.
+"""
+
+import bmesh
+import numpy as np
+
+from . import island_engine
+
+
+# Cells per axis are limited, large meshes get coarser cells instead
+MAX_GRID_SIZE = 1 << 14
+CELL_FACTOR = 1.0
+# Max cells per axis of the grid that finds triangles near other groups
+CONTESTED_GRID_SIZE = 1024
+# Candidate pairs tested at once
+PAIR_CHUNK_SIZE = 1 << 20
+
+
+def _min3(a, b, c):
+    return np.minimum(np.minimum(a, b), c)
+
+
+def _max3(a, b, c):
+    return np.maximum(np.maximum(a, b), c)
+
+
+def calc_tris_overlap(tris_a: np.ndarray, tris_b: np.ndarray, include_touching=False, eps=1e-7) -> np.ndarray:
+    """Separating axis test of triangle pairs (P, 3, 2).
+    Shared edges and vertices only count with include_touching (like intersect_tri_tri_2d).
+    """
+    ax, ay = tris_a[:, :, 0], tris_a[:, :, 1]
+    bx, by = tris_b[:, :, 0], tris_b[:, :, 1]
+    separated = np.zeros(len(tris_a), dtype=bool)
+    for px, py in ((ax, ay), (bx, by)):
+        for i in range(3):
+            j = (i + 1) % 3
+            # Edge normal as axis
+            nx = py[:, i] - py[:, j]
+            ny = px[:, j] - px[:, i]
+            proj_a = [ax[:, k] * nx + ay[:, k] * ny for k in range(3)]
+            proj_b = [bx[:, k] * nx + by[:, k] * ny for k in range(3)]
+            tolerance = eps * (np.abs(nx) + np.abs(ny))
+            if include_touching:
+                separated |= (_max3(*proj_a) < _min3(*proj_b) - tolerance) | (_max3(*proj_b) < _min3(*proj_a) - tolerance)
+            else:
+                separated |= (_max3(*proj_a) <= _min3(*proj_b) + tolerance) | (_max3(*proj_b) <= _min3(*proj_a) + tolerance)
+    return ~separated
+
+
+def _calc_contested_tris(tri_min: np.ndarray, tri_max: np.ndarray, tri_groups: np.ndarray) -> np.ndarray:
+    """Triangles that touch a coarse grid cell covered by the bounding boxes of two or more groups.
+    Others can't overlap a triangle of another group.
+    """
+    group_ids, tri_group_index = np.unique(tri_groups, return_inverse=True)
+    group_count = len(group_ids)
+    order = np.argsort(tri_group_index, kind='stable')
+    starts = np.searchsorted(tri_group_index[order], np.arange(group_count))
+    group_min = np.minimum.reduceat(tri_min[order], starts)
+    group_max = np.maximum.reduceat(tri_max[order], starts)
+
+    grid_min = group_min.min(axis=0)
+    extent = np.maximum(group_max.max(axis=0) - grid_min, 1e-12)
+    res = int(min(max(np.sqrt(group_count) * 4, 16), CONTESTED_GRID_SIZE))
+    scale = res / extent
+
+    def cell_range(lo, hi):
+        return (np.clip(np.floor((lo - grid_min) * scale), 0, res - 1).astype('int64'),
+                np.clip(np.floor((hi - grid_min) * scale), 0, res - 1).astype('int64'))
+
+    # Count of group boxes per cell with a 2D difference array
+    c0, c1 = cell_range(group_min, group_max)
+    diff = np.zeros((res + 1) * (res + 1), dtype='int64')
+    stride = res + 1
+    for x, y, sign in ((c0[:, 0], c0[:, 1], 1), (c1[:, 0] + 1, c0[:, 1], -1),
+                       (c0[:, 0], c1[:, 1] + 1, -1), (c1[:, 0] + 1, c1[:, 1] + 1, 1)):
+        diff += np.bincount(y * stride + x, minlength=diff.size) * sign
+    counts = diff.reshape(res + 1, res + 1).cumsum(axis=0).cumsum(axis=1)[:res, :res]
+
+    # Summed area table of contested cells, one lookup per triangle rect
+    table = np.zeros((res + 1, res + 1), dtype='int64')
+    table[1:, 1:] = (counts >= 2).cumsum(axis=0).cumsum(axis=1)
+    c0, c1 = cell_range(tri_min, tri_max)
+    contested = table[c1[:, 1] + 1, c1[:, 0] + 1] - table[c0[:, 1], c1[:, 0] + 1] - table[c1[:, 1] + 1, c0[:, 0]] + table[c0[:, 1], c0[:, 0]]
+    return contested > 0
+
+
+def calc_overlapping_tri_pairs(tris: np.ndarray, tri_groups: np.ndarray | None = None, include_touching=False) -> np.ndarray:
+    """Index pairs (P, 2) of overlapping triangles (T, 3, 2), pairs inside a group are skipped"""
+    tris = np.asarray(tris, dtype='float32')
+    count = len(tris)
+    if count < 2:
+        return np.empty((0, 2), dtype='int64')
+
+    tri_min = _min3(tris[:, 0], tris[:, 1], tris[:, 2])
+    tri_max = _max3(tris[:, 0], tris[:, 1], tris[:, 2])
+    tri_ids = np.arange(count)
+
+    # Few large groups (islands) leave most triangles far from any other group
+    if tri_groups is not None and len(np.unique(tri_groups)) * 8 <= count:
+        tri_ids = np.flatnonzero(_calc_contested_tris(tri_min, tri_max, tri_groups))
+        if len(tri_ids) < 2:
+            return np.empty((0, 2), dtype='int64')
+        tris = tris[tri_ids]
+        tri_min = tri_min[tri_ids]
+        tri_max = tri_max[tri_ids]
+        tri_groups = tri_groups[tri_ids]
+        count = len(tri_ids)
+
+    grid_min = tri_min.min(axis=0).astype('float64')
+    grid_extent = max(float((tri_max.max(axis=0) - grid_min).max()), 1e-12)
+
+    # About one cell per triangle side, coarser when big triangles would cover too many cells
+    cell = max(float(np.median((tri_max - tri_min).max(axis=1))) * CELL_FACTOR, grid_extent / MAX_GRID_SIZE, 1e-12)
+    for _ in range(4):
+        cell_min = np.floor((tri_min - grid_min) / cell).astype('int32')
+        cell_max = np.floor((tri_max - grid_min) / cell).astype('int32')
+        cells_per_tri = (cell_max - cell_min + 1).astype('int64').prod(axis=1)
+        total = int(cells_per_tri.sum())
+        if total <= count * 16:
+            break
+        cell *= np.sqrt(total / (count * 4))
+    grid_width = int(cell_max[:, 0].max()) + 1
+
+    # One entry per (triangle, covered cell), sorted by cell
+    entry_tri = np.repeat(np.arange(count, dtype='int32'), cells_per_tri)
+    local = np.arange(total, dtype='int32') - np.repeat((np.cumsum(cells_per_tri) - cells_per_tri).astype('int32'), cells_per_tri)
+    span_x = (cell_max[:, 0] - cell_min[:, 0] + 1)[entry_tri]
+    entry_x = cell_min[entry_tri, 0] + local % span_x
+    entry_y = cell_min[entry_tri, 1] + local // span_x
+    del local, span_x
+    order = np.argsort(entry_y.astype('int64') * grid_width + entry_x)
+    entry_tri = entry_tri[order]
+    entry_x = entry_x[order]
+    entry_y = entry_y[order]
+    del order
+
+    # Every entry pairs with the entries after it in the same cell
+    new_cell = np.empty(total, dtype=bool)
+    new_cell[0] = True
+    new_cell[1:] = (entry_x[1:] != entry_x[:-1]) | (entry_y[1:] != entry_y[:-1])
+    cell_starts = np.flatnonzero(new_cell)
+    cell_sizes = np.diff(cell_starts, append=total)
+    partners = np.repeat(cell_starts + cell_sizes, cell_sizes) - np.arange(total) - 1
+    first_pair = np.cumsum(partners) - partners
+    pair_total = int(partners.sum())
+
+    # Columns for cheap gathers
+    min_x, min_y = np.ascontiguousarray(tri_min[:, 0]), np.ascontiguousarray(tri_min[:, 1])
+    max_x, max_y = np.ascontiguousarray(tri_max[:, 0]), np.ascontiguousarray(tri_max[:, 1])
+    cell_x, cell_y = np.ascontiguousarray(cell_min[:, 0]), np.ascontiguousarray(cell_min[:, 1])
+
+    tris = tris.astype('float64')
+
+    bounds = np.searchsorted(first_pair, np.arange(0, pair_total, PAIR_CHUNK_SIZE), side='right') - 1
+    bounds = np.unique(np.append(bounds, total)).tolist()
+    result = []
+    for entry_a, entry_b in zip(bounds[:-1], bounds[1:]):
+        chunk_partners = partners[entry_a:entry_b]
+        first = np.repeat(np.arange(entry_a, entry_b, dtype='int32'), chunk_partners)
+        second = first + 1 + (np.arange(len(first), dtype='int32') -
+                              np.repeat((first_pair[entry_a:entry_b] - first_pair[entry_a]).astype('int32'), chunk_partners))
+        tri_a = entry_tri[first]
+        tri_b = entry_tri[second]
+        if tri_groups is not None:
+            valid = tri_groups[tri_a] != tri_groups[tri_b]
+            first, tri_a, tri_b = first[valid], tri_a[valid], tri_b[valid]
+
+        # Report the pair only from the cell that holds the min corner of the bbox intersection
+        valid = ((np.maximum(cell_x[tri_a], cell_x[tri_b]) == entry_x[first]) &
+                 (np.maximum(cell_y[tri_a], cell_y[tri_b]) == entry_y[first]))
+        tri_a, tri_b = tri_a[valid], tri_b[valid]
+
+        if include_touching:
+            valid = ((min_x[tri_a] <= max_x[tri_b]) & (min_x[tri_b] <= max_x[tri_a]) &
+                     (min_y[tri_a] <= max_y[tri_b]) & (min_y[tri_b] <= max_y[tri_a]))
+        else:
+            valid = ((min_x[tri_a] < max_x[tri_b]) & (min_x[tri_b] < max_x[tri_a]) &
+                     (min_y[tri_a] < max_y[tri_b]) & (min_y[tri_b] < max_y[tri_a]))
+        tri_a, tri_b = tri_a[valid], tri_b[valid]
+
+        overlap = calc_tris_overlap(tris[tri_a], tris[tri_b], include_touching)
+        result.append(np.stack((tri_a[overlap], tri_b[overlap]), axis=1))
+
+    pairs = np.concatenate(result) if result else np.empty((0, 2), dtype='int64')
+    return np.sort(tri_ids[pairs], axis=1)
+
+
+def calc_overlapping_pairs(tris: np.ndarray, tri_groups: np.ndarray, include_touching=False) -> np.ndarray:
+    """Unique pairs (P, 2) of group ids, sorted, with at least one overlapping triangle pair"""
+    tri_groups = np.asarray(tri_groups, dtype='int64')
+    tri_pairs = calc_overlapping_tri_pairs(tris, tri_groups, include_touching)
+    if not len(tri_pairs):
+        return np.empty((0, 2), dtype='int64')
+    pairs = np.sort(tri_groups[tri_pairs], axis=1)
+    return np.unique(pairs, axis=0)
+
+
+class MeshOverlaps:
+    """Overlapping faces of one mesh, face indices follow BMesh order"""
+
+    def __init__(self):
+        self.face_pairs: np.ndarray = np.empty((0, 2), dtype='int64')
+        self.face_islands: np.ndarray = np.empty(0, dtype='int64')  # Island index per face, -1 for skipped faces
+
+    @property
+    def island_pairs(self) -> np.ndarray:
+        """Pairs of different islands with overlapping faces"""
+        pairs = self.face_islands[self.face_pairs]
+        pairs = np.sort(pairs[pairs[:, 0] != pairs[:, 1]], axis=1)
+        return np.unique(pairs, axis=0) if len(pairs) else pairs
+
+    @property
+    def overlapping_faces(self) -> np.ndarray:
+        return np.unique(self.face_pairs)
+
+
+def calc_mesh_overlaps(bm: bmesh.types.BMesh, uv: bmesh.types.BMLayerItem, face_tags: np.ndarray | None = None) -> MeshOverlaps | None:
+    """Overlaps between the visible (or tagged) faces of a mesh, None when the scratch mesh can't be written"""
+    try:
+        me = island_engine.scratch_mesh()
+        bm.to_mesh(me)
+    except (AttributeError, RuntimeError, ValueError):
+        return None
+
+    # Arrays and triangles come from the same copy of the mesh
+    try:
+        if (arrays := island_engine.MeshArrays.from_mesh(me, uv.name)) is None:
+            return None
+        me.calc_loop_triangles()
+        tri_count = len(me.loop_triangles)
+        tri_loops = np.empty(tri_count * 3, dtype='int32')
+        me.loop_triangles.foreach_get('loops', tri_loops)
+        tri_faces = np.empty(tri_count, dtype='int32')
+        me.loop_triangles.foreach_get('polygon_index', tri_faces)
+    finally:
+        me.clear_geometry()
+
+    if face_tags is None:
+        face_tags = ~arrays.face_hide
+    tagged = face_tags[tri_faces]
+    tris = arrays.uv_co[tri_loops.reshape(-1, 3)[tagged]]
+    tri_faces = tri_faces[tagged]
+
+    result = MeshOverlaps()
+    result.face_islands = np.full(arrays.face_count, -1, dtype='int64')
+    face_order, starts = island_engine.calc_island_face_order(arrays, face_tags, island_engine.MODE_UV)
+    result.face_islands[face_order] = np.repeat(np.arange(len(starts)), np.diff(starts, append=len(face_order)))
+    result.face_pairs = calc_overlapping_pairs(tris, tri_faces)
+    return result
+
+
+def calc_island_groups(islands_tris: list[np.ndarray], include_touching=True) -> np.ndarray:
+    """Component label per island, islands are linked when their triangles (T, 3, 2) overlap"""
+    count = len(islands_tris)
+    tri_islands = np.repeat(np.arange(count), [len(tris) for tris in islands_tris])
+    tris = np.concatenate(islands_tris) if count else np.empty((0, 3, 2))
+    pairs = calc_overlapping_pairs(tris, tri_islands, include_touching)
+    return island_engine.calc_components(count, pairs[:, 0], pairs[:, 1])
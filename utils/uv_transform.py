@@ -0,0 +1,190 @@
+"""
+Bulk UV transform kernel
+
+Gathers the corner UVs of a whole BMesh through the island engine scratch mesh
+and applies 2x3 affine matrices (one per island) with NumPy, instead of doing
+Vector math per corner. Island membership is a corner-index array built from
+the island engine partition, which is reused from island_cache while the mesh
+is unchanged.
+
+Reading costs one copy of the whole mesh into the scratch mesh. Writing back
+goes per corner through the BMLoop UV layer, but only for the faces with a
+changed corner, the BMesh itself (elements, shape keys, selection history) is
+left as it is. This pays off for whole-mesh operators, a single island of live
+faces is cheaper to transform with Vector math in place.
+"""
+
+import math
+
+import bmesh
+import numpy as np
+
+from . import island_cache
+from . import island_engine
+from . import trace
+
+
+def affine_matrix(angle: float = 0.0, scale=(1.0, 1.0), pivot=(0.0, 0.0), offset=(0.0, 0.0), aspect: float = 1.0) -> np.ndarray:
+    """2x3 matrix that scales, then rotates counter-clockwise around pivot, then moves by offset.
+    :param aspect: Aspect Ratio = Width / Height, rotation happens in pixel space
+    """
+    cos_a = math.cos(angle)
+    sin_a = math.sin(angle)
+    linear = np.array(((cos_a, -sin_a / aspect), (sin_a * aspect, cos_a))) * np.asarray(scale, dtype='float64')
+    pivot = np.asarray(pivot, dtype='float64')
+    translation = pivot - linear @ pivot + np.asarray(offset, dtype='float64')
+    return np.column_stack((linear, translation))
+
+
+def affine_matrices(angles: np.ndarray, scales: np.ndarray, pivots: np.ndarray, offsets: np.ndarray | None = None,
+                    aspect: float = 1.0) -> np.ndarray:
+    """Vectorized affine_matrix, (N, 2, 3) from N angles, scales (N, 2), pivots (N, 2) and offsets (N, 2)"""
+    cos_a = np.cos(angles)
+    sin_a = np.sin(angles)
+    matrices = np.empty((len(angles), 2, 3), dtype='float64')
+    matrices[:, 0, 0] = cos_a * scales[:, 0]
+    matrices[:, 0, 1] = -sin_a / aspect * scales[:, 1]
+    matrices[:, 1, 0] = sin_a * aspect * scales[:, 0]
+    matrices[:, 1, 1] = cos_a * scales[:, 1]
+    matrices[:, :, 2] = pivots - np.einsum('nij,nj->ni', matrices[:, :, :2], pivots)
+    if offsets is not None:
+        matrices[:, :, 2] += offsets
+    return matrices
+
+
+def transform_uvs(uv_co: np.ndarray, matrices: np.ndarray, corner_islands: np.ndarray | None = None) -> np.ndarray:
+    """Apply a (2, 3) matrix to all UVs (N, 2), or (I, 2, 3) matrices picked per UV by corner_islands"""
+    x = uv_co[:, 0]
+    y = uv_co[:, 1]
+    if corner_islands is not None:
+        matrices = matrices[corner_islands]
+        return np.stack((matrices[:, 0, 0] * x + matrices[:, 0, 1] * y + matrices[:, 0, 2],
+                         matrices[:, 1, 0] * x + matrices[:, 1, 1] * y + matrices[:, 1, 2]), axis=1)
+    return np.stack((matrices[0, 0] * x + matrices[0, 1] * y + matrices[0, 2],
+                     matrices[1, 0] * x + matrices[1, 1] * y + matrices[1, 2]), axis=1)
+
+
+def get_corner_uv_select(attributes, uv_name: str, count: int) -> np.ndarray:
+    """UV vertex selection per corner (Blender 5.0+ stores it once, older versions per UV map)"""
+    name = '.uv_select_vert' if '.uv_select_vert' in attributes else f'.vs.{uv_name}'
+    return island_engine.get_attribute(attributes, name, count, bool, 'value')
+
+
+class IslandCorners:
+    """Corners of islands, grouped by island"""
+
+    def __init__(self, corners: np.ndarray, corner_islands: np.ndarray, island_count: int):
+        self.corners = corners
+        self.corner_islands = corner_islands
+        self.island_count = island_count
+        self.starts: np.ndarray = np.flatnonzero(np.diff(corner_islands, prepend=-1))
+
+    def __len__(self):
+        return self.island_count
+
+    def calc_bounds(self, uv_co: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Min and max (I, 2) of every island"""
+        coords = uv_co[self.corners]
+        return np.minimum.reduceat(coords, self.starts), np.maximum.reduceat(coords, self.starts)
+
+    def filter(self, island_mask: np.ndarray) -> 'IslandCorners':
+        """Islands where island_mask is set, renumbered in order"""
+        keep = island_mask[self.corner_islands]
+        new_index = np.cumsum(island_mask) - 1
+        return IslandCorners(self.corners[keep], new_index[self.corner_islands[keep]], int(island_mask.sum()))
+
+
+class CornerUVs:
+    """Corner UVs of one BMesh in mesh loop order, read with one mesh copy and transformed in place.
+    write() sets the corners of changed faces through the BMLoop UV layer.
+    """
+
+    def __init__(self, bm: bmesh.types.BMesh, uv: bmesh.types.BMLayerItem, arrays: island_engine.MeshArrays):
+        self.bm = bm
+        self.uv = uv
+        self.arrays = arrays
+        self.uv_co: np.ndarray = arrays.uv_co.astype('float64')
+        self.written_uv_co: np.ndarray = arrays.uv_co  # float32 UVs the BMesh holds
+        self.face_select: np.ndarray = np.empty(0, dtype=bool)
+        self.corner_select: np.ndarray = np.empty(0, dtype=bool)
+
+    @classmethod
+    @trace.traced('TRANSFORM')
+    def from_bmesh(cls, bm: bmesh.types.BMesh, uv: bmesh.types.BMLayerItem) -> 'CornerUVs | None':
+        """Return None when the scratch mesh can't be written"""
+        me = island_engine.scratch_mesh()
+        try:
+            bm.to_mesh(me)
+        except (AttributeError, RuntimeError, ValueError):
+            return None
+
+        try:
+            if (arrays := island_engine.MeshArrays.from_mesh(me, uv.name)) is None:
+                return None
+            self = cls(bm, uv, arrays)
+            attributes = me.attributes
+            self.face_select = island_engine.get_attribute(attributes, '.select_poly', len(me.polygons), bool, 'value')
+            self.corner_select = get_corner_uv_select(attributes, uv.name, len(me.loops))
+        finally:
+            me.clear_geometry()
+        return self
+
+    def calc_island_corners(self, face_tags: np.ndarray, mode: str = island_engine.MODE_UV, umesh=None) -> IslandCorners:
+        """Corners of the islands of tagged faces, the partition is cached when umesh is given"""
+        arrays = self.arrays
+        key = island_cache.make_key(umesh, mode, math.pi, face_tags, arrays) if umesh is not None else None
+        if (entry := island_cache.island_cache.get(key, umesh)) is not None:
+            face_order, starts = entry.face_order, entry.starts
+        else:
+            face_order, starts = island_engine.calc_island_face_order(arrays, face_tags, mode)
+            island_cache.island_cache.put(key, face_order, starts, umesh)
+
+        face_islands = np.repeat(np.arange(len(starts)), np.diff(starts, append=len(face_order)))
+        return self.calc_face_corners(face_order, face_islands, len(starts))
+
+    def calc_face_corners(self, faces: np.ndarray, face_islands: np.ndarray, island_count: int) -> IslandCorners:
+        """Corners of faces grouped by island, faces of one island must be contiguous"""
+        arrays = self.arrays
+        sizes = arrays.loop_total[faces]
+        corners = np.repeat(arrays.loop_start[faces] - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+        return IslandCorners(corners, np.repeat(face_islands, sizes), island_count)
+
+    def transform(self, matrices: np.ndarray, corners: np.ndarray | None = None, corner_islands: np.ndarray | None = None):
+        """Transform all corners, or the given corners with one matrix or a matrix per island"""
+        if corners is None:
+            self.uv_co = transform_uvs(self.uv_co, matrices, corner_islands)
+        else:
+            self.uv_co[corners] = transform_uvs(self.uv_co[corners], matrices, corner_islands)
+
+    def transform_islands(self, islands: IslandCorners, matrices: np.ndarray):
+        self.transform(matrices, islands.corners, islands.corner_islands)
+
+    def move(self, delta, corners: np.ndarray | None = None):
+        if corners is None:
+            self.uv_co += delta
+        else:
+            self.uv_co[corners] += delta
+
+    @trace.traced('TRANSFORM')
+    def write(self) -> int:
+        """Write the UVs of faces with a changed corner through the BMesh UV layer, return the face count"""
+        arrays = self.arrays
+        uv_co = self.uv_co.astype('float32')
+        changed = (uv_co != self.written_uv_co).any(axis=1)
+        faces = np.unique(arrays.loop_face[changed])
+        if not len(faces):
+            return 0
+
+        # Every corner of a changed face, unchanged corners get their own float32 value back
+        sizes = arrays.loop_total[faces]
+        corners = np.repeat(arrays.loop_start[faces] - (np.cumsum(sizes) - sizes), sizes) + np.arange(sizes.sum())
+        coords = iter(uv_co[corners].tolist())
+
+        uv = self.uv
+        bm_faces = self.bm.faces
+        bm_faces.ensure_lookup_table()
+        for face_index in faces.tolist():
+            for crn in bm_faces[face_index].loops:
+                crn[uv].uv = next(coords)
+        self.written_uv_co = uv_co
+        return len(faces)